@@ -0,0 +1,99 @@
+"""
+Throughput of a loopback link against the APCI parameters k and w
+
+A T104Slave answers an interrogation with a burst of M_ME_NC_1 ASDUs, which
+a T104Connection counts. For each k/w pair both ends are configured with
+set_apci_parameters() and the ASDUs per second of the burst are reported.
+The sender stops after k unconfirmed I frames and the receiver confirms
+after w, so with a round trip time RTT throughput is bound by about
+k / RTT frames per second. Loopback has almost no RTT; to see the effect of
+a satellite link add delay to the loopback interface first (Linux, root):
+
+    tc qdisc add dev lo root netem delay 300ms
+    python apci_window_bench.py --asdus 2000 --windows 12:8,128:64,1024:512
+    tc qdisc del dev lo root
+
+Run from this directory:
+
+    python apci_window_bench.py [--asdus N] [--repeat R] [--windows K:W,...]
+"""
+import sys
+import argparse
+import threading
+import time
+
+sys.path.insert(1, '../')
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDUBuilder, get_builder
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24111
+
+
+class Burst():
+    def __init__(self, count):
+        # full ASDUs of points with their own IOA
+        points = count * get_builder().get_capacity(TypeID.M_ME_NC_1)
+        self.asdus = ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, range(0, points * 2, 2), [1.0] * points,
+                                             cot=CauseOfTransmission.INTERROGATED_BY_STATION)
+        self.received = 0
+        self.done = threading.Event()
+
+    def send(self, parameter, connection, asdu, qoi):
+        connection.send_act_con(asdu)
+        for response in self.asdus:
+            connection.send_asdu(response)
+        connection.send_act_term(asdu)
+        return True
+
+    def receive(self, asdu):
+        if asdu.get_cot() == CauseOfTransmission.INTERROGATED_BY_STATION:
+            self.received += 1
+        elif asdu.get_cot() == CauseOfTransmission.ACTIVATION_TERMINATION:
+            self.done.set()
+        return True
+
+
+def measure(slave, burst, k, w):
+    slave.set_apci_parameters(k=k, w=w)
+    burst.received = 0
+    burst.done.clear()
+    connection = T104Connection("127.0.0.1", PORT)
+    connection.set_apci_parameters(k=k, w=w)
+    connection.set_asdu_received_handler(burst.receive)
+    with connection.connect():
+        connection.send_start_dt()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        connection.send_interrogation_command(ca=1)
+        if not burst.done.wait(120):
+            raise RuntimeError("burst not received")
+        duration = time.perf_counter() - start
+    return burst.received / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--asdus", type=int, default=2000, help="ASDUs per burst")
+    parser.add_argument("--repeat", type=int, default=3, help="bursts per k/w pair, the best one is reported")
+    parser.add_argument("--windows", default="1:1,4:2,12:8,32:16,128:64", help="k:w pairs")
+    args = parser.parse_args()
+
+    burst = Burst(args.asdus)
+    slave = T104Slave(max_high_prio_queue_size=len(burst.asdus) + 2)
+    slave.set_local_address(b"127.0.0.1")
+    slave.set_local_port(PORT)
+    slave.set_interrogation_handler(burst.send)
+    slave.start()
+    try:
+        for window in args.windows.split(","):
+            k, w = (int(value) for value in window.split(":"))
+            throughput = max(measure(slave, burst, k, w) for _ in range(args.repeat))
+            print("k={:<6} w={:<6} {:10.0f} ASDU/s".format(k, w, throughput))
+    finally:
+        slave.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Throughput and latency of per-ASDU callbacks against batched delivery
+
+A T104Slave on the loopback interface answers an interrogation with a burst
+of M_ME_NC_1 ASDUs, the T104Connection receives them either with
+set_asdu_received_handler() or set_asdu_batch_handler(). The latency of an
+ASDU is the time from sending it until a Python handler has it, the CPU
+time includes both ends. The callback cost is the time the library
+connection thread spends in Python (holding the GIL) per ASDU, measured by
+calling the registered ctypes callback directly. Run from this directory:
+
+    python batch_receive_bench.py [--asdus N] [--repeat R] [--batch-size B] [--latency S]
+"""
+import sys
+import argparse
+import ctypes
+import threading
+import time
+import timeit
+
+sys.path.insert(1, '../')
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDUBuilder
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24110
+ELEMENTS = 16
+
+
+def ioa_of(buffer):
+    # default connection parameters: 6 byte header, 3 byte IOA
+    return buffer[6] | buffer[7] << 8 | buffer[8] << 16
+
+
+class Burst():
+    def __init__(self, count):
+        self.count = count
+        self.asdus = [asdu for index in range(count)
+                      for asdu in ASDUBuilder.from_arrays(TypeID.M_ME_NC_1,
+                                                          range(index * ELEMENTS, (index + 1) * ELEMENTS),
+                                                          [float(index)] * ELEMENTS,
+                                                          cot=CauseOfTransmission.INTERROGATED_BY_STATION)]
+        self.reset()
+
+    def reset(self):
+        self.sent = [0.0] * self.count
+        self.received = [0.0] * self.count
+        self.done = threading.Event()
+
+    def send(self, parameter, connection, asdu, qoi):
+        connection.send_act_con(asdu)
+        for index, response in enumerate(self.asdus):
+            self.sent[index] = time.perf_counter()
+            connection.send_asdu(response)
+        return True
+
+    def receive(self, buffers):
+        now = time.perf_counter()
+        for buffer in buffers:
+            index = ioa_of(buffer) // ELEMENTS
+            if index < self.count:
+                self.received[index] = now
+                if index == self.count - 1:
+                    self.done.set()
+
+
+def measure(burst, connect):
+    burst.reset()
+    connection = T104Connection("127.0.0.1", PORT)
+    connect(connection, burst)
+    with connection.connect():
+        connection.send_start_dt()
+        time.sleep(0.1)
+        cpu = time.process_time()
+        connection.send_interrogation_command(ca=1)
+        if not burst.done.wait(30):
+            raise RuntimeError("burst not received")
+        cpu = time.process_time() - cpu
+    latencies = sorted(received - sent for sent, received in zip(burst.sent, burst.received))
+    duration = max(burst.received) - min(burst.sent)
+    return (burst.count / duration, cpu / burst.count,
+            latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)])
+
+
+def per_asdu(connection, burst):
+    def handler(asdu):
+        if asdu.get_cot() == CauseOfTransmission.INTERROGATED_BY_STATION:
+            burst.receive([asdu.get_buffer()])
+        return True
+    connection.set_asdu_received_handler(handler)
+
+
+def batched(batch_size, latency):
+    def connect(connection, burst):
+        connection.set_asdu_batch_handler(lambda parameters, buffers: burst.receive(buffers), batch_size, latency)
+    return connect
+
+
+def callback_cost(connect, number=20000, repeat=5):
+    burst = Burst(1)
+    connection = T104Connection("127.0.0.1", PORT)
+    connect(connection, burst)
+    callback = connection._asdu_received_callback
+    asdu = burst.asdus[0]
+    asdu.set_cot(CauseOfTransmission.INTERROGATED_BY_STATION)
+    argument = ctypes.pointer(asdu) if connect is per_asdu else ctypes.addressof(asdu)
+    best = min(timeit.repeat(lambda: callback(None, argument), number=number, repeat=repeat))
+    if connection._batch_receiver:
+        connection._batch_receiver.stop()
+    return best / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--asdus", type=int, default=2000, help="ASDUs per burst")
+    parser.add_argument("--repeat", type=int, default=5, help="bursts per mode, the best one is reported")
+    parser.add_argument("--batch-size", type=int, default=256, help="max batch size")
+    parser.add_argument("--latency", type=float, default=0.005, help="max batch latency in seconds")
+    args = parser.parse_args()
+
+    burst = Burst(args.asdus)
+    slave = T104Slave(max_high_prio_queue_size=args.asdus + 1)
+    slave.set_local_address(b"127.0.0.1")
+    slave.set_local_port(PORT)
+    slave.set_interrogation_handler(burst.send)
+    slave.start()
+    try:
+        modes = [("per ASDU callback", per_asdu), ("batched", batched(args.batch_size, args.latency))]
+        for name, connect in modes:
+            print("{:20} {:10.2f} us callback/ASDU".format(name, callback_cost(connect) * 1e6))
+        for name, connect in modes:
+            throughput, cpu, p50, p99 = max(measure(burst, connect) for _ in range(args.repeat))
+            print("{:20} {:10.0f} ASDU/s {:8.1f} us CPU/ASDU   p50 {:8.2f} ms   p99 {:8.2f} ms".format(
+                name, throughput, cpu * 1e6, p50 * 1e3, p99 * 1e3))
+    finally:
+        slave.stop()
+
+
+if __name__ == "__main__":
+    main()
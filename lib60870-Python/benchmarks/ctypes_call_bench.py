@@ -0,0 +1,63 @@
+"""
+Micro-benchmark for the per-call cost of the ctypes wrappers
+
+Measures the time spent in a single wrapper call for the hot decode path:
+ASDU.get_element(), MeasuredValueShort.get_value() and
+CP56Time2a.to_ms_timestamp(), and compares decoding a whole ASDU through
+the library with the pure Python ASDUDecoder. Run from this directory:
+
+    python ctypes_call_bench.py [--number N] [--repeat R]
+"""
+import sys
+import argparse
+import timeit
+
+sys.path.insert(1, '../')
+from lib60870.asdu import ASDU, get_decoder
+from lib60870.CP56Time2a import CP56Time2a
+from lib60870.information_object import MeasuredValueShort
+from lib60870.lib60870 import CauseOfTransmission, TypeID, QualityDescriptor
+
+
+def build_asdu():
+    asdu = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.SPONTANEOUS)
+    for ioa in range(100, 110):
+        asdu.add_information_object(MeasuredValueShort(ioa, ioa * 1.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+    return asdu
+
+
+def benchmarks():
+    asdu = build_asdu()
+    measured_value = MeasuredValueShort(100, 12.5, QualityDescriptor.IEC60870_QUALITY_GOOD)
+    timestamp = CP56Time2a(1500000000000)
+    decoder = get_decoder()
+    buffer = asdu.get_buffer()
+    return [
+        ("ASDU.get_element", lambda: asdu.get_element(3)),
+        ("MeasuredValueShort.get_value", measured_value.get_value),
+        ("CP56Time2a.to_ms_timestamp", timestamp.to_ms_timestamp),
+        ("ASDU.get_elements (10)", asdu.get_elements),
+        ("ASDUDecoder.decode (10)", lambda: decoder.decode(buffer)),
+    ]
+
+
+def run(number, repeat):
+    results = []
+    for name, function in benchmarks():
+        best = min(timeit.repeat(function, number=number, repeat=repeat))
+        results.append((name, best / number * 1e9))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=100000, help="calls per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements, the best one is reported")
+    args = parser.parse_args()
+
+    for name, ns_per_call in run(args.number, args.repeat):
+        print("{:32} {:10.1f} ns/call".format(name, ns_per_call))
+
+
+if __name__ == "__main__":
+    main()
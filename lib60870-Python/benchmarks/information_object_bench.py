@@ -0,0 +1,245 @@
+"""
+Cost of the information object wrappers for every TypeID
+
+For every entry of information_object._type_id_type_lookup the matrix
+measures, with and without time tag where the class takes an optional
+timestamp:
+
+    construct   creating the information object
+    add         ASDU.add_information_object() into an empty ASDU
+    decode      ASDU.get_element() of an ASDU holding the object
+    getters     calling every get_*() method of the object once
+
+in nanoseconds per operation, the best of --repeat runs of --number
+operations. Classes that cannot be created and information objects that
+add_information_object() rejects are reported as errors. With tracemalloc
+the Python memory blocks and bytes retained per operation are counted, and
+the peak of a single operation. Memory the library allocates with malloc()
+is not traced. Run from this directory:
+
+    python information_object_bench.py [--number N] [--repeat R] [--sort COLUMN] [--output FILE]
+"""
+import sys
+import argparse
+import ctypes
+import inspect
+import json
+import time
+import tracemalloc
+
+sys.path.insert(1, '../')
+from lib60870 import information_object
+from lib60870.CP56Time2a import CP56Time2a
+from lib60870.asdu import ASDU
+from lib60870.common import BinaryCounterReading
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+OPERATIONS = ("construct", "add", "decode", "getters")
+
+# constructor arguments by parameter name, the types of the wrapper such as CP16Time2a are created from _fields_
+SAMPLE_ARGUMENTS = {
+    "ioa": 400, "value": 1, "quality": 0, "qds": 0, "qdp": 0, "isTransient": False, "command": True,
+    "selectCommand": False, "qu": 0, "ql": 0, "qoi": 20, "qcc": 5, "qrp": 1, "qpm": 0, "qpa": 1, "coi": 0,
+    "event": 0, "oci": 0, "nof": 1, "nos": 1, "lengthOfFile": 100, "lengthOfSection": 100, "positive": True,
+    "notReady": False, "scq": 0, "lsq": 0, "chs": 0, "afq": 0, "data": b"segment", "los": 7, "sof": 0,
+    "as_scaled": False,
+}
+
+# integrated totals take their value as BinaryCounterReading
+_counter_types = (15, 16, 37)
+
+# getters that are no measured operation
+_skipped_getters = ("get_pointer_type", "get_type_id", "get_max_data_size")
+
+
+def sample_arguments(type_id, io_type, timestamp):
+    """
+    Constructor arguments of io_type, without the optional timestamp unless timestamp
+    """
+    fields = dict(getattr(io_type, "_fields_", []))
+    arguments = []
+    for name, parameter in list(inspect.signature(io_type.__init__).parameters.items())[1:]:
+        if parameter.default is not inspect.Parameter.empty and not (name == "timestamp" and timestamp):
+            break
+        field = fields.get(name)
+        if name == "timestamp" and field is None:
+            arguments.append(CP56Time2a(1500000000000))
+        elif field is CP56Time2a:
+            arguments.append(CP56Time2a(1500000000000))
+        elif name == "value" and type_id.value in _counter_types:
+            arguments.append(BinaryCounterReading())
+        elif isinstance(field, type) and field.__module__.startswith("lib60870"):
+            # CP16Time2a, CP24Time2a, SingleEvent, StatusAndStatusChangeDetection
+            arguments.append(field())
+        elif name == "value" and field is ctypes.c_float:
+            arguments.append(12.5)
+        else:
+            arguments.append(SAMPLE_ARGUMENTS[name])
+    return arguments
+
+
+def variants(io_type):
+    """
+    True for the variant with time tag, False without, as the constructor allows
+    """
+    parameter = inspect.signature(io_type.__init__).parameters.get("timestamp")
+    if parameter is None:
+        return [False]
+    if parameter.default is inspect.Parameter.empty:
+        return [True]
+    return [False, True]
+
+
+def getters(io):
+    return [getattr(io, name) for name in sorted(dir(io))
+            if name.startswith("get_") and name not in _skipped_getters and callable(getattr(io, name))]
+
+
+class AddOperation():
+    """
+    Adds the information object to a fresh empty ASDU per call, prepare() creates them outside the measurement
+    """
+    def __init__(self, type_id, io):
+        self.type_id = type_id
+        self.io = io
+        self.asdus = []
+
+    def prepare(self, count):
+        self.asdus = [ASDU(type_id=self.type_id, cot=CauseOfTransmission.SPONTANEOUS) for _ in range(count)]
+
+    def __call__(self):
+        return self.asdus.pop().add_information_object(self.io)
+
+
+def operations(type_id, io_type, timestamp):
+    """
+    The measured operations as functions, None where there is no ASDU to add to, and the error of add, if any
+    """
+    arguments = sample_arguments(type_id, io_type, timestamp)
+    io = io_type(*arguments)
+    methods = getters(io)
+
+    def call_getters():
+        for method in methods:
+            method()
+
+    result = {"construct": lambda: io_type(*arguments), "getters": call_getters, "add": None, "decode": None}
+    if type_id == TypeID.INVALID:
+        return result, methods, None
+    asdu = ASDU(type_id=type_id, cot=CauseOfTransmission.SPONTANEOUS)
+    if not asdu.add_information_object(io):
+        return result, methods, "add_information_object() failed"
+
+    result["add"] = AddOperation(type_id, io)
+    result["decode"] = lambda: asdu.get_element(0)
+    return result, methods, None
+
+
+def time_operation(function, number, repeat):
+    best = None
+    prepare = getattr(function, "prepare", None)
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare(number)
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / number * 1e9
+
+
+def trace_operation(function, number):
+    """
+    Python memory blocks and bytes retained per operation and the peak bytes of one operation
+    """
+    prepare = getattr(function, "prepare", None)
+    if prepare is not None:
+        prepare(number + 1)
+    results = [None] * number
+    tracemalloc.start()
+    try:
+        function()
+        current, peak = tracemalloc.get_traced_memory()
+        before = tracemalloc.take_snapshot()
+        for index in range(number):
+            results[index] = function()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    statistics = after.compare_to(before, "filename")
+    blocks = sum(statistic.count_diff for statistic in statistics)
+    size = sum(statistic.size_diff for statistic in statistics)
+    return {"blocks": blocks / number, "bytes": size / number, "peak": peak}
+
+
+def run(args):
+    selected = None if args.type_ids is None else set(int(value) for value in args.type_ids.split(","))
+    rows = []
+    for type_id, io_type in information_object._type_id_type_lookup:
+        if selected is not None and type_id.value not in selected:
+            continue
+        for timestamp in variants(io_type):
+            row = {"type_id": type_id.value, "name": type_id.name, "class": io_type.__name__,
+                   "timestamp": timestamp, "ns": {}, "allocations": {}}
+            try:
+                functions, methods, error = operations(type_id, io_type, timestamp)
+            except Exception as error:
+                row["error"] = "{}: {}".format(type(error).__name__, error)
+                rows.append(row)
+                continue
+            if error is not None:
+                row["error"] = error
+            row["getters"] = [method.__name__ for method in methods]
+            for name in OPERATIONS:
+                function = functions[name]
+                if function is None:
+                    row["ns"][name] = None
+                    row["allocations"][name] = None
+                    continue
+                row["ns"][name] = time_operation(function, args.number, args.repeat)
+                if args.tracemalloc:
+                    row["allocations"][name] = trace_operation(function, args.trace_number)
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="operations per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements, the best one is reported")
+    parser.add_argument("--type-ids", help="comma separated TypeID numbers, all by default")
+    parser.add_argument("--sort", choices=OPERATIONS, help="sort by the cost of an operation, most expensive first")
+    parser.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false", help="skip allocation tracing")
+    parser.add_argument("--trace-number", type=int, default=200, help="operations traced with tracemalloc")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = run(args)
+    if args.sort:
+        rows.sort(key=lambda row: -(row["ns"].get(args.sort) or 0.0))
+
+    print("{:>3} {:52} {:>2} {:>10} {:>10} {:>10} {:>10} {:>14} {:>14}".format(
+        "id", "class", "ts", "construct", "add", "decode", "getters", "construct blk", "decode blk"))
+    for row in rows:
+        if not row["ns"]:
+            print("{:3d} {:52} {:>2} {}".format(row["type_id"], row["class"], "t" if row["timestamp"] else "",
+                                                row["error"]))
+            continue
+        allocations = row["allocations"]
+        print("{:3d} {:52} {:>2} {} {:>14} {:>14}{}".format(
+            row["type_id"], row["class"], "t" if row["timestamp"] else "",
+            " ".join("{:10.0f}".format(row["ns"][name]) if row["ns"][name] is not None else "{:>10}".format("-")
+                     for name in OPERATIONS),
+            *["{:.1f}/{:.0f}B".format(allocations[name]["blocks"], allocations[name]["bytes"])
+              if allocations.get(name) else "-" for name in ("construct", "decode")],
+            "  " + row["error"] if "error" in row else ""))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"benchmark": "information_object_bench", "number": args.number, "repeat": args.repeat,
+                       "python": sys.version.split()[0], "results": rows}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
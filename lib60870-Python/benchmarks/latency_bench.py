@@ -0,0 +1,316 @@
+"""
+End-to-end latency from T104Slave.enqueue_asdu() to the T104Connection callback
+
+A T104Slave and a T104Connection are connected over loopback. The slave
+enqueues M_BO_NA_1 ASDUs at a fixed rate, with the microseconds of
+time.perf_counter() at the moment of enqueueing in the bitstring of the
+first element. The receiving callback takes the time again and the
+difference is the latency of the ASDU: the low priority queue of the slave,
+the connection threads of both ends, the ctypes callback and, depending on
+the mode, the batch receiver or the asyncio event loop.
+
+The matrix runs every combination of
+    --queue-sizes   max_low_prio_queue_size of the slave
+    --windows       k:w of both ends
+    --fills         elements per ASDU, "max" for a full ASDU
+    --modes         handler (set_asdu_received_handler), batch
+                    (set_asdu_batch_handler) or async (AsyncT104Connection)
+and reports p50, p99 and p99.9 per combination. ASDUs dropped by a full
+queue are reported as lost. The slave sends about one ASDU of its low
+priority queue per millisecond, rates near 1000 ASDUs per second measure
+the queueing delay instead. With --output the results are written as JSON,
+with --baseline a previous JSON is compared and the run fails when the p99
+of a combination grew by more than --tolerance. Run from this directory:
+
+    python latency_bench.py [--count N] [--rate R] [--output FILE] [--baseline FILE]
+"""
+import sys
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import math
+import platform
+import struct
+import threading
+import time
+
+sys.path.insert(1, '../')
+import lib60870
+from lib60870.AsyncT104Connection import AsyncT104Connection
+from lib60870.CommandTracker import LatencyHistogram
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDUBuilder, get_builder
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24120
+
+# default connection parameters: 6 byte header, then the 3 byte IOA and the bitstring of the first element
+STAMP_OFFSET = 9
+_stamp = struct.Struct("<I")
+
+# 10 us to 1.3 s
+HISTOGRAM_BOUNDS = [0.00001 * 2 ** exponent for exponent in range(18)]
+
+
+def now_us():
+    return time.perf_counter_ns() // 1000 & 0xffffffff
+
+
+class Receiver():
+    """
+    Collects the latency of the stamped ASDUs, subclasses connect in one callback mode
+    """
+    def __init__(self):
+        self.samples = []
+        self.received = 0
+
+    def add(self, received, buffer):
+        if buffer[0] == TypeID.M_BO_NA_1.value:
+            self.samples.append(((received - _stamp.unpack_from(buffer, STAMP_OFFSET)[0]) & 0xffffffff) / 1e6)
+            self.received += 1
+
+    def reset(self):
+        self.samples = []
+        self.received = 0
+
+
+class HandlerReceiver(Receiver):
+    def open(self, port, k, w):
+        self._stack = contextlib.ExitStack()
+        connection = T104Connection("127.0.0.1", port)
+        connection.set_apci_parameters(k=k, w=w)
+        connection.set_asdu_received_handler(self.receive)
+        self._stack.enter_context(connection.connect())
+        connection.send_start_dt()
+
+    def receive(self, asdu):
+        received = now_us()
+        self.add(received, asdu.get_buffer())
+        return True
+
+    def close(self):
+        self._stack.close()
+
+
+class BatchReceiver(HandlerReceiver):
+    def __init__(self, batch_size, latency):
+        super().__init__()
+        self.batch_size = batch_size
+        self.latency = latency
+
+    def open(self, port, k, w):
+        self._stack = contextlib.ExitStack()
+        connection = T104Connection("127.0.0.1", port)
+        connection.set_apci_parameters(k=k, w=w)
+        connection.set_asdu_batch_handler(self.receive_batch, self.batch_size, self.latency)
+        self._stack.enter_context(connection.connect())
+        connection.send_start_dt()
+
+    def receive_batch(self, parameters, buffers):
+        received = now_us()
+        for buffer in buffers:
+            self.add(received, buffer)
+
+
+class AsyncReceiver(Receiver):
+    def open(self, port, k, w):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="latency_bench", daemon=True)
+        self.thread.start()
+        self.connection = AsyncT104Connection("127.0.0.1", port, max_queue_size=1 << 16, loop=self.loop)
+        self.connection.connection.set_apci_parameters(k=k, w=w)
+        asyncio.run_coroutine_threadsafe(self._connect(), self.loop).result(10)
+        self.task = asyncio.run_coroutine_threadsafe(self._receive(), self.loop)
+
+    async def _connect(self):
+        await self.connection.connect()
+        await self.connection.start_dt()
+
+    async def _receive(self):
+        async for asdu in self.connection:
+            self.add(now_us(), asdu.get_buffer())
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.connection.close(), self.loop).result(10)
+        self.task.result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def percentile(ordered, percent):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, int(math.ceil(len(ordered) * percent / 100.0)) - 1))]
+
+
+def send(slave, asdu, count, rate):
+    start = time.perf_counter()
+    for index in range(count):
+        delay = start + index / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        _stamp.pack_into(asdu.encodedData, STAMP_OFFSET, now_us())
+        slave.enqueue_asdu(asdu)
+    return time.perf_counter() - start
+
+
+def wait_received(receiver, count, timeout):
+    """
+    Wait until count ASDUs arrived or none arrived for timeout seconds
+    """
+    last, deadline = receiver.received, time.monotonic() + timeout
+    while receiver.received < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+        if receiver.received != last:
+            last, deadline = receiver.received, time.monotonic() + timeout
+
+
+def measure(receiver, mode, queue_size, k, w, fill, args):
+    capacity = get_builder().get_capacity(TypeID.M_BO_NA_1)
+    elements = capacity if fill == "max" else int(fill)
+    # IOAs with gaps, the builder would send contiguous ones as a sequence
+    asdu = ASDUBuilder.from_arrays(TypeID.M_BO_NA_1, range(0, elements * 2, 2), [0] * elements,
+                                   cot=CauseOfTransmission.SPONTANEOUS)[0]
+    slave = T104Slave(max_low_prio_queue_size=queue_size)
+    slave.set_local_address(b"127.0.0.1")
+    slave.set_local_port(PORT)
+    slave.set_apci_parameters(k=k, w=w)
+    slave.start()
+    receiver.reset()
+    try:
+        receiver.open(PORT, k, w)
+        try:
+            time.sleep(0.1)
+            send(slave, asdu, args.warmup, args.rate)
+            wait_received(receiver, args.warmup, 0.5)
+            receiver.reset()
+            duration = send(slave, asdu, args.count, args.rate)
+            wait_received(receiver, args.count, args.timeout)
+        finally:
+            receiver.close()
+    finally:
+        slave.stop()
+
+    histogram = LatencyHistogram(HISTOGRAM_BOUNDS)
+    for sample in receiver.samples:
+        histogram.add(sample)
+    ordered = sorted(receiver.samples)
+    return {
+        "queue_size": queue_size,
+        "k": k,
+        "w": w,
+        "fill": elements,
+        "mode": mode,
+        "sent": args.count,
+        "received": receiver.received,
+        "lost": args.count - receiver.received,
+        "rate": args.count / duration,
+        "latency": {
+            "count": len(ordered),
+            "mean": sum(ordered) / len(ordered) if ordered else None,
+            "p50": percentile(ordered, 50),
+            "p99": percentile(ordered, 99),
+            "p99.9": percentile(ordered, 99.9),
+            "max": ordered[-1] if ordered else None,
+        },
+        "histogram": {"bounds": HISTOGRAM_BOUNDS, "counts": histogram.counts},
+    }
+
+
+def key(result):
+    return (result["queue_size"], result["k"], result["w"], result["fill"], result["mode"])
+
+
+def compare(results, baseline, tolerance):
+    """
+    The combinations whose p99 grew by more than tolerance against the baseline results
+    """
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(key(result))
+        if before is None or before["latency"]["p99"] is None or result["latency"]["p99"] is None:
+            continue
+        if result["latency"]["p99"] > before["latency"]["p99"] * (1.0 + tolerance):
+            regressions.append((result, before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queue-sizes", default="16,1024", help="low priority queue sizes of the slave")
+    parser.add_argument("--windows", default="12:8,128:64", help="k:w pairs")
+    parser.add_argument("--fills", default="1,max", help="elements per ASDU")
+    parser.add_argument("--modes", default="handler,batch,async", help="callback modes")
+    parser.add_argument("--count", type=int, default=1000, help="ASDUs per combination")
+    parser.add_argument("--warmup", type=int, default=100, help="ASDUs sent before measuring")
+    parser.add_argument("--rate", type=float, default=200.0, help="ASDUs per second")
+    parser.add_argument("--timeout", type=float, default=2.0, help="seconds to wait for the last ASDUs")
+    parser.add_argument("--batch-size", type=int, default=256, help="max batch size of the batch mode")
+    parser.add_argument("--batch-latency", type=float, default=0.005, help="max batch latency in seconds")
+    parser.add_argument("--output", help="write the results as JSON to this file, - for stdout")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare the p99 with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth of the p99")
+    args = parser.parse_args()
+
+    receivers = {
+        "handler": HandlerReceiver,
+        "batch": lambda: BatchReceiver(args.batch_size, args.batch_latency),
+        "async": AsyncReceiver,
+    }
+    modes = args.modes.split(",")
+    for mode in modes:
+        if mode not in receivers:
+            parser.error("unknown mode {}".format(mode))
+    windows = [tuple(int(value) for value in window.split(":")) for window in args.windows.split(",")]
+    fills = args.fills.split(",")
+
+    results = []
+    report = sys.stderr if args.output == "-" else sys.stdout
+    print("{:>6} {:>5} {:>5} {:>4} {:8} {:>9} {:>9} {:>9} {:>9} {:>6}".format(
+        "queue", "k", "w", "fill", "mode", "p50 ms", "p99 ms", "p99.9 ms", "max ms", "lost"), file=report)
+    for queue_size in (int(value) for value in args.queue_sizes.split(",")):
+        for k, w in windows:
+            for fill in fills:
+                for mode in modes:
+                    result = measure(receivers[mode](), mode, queue_size, k, w, fill, args)
+                    results.append(result)
+                    latency = result["latency"]
+                    print("{:6d} {:5d} {:5d} {:4d} {:8} {:9.3f} {:9.3f} {:9.3f} {:9.3f} {:6d}".format(
+                        queue_size, k, w, result["fill"], mode,
+                        *[(latency[name] or 0.0) * 1e3 for name in ("p50", "p99", "p99.9", "max")],
+                        result["lost"]), file=report)
+
+    document = {
+        "benchmark": "latency_bench",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "version": lib60870.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {"count": args.count, "warmup": args.warmup, "rate": args.rate,
+                       "batch_size": args.batch_size, "batch_latency": args.batch_latency},
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w") as output:
+            json.dump(document, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        for result, before in regressions:
+            print("regression: queue {} k {} w {} fill {} {}: p99 {:.3f} ms, was {:.3f} ms".format(
+                *key(result), result["latency"]["p99"] * 1e3, before["latency"]["p99"] * 1e3), file=report)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from lib60870.lib60870 import IEC60870ConnectionEvent, CauseOfTransmission, Qual
 from lib60870.T104Slave import T104Slave
 from lib60870.information_object import *
 from lib60870.asdu import ASDU
+from lib60870.PointDatabase import PointDatabase
 
 logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.INFO)
 
@@ -20,38 +21,6 @@ def connection_request_callback(parameter, conn):
     return True
 
 
-def interrogation_callback(parameter, connection, asdu, qoi):
-    logging.info("Received interrogation for group {}".format(qoi))
-    if qoi == 20:
-        connection.send_act_con(asdu)
-
-        new_asdu = ASDU(parameter, TypeID.M_ME_NB_1, False, CauseOfTransmission.INTERROGATED_BY_STATION, 0, 1)
-        new_asdu.add_information_object(MeasuredValueScaled(100, -1, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(MeasuredValueScaled(101, 23, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(MeasuredValueScaled(102, 2300, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        connection.send_asdu(new_asdu)
-
-        new_asdu = ASDU(parameter, TypeID.M_SP_NA_1, False, CauseOfTransmission.INTERROGATED_BY_STATION, 0, 1)
-        new_asdu.add_information_object(SinglePointInformation(104, True, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(SinglePointInformation(105, False, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        connection.send_asdu(new_asdu)
-
-        new_asdu = ASDU(parameter, TypeID.M_SP_NA_1, False, CauseOfTransmission.INTERROGATED_BY_STATION,  0, 1)
-        new_asdu.add_information_object(SinglePointInformation(301, False, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(SinglePointInformation(302, True, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(SinglePointInformation(303, False, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(SinglePointInformation(304, True, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(SinglePointInformation(305, False, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(SinglePointInformation(306, True, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        new_asdu.add_information_object(SinglePointInformation(307, False, QualityDescriptor.IEC60870_QUALITY_GOOD))
-        connection.send_asdu(new_asdu)
-
-        connection.send_act_term(asdu)
-    else:
-        connection.send_act_con(asdu, True)
-    return True
-
-
 def asdu_callback(parameter, connection, asdu):
     logging.info("Received asdu {}".format(asdu))
     if asdu.get_type_id() == TypeID.C_SC_NA_1:
@@ -73,6 +42,14 @@ def asdu_callback(parameter, connection, asdu):
         return False
 
 
+def create_point_database():
+    database = PointDatabase()
+    database.add_points(1, TypeID.M_ME_NB_1, [100, 101, 102, 110], [-1, 23, 2300, 0])
+    database.add_points(1, TypeID.M_SP_NA_1, [104, 105], [True, False])
+    database.add_points(1, TypeID.M_SP_NA_1, range(301, 308), [False, True, False, True, False, True, False], group=1)
+    return database
+
+
 def main():
     t104slave = T104Slave()
     t104slave.set_local_address(ip=b"localhost")
@@ -81,7 +58,8 @@ def main():
     # Set up callbacks
     t104slave.set_connection_request_handler(connection_request_callback)
     t104slave.set_clock_synchronization_handler(clock_sync_callback)
-    t104slave.set_interrogation_handler(interrogation_callback)
+    database = create_point_database()
+    t104slave.set_point_database(database)
     t104slave.set_asdu_handler(asdu_callback)
 
     if not t104slave.start():
@@ -93,6 +71,7 @@ def main():
             time.sleep(1)
             asdu = ASDU(connectionParameters, TypeID.M_ME_NB_1, False, CauseOfTransmission.PERIODIC, 0, 1, False, False)
             asdu.add_information_object(MeasuredValueScaled(110, scaledValue, QualityDescriptor.IEC60870_QUALITY_GOOD))
+            database.update(1, 110, scaledValue)
             scaledValue += 1
             t104slave.enqueue_asdu(asdu)
     except KeyboardInterrupt:
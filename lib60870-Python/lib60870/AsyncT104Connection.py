@@ -0,0 +1,251 @@
+import logging
+import asyncio
+import collections
+
+from lib60870.T104Connection import T104Connection
+from lib60870.Interrogation import Interrogation
+from lib60870 import lib60870
+from lib60870.lib60870 import CauseOfTransmission, IEC60870ConnectionEvent, TypeID
+
+logger = logging.getLogger(__name__)
+
+# marks the end of the ASDU stream when the connection is closed
+_CLOSED = object()
+
+
+class AsyncT104Connection():
+    """
+    asyncio client on top of T104Connection
+
+    The library connection thread hands connection events and received
+    ASDUs to the event loop with call_soon_threadsafe(), so any number of
+    connections can be supervised from one loop. Received ASDUs are copied
+    and queued in a bounded queue, read with `async for asdu in connection`.
+    When the queue is full the oldest ASDU is dropped and counted in
+    `dropped`.
+    """
+    def __init__(self, ip, port=lib60870.IEC_60870_5_104_DEFAULT_PORT, max_queue_size=1024, loop=None):
+        self.connection = T104Connection(ip, port)
+        self.loop = loop
+        self.max_queue_size = max_queue_size
+        self.dropped = 0
+        self._queue = collections.deque()
+        self._queue_ready = None
+        self._event_waiters = collections.defaultdict(list)
+        self._command_waiters = collections.defaultdict(list)
+        self._interrogations = {}
+        self._open = False
+
+        self.connection.set_connection_handler(self._connection_handler)
+        self.connection.set_asdu_received_handler(self._asdu_received_handler)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        asdu = await self.receive()
+        if asdu is None:
+            raise StopAsyncIteration
+        return asdu
+
+    @property
+    def is_open(self):
+        return self._open
+
+    # called on the library connection thread
+    def _connection_handler(self, parameter, event):
+        self._call_soon(self._on_connection_event, event)
+
+    def _asdu_received_handler(self, asdu):
+        self._call_soon(self._on_asdu, asdu.copy())
+        return True
+
+    def _call_soon(self, callback, *args):
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            logger.warning("event loop closed, dropping {}".format(args))
+
+    # called on the event loop
+    def _on_connection_event(self, event):
+        logger.debug("connection event: {}".format(event))
+        if event == IEC60870ConnectionEvent.IEC60870_CONNECTION_OPENED:
+            self._open = True
+        elif event == IEC60870ConnectionEvent.IEC60870_CONNECTION_CLOSED:
+            self._open = False
+            self._put(_CLOSED)
+            self._fail_waiters(ConnectionError("connection closed"))
+        for future in self._event_waiters.pop(event, []):
+            if not future.done():
+                future.set_result(event)
+
+    def _on_asdu(self, asdu):
+        cot = asdu.get_cot()
+        if self._command_waiters and cot in (CauseOfTransmission.ACTIVATION_CON,
+                                             CauseOfTransmission.DEACTIVATION_CON):
+            size_of_ioa = asdu.parameters.contents.sizeOfIOA
+            ioa = int.from_bytes(bytes(asdu.payload[0:size_of_ioa]), "little") if asdu.payloadSize else 0
+            for future in self._command_waiters.pop((asdu.get_type_id(), asdu.get_ca(), ioa), []):
+                if not future.done():
+                    future.set_result(asdu)
+        for interrogation, future in list(self._interrogations.values()):
+            if interrogation.feed(asdu) and interrogation.done.is_set() and not future.done():
+                future.set_result(None)
+        self._put(asdu)
+
+    def _put(self, item):
+        if len(self._queue) >= self.max_queue_size:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(item)
+        if self._queue_ready is not None and not self._queue_ready.done():
+            self._queue_ready.set_result(None)
+
+    def _fail_waiters(self, exception):
+        waiters = list(self._event_waiters.values()) + list(self._command_waiters.values()) + \
+            [[future] for interrogation, future in self._interrogations.values()]
+        self._event_waiters.clear()
+        self._command_waiters.clear()
+        for futures in waiters:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exception)
+
+    async def _wait_for(self, waiters, key, timeout):
+        future = self.loop.create_future()
+        waiters[key].append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            if future in waiters.get(key, []):
+                waiters[key].remove(future)
+
+    async def connect(self, timeout=10.0):
+        """
+        Connect without blocking the event loop
+
+        The library does not report failed connection attempts, they raise
+        ConnectionError after timeout.
+        """
+        self.loop = self.loop or asyncio.get_event_loop()
+        future = self.loop.create_future()
+        self._event_waiters[IEC60870ConnectionEvent.IEC60870_CONNECTION_OPENED].append(future)
+        self.connection.connect_async()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise ConnectionError("connection to server failed")
+
+    async def close(self):
+        """
+        Close the connection, the library joins its thread in an executor
+        """
+        if self.loop is not None:
+            await self.loop.run_in_executor(None, self.connection.close)
+        else:
+            self.connection.close()
+
+    async def start_dt(self, timeout=10.0):
+        """
+        Send STARTDT act and wait for STARTDT con
+        """
+        self.connection.send_start_dt()
+        await self._wait_for(self._event_waiters, IEC60870ConnectionEvent.IEC60870_CONNECTION_STARTDT_CON_RECEIVED,
+                             timeout)
+
+    async def stop_dt(self, timeout=10.0):
+        """
+        Send STOPDT act and wait for STOPDT con
+        """
+        self.connection.send_stop_dt()
+        await self._wait_for(self._event_waiters, IEC60870ConnectionEvent.IEC60870_CONNECTION_STOPDT_CON_RECEIVED,
+                             timeout)
+
+    async def receive(self):
+        """
+        Next received ASDU, None when the connection is closed
+        """
+        while not self._queue:
+            self._queue_ready = self.loop.create_future()
+            await self._queue_ready
+        item = self._queue.popleft()
+        return None if item is _CLOSED else item
+
+    async def _command(self, send, type_id, ca, ioa, timeout):
+        # the confirmation is delivered on the event loop, so waiting after sending cannot miss it
+        if not send():
+            raise ConnectionError("failed to send {}".format(type_id.name))
+        return await self._wait_for(self._command_waiters, (type_id, ca, ioa), timeout)
+
+    async def send_interrogation_command(self,
+                                         cot=lib60870.CauseOfTransmission.ACTIVATION,
+                                         ca=1,
+                                         qoi=lib60870.QualifierOfInterrogation.IEC60870_QOI_STATION,
+                                         timeout=10.0):
+        """
+        Send an interrogation command and return the ACT_CON ASDU
+        """
+        return await self._command(
+            lambda: self.connection.send_interrogation_command(cot, ca, qoi), TypeID.C_IC_NA_1, ca, 0, timeout)
+
+    async def interrogate(self, ca=1, qoi=lib60870.QualifierOfInterrogation.IEC60870_QOI_STATION, timeout=30.0):
+        """
+        Interrogate a CA and wait for ACT_TERM, returns an InterrogationResult
+
+        Raises InterrogationError on a negative confirmation, TimeoutError
+        after timeout seconds and ConnectionError when the connection is
+        closed. The responses are still queued for receive().
+        """
+        if ca in self._interrogations:
+            raise RuntimeError("Interrogation of CA {} pending".format(ca))
+        interrogation = Interrogation(ca, qoi)
+        future = self.loop.create_future()
+        self._interrogations[ca] = (interrogation, future)
+        try:
+            if not self.connection.send_interrogation_command(CauseOfTransmission.ACTIVATION, ca,
+                                                              lib60870.QualifierOfInterrogation(interrogation.qoi)):
+                raise ConnectionError("failed to send C_IC_NA_1")
+            try:
+                await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError("interrogation of CA {} timed out".format(ca))
+            return interrogation.get_result()
+        finally:
+            del self._interrogations[ca]
+
+    async def send_counter_interrogation_command(self, cot, ca, qcc, timeout=10.0):
+        """
+        Send a counter interrogation command and return the ACT_CON ASDU
+        """
+        return await self._command(
+            lambda: self.connection.send_counter_interrogation_command(cot, ca, qcc), TypeID.C_CI_NA_1, ca, 0, timeout)
+
+    async def send_clock_sync_command(self, ca=1, cp56time2a=None, timeout=10.0):
+        """
+        Send a clock synchronization command and return the ACT_CON ASDU
+        """
+        def send():
+            self.connection.send_clock_sync_command(ca, cp56time2a)
+            return True
+        return await self._command(send, TypeID.C_CS_NA_1, ca, 0, timeout)
+
+    async def send_test_command(self, ca=1, timeout=10.0):
+        """
+        Send a test command and return the ACT_CON ASDU
+        """
+        return await self._command(lambda: self.connection.send_test_command(ca), TypeID.C_TS_NA_1, ca, 0, timeout)
+
+    async def send_control_command(self, cot, ca, command, timeout=10.0):
+        """
+        Send a control command and return the ACT_CON (or DEACT_CON) ASDU
+        """
+        return await self._command(
+            lambda: self.connection.send_control_command(cot, ca, command),
+            command.get_type_id(), ca, command.get_object_address(), timeout)
+
+    def send_read_command(self, ca, ioa):
+        return self.connection.send_read_command(ca, ioa)
+
+    def send_asdu(self, asdu):
+        return self.connection.send_asdu(asdu)
@@ -0,0 +1,198 @@
+import logging
+import asyncio
+import concurrent.futures
+
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDU
+from lib60870.lib60870 import CauseOfTransmission
+
+logger = logging.getLogger(__name__)
+
+# result of a handler that was cancelled or not run, nothing is sent
+_CANCELLED = object()
+
+
+class AsyncT104Slave():
+    """
+    asyncio outstation on top of T104Slave
+
+    Handlers are coroutines, run on the event loop instead of the library
+    connection thread. The connection thread copies the request, schedules
+    the handler with run_coroutine_threadsafe() and waits for its result, so
+    a slow handler stalls the receive loop of its own connection only.
+
+    The response is sent through the MasterConnection by the connection
+    thread before the callback returns. The library frees a MasterConnection
+    only after that, when its master disconnected:
+
+    - interrogation and counter interrogation handlers return the response
+      ASDUs, which are sent between ACT_CON and ACT_TERM, or False for a
+      negative ACT_CON
+    - the clock synchronization handler returns True or False for a positive
+      or negative ACT_CON
+    - the read handler returns the response ASDUs, or False for an
+      UNKNOWN_INFORMATION_OBJECT_ADDRESS response
+    - the ASDU handler returns the response ASDUs or True when it handled
+      the request, or False for an UNKNOWN_TYPE_ID response
+
+    A handler that runs longer than timeout seconds is cancelled and
+    answered like one returning False. By default the timeout is 80% of t1,
+    as the master closes the connection when its request is not acknowledged
+    within t1.
+    """
+    def __init__(self, parameters=None, max_low_prio_queue_size=128, max_high_prio_queue_size=128, loop=None,
+                 timeout=None):
+        self.slave = T104Slave(parameters, max_low_prio_queue_size, max_high_prio_queue_size)
+        self.loop = loop
+        self.timeout = timeout
+        self.pending = set()
+
+    def set_local_address(self, ip):
+        self.slave.set_local_address(ip)
+
+    def set_local_port(self, port):
+        self.slave.set_local_port(port)
+
+    def set_apci_parameters(self, **apci):
+        self.slave.set_apci_parameters(**apci)
+
+    def get_connection_parameters(self):
+        return self.slave.get_connection_parameters()
+
+    def get_open_connections(self):
+        return self.slave.get_open_connections()
+
+    def enqueue_asdu(self, asdu):
+        self.slave.enqueue_asdu(asdu)
+
+    def start(self):
+        """
+        Start the server, handlers run on the current event loop unless one was given
+        """
+        self.loop = self.loop or asyncio.get_event_loop()
+        return self.slave.start()
+
+    def stop(self):
+        """
+        Stop the server, handlers that are running are cancelled without response
+        """
+        for future in list(self.pending):
+            future.cancel()
+        self.slave.stop()
+
+    async def join(self):
+        """
+        Wait for the handlers that are running
+        """
+        while self.pending:
+            await asyncio.wait([asyncio.wrap_future(future, loop=self.loop) for future in list(self.pending)])
+
+    def _get_timeout(self):
+        if self.timeout is not None:
+            return self.timeout
+        return self.slave.get_connection_parameters().t1 * 0.8
+
+    # called on the library connection thread
+    def _call(self, handler, asdu, *args):
+        """
+        Run the handler on the event loop and wait for its result, _CANCELLED when there is none
+        """
+        coroutine = self._run(handler, asdu, *args)
+        try:
+            future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        except RuntimeError:
+            coroutine.close()
+            logger.warning("event loop closed, request not handled")
+            return _CANCELLED
+        self.pending.add(future)
+        future.add_done_callback(self._done)
+        try:
+            return future.result(self._get_timeout())
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning("handler for {} timed out".format(asdu))
+            return False
+        except concurrent.futures.CancelledError:
+            return _CANCELLED
+
+    def _done(self, future):
+        self.pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("handler failed: {!r}".format(future.exception()))
+
+    def _respond_activation(self, connection, asdu, result):
+        if result is _CANCELLED:
+            return
+        if result is False:
+            connection.send_act_con(asdu, True)
+            return
+        connection.send_act_con(asdu)
+        for response in result or []:
+            connection.send_asdu(response)
+        connection.send_act_term(asdu)
+
+    def _respond_request(self, connection, asdu, result, negative_cot):
+        if result is _CANCELLED or result is True or result is None:
+            return
+        if result is False:
+            asdu.set_cot(negative_cot)
+            asdu.set_negative(True)
+            connection.send_asdu(asdu)
+            return
+        if isinstance(result, ASDU):
+            result = [result]
+        for response in result:
+            connection.send_asdu(response)
+
+    def set_interrogation_handler(self, handler):
+        def callback(parameter, connection, asdu, qoi):
+            asdu = asdu.copy()
+            self._respond_activation(connection, asdu, self._call(handler, asdu, connection, asdu, qoi))
+            return True
+
+        self.slave.set_interrogation_handler(callback)
+
+    def set_counter_interrogation_handler(self, handler):
+        def callback(parameter, connection, asdu, qcc):
+            asdu = asdu.copy()
+            self._respond_activation(connection, asdu, self._call(handler, asdu, connection, asdu, qcc))
+            return True
+
+        self.slave.set_counter_interrogation_handler(callback)
+
+    def set_clock_synchronization_handler(self, handler):
+        def callback(parameter, connection, asdu, newtime):
+            asdu = asdu.copy()
+            newtime = type(newtime).from_buffer_copy(newtime)
+            result = self._call(handler, asdu, connection, asdu, newtime)
+            if result is not _CANCELLED:
+                connection.send_act_con(asdu, not result)
+            return True
+
+        self.slave.set_clock_synchronization_handler(callback)
+
+    def set_read_handler(self, handler):
+        def callback(parameter, connection, asdu, ioa):
+            asdu = asdu.copy()
+            self._respond_request(connection, asdu, self._call(handler, asdu, connection, asdu, ioa),
+                                  CauseOfTransmission.UNKNOWN_INFORMATION_OBJECT_ADDRESS)
+            return True
+
+        self.slave.set_read_handler(callback)
+
+    def set_asdu_handler(self, handler):
+        def callback(parameter, connection, asdu):
+            asdu = asdu.copy()
+            self._respond_request(connection, asdu, self._call(handler, asdu, connection, asdu),
+                                  CauseOfTransmission.UNKNOWN_TYPE_ID)
+            return True
+
+        self.slave.set_asdu_handler(callback)
+
+    # called on the event loop
+    async def _run(self, handler, asdu, *args):
+        try:
+            return await handler(*args)
+        except Exception:
+            logger.exception("handler for {} failed".format(asdu))
+            return False
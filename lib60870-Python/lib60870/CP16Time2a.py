@@ -27,12 +27,11 @@ class CP16Time2a(ctypes.Structure):
             self.get_millisecond())
 
     def get_millisecond(self):
-        lib.CP16Time2a_getEplapsedTimeInMs.restype = c_int
         return lib.CP16Time2a_getEplapsedTimeInMs(pCP16Time2a(self))
 
     def set_millisecond(self, value):
         assert(0 <= value < 60000)
-        lib.CP16Time2a_setEplapsedTimeInMs(pCP16Time2a(self), c_int(value))
+        lib.CP16Time2a_setEplapsedTimeInMs(pCP16Time2a(self), value)
 
     @property
     def pointer(self):
@@ -31,42 +31,37 @@ class CP24Time2a(ctypes.Structure):
             "S" if self.is_substituted() else "")
 
     def get_millisecond(self):
-        lib.CP24Time2a_getMillisecond.restype = c_int
         return lib.CP24Time2a_getMillisecond(pCP24Time2a(self))
 
     def set_millisecond(self, value):
         assert(0 <= value < 1000)
-        lib.CP24Time2a_setMillisecond(pCP24Time2a(self), c_int(value))
+        lib.CP24Time2a_setMillisecond(pCP24Time2a(self), value)
 
     def get_second(self):
-        lib.CP24Time2a_getSecond.restype = c_int
         return lib.CP24Time2a_getSecond(pCP24Time2a(self))
 
     def set_second(self, value):
         assert(0 <= value < 60)
-        lib.CP24Time2a_setSecond(pCP24Time2a(self), c_int(value))
+        lib.CP24Time2a_setSecond(pCP24Time2a(self), value)
 
     def get_minute(self):
-        lib.CP24Time2a_getMinute.restype = c_int
         return lib.CP24Time2a_getMinute(pCP24Time2a(self))
 
     def set_minute(self, value):
         assert(0 <= value < 60)
-        lib.CP24Time2a_setMinute(pCP24Time2a(self), c_int(value))
+        lib.CP24Time2a_setMinute(pCP24Time2a(self), value)
 
     def is_invalid(self):
-        lib.CP24Time2a_isInvalid.restype = c_bool
         return lib.CP24Time2a_isInvalid(pCP24Time2a(self))
 
     def set_invalid(self, value):
-        lib.CP24Time2a_setInvalid(pCP24Time2a(self), c_bool(value))
+        lib.CP24Time2a_setInvalid(pCP24Time2a(self), value)
 
     def is_substituted(self):
-        lib.CP24Time2a_isSubstituted.restype = c_bool
         return lib.CP24Time2a_isSubstituted(pCP24Time2a(self))
 
     def set_substituted(self):
-        lib.CP24Time2a_setSubstituted(pCP24Time2a(self), c_bool(value))
+        lib.CP24Time2a_setSubstituted(pCP24Time2a(self), value)
 
     @property
     def pointer(self):
@@ -24,7 +24,7 @@ class CP56Time2a(ctypes.Structure):
         return len(a) == len(b) and all(x == y for x, y in zip(a,b))
 
     def from_timestamp(self, ms_timestamp):
-        lib.CP56Time2a_setFromMsTimestamp(pCP56Time2a(self), c_uint64(ms_timestamp))
+        lib.CP56Time2a_setFromMsTimestamp(pCP56Time2a(self), ms_timestamp)
 
     def __repr__(self):
         return "{}({})".format(type(self).__name__, self.to_ms_timestamp())
@@ -43,96 +43,84 @@ class CP56Time2a(ctypes.Structure):
             "S" if self.is_substituted() else "")
 
     def set_from_ms_timestamp(self, timestamp):
-        lib.CP56Time2a_setFromMsTimestamp(pCP56Time2a(self), c_uint64(timestamp))
+        lib.CP56Time2a_setFromMsTimestamp(pCP56Time2a(self), timestamp)
 
     def to_ms_timestamp(self):
-        lib.CP56Time2a_toMsTimestamp.restype = c_uint64
         return lib.CP56Time2a_toMsTimestamp(pCP56Time2a(self))
 
     def get_millisecond(self):
-        lib.CP56Time2a_getMillisecond.restype = c_int
         return lib.CP56Time2a_getMillisecond(pCP56Time2a(self))
 
     def set_millisecond(self, value):
         assert(0 <= value < 1000)
-        lib.CP56Time2a_setMillisecond(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setMillisecond(pCP56Time2a(self), value)
 
     def get_second(self):
-        lib.CP56Time2a_getSecond.restype = c_int
         return lib.CP56Time2a_getSecond(pCP56Time2a(self))
 
     def set_second(self, value):
         assert(0 <= value < 60)
-        lib.CP56Time2a_setSecond(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setSecond(pCP56Time2a(self), value)
 
     def get_minute(self):
-        lib.CP56Time2a_getMinute.restype = c_int
         return lib.CP56Time2a_getMinute(pCP56Time2a(self))
 
     def set_minute(self, value):
         assert(0 <= value < 60)
-        lib.CP56Time2a_setMinute(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setMinute(pCP56Time2a(self), value)
 
     def get_hour(self):
-        lib.CP56Time2a_getHour.restype = c_int
         return lib.CP56Time2a_getHour(pCP56Time2a(self))
 
     def set_hour(self, value):
         assert(0 <= value < 24)
-        lib.CP56Time2a_setHour(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setHour(pCP56Time2a(self), value)
 
     def get_day_of_week(self):
-        lib.CP56Time2a_getDayOfWeek.restype = c_int
         return lib.CP56Time2a_getDayOfWeek(pCP56Time2a(self))
 
     def set_day_of_week(self, value):
         assert(0 < value <= 7)
-        lib.CP56Time2a_setDayOfWeek(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setDayOfWeek(pCP56Time2a(self), value)
 
     def get_day_of_month(self):
-        lib.CP56Time2a_getDayOfMonth.restype = c_int
         return lib.CP56Time2a_getDayOfMonth(pCP56Time2a(self))
 
     def set_day_of_month(self, value):
         assert(0 < value <= 31)
-        lib.CP56Time2a_setDayOfMonth(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setDayOfMonth(pCP56Time2a(self), value)
 
     def get_month(self):
-        lib.CP56Time2a_getMonth.restype = c_int
         return lib.CP56Time2a_getMonth(pCP56Time2a(self))
 
     def set_month(self, value):
         assert(0 < value <= 12)
-        lib.CP56Time2a_setMonth(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setMonth(pCP56Time2a(self), value)
 
     def get_year(self):
-        lib.CP56Time2a_getYear.restype = c_int
         return lib.CP56Time2a_getYear(pCP56Time2a(self))
 
     def set_year(self, value):
         assert(0 <= value < 100)
-        lib.CP56Time2a_setYear(pCP56Time2a(self), c_int(value))
+        lib.CP56Time2a_setYear(pCP56Time2a(self), value)
 
     def is_summer_time(self):
-        lib.CP56Time2a_isSummerTime.restype = c_bool
         return lib.CP56Time2a_isSummerTime(pCP56Time2a(self))
 
     def set_summer_time(self, value):
-        lib.CP56Time2a_setSummerTime(pCP56Time2a(self), c_bool(value))
+        lib.CP56Time2a_setSummerTime(pCP56Time2a(self), value)
 
     def is_invalid(self):
-        lib.CP56Time2a_isInvalid.restype = c_bool
         return lib.CP56Time2a_isInvalid(pCP56Time2a(self))
 
     def set_invalid(self, value):
-        lib.CP56Time2a_setInvalid(pCP56Time2a(self), c_bool(value))
+        lib.CP56Time2a_setInvalid(pCP56Time2a(self), value)
 
     def is_substituted(self):
-        lib.CP56Time2a_isSubstituted.restype = c_bool
         return lib.CP56Time2a_isSubstituted(pCP56Time2a(self))
 
     def set_substituted(self):
-        lib.CP56Time2a_setSubstituted(pCP56Time2a(self), c_bool(value))
+        lib.CP56Time2a_setSubstituted(pCP56Time2a(self), value)
 
     @property
     def pointer(self):
@@ -0,0 +1,703 @@
+import logging
+import array
+import enum
+import multiprocessing
+import os
+import queue
+import socket
+import struct
+import zlib
+
+from lib60870 import lib60870
+from lib60870.asdu import _as_float, get_decoder
+
+logger = logging.getLogger(__name__)
+
+# numpy layout of CaptureBatch.frames_to_numpy(), sequence numbers are -1 where the format has none
+CAPTURE_FRAME_FIELDS = [
+    ("timestamp", "<f8"),
+    ("flow", "<u4"),
+    ("direction", "u1"),
+    ("format", "u1"),
+    ("send_seq", "<i4"),
+    ("recv_seq", "<i4"),
+    ("u_function", "u1"),
+    ("type_id", "u1"),
+    ("cot", "u1"),
+    ("ca", "<u2"),
+    ("elements", "u1"),
+]
+
+# numpy layout of CaptureBatch.points_to_numpy(), frame is the position of the I frame in the batch
+CAPTURE_POINT_FIELDS = [
+    ("frame", "<u4"),
+    ("ca", "<u2"),
+    ("ioa", "<u4"),
+    ("type_id", "u1"),
+    ("cot", "u1"),
+    ("value", "<f8"),
+    ("quality", "u1"),
+    ("timestamp_ms", "<i8"),
+]
+
+
+class FrameFormat(enum.IntEnum):
+    I = 0
+    S = 1
+    U = 2
+
+
+class Direction(enum.IntEnum):
+    # master to outstation, towards the IEC 104 port
+    CONTROL = 0
+    # outstation to master
+    MONITOR = 1
+
+
+class UFunction(enum.IntEnum):
+    STARTDT_ACT = 0x07
+    STARTDT_CON = 0x0b
+    STOPDT_ACT = 0x13
+    STOPDT_CON = 0x23
+    TESTFR_ACT = 0x43
+    TESTFR_CON = 0x83
+
+
+_START = 0x68
+_MAX_APDU_LENGTH = 253
+_APCI_LENGTH = 4
+
+_PCAP_MAGICS = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+_PCAPNG_SECTION = b"\x0a\x0d\x0d\x0a"
+
+_LINKTYPE_NULL = 0
+_LINKTYPE_ETHERNET = 1
+_LINKTYPE_RAW = (12, 14, 101, 228, 229)
+_LINKTYPE_LINUX_SLL = 113
+_LINKTYPE_LINUX_SLL2 = 276
+
+_ETHERTYPE_IPV4 = 0x0800
+_ETHERTYPE_IPV6 = 0x86dd
+_ETHERTYPE_VLAN = (0x8100, 0x88a8, 0x9100)
+_IPV6_EXTENSIONS = (0, 43, 60)
+_IPV6_AUTHENTICATION = 51
+_PROTOCOL_TCP = 6
+
+_TCP_FIN = 0x01
+_TCP_SYN = 0x02
+_TCP_RST = 0x04
+
+
+def _read_pcap(stream, byte_order, resolution):
+    header = stream.read(20)
+    if len(header) < 20:
+        return
+    linktype = struct.unpack(byte_order + "HHiIII", header)[5] & 0x0fffffff
+    record = struct.Struct(byte_order + "IIII")
+    while True:
+        header = stream.read(16)
+        if len(header) < 16:
+            return
+        seconds, fraction, captured, original = record.unpack(header)
+        data = stream.read(captured)
+        if len(data) < captured:
+            return
+        yield seconds + fraction * resolution, linktype, data
+
+
+def _read_pcapng(stream):
+    # read_packets() read the type of the first section header block
+    block_type = _PCAPNG_SECTION
+    byte_order = "<"
+    interfaces = []
+    while True:
+        if block_type is None:
+            block_type = stream.read(4)
+        head = stream.read(4)
+        if len(block_type) < 4 or len(head) < 4:
+            return
+        if block_type == _PCAPNG_SECTION:
+            # the byte order magic follows the block length
+            magic = stream.read(4)
+            byte_order = "<" if magic == b"\x4d\x3c\x2b\x1a" else ">"
+            length = struct.unpack(byte_order + "I", head)[0]
+            body = magic + stream.read(length - 12)
+            interfaces = []
+        else:
+            length = struct.unpack(byte_order + "I", head)[0]
+            body = stream.read(length - 8)
+        if len(body) < length - 8:
+            return
+        code = struct.unpack(byte_order + "I", block_type)[0]
+        block_type = None
+        if code == 1:
+            interfaces.append((struct.unpack_from(byte_order + "H", body)[0], _pcapng_resolution(body, byte_order)))
+        elif code == 6:
+            interface, high, low, captured = struct.unpack_from(byte_order + "IIII", body)
+            linktype, resolution = interfaces[interface]
+            yield ((high << 32) | low) * resolution, linktype, body[20:20 + captured]
+        elif code == 3:
+            original = struct.unpack_from(byte_order + "I", body)[0]
+            # simple packet blocks have no timestamp
+            yield 0.0, interfaces[0][0], body[4:4 + min(original, len(body) - 8)]
+        elif code == 2:
+            interface, drops, high, low, captured = struct.unpack_from(byte_order + "HHIII", body)
+            linktype, resolution = interfaces[interface]
+            yield ((high << 32) | low) * resolution, linktype, body[20:20 + captured]
+
+
+def _pcapng_resolution(body, byte_order):
+    """
+    Timestamp unit of an interface description block, microseconds unless if_tsresol says otherwise
+    """
+    offset = 8
+    # the block trailer repeats the block length
+    end = len(body) - 4
+    while offset + 4 <= end:
+        code, length = struct.unpack_from(byte_order + "HH", body, offset)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            value = body[offset + 4]
+            return 2.0 ** -(value & 0x7f) if value & 0x80 else 10.0 ** -value
+        offset += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def read_packets(stream):
+    """
+    Iterate (timestamp, linktype, data) over the packets of a pcap or pcapng stream
+    """
+    magic = stream.read(4)
+    if magic in _PCAP_MAGICS:
+        return _read_pcap(stream, *_PCAP_MAGICS[magic])
+    if magic == _PCAPNG_SECTION:
+        return _read_pcapng(stream)
+    raise ValueError("Not a pcap or pcapng capture (magic {})".format(magic.hex()))
+
+
+def _network_layer(linktype, data):
+    """
+    The IP packet of a link layer frame, None for other protocols
+    """
+    if linktype == _LINKTYPE_ETHERNET:
+        offset = 12
+        ethertype = data[12] << 8 | data[13]
+        while ethertype in _ETHERTYPE_VLAN:
+            offset += 4
+            ethertype = data[offset] << 8 | data[offset + 1]
+        if ethertype in (_ETHERTYPE_IPV4, _ETHERTYPE_IPV6):
+            return data[offset + 2:]
+        return None
+    if linktype == _LINKTYPE_LINUX_SLL:
+        ethertype = data[14] << 8 | data[15]
+        return data[16:] if ethertype in (_ETHERTYPE_IPV4, _ETHERTYPE_IPV6) else None
+    if linktype == _LINKTYPE_LINUX_SLL2:
+        ethertype = data[0] << 8 | data[1]
+        return data[20:] if ethertype in (_ETHERTYPE_IPV4, _ETHERTYPE_IPV6) else None
+    if linktype == _LINKTYPE_NULL:
+        return data[4:]
+    if linktype in _LINKTYPE_RAW:
+        return data
+    return None
+
+
+def _transport_layer(packet):
+    """
+    (source, destination, TCP segment) of an IP packet, None for other protocols and fragments
+    """
+    version = packet[0] >> 4
+    if version == 4:
+        header_length = (packet[0] & 0x0f) * 4
+        if packet[9] != _PROTOCOL_TCP or (packet[6] & 0x3f) or packet[7]:
+            return None
+        total_length = packet[2] << 8 | packet[3]
+        return packet[12:16], packet[16:20], packet[header_length:total_length]
+    if version == 6:
+        next_header = packet[6]
+        end = 40 + (packet[4] << 8 | packet[5])
+        offset = 40
+        while next_header != _PROTOCOL_TCP:
+            if next_header in _IPV6_EXTENSIONS:
+                next_header, offset = packet[offset], offset + (packet[offset + 1] + 1) * 8
+            elif next_header == _IPV6_AUTHENTICATION:
+                next_header, offset = packet[offset], offset + (packet[offset + 1] + 2) * 4
+            else:
+                # fragments and other protocols
+                return None
+        return packet[8:24], packet[24:40], packet[offset:end]
+    return None
+
+
+def _address(packed):
+    return socket.inet_ntop(socket.AF_INET if len(packed) == 4 else socket.AF_INET6, packed)
+
+
+def flow_id(server, server_port, client, client_port):
+    """
+    Stable 32 bit ID of a TCP connection, by its packed addresses and ports
+    """
+    return zlib.crc32(server + struct.pack(">HH", server_port, client_port) + client)
+
+
+class CaptureBatch():
+    """
+    The frames and decoded points of part of a capture, in columns
+
+    Frames are APDUs; only I frames have a TypeID, COT, CA and elements.
+    `flows` maps the flow IDs of the batch to (server, server port, client,
+    client port). Point values are float, see RemotePointImage; timestamps
+    are -1 without time tag. `asdus` holds the encoded ASDU of every I frame
+    when the reader keeps them, else it is None.
+    """
+    def __init__(self, keep_asdus=False):
+        self.flows = {}
+        self.timestamps = array.array("d")
+        self.flow_ids = array.array("I")
+        self.directions = array.array("B")
+        self.formats = array.array("B")
+        self.send_seqs = array.array("i")
+        self.recv_seqs = array.array("i")
+        self.u_functions = array.array("B")
+        self.type_ids = array.array("B")
+        self.cots = array.array("B")
+        self.cas = array.array("H")
+        self.element_counts = array.array("B")
+        self.point_frames = array.array("I")
+        self.point_cas = array.array("H")
+        self.point_ioas = array.array("I")
+        self.point_type_ids = array.array("B")
+        self.point_cots = array.array("B")
+        self.point_values = array.array("d")
+        self.point_qualities = array.array("B")
+        self.point_timestamps = array.array("q")
+        self.asdus = [] if keep_asdus else None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __repr__(self):
+        return "CaptureBatch(frames={}, points={}, flows={})".format(len(self), len(self.point_ioas), len(self.flows))
+
+    def frames_to_numpy(self):
+        """
+        The frames as numpy structured array of CAPTURE_FRAME_FIELDS
+        """
+        return self._to_numpy(CAPTURE_FRAME_FIELDS, (
+            self.timestamps, self.flow_ids, self.directions, self.formats, self.send_seqs, self.recv_seqs,
+            self.u_functions, self.type_ids, self.cots, self.cas, self.element_counts))
+
+    def points_to_numpy(self):
+        """
+        The decoded points as numpy structured array of CAPTURE_POINT_FIELDS
+        """
+        return self._to_numpy(CAPTURE_POINT_FIELDS, (
+            self.point_frames, self.point_cas, self.point_ioas, self.point_type_ids, self.point_cots,
+            self.point_values, self.point_qualities, self.point_timestamps))
+
+    @staticmethod
+    def _to_numpy(fields, columns):
+        import numpy
+
+        result = numpy.empty(len(columns[0]), dtype=fields)
+        for (field, dtype), column in zip(fields, columns):
+            if len(column):
+                result[field] = numpy.frombuffer(column, dtype=column.typecode)
+        return result
+
+
+class _Stream():
+    """
+    One direction of a TCP connection: reassembles the segments and splits the APDUs
+    """
+    def __init__(self, flow, direction):
+        self.flow = flow
+        self.direction = direction
+        self.next_seq = None
+        self.timestamp = 0.0
+        self.pending = {}
+        self.pending_size = 0
+        self.buffer = bytearray()
+        # a capture can start in the middle of an APDU
+        self.synchronized = False
+
+
+class CaptureReader():
+    """
+    Streaming reader of IEC 60870-5-104 traffic in pcap and pcapng captures
+
+    Reassembles the TCP connections to or from `ports` (Ethernet, VLAN,
+    Linux cooked, loopback and raw IPv4 and IPv6 links), splits the byte
+    streams into APDUs at the 0x68 start octet and classifies them as I, S
+    and U frames. The ASDUs of I frames are decoded with the pure Python
+    ASDUDecoder for `parameters`; ASDUs it cannot decode are counted and
+    kept as frames without points.
+
+    Iterating yields CaptureBatch objects of about batch_size frames, so
+    captures of any size are read in bounded memory. Out of order segments
+    are held back up to max_pending bytes per direction; beyond that, or at
+    the end of the capture, the missing data is skipped as a gap and the
+    stream resynchronizes on the next plausible start octet. `statistics`
+    counts packets, segments, gaps, frames and decode errors.
+
+    With partition=(index, count) only the TCP connections whose flow ID
+    modulo count is index are reassembled, see ParallelCaptureReader.
+    """
+    def __init__(self, source, ports=(lib60870.IEC_60870_5_104_DEFAULT_PORT,), parameters=None, batch_size=65536,
+                 decode=True, keep_asdus=False, max_pending=1 << 20, partition=None):
+        self.source = source
+        self.ports = frozenset(ports)
+        self.parameters = parameters
+        self.batch_size = batch_size
+        self.decode = decode
+        self.keep_asdus = keep_asdus
+        self.max_pending = max_pending
+        self.partition = partition
+        self.statistics = dict.fromkeys((
+            "packets", "segments", "ignored", "retransmitted", "out_of_order", "gaps", "skipped_bytes", "frames",
+            "i_frames", "s_frames", "u_frames", "points", "undecoded"), 0)
+        self._decoder = get_decoder(parameters)
+        self._streams = {}
+        self._batch = None
+
+    def __iter__(self):
+        if isinstance(self.source, (str, bytes, os.PathLike)):
+            with open(self.source, "rb") as stream:
+                yield from self._read(stream)
+        else:
+            yield from self._read(self.source)
+
+    def to_numpy(self):
+        """
+        Read the whole capture, returns (frames, points) as numpy structured arrays
+
+        The point frame field is the position in the frames array.
+        """
+        import numpy
+
+        frames, points = [], []
+        offset = 0
+        for batch in self:
+            frames.append(batch.frames_to_numpy())
+            batch_points = batch.points_to_numpy()
+            batch_points["frame"] += offset
+            points.append(batch_points)
+            offset += len(batch)
+        if not frames:
+            return numpy.empty(0, dtype=CAPTURE_FRAME_FIELDS), numpy.empty(0, dtype=CAPTURE_POINT_FIELDS)
+        return numpy.concatenate(frames), numpy.concatenate(points)
+
+    def _read(self, stream):
+        self._batch = CaptureBatch(self.keep_asdus)
+        statistics = self.statistics
+        ports = self.ports
+        for timestamp, linktype, data in read_packets(stream):
+            statistics["packets"] += 1
+            try:
+                packet = _network_layer(linktype, data)
+                transport = packet and _transport_layer(packet)
+            except IndexError:
+                transport = None
+            if not transport or len(transport[2]) < 20:
+                statistics["ignored"] += 1
+                continue
+            source, destination, segment = transport
+            source_port = segment[0] << 8 | segment[1]
+            destination_port = segment[2] << 8 | segment[3]
+            if destination_port in ports:
+                key = (destination, destination_port, source, source_port, Direction.CONTROL)
+            elif source_port in ports:
+                key = (source, source_port, destination, destination_port, Direction.MONITOR)
+            else:
+                statistics["ignored"] += 1
+                continue
+            tcp_stream = self._streams.get(key)
+            if tcp_stream is None:
+                flow = flow_id(*key[:4])
+                if self.partition is not None and flow % self.partition[1] != self.partition[0]:
+                    statistics["ignored"] += 1
+                    continue
+                tcp_stream = self._streams[key] = _Stream(flow, key[4])
+                self._batch.flows[flow] = (_address(key[0]), key[1], _address(key[2]), key[3])
+            statistics["segments"] += 1
+            self._segment(tcp_stream, timestamp, segment)
+            if segment[13] & (_TCP_FIN | _TCP_RST):
+                del self._streams[key]
+            if len(self._batch) >= self.batch_size:
+                yield self._next_batch()
+        for tcp_stream in list(self._streams.values()):
+            while tcp_stream.pending:
+                self._skip_gap(tcp_stream, tcp_stream.timestamp)
+        self._streams.clear()
+        if len(self._batch):
+            yield self._next_batch()
+
+    def _next_batch(self):
+        batch, self._batch = self._batch, CaptureBatch(self.keep_asdus)
+        flows = batch.flows
+        # flows that continue are listed in the next batch as well
+        for tcp_stream in self._streams.values():
+            if tcp_stream.flow in flows:
+                self._batch.flows[tcp_stream.flow] = flows[tcp_stream.flow]
+        return batch
+
+    def _segment(self, tcp_stream, timestamp, segment):
+        seq = int.from_bytes(segment[4:8], "big")
+        flags = segment[13]
+        payload = segment[(segment[12] >> 4) * 4:]
+        tcp_stream.timestamp = timestamp
+        if flags & _TCP_SYN:
+            # a new connection on the same addresses starts over
+            tcp_stream.next_seq = (seq + 1) & 0xffffffff
+            tcp_stream.pending.clear()
+            tcp_stream.pending_size = 0
+            del tcp_stream.buffer[:]
+            tcp_stream.synchronized = True
+            return
+        if not payload:
+            return
+        if tcp_stream.next_seq is None:
+            tcp_stream.next_seq = seq
+        offset = (seq - tcp_stream.next_seq) & 0xffffffff
+        if offset >= 0x80000000:
+            # starts before the expected sequence number
+            behind = 0x100000000 - offset
+            if behind >= len(payload):
+                self.statistics["retransmitted"] += 1
+                return
+            payload = payload[behind:]
+            offset = 0
+        if offset:
+            self.statistics["out_of_order"] += 1
+            seq = (tcp_stream.next_seq + offset) & 0xffffffff
+            if seq not in tcp_stream.pending or len(tcp_stream.pending[seq]) < len(payload):
+                tcp_stream.pending_size += len(payload) - len(tcp_stream.pending.get(seq, b""))
+                tcp_stream.pending[seq] = payload
+            while tcp_stream.pending_size > self.max_pending:
+                self._skip_gap(tcp_stream, timestamp)
+            return
+        self._append(tcp_stream, timestamp, payload)
+
+    def _append(self, tcp_stream, timestamp, payload):
+        tcp_stream.buffer += payload
+        tcp_stream.next_seq = (tcp_stream.next_seq + len(payload)) & 0xffffffff
+        pending = tcp_stream.pending
+        while pending:
+            # segments that are now in order, and retransmissions overlapping them
+            for seq in list(pending):
+                offset = (seq - tcp_stream.next_seq) & 0xffffffff
+                if offset < 0x80000000 and offset:
+                    continue
+                data = pending.pop(seq)
+                tcp_stream.pending_size -= len(data)
+                behind = 0 if offset == 0 else 0x100000000 - offset
+                if behind < len(data):
+                    tcp_stream.buffer += data[behind:]
+                    tcp_stream.next_seq = (tcp_stream.next_seq + len(data) - behind) & 0xffffffff
+                break
+            else:
+                break
+        self._split(tcp_stream, timestamp)
+
+    def _skip_gap(self, tcp_stream, timestamp):
+        """
+        Give up on missing data, continue at the first held back segment
+        """
+        self.statistics["gaps"] += 1
+        first = min(tcp_stream.pending, key=lambda seq: (seq - tcp_stream.next_seq) & 0xffffffff)
+        del tcp_stream.buffer[:]
+        tcp_stream.synchronized = False
+        tcp_stream.next_seq = first
+        data = tcp_stream.pending.pop(first)
+        tcp_stream.pending_size -= len(data)
+        self._append(tcp_stream, timestamp, data)
+
+    def _split(self, tcp_stream, timestamp):
+        buffer = tcp_stream.buffer
+        size = len(buffer)
+        position = 0
+        while size - position >= 2:
+            length = buffer[position + 1]
+            if buffer[position] != _START or not _APCI_LENGTH <= length <= _MAX_APDU_LENGTH or (
+                    not tcp_stream.synchronized and not self._plausible(buffer, position)):
+                start = buffer.find(_START, position + 1)
+                skipped = (size if start < 0 else start) - position
+                self.statistics["skipped_bytes"] += skipped
+                tcp_stream.synchronized = False
+                if start < 0:
+                    position = size
+                    break
+                position = start
+                continue
+            end = position + 2 + length
+            if end > size:
+                break
+            tcp_stream.synchronized = True
+            self._frame(tcp_stream, timestamp, buffer, position + 2, end)
+            position = end
+        if position:
+            del buffer[:position]
+
+    @staticmethod
+    def _plausible(buffer, position):
+        """
+        After a gap, a start octet is only trusted when the next APDU starts right after its APDU
+        """
+        end = position + 2 + buffer[position + 1]
+        return end >= len(buffer) or buffer[end] == _START
+
+    def _frame(self, tcp_stream, timestamp, buffer, start, end):
+        batch = self._batch
+        statistics = self.statistics
+        statistics["frames"] += 1
+        control = buffer[start]
+        batch.timestamps.append(timestamp)
+        batch.flow_ids.append(tcp_stream.flow)
+        batch.directions.append(tcp_stream.direction)
+        if control & 0x01 == 0:
+            statistics["i_frames"] += 1
+            batch.formats.append(FrameFormat.I)
+            batch.send_seqs.append((control | buffer[start + 1] << 8) >> 1)
+            batch.recv_seqs.append((buffer[start + 2] | buffer[start + 3] << 8) >> 1)
+            batch.u_functions.append(0)
+            self._asdu(batch, bytes(buffer[start + _APCI_LENGTH:end]))
+            return
+        if control & 0x03 == 0x01:
+            statistics["s_frames"] += 1
+            batch.formats.append(FrameFormat.S)
+            batch.send_seqs.append(-1)
+            batch.recv_seqs.append((buffer[start + 2] | buffer[start + 3] << 8) >> 1)
+            batch.u_functions.append(0)
+        else:
+            statistics["u_frames"] += 1
+            batch.formats.append(FrameFormat.U)
+            batch.send_seqs.append(-1)
+            batch.recv_seqs.append(-1)
+            batch.u_functions.append(control)
+        batch.type_ids.append(0)
+        batch.cots.append(0)
+        batch.cas.append(0)
+        batch.element_counts.append(0)
+
+    def _asdu(self, batch, asdu):
+        decoder = self._decoder
+        if batch.asdus is not None:
+            batch.asdus.append(asdu)
+        if len(asdu) < decoder.header_length:
+            self.statistics["undecoded"] += 1
+            batch.type_ids.append(asdu[0] if asdu else 0)
+            batch.cots.append(0)
+            batch.cas.append(0)
+            batch.element_counts.append(0)
+            return
+        header = decoder._header.unpack_from(asdu)
+        type_id, vsq, cot, ca = header[0], header[1], header[2], header[-1]
+        batch.type_ids.append(type_id)
+        batch.cots.append(cot & 0x3f)
+        batch.cas.append(ca)
+        batch.element_counts.append(vsq & 0x7f)
+        if not self.decode:
+            return
+        try:
+            decoded = decoder.decode(asdu)
+        except ValueError:
+            self.statistics["undecoded"] += 1
+            return
+        frame = len(batch) - 1
+        cot = cot & 0x3f
+        for element in decoded.elements:
+            batch.point_frames.append(frame)
+            batch.point_cas.append(ca)
+            batch.point_ioas.append(element.ioa)
+            batch.point_type_ids.append(type_id)
+            batch.point_cots.append(cot)
+            batch.point_values.append(_as_float(element.value))
+            batch.point_qualities.append(element.quality or 0)
+            batch.point_timestamps.append(-1 if element.timestamp is None else element.timestamp)
+        self.statistics["points"] += len(decoded.elements)
+
+
+def _partition_main(path, index, count, results, options):
+    """
+    Worker process of ParallelCaptureReader: reads one partition of the flows
+    """
+    try:
+        reader = CaptureReader(path, partition=(index, count), **options)
+        for batch in reader:
+            results.put(("batch", index, batch))
+        results.put(("done", index, reader.statistics))
+    except Exception as exception:
+        results.put(("error", index, "{}: {}".format(type(exception).__name__, exception)))
+
+
+class ParallelCaptureReader():
+    """
+    Reads a capture file with worker processes, partitioned by TCP flow
+
+    Every worker reads the whole file but reassembles and decodes only its
+    share of the TCP connections, see CaptureReader partition, so the
+    expensive part scales with the number of processes. Iterating yields the
+    CaptureBatch objects of all workers as they arrive: batches of one flow
+    are in order, batches of different flows are interleaved. `statistics`
+    sums the counters of the workers after the last batch; packets are
+    counted by every worker.
+
+    The queue of results is polled every poll_interval seconds; a worker that
+    exited without reporting its end, killed for example, fails the iteration
+    with RuntimeError. Keyword arguments are passed to CaptureReader.
+    """
+    def __init__(self, path, workers=None, max_queued=16, start_method="spawn", poll_interval=1.0, **options):
+        self.path = os.fspath(path)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queued = max_queued
+        self.poll_interval = poll_interval
+        self.options = options
+        self.statistics = None
+        self._context = multiprocessing.get_context(start_method)
+
+    def __iter__(self):
+        results = self._context.Queue(self.max_queued)
+        processes = [self._context.Process(target=_partition_main, name="CaptureReader-{}".format(index),
+                                           args=(self.path, index, self.workers, results, self.options),
+                                           daemon=True)
+                     for index in range(self.workers)]
+        for process in processes:
+            process.start()
+        statistics = {}
+        running = len(processes)
+        finished = set()
+        exited = set()
+        try:
+            while running:
+                try:
+                    kind, index, value = results.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    # an exited worker has flushed its results, they are lost when
+                    # still missing after another poll
+                    lost = exited - finished
+                    if lost:
+                        raise RuntimeError("capture worker {} exited with {}".format(
+                            min(lost), processes[min(lost)].exitcode))
+                    exited = {index for index, process in enumerate(processes)
+                              if index not in finished and process.exitcode is not None}
+                    continue
+                if kind == "batch":
+                    yield value
+                    continue
+                running -= 1
+                finished.add(index)
+                if kind == "error":
+                    raise RuntimeError("capture worker failed, {}".format(value))
+                for name, count in value.items():
+                    statistics[name] = statistics.get(name, 0) + count
+            self.statistics = statistics
+        finally:
+            for process in processes:
+                if running:
+                    process.kill()
+                process.join()
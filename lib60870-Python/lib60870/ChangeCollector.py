@@ -0,0 +1,153 @@
+import logging
+import collections
+import threading
+import time
+
+from lib60870.asdu import get_builder
+from lib60870.lib60870 import CauseOfTransmission
+
+logger = logging.getLogger(__name__)
+
+# time tagged TypeIDs, their changes are events and are all sent instead of only the last one
+_time_tagged_types = (2, 4, 6, 8, 10, 12, 14, 16, 30, 31, 32, 33, 34, 35, 36, 37)
+
+
+class _PendingChanges():
+    def __init__(self, since, coalesce):
+        self.since = since
+        self.changes = {} if coalesce else []
+
+    def __len__(self):
+        return len(self.changes)
+
+    def add(self, ioa, value, quality, timestamp):
+        if isinstance(self.changes, dict):
+            self.changes[ioa] = (value, quality, timestamp)
+        else:
+            self.changes.append((ioa, (value, quality, timestamp)))
+
+    def points(self):
+        changes = self.changes.items() if isinstance(self.changes, dict) else self.changes
+        ioas = [ioa for ioa, change in changes]
+        values = [change[0] for ioa, change in changes]
+        qualities = [change[1] for ioa, change in changes]
+        timestamps = [change[2] for ioa, change in changes]
+        return ioas, values, qualities, timestamps
+
+
+class ChangeCollector():
+    """
+    Coalesces spontaneous changes into full ASDUs for T104Slave.enqueue_asdu()
+
+    Changes are collected per CA and TypeID. A group is packed with
+    ASDUBuilder and enqueued as soon as it holds max_fill points (by default
+    as many as fit in one ASDU), or when its oldest change is max_delay
+    seconds old. For points without time tag only the last change of an IOA
+    is sent, changes of time tagged points are events and are all sent.
+
+    The TypeID of a point can be left out when the slave has a
+    PointDatabase, which is then updated as well. Call start() to flush aged
+    changes from a background thread, or call flush() from the scan cycle.
+    """
+    def __init__(self, slave, max_delay=0.1, max_fill=None, cot=CauseOfTransmission.SPONTANEOUS,
+                 parameters=None, database=None):
+        self.slave = slave
+        self.max_delay = max_delay
+        self.max_fill = max_fill
+        self.cot = cot
+        self.builder = get_builder(parameters or slave.get_connection_parameters())
+        self.database = database if database is not None else getattr(slave, "point_database", None)
+        self.changes = 0
+        self.asdus = 0
+        self._pending = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._thread = None
+        self._running = False
+
+    def __len__(self):
+        return sum(len(pending) for pending in self._pending.values())
+
+    def update(self, ioa, value, quality=0, timestamp=None, ca=1, type_id=None):
+        """
+        Add the change of a point, the timestamp defaults to now
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        if self.database is not None:
+            if type_id is None:
+                type_id = self.database.get_type_id(ca, ioa)
+            self.database.update(ca, ioa, value, quality, timestamp)
+        elif type_id is None:
+            raise ValueError("TypeID of IOA {} unknown without PointDatabase".format(ioa))
+        key = (ca, type_id)
+        with self._lock:
+            self.changes += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingChanges(time.monotonic(),
+                                                               type_id.value not in _time_tagged_types)
+                self._changed.set()
+            pending.add(ioa, value, quality, timestamp)
+            if len(pending) >= (self.max_fill or self.builder.get_capacity(type_id)):
+                self._enqueue(key, self._pending.pop(key))
+
+    def update_many(self, ioas, values, qualities=None, timestamps=None, ca=1, type_id=None, deadband=None):
+        """
+        Add the changes of several points, passing them through a DeadbandFilter when given
+        """
+        if deadband is not None:
+            ioas, values, qualities, timestamps = deadband.filter(ioas, values, qualities, timestamps)
+            ioas, values, qualities, timestamps = ioas.tolist(), values.tolist(), qualities.tolist(), timestamps.tolist()
+        for offset, ioa in enumerate(ioas):
+            self.update(ioa, values[offset],
+                        0 if qualities is None else qualities[offset],
+                        None if timestamps is None else timestamps[offset],
+                        ca, type_id)
+
+    def _enqueue(self, key, pending):
+        ca, type_id = key
+        ioas, values, qualities, timestamps = pending.points()
+        for asdu in self.builder.build(type_id, ioas, values, qualities, timestamps, self.cot, ca):
+            self.slave.enqueue_asdu(asdu)
+            self.asdus += 1
+
+    def flush(self, max_age=0):
+        """
+        Enqueue the changes that are at least max_age seconds old, all by default
+
+        Returns the time until the next group is due, or None when nothing is pending
+        """
+        with self._lock:
+            now = time.monotonic()
+            for key, pending in list(self._pending.items()):
+                if now - pending.since >= max_age:
+                    self._enqueue(key, self._pending.pop(key))
+            if not self._pending:
+                return None
+            return min(pending.since for pending in self._pending.values()) + max_age - now
+
+    def start(self):
+        """
+        Flush aged changes from a background thread
+        """
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ChangeCollector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread and enqueue the pending changes
+        """
+        self._running = False
+        self._changed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while self._running:
+            self._changed.clear()
+            timeout = self.flush(self.max_delay)
+            self._changed.wait(timeout)
@@ -0,0 +1,338 @@
+import logging
+import bisect
+import heapq
+import itertools
+import threading
+import time
+
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+logger = logging.getLogger(__name__)
+
+# C_SC_NA_1 to C_BO_NA_1 and C_SC_TA_1 to C_BO_TA_1
+COMMAND_TYPE_IDS = frozenset(TypeID(value) for value in itertools.chain(range(45, 52), range(58, 65)))
+
+# upper bounds of the histogram buckets in seconds, 1 ms doubling up to about 65 s
+DEFAULT_LATENCY_BOUNDS = tuple(0.001 * 2 ** index for index in range(17))
+
+_REJECTING_COTS = (
+    CauseOfTransmission.UNKNOWN_TYPE_ID,
+    CauseOfTransmission.UNKNOWN_CAUSE_OF_TRANSMISSION,
+    CauseOfTransmission.UNKNOWN_COMMON_ADDRESS_OF_ASDU,
+    CauseOfTransmission.UNKNOWN_INFORMATION_OBJECT_ADDRESS,
+)
+
+
+class CommandError(RuntimeError):
+    """
+    The outstation rejected a command, `asdu` is its negative confirmation
+    """
+    def __init__(self, message, asdu):
+        super().__init__(message)
+        self.asdu = asdu
+
+
+class LatencyHistogram():
+    """
+    Counts of latencies in buckets with upper bounds `bounds`, in seconds
+
+    Latencies above the last bound are counted in an overflow bucket.
+    Percentiles are interpolated within their bucket and never exceed the
+    largest latency seen.
+    """
+    def __init__(self, bounds=DEFAULT_LATENCY_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+
+    def add(self, latency):
+        self.counts[bisect.bisect_left(self.bounds, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = latency if self.max is None else max(self.max, latency)
+
+    def percentile(self, percent):
+        if not self.count:
+            return None
+        rank = self.count * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def get(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class TrackedCommand():
+    """
+    A control command sent to an outstation, see CommandTracker
+
+    `confirmation_time` is the time from sending to ACT_CON and `duration`
+    the time to completion, both in seconds. A command completes on ACT_TERM,
+    or on ACT_CON when no termination is expected (select commands).
+    """
+    def __init__(self, outstation, ca, ioa, type_id, termination, deadline):
+        self.outstation = outstation
+        self.ca = ca
+        self.ioa = ioa
+        self.type_id = type_id
+        self.termination = termination
+        self.deadline = deadline
+        self.confirmation_time = None
+        self.duration = None
+        self.error = None
+        self.started = time.monotonic()
+        self.done = threading.Event()
+
+    def __repr__(self):
+        return "TrackedCommand(outstation={}, ca={}, ioa={}, type_id={}, confirmation_time={}, duration={})".format(
+            self.outstation, self.ca, self.ioa, self.type_id.name, self.confirmation_time, self.duration)
+
+    @property
+    def key(self):
+        return (self.outstation, self.ca, self.ioa, self.type_id)
+
+    @property
+    def label(self):
+        # the CA stands for the outstation when the connection was attached without name
+        return self.ca if self.outstation is None else self.outstation
+
+    def wait(self, timeout=None):
+        """
+        Wait for completion, raises CommandError or TimeoutError when the command failed
+        """
+        if not self.done.wait(timeout):
+            raise TimeoutError("{} to CA {} IOA {} pending".format(self.type_id.name, self.ca, self.ioa))
+        if self.error is not None:
+            raise self.error
+        return self
+
+
+class _OutstationMetrics():
+    def __init__(self, bounds):
+        self.confirmation = LatencyHistogram(bounds)
+        self.completion = LatencyHistogram(bounds)
+        self.sent = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def get(self):
+        return {
+            "sent": self.sent,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "confirmation": self.confirmation.get(),
+            "completion": self.completion.get(),
+        }
+
+
+class CommandTracker():
+    """
+    Measures the round trip of control commands, ACT to ACT_CON to ACT_TERM
+
+    Outgoing commands are tracked by outstation, CA, IOA and TypeID and
+    matched with the responses of the ASDU received handler. attach() names
+    the outstation of a connection and feeds the tracker before the
+    connection's own handler; send_control_command() then tracks and sends a
+    command. For other sources, track() a command before sending it and
+    feed() the received ASDUs.
+
+    Latencies go into a LatencyHistogram per outstation (the CA when the
+    outstation has no name), for ACT_CON and for completion. A command
+    without completion after timeout seconds fails with TimeoutError and is
+    passed to the timeout handler. One command per key can be pending.
+    """
+    def __init__(self, timeout=10.0, termination=True, bounds=DEFAULT_LATENCY_BOUNDS):
+        self.timeout = timeout
+        self.termination = termination
+        self.bounds = bounds
+        self._pending = {}
+        self._deadlines = []
+        self._sequence = itertools.count()
+        self._outstations = {}
+        self._metrics = {}
+        self._timeout_handler = None
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="CommandTracker", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def attach(self, connection, outstation=None, callback=None):
+        """
+        Feed the ASDUs received by a T104Connection, replaces its ASDU received handler
+
+        callback(asdu) is still called for every ASDU.
+        """
+        self._outstations[id(connection)] = outstation
+
+        def handler(asdu):
+            self.feed(asdu, outstation)
+            return True if callback is None else callback(asdu)
+
+        connection.set_asdu_received_handler(handler)
+
+    def set_timeout_handler(self, callback):
+        """
+        callback(command) is called on the tracker thread for each command that timed out
+        """
+        self._timeout_handler = callback
+
+    def send_control_command(self, connection, cot, ca, command, timeout=None):
+        """
+        Track and send a command on an attached connection, returns the TrackedCommand
+        """
+        select = command.is_select() if hasattr(command, "is_select") else False
+        tracked = self.track(ca, command.get_object_address(), command.get_type_id(),
+                             self._outstations.get(id(connection)), select, timeout)
+        if not connection.send_control_command(cot, ca, command):
+            self.cancel(tracked)
+            raise ConnectionError("failed to send {}".format(tracked.type_id.name))
+        return tracked
+
+    def track(self, ca, ioa, type_id, outstation=None, select=False, timeout=None):
+        """
+        Start tracking a command that is about to be sent, returns the TrackedCommand
+        """
+        type_id = TypeID(type_id)
+        if type_id not in COMMAND_TYPE_IDS:
+            raise ValueError("{} is no control command".format(type_id.name))
+        timeout = self.timeout if timeout is None else timeout
+        tracked = TrackedCommand(outstation, ca, ioa, type_id, self.termination and not select,
+                                 time.monotonic() + timeout)
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Tracker stopped")
+            if tracked.key in self._pending:
+                raise RuntimeError("{} to CA {} IOA {} pending".format(type_id.name, ca, ioa))
+            self._pending[tracked.key] = tracked
+            self._get_metrics(tracked.label).sent += 1
+            heapq.heappush(self._deadlines, (tracked.deadline, next(self._sequence), tracked))
+            self._condition.notify()
+        return tracked
+
+    def cancel(self, tracked):
+        """
+        Stop tracking a command, it is not counted as completed or timed out
+        """
+        with self._condition:
+            if self._pending.get(tracked.key) is tracked:
+                del self._pending[tracked.key]
+                self._get_metrics(tracked.label).sent -= 1
+
+    def feed(self, asdu, outstation=None):
+        """
+        Handle a received ASDU, True when it answers a tracked command
+        """
+        if not self._pending:
+            return False
+        type_id = asdu.get_type_id()
+        if type_id not in COMMAND_TYPE_IDS or asdu.get_number_of_elements() < 1:
+            return False
+        key = (outstation, asdu.get_ca(), asdu.get_element(0).get_object_address(), type_id)
+        now = time.monotonic()
+        cot = asdu.get_cot()
+        with self._condition:
+            tracked = self._pending.get(key)
+            if tracked is None:
+                return False
+            metrics = self._get_metrics(tracked.label)
+            if asdu.is_negative() or cot in _REJECTING_COTS:
+                metrics.rejected += 1
+                if cot == CauseOfTransmission.ACTIVATION_CON:
+                    tracked.confirmation_time = now - tracked.started
+                    metrics.confirmation.add(tracked.confirmation_time)
+                self._finish(tracked, CommandError("{} to CA {} IOA {} rejected ({})".format(
+                    type_id.name, tracked.ca, tracked.ioa, cot.name), asdu.copy()))
+            elif cot == CauseOfTransmission.ACTIVATION_CON:
+                tracked.confirmation_time = now - tracked.started
+                metrics.confirmation.add(tracked.confirmation_time)
+                if not tracked.termination:
+                    self._complete(tracked, metrics, now)
+            elif cot == CauseOfTransmission.ACTIVATION_TERMINATION:
+                self._complete(tracked, metrics, now)
+            else:
+                return False
+        return True
+
+    def get_latency(self, outstation):
+        """
+        Counters and ACT_CON and completion latency statistics of one outstation
+        """
+        with self._condition:
+            return self._metrics[outstation].get()
+
+    def get_metrics(self):
+        """
+        get_latency() of all outstations, by outstation
+        """
+        with self._condition:
+            return {outstation: metrics.get() for outstation, metrics in self._metrics.items()}
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    # called with the condition held
+    def _get_metrics(self, label):
+        metrics = self._metrics.get(label)
+        if metrics is None:
+            metrics = self._metrics[label] = _OutstationMetrics(self.bounds)
+        return metrics
+
+    def _complete(self, tracked, metrics, now):
+        tracked.duration = now - tracked.started
+        metrics.completion.add(tracked.duration)
+        metrics.completed += 1
+        self._finish(tracked, None)
+
+    def _finish(self, tracked, error):
+        del self._pending[tracked.key]
+        tracked.error = error
+        tracked.done.set()
+
+    def _run(self):
+        while True:
+            expired = []
+            with self._condition:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    tracked = heapq.heappop(self._deadlines)[2]
+                    if self._pending.get(tracked.key) is not tracked:
+                        continue
+                    self._get_metrics(tracked.label).timed_out += 1
+                    self._finish(tracked, TimeoutError("{} to CA {} IOA {} got no {}".format(
+                        tracked.type_id.name, tracked.ca, tracked.ioa,
+                        "ACT_CON" if tracked.confirmation_time is None else "ACT_TERM")))
+                    expired.append(tracked)
+                if not expired:
+                    self._condition.wait(self._deadlines[0][0] - now if self._deadlines else None)
+            for tracked in expired:
+                logger.warning(str(tracked.error))
+                if self._timeout_handler is not None:
+                    try:
+                        self._timeout_handler(tracked)
+                    except Exception:
+                        logger.exception("timeout handler failed")
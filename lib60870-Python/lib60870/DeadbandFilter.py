@@ -0,0 +1,135 @@
+import logging
+import enum
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DeadbandMode(enum.Enum):
+    # the change since the last sent value exceeds the deadband
+    ABSOLUTE = 0
+    # the change since the last sent value exceeds deadband percent of the range of the point
+    PERCENT = 1
+    # the change since the last sent value, integrated over seconds, exceeds the deadband
+    INTEGRATED = 2
+
+
+class DeadbandFilter():
+    """
+    Vectorized deadband filter for measured values before transmission
+
+    Holds per IOA the deadband mode and threshold, the last sent value and
+    quality and the integrated deviation in numpy arrays. filter() takes the
+    new values of any number of points and returns only those that left
+    their band, had a quality change or were never sent; the others are
+    suppressed and counted. IOAs the filter does not know are passed
+    unfiltered. Requires numpy.
+    """
+    def __init__(self, ioas, deadbands, modes=DeadbandMode.ABSOLUTE, ranges=None):
+        import numpy
+
+        self._numpy = numpy
+        ioas = numpy.asarray(ioas, dtype=numpy.int64)
+        count = len(ioas)
+        order = numpy.argsort(ioas, kind="stable")
+        self.ioas = ioas[order]
+        if len(numpy.unique(self.ioas)) != count:
+            raise ValueError("IOAs are not unique")
+        if isinstance(modes, DeadbandMode):
+            modes = [modes] * count
+        self.modes = numpy.array([DeadbandMode(mode).value for mode in modes], dtype=numpy.int8)[order]
+        deadbands = numpy.broadcast_to(numpy.asarray(deadbands, dtype=numpy.float64), (count,))[order]
+        spans = numpy.broadcast_to(numpy.asarray(1.0 if ranges is None else ranges, dtype=numpy.float64),
+                                   (count,))[order]
+        if ranges is None and (self.modes == DeadbandMode.PERCENT.value).any():
+            raise ValueError("Percent deadbands need the ranges of the points")
+        self.thresholds = numpy.where(self.modes == DeadbandMode.PERCENT.value, deadbands / 100.0 * spans, deadbands)
+        self.last_values = numpy.full(count, numpy.nan)
+        self.last_qualities = numpy.zeros(count, dtype=numpy.uint8)
+        self.last_timestamps = numpy.zeros(count, dtype=numpy.int64)
+        self.integrals = numpy.zeros(count)
+        self.point_suppressed = numpy.zeros(count, dtype=numpy.int64)
+        self.received = 0
+        self.passed = 0
+
+    def __len__(self):
+        return len(self.ioas)
+
+    @property
+    def suppressed(self):
+        return self.received - self.passed
+
+    def get_statistics(self):
+        """
+        Received, passed and suppressed values, and the ratio of suppressed values
+        """
+        return {
+            "received": self.received,
+            "passed": self.passed,
+            "suppressed": self.suppressed,
+            "suppression_ratio": self.suppressed / self.received if self.received else 0.0,
+        }
+
+    def reset_statistics(self):
+        self.point_suppressed[:] = 0
+        self.received = 0
+        self.passed = 0
+
+    def reset(self, ioas=None):
+        """
+        Forget the last sent values, of all points or the given IOAs, so they pass next time
+        """
+        positions = slice(None) if ioas is None else self._positions(self._numpy.asarray(ioas))[0]
+        self.last_values[positions] = self._numpy.nan
+        self.integrals[positions] = 0.0
+
+    def _positions(self, ioas):
+        numpy = self._numpy
+        positions = numpy.searchsorted(self.ioas, ioas)
+        clipped = numpy.minimum(positions, len(self.ioas) - 1)
+        known = (positions < len(self.ioas)) & (self.ioas[clipped] == ioas) if len(self.ioas) else \
+            numpy.zeros(len(ioas), dtype=bool)
+        return clipped[known], known
+
+    def filter(self, ioas, values, qualities=None, timestamps=None):
+        """
+        The points that are to be sent, as arrays of ioas, values, qualities and timestamps
+
+        Each IOA should appear at most once per call. Timestamps in ms since
+        epoch are used by integrated deadbands and default to now.
+        """
+        numpy = self._numpy
+        ioas = numpy.asarray(ioas, dtype=numpy.int64)
+        values = numpy.asarray(values, dtype=numpy.float64)
+        count = len(ioas)
+        qualities = numpy.zeros(count, dtype=numpy.uint8) if qualities is None else \
+            numpy.asarray(qualities, dtype=numpy.uint8)
+        timestamps = numpy.full(count, int(time.time() * 1000), dtype=numpy.int64) if timestamps is None else \
+            numpy.asarray(timestamps, dtype=numpy.int64)
+
+        positions, known = self._positions(ioas)
+        new_values = values[known]
+        new_qualities = qualities[known]
+        new_timestamps = timestamps[known]
+
+        last_values = self.last_values[positions]
+        deviation = numpy.abs(new_values - last_values)
+        elapsed = numpy.maximum(new_timestamps - self.last_timestamps[positions], 0) / 1000.0
+        integrated = self.modes[positions] == DeadbandMode.INTEGRATED.value
+        integrals = numpy.where(integrated, self.integrals[positions] + deviation * elapsed, 0.0)
+        exceeded = numpy.where(integrated, integrals > self.thresholds[positions],
+                               deviation > self.thresholds[positions])
+        send = numpy.isnan(last_values) | exceeded | (new_qualities != self.last_qualities[positions])
+
+        sent = positions[send]
+        self.last_values[sent] = new_values[send]
+        self.last_qualities[sent] = new_qualities[send]
+        self.integrals[positions] = numpy.where(send, 0.0, numpy.nan_to_num(integrals))
+        self.last_timestamps[positions] = new_timestamps
+        self.point_suppressed[positions[~send]] += 1
+
+        selected = ~known
+        selected[known] = send
+        self.received += count
+        self.passed += int(selected.sum())
+        return ioas[selected], values[selected], qualities[selected], timestamps[selected]
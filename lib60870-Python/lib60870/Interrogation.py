@@ -0,0 +1,148 @@
+import logging
+import array
+import threading
+import time
+
+from lib60870.asdu import _as_float
+from lib60870.lib60870 import CauseOfTransmission, QualifierOfInterrogation, TypeID
+
+logger = logging.getLogger(__name__)
+
+# numpy layout of InterrogationResult.to_numpy()
+INTERROGATION_FIELDS = [
+    ("type_id", "u1"),
+    ("ioa", "<u4"),
+    ("value", "<f8"),
+    ("quality", "u1"),
+    ("timestamp_ms", "<i8"),
+]
+
+
+class InterrogationError(RuntimeError):
+    """
+    The outstation rejected an interrogation, `asdu` is its negative confirmation
+    """
+    def __init__(self, message, asdu):
+        super().__init__(message)
+        self.asdu = asdu
+
+
+class InterrogationResult():
+    """
+    The points of an interrogation response in columns
+
+    `duration` is the time from sending the command to ACT_TERM and
+    `confirmation_time` the time to ACT_CON, both in seconds. Values are
+    float, see RemotePointImage; timestamps are -1 without time tag.
+    """
+    def __init__(self, ca, qoi):
+        self.ca = ca
+        self.qoi = qoi
+        self.asdus = 0
+        self.duration = None
+        self.confirmation_time = None
+        self.type_ids = array.array("B")
+        self.ioas = array.array("L")
+        self.values = array.array("d")
+        self.qualities = array.array("B")
+        self.timestamps = array.array("q")
+
+    def __len__(self):
+        return len(self.ioas)
+
+    def __repr__(self):
+        return "InterrogationResult(ca={}, qoi={}, points={}, asdus={}, duration={})".format(
+            self.ca, self.qoi, len(self), self.asdus, self.duration)
+
+    def add(self, decoded):
+        self.asdus += 1
+        type_id = decoded.type_id.value
+        for element in decoded.elements:
+            self.type_ids.append(type_id)
+            self.ioas.append(element.ioa)
+            self.values.append(_as_float(element.value))
+            self.qualities.append(element.quality or 0)
+            self.timestamps.append(-1 if element.timestamp is None else element.timestamp)
+
+    def to_dict(self):
+        """
+        IOA to value
+        """
+        return dict(zip(self.ioas, self.values))
+
+    def to_numpy(self):
+        """
+        The points as numpy structured array of INTERROGATION_FIELDS
+        """
+        import numpy
+
+        result = numpy.empty(len(self), dtype=INTERROGATION_FIELDS)
+        for field, column in (("type_id", self.type_ids), ("ioa", self.ioas), ("value", self.values),
+                              ("quality", self.qualities), ("timestamp_ms", self.timestamps)):
+            if len(column):
+                result[field] = numpy.frombuffer(column, dtype=column.typecode)
+        return result
+
+
+class Interrogation():
+    """
+    A pending (counter) interrogation of one CA, fed with the received ASDUs
+
+    Collects the responses with the COT of the interrogated group until
+    ACT_TERM. A negative ACT_CON, or an unknown CA, TypeID or COT
+    reply, fails it with InterrogationError. For C_CI_NA_1 the qualifier
+    is the QCC.
+    """
+    def __init__(self, ca, qoi=QualifierOfInterrogation.IEC60870_QOI_STATION, type_id=TypeID.C_IC_NA_1):
+        self.qoi = int(getattr(qoi, "value", qoi))
+        if type_id == TypeID.C_CI_NA_1:
+            # RQT, 1 to 4 are the counter groups and 5 is general
+            request = self.qoi & 0x3f
+            if not 1 <= request <= 5:
+                raise ValueError("Invalid qualifier of counter interrogation ({})".format(qoi))
+            cot = CauseOfTransmission.REQUESTED_BY_GENERAL_COUNTER.value + request % 5
+        else:
+            group = self.qoi - QualifierOfInterrogation.IEC60870_QOI_STATION.value
+            if not 0 <= group <= 16:
+                raise ValueError("Invalid qualifier of interrogation ({})".format(qoi))
+            cot = CauseOfTransmission.INTERROGATED_BY_STATION.value + group
+        self.ca = ca
+        self.type_id = type_id
+        self.cot = CauseOfTransmission(cot)
+        self.result = InterrogationResult(ca, self.qoi)
+        self.error = None
+        self.started = time.monotonic()
+        self.done = threading.Event()
+
+    def feed(self, asdu):
+        """
+        Handle a received ASDU, True when it belongs to this interrogation
+        """
+        if asdu.get_ca() != self.ca or self.done.is_set():
+            return False
+        cot = asdu.get_cot()
+        if cot == self.cot:
+            self.result.add(asdu.decode())
+            return True
+        if asdu.get_type_id() != self.type_id:
+            return False
+        if asdu.is_negative() or cot in (CauseOfTransmission.UNKNOWN_TYPE_ID,
+                                         CauseOfTransmission.UNKNOWN_CAUSE_OF_TRANSMISSION,
+                                         CauseOfTransmission.UNKNOWN_COMMON_ADDRESS_OF_ASDU):
+            self.fail(InterrogationError("interrogation of CA {} rejected ({})".format(self.ca, cot.name),
+                                         asdu.copy()))
+        elif cot == CauseOfTransmission.ACTIVATION_CON:
+            self.result.confirmation_time = time.monotonic() - self.started
+        elif cot == CauseOfTransmission.ACTIVATION_TERMINATION:
+            self.result.duration = time.monotonic() - self.started
+            self.done.set()
+        return True
+
+    def fail(self, error):
+        self.error = error
+        self.done.set()
+
+    def get_result(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
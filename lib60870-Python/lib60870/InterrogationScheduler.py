@@ -0,0 +1,320 @@
+import logging
+import collections
+import concurrent.futures
+import enum
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from lib60870.lib60870 import QualifierOfInterrogation
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(enum.IntEnum):
+    # operator requests and reconciliation after a reconnect
+    HIGH = 0
+    NORMAL = 1
+    # periodic cycles
+    LOW = 2
+
+
+class InterrogationKind(enum.Enum):
+    GENERAL = 0
+    COUNTER = 1
+
+
+class _Request():
+    def __init__(self, connection, kind, ca, qualifier, priority, timeout):
+        self.connection = connection
+        self.kind = kind
+        self.ca = ca
+        self.qualifier = qualifier
+        self.priority = priority
+        self.timeout = timeout
+        self.queued = time.monotonic()
+        self.future = concurrent.futures.Future()
+
+    @property
+    def key(self):
+        return (id(self.connection), self.kind, self.ca, self.qualifier)
+
+    @property
+    def link_key(self):
+        # the connection runs one interrogation and one counter interrogation per CA at a time
+        return (id(self.connection), self.kind, self.ca)
+
+    def run(self):
+        if self.kind == InterrogationKind.COUNTER:
+            return self.connection.counter_interrogate(self.ca, self.qualifier, self.timeout)
+        return self.connection.interrogate(self.ca, self.qualifier, self.timeout)
+
+
+class InterrogationCycle():
+    """
+    Periodic interrogation of one CA, see InterrogationScheduler.add_cycle()
+    """
+    def __init__(self, connection, period, kind, ca, qualifier, priority, jitter, timeout):
+        self.connection = connection
+        self.timeout = timeout
+        self.period = period
+        self.kind = kind
+        self.ca = ca
+        self.qualifier = qualifier
+        self.priority = priority
+        self.jitter = jitter
+        self.due = None
+        self.runs = 0
+        self.active = True
+
+    def next_interval(self):
+        return self.period * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class _Statistics():
+    """
+    Count, mean and percentiles of the last window samples
+    """
+    def __init__(self, window=1000):
+        self.samples = collections.deque(maxlen=window)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def get(self):
+        if not self.samples:
+            return {"count": 0, "mean": None, "p50": None, "p95": None, "max": None}
+        ordered = sorted(self.samples)
+        return {
+            "count": len(ordered),
+            "mean": sum(ordered) / len(ordered),
+            "p50": ordered[len(ordered) // 2],
+            "p95": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+            "max": ordered[-1],
+        }
+
+
+class InterrogationScheduler():
+    """
+    Rate limits general and counter interrogations across many connections
+
+    Requests are queued by priority and started when the token bucket
+    (`rate` interrogations per second, up to `burst` at once) has a token
+    and fewer than max_concurrent interrogations are running. A request for
+    a connection, kind, CA and qualifier that is already queued returns the
+    queued Future instead of adding another one, and a connection gets at
+    most one interrogation and one counter interrogation per CA at a time.
+
+    Interrogations run with T104Connection.interrogate() and
+    counter_interrogate() on a thread pool; the Future of a request resolves
+    to the InterrogationResult or to its exception. Cycles added with
+    add_cycle() request an interrogation every period, the first one after
+    a random part of the period and the next ones with jitter, so cycles of
+    many links do not line up.
+    """
+    def __init__(self, rate=10.0, burst=5, max_concurrent=16):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.coalesced = 0
+        self._tokens = float(burst)
+        self._tokens_updated = time.monotonic()
+        self._queue = []
+        self._queued = {}
+        self._running = set()
+        self._cycles = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._queue_time = _Statistics()
+        self._completion_time = _Statistics()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_concurrent, "InterrogationScheduler")
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="InterrogationScheduler", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self._queued)
+
+    def request(self, connection, ca=1, qoi=QualifierOfInterrogation.IEC60870_QOI_STATION, priority=Priority.NORMAL,
+                timeout=30.0):
+        """
+        Queue a general interrogation, returns a concurrent.futures.Future
+        """
+        return self._request(_Request(connection, InterrogationKind.GENERAL, ca, int(getattr(qoi, "value", qoi)),
+                                      priority, timeout))
+
+    def request_counter(self, connection, ca=1, qcc=5, priority=Priority.NORMAL, timeout=30.0):
+        """
+        Queue a counter interrogation, returns a concurrent.futures.Future
+        """
+        return self._request(_Request(connection, InterrogationKind.COUNTER, ca, qcc, priority, timeout))
+
+    def _request(self, request):
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Scheduler stopped")
+            queued = self._queued.get(request.key)
+            if queued is not None:
+                self.coalesced += 1
+                if request.priority < queued.priority:
+                    # raise the queued request, the old heap entry is skipped
+                    queued.priority = request.priority
+                    heapq.heappush(self._queue, (queued.priority, next(self._sequence), queued))
+                return queued.future
+            self._queued[request.key] = request
+            heapq.heappush(self._queue, (request.priority, next(self._sequence), request))
+            self._condition.notify()
+            return request.future
+
+    def add_cycle(self, connection, period, kind=InterrogationKind.GENERAL, ca=1, qualifier=None,
+                  priority=Priority.LOW, jitter=0.1, first=None, timeout=30.0):
+        """
+        Interrogate every period seconds (+- jitter as fraction), the first time after first seconds,
+        by default after a random part of the period
+        """
+        if qualifier is None:
+            qualifier = 5 if kind == InterrogationKind.COUNTER else QualifierOfInterrogation.IEC60870_QOI_STATION.value
+        cycle = InterrogationCycle(connection, period, kind, ca, int(getattr(qualifier, "value", qualifier)),
+                                   priority, jitter, timeout)
+        with self._condition:
+            cycle.due = time.monotonic() + (random.uniform(0, period) if first is None else first)
+            heapq.heappush(self._cycles, (cycle.due, next(self._sequence), cycle))
+            self._condition.notify()
+        return cycle
+
+    def remove_cycle(self, cycle):
+        cycle.active = False
+
+    def stop(self):
+        """
+        Stop scheduling, cancels the queued requests and waits for the running ones
+        """
+        with self._condition:
+            self._stopped = True
+            for request in self._queued.values():
+                request.future.cancel()
+            self._queue = []
+            self._queued.clear()
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def get_metrics(self):
+        """
+        Queue length per priority, running requests, counters and queue and completion time statistics
+        """
+        with self._condition:
+            queued = collections.Counter(request.priority.name if isinstance(request.priority, Priority)
+                                         else request.priority for request in self._queued.values())
+            return {
+                "queued": len(self._queued),
+                "queued_by_priority": dict(queued),
+                "running": len(self._running),
+                "tokens": self._take_tokens(0),
+                "started": self.started,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "coalesced": self.coalesced,
+                "cycles": sum(1 for due, sequence, cycle in self._cycles if cycle.active),
+                "queue_time": self._queue_time.get(),
+                "completion_time": self._completion_time.get(),
+            }
+
+    # called with the condition held
+    def _take_tokens(self, count):
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._tokens_updated) * self.rate)
+        self._tokens_updated = now
+        self._tokens -= count
+        return self._tokens
+
+    def _next_request(self):
+        """
+        Pop the first queued request whose connection and CA are idle
+        """
+        skipped = []
+        result = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            request = entry[2]
+            if self._queued.get(request.key) is not request or entry[0] != request.priority:
+                continue
+            if request.link_key in self._running:
+                skipped.append(entry)
+                continue
+            result = request
+            break
+        for entry in skipped:
+            heapq.heappush(self._queue, entry)
+        return result
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                timeout = None
+                while self._cycles and self._cycles[0][0] <= now:
+                    due, sequence, cycle = heapq.heappop(self._cycles)
+                    if not cycle.active:
+                        continue
+                    cycle.runs += 1
+                    self._request(_Request(cycle.connection, cycle.kind, cycle.ca, cycle.qualifier, cycle.priority,
+                                           cycle.timeout))
+                    cycle.due = max(due + cycle.next_interval(), now)
+                    heapq.heappush(self._cycles, (cycle.due, next(self._sequence), cycle))
+                if self._cycles:
+                    timeout = self._cycles[0][0] - now
+                if self._queue and len(self._running) < self.max_concurrent:
+                    tokens = self._take_tokens(0)
+                    if tokens >= 1:
+                        request = self._next_request()
+                        if request is not None:
+                            self._take_tokens(1)
+                            self._start(request)
+                            continue
+                    else:
+                        wait = (1 - tokens) / self.rate
+                        timeout = wait if timeout is None else min(timeout, wait)
+                self._condition.wait(timeout)
+
+    def _start(self, request):
+        del self._queued[request.key]
+        self._running.add(request.link_key)
+        self.started += 1
+        self._queue_time.add(time.monotonic() - request.queued)
+        if not request.future.set_running_or_notify_cancel():
+            self._running.discard(request.link_key)
+            return
+        self._executor.submit(self._execute, request)
+
+    def _execute(self, request):
+        started = time.monotonic()
+        try:
+            result = request.run()
+        except BaseException as exception:
+            with self._condition:
+                self.failed += 1
+                if isinstance(exception, TimeoutError):
+                    self.timed_out += 1
+                self._finish(request)
+            logger.warning("{} of CA {} failed: {}".format(request.kind.name, request.ca, exception))
+            request.future.set_exception(exception)
+        else:
+            with self._condition:
+                self.completed += 1
+                self._completion_time.add(time.monotonic() - started)
+                self._finish(request)
+            request.future.set_result(result)
+
+    def _finish(self, request):
+        self._running.discard(request.link_key)
+        self._condition.notify()
@@ -0,0 +1,544 @@
+import logging
+import argparse
+import bisect
+import collections
+import contextlib
+import math
+import random
+import threading
+import time
+
+from lib60870 import lib60870
+from lib60870.ChangeCollector import ChangeCollector
+from lib60870.PointDatabase import PointDatabase
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import get_builder
+from lib60870.lib60870 import CauseOfTransmission, QualifierOfInterrogation, TypeID
+
+logger = logging.getLogger(__name__)
+
+# measured values without time tag, the TypeIDs sent with COT PERIODIC
+PERIODIC_TYPE_IDS = (9, 11, 13, 21)
+
+# TypeIDs by the way _next_value() changes their points
+_single_types = (1, 2, 30)
+_double_types = (3, 4, 31)
+_step_types = (5, 6, 32)
+_normalized_types = (9, 10, 34, 21)
+_scaled_types = (11, 12, 35)
+_float_types = (13, 14, 36)
+_counter_types = (15, 16, 37)
+
+
+def rate_distribution(spec):
+    """
+    Function drawing the change rate of a point, in changes per second, from a random.Random
+
+    spec is "fixed:RATE", "uniform:LOW,HIGH", "exponential:MEAN",
+    "lognormal:MEDIAN,SIGMA" or "pareto:MINIMUM,ALPHA". The heavy tailed
+    distributions model stations where a few points change often and most
+    hardly ever.
+    """
+    name, _, arguments = spec.partition(":")
+    try:
+        values = [float(value) for value in arguments.split(",")] if arguments else []
+    except ValueError:
+        raise ValueError("Invalid rate distribution ({})".format(spec))
+    distributions = {
+        "fixed": (1, lambda rng, rate: rate),
+        "uniform": (2, lambda rng, low, high: rng.uniform(low, high)),
+        "exponential": (1, lambda rng, mean: rng.expovariate(1.0 / mean) if mean > 0 else 0.0),
+        "lognormal": (2, lambda rng, median, sigma: rng.lognormvariate(math.log(median), sigma)),
+        "pareto": (2, lambda rng, minimum, alpha: minimum * rng.paretovariate(alpha)),
+    }
+    if name not in distributions or len(values) != distributions[name][0] or any(value < 0 for value in values):
+        raise ValueError("Invalid rate distribution ({})".format(spec))
+    draw = distributions[name][1]
+    return lambda rng: draw(rng, *values)
+
+
+def _next_value(type_id, value, rng):
+    """
+    A plausible next value of a point after value
+    """
+    if type_id in _single_types:
+        return 0 if value else 1
+    if type_id in _double_types:
+        # DPI OFF and ON
+        return 1 if value == 2 else 2
+    if type_id in _step_types:
+        return (value + 1) % 64
+    if type_id in _normalized_types:
+        return min(max(value + rng.gauss(0.0, 0.01), -1.0), 0.999)
+    if type_id in _scaled_types:
+        return min(max(int(value) + rng.randint(-10, 10), -32768), 32767)
+    if type_id in _float_types:
+        return value + rng.gauss(0.0, 1.0)
+    if type_id in _counter_types:
+        return (int(value) + rng.randint(1, 10)) & 0xffffffff
+    # bitstrings and packed single points
+    return rng.getrandbits(32)
+
+
+class _CountingConnection():
+    """
+    MasterConnection seen by the interrogation handler, counts the response ASDUs the library took
+    """
+    def __init__(self, connection, outstation):
+        self.connection = connection
+        self.outstation = outstation
+
+    def send_asdu(self, asdu):
+        sent = self.connection.send_asdu(asdu)
+        if sent:
+            self.outstation.interrogation_asdus += 1
+        elif asdu.get_cot() != CauseOfTransmission.UNKNOWN_COMMON_ADDRESS_OF_ASDU:
+            self.outstation.truncated_interrogations += 1
+        return sent
+
+    def send_act_con(self, asdu, negative=False):
+        return self.connection.send_act_con(asdu, negative)
+
+    def send_act_term(self, asdu):
+        return self.connection.send_act_term(asdu)
+
+
+class _Outstation():
+    """
+    One T104Slave of the generator with its points and change schedule
+    """
+    def __init__(self, index, port, ca, layout, rates, period, periodic_fraction, rng, options):
+        self.index = index
+        self.port = port
+        self.ca = ca
+        self.rng = rng
+        self.max_queue_size = options["max_queue_size"]
+        self.database = PointDatabase()
+        self.type_ids = []
+        self.ioas = []
+        self.values = []
+        self.periodic = collections.OrderedDict()
+        spontaneous = []
+        ioa = options["first_ioa"]
+        for type_id, count in layout:
+            ioas = list(range(ioa, ioa + count))
+            ioa += count
+            self.database.add_points(ca, type_id, ioas)
+            cyclic = 0
+            if period is not None and type_id.value in PERIODIC_TYPE_IDS:
+                cyclic = int(round(count * periodic_fraction))
+                self.periodic[type_id] = list(range(len(self.ioas), len(self.ioas) + cyclic))
+            for offset, point_ioa in enumerate(ioas):
+                if offset >= cyclic:
+                    spontaneous.append(len(self.ioas))
+                self.type_ids.append(type_id)
+                self.ioas.append(point_ioa)
+                self.values.append(0)
+        # points by cumulative change rate, a change picks a point in proportion to its rate
+        self.points = []
+        self.cumulative = []
+        self.rate = 0.0
+        for point in spontaneous:
+            rate = rates(rng)
+            if rate > 0:
+                self.rate += rate
+                self.points.append(point)
+                self.cumulative.append(self.rate)
+
+        responses = len(self.database.build_interrogation_response(ca, QualifierOfInterrogation.IEC60870_QOI_STATION,
+                                                                   options["parameters"]))
+        # the whole interrogation response and its ACT_CON and ACT_TERM fit the high priority queue
+        self.slave = T104Slave(options["parameters"], self.max_queue_size, responses + options["high_prio_reserve"])
+        self.slave.set_local_address(options["address"].encode())
+        self.slave.set_local_port(port)
+        self.slave.set_interrogation_handler(self._interrogation_handler)
+        self.collector = ChangeCollector(self.slave, options["max_delay"], database=self.database,
+                                         parameters=options["parameters"])
+        self.builder = get_builder(options["parameters"])
+        self.period = period
+
+        self.changes = 0
+        self.periodic_asdus = 0
+        self.interrogations = 0
+        self.interrogation_asdus = 0
+        self.truncated_interrogations = 0
+        self.overflows = 0
+        self.connections = 0
+        self._unsent = 0
+        self._counted = 0
+
+    def _interrogation_handler(self, parameter, connection, asdu, qoi):
+        self.interrogations += 1
+        return self.database.interrogation_handler(parameter, _CountingConnection(connection, self), asdu, qoi)
+
+    @property
+    def spontaneous_asdus(self):
+        return self.collector.asdus
+
+    def start(self, now):
+        if not self.slave.start():
+            raise RuntimeError("outstation {} cannot listen on port {}".format(self.index, self.port))
+        self.next_change = now + self.rng.expovariate(self.rate) if self.rate > 0 else math.inf
+        # outstations start their cycles out of phase
+        self.next_cycle = now + self.rng.uniform(0, self.period) if self.periodic else math.inf
+
+    def flush(self):
+        self.collector.flush()
+        self._count_overflows()
+
+    def stop(self):
+        self.slave.stop()
+
+    def run(self, now):
+        """
+        Generate the changes and cycles due at now, returns how far the schedule fell behind
+        """
+        lag = 0.0
+        if self.next_change <= now:
+            lag = now - self.next_change
+            rng = self.rng
+            while self.next_change <= now:
+                point = self.points[bisect.bisect(self.cumulative, rng.random() * self.rate)]
+                value = self.values[point] = _next_value(self.type_ids[point].value, self.values[point], rng)
+                self.collector.update(self.ioas[point], value, ca=self.ca, type_id=self.type_ids[point])
+                self.changes += 1
+                self.next_change += rng.expovariate(self.rate)
+        self.collector.flush(self.collector.max_delay)
+        if self.next_cycle <= now:
+            lag = max(lag, now - self.next_cycle)
+            self._send_cycle()
+            self.next_cycle += self.period
+            if self.next_cycle <= now:
+                # skip the cycles missed while the generator was behind
+                self.next_cycle = now + self.period
+        self._count_overflows()
+        return lag
+
+    def _send_cycle(self):
+        for type_id, points in self.periodic.items():
+            for point in points:
+                self.values[point] = _next_value(type_id.value, self.values[point], self.rng)
+            ioas = [self.ioas[point] for point in points]
+            values = [self.values[point] for point in points]
+            self.database.update_many(self.ca, ioas, values)
+            for asdu in self.builder.build(type_id, ioas, values, cot=CauseOfTransmission.PERIODIC, ca=self.ca):
+                self.slave.enqueue_asdu(asdu)
+                self.periodic_asdus += 1
+
+    def _count_overflows(self):
+        # the library drops the oldest ASDU of a full queue without telling, but nothing leaves the queue while
+        # no master is connected
+        self.connections = self.slave.get_open_connections()
+        enqueued = self.collector.asdus + self.periodic_asdus
+        added, self._counted = enqueued - self._counted, enqueued
+        if self.connections:
+            self._unsent = 0
+        else:
+            unsent = self._unsent + added
+            self.overflows += max(0, unsent - max(self._unsent, self.max_queue_size))
+            self._unsent = unsent
+
+    def get_metrics(self):
+        return {
+            "outstation": self.index,
+            "port": self.port,
+            "connections": self.connections,
+            "points": len(self.ioas),
+            "offered_changes_per_second": self.rate,
+            "changes": self.changes,
+            "spontaneous_asdus": self.spontaneous_asdus,
+            "periodic_asdus": self.periodic_asdus,
+            "interrogations": self.interrogations,
+            "interrogation_asdus": self.interrogation_asdus,
+            "truncated_interrogations": self.truncated_interrogations,
+            "overflows": self.overflows,
+        }
+
+
+class LoadGenerator():
+    """
+    Synthetic outstations on consecutive ports, to size masters before a rollout
+
+    Starts `outstations` T104Slaves listening on address from port on. Each
+    has `points` points, split over type_ids (a sequence of TypeIDs or a
+    dict of TypeID to weight) in contiguous IOA ranges, and answers general
+    interrogation from a PointDatabase. Every point gets a change rate
+    drawn from `rates` (a rate_distribution() spec or function) and changes
+    as a Poisson process; the changes are packed by a ChangeCollector and
+    enqueued as spontaneous ASDUs. With a period, periodic_fraction of the
+    measured values without time tag are sent every period seconds with
+    COT PERIODIC instead.
+
+    One thread generates the changes of all outstations every tick
+    seconds. get_metrics() reports the achieved ASDUs and changes per
+    second, how far the generator fell behind its schedule and the CPU
+    used by the process and by the generator thread.
+
+    The library drops the oldest ASDU of a full event queue
+    (max_queue_size) without reporting it. `overflows` counts the ASDUs
+    dropped while no master was connected, when nothing leaves the queue,
+    and truncated interrogation responses. Losses to a connected master
+    that falls behind show as the difference between the ASDUs sent here
+    and the ASDUs the master received.
+    """
+    def __init__(self, outstations=1, points=1000, type_ids=(TypeID.M_ME_NC_1,), rates="exponential:0.1",
+                 period=None, periodic_fraction=1.0, port=lib60870.IEC_60870_5_104_DEFAULT_PORT, address="127.0.0.1",
+                 ca=1, max_queue_size=1000, max_delay=0.1, tick=0.01, first_ioa=1, seed=None, parameters=None):
+        if not isinstance(type_ids, dict):
+            type_ids = {type_id: 1 for type_id in type_ids}
+        if not type_ids or any(weight < 0 for weight in type_ids.values()) or not sum(type_ids.values()) > 0:
+            raise ValueError("type_ids need a positive weight")
+        if callable(rates):
+            self.rates = rates
+        else:
+            self.rates = rate_distribution(rates)
+        if period is not None and period <= 0:
+            raise ValueError("period must be positive")
+        self.tick = tick
+        self.layout = self._split(points, type_ids)
+        options = {
+            "address": address,
+            "first_ioa": first_ioa,
+            "high_prio_reserve": 4,
+            "max_delay": max_delay,
+            "max_queue_size": max_queue_size,
+            "parameters": parameters,
+        }
+        self.random = random.Random(seed)
+        self._outstations = [
+            _Outstation(index, port + index, ca, self.layout, self.rates, period, periodic_fraction,
+                        random.Random(self.random.getrandbits(64)), options)
+            for index in range(outstations)]
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._thread = None
+        self._started = None
+        self._stopped = None
+        self._lag = 0.0
+        self._generator_cpu = 0.0
+        self._snapshot = None
+
+    @staticmethod
+    def _split(points, type_ids):
+        """
+        Points per TypeID in proportion to the weights, by largest remainder
+        """
+        total = float(sum(type_ids.values()))
+        shares = [(type_id, points * weight / total) for type_id, weight in type_ids.items()]
+        counts = [int(share) for type_id, share in shares]
+        by_remainder = sorted(range(len(shares)), key=lambda position: counts[position] - shares[position][1])
+        for position in by_remainder[:points - sum(counts)]:
+            counts[position] += 1
+        return [(type_id, count) for (type_id, share), count in zip(shares, counts) if count]
+
+    def __len__(self):
+        return len(self._outstations)
+
+    def get_ports(self):
+        return [outstation.port for outstation in self._outstations]
+
+    def get_slave(self, index):
+        return self._outstations[index].slave
+
+    def get_database(self, index):
+        return self._outstations[index].database
+
+    def start(self):
+        """
+        Start the outstations and the generator thread
+        """
+        now = time.monotonic()
+        for outstation in self._outstations:
+            try:
+                outstation.start(now)
+            except RuntimeError:
+                self._stop_slaves()
+                raise
+        self._started = now
+        self._stopped = None
+        self._snapshot = (now, time.process_time(), 0, 0)
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="LoadGenerator", daemon=True)
+        self._thread.start()
+
+    def stop(self, drain=0.0):
+        """
+        Stop generating, enqueue the pending changes and stop the outstations after drain seconds
+        """
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._stopped = time.monotonic()
+        for outstation in self._outstations:
+            outstation.flush()
+        if drain:
+            time.sleep(drain)
+        self._stop_slaves()
+
+    def _stop_slaves(self):
+        for outstation in self._outstations:
+            outstation.stop()
+
+    def _run(self):
+        while self._running.is_set():
+            now = time.monotonic()
+            lag = 0.0
+            for outstation in self._outstations:
+                lag = max(lag, outstation.run(now))
+            with self._lock:
+                # changes are due anywhere within a tick
+                self._lag = max(self._lag, lag - self.tick)
+                self._generator_cpu = time.thread_time()
+            delay = now + self.tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def get_metrics(self):
+        """
+        Totals since start() and rates, lag and CPU since the previous call, with the metrics per outstation
+
+        elapsed runs from start() to stop(). cpu_percent is the CPU time of the
+        whole process, the library threads included, in percent of one core.
+        """
+        outstations = [outstation.get_metrics() for outstation in self._outstations]
+        now = time.monotonic()
+        cpu = time.process_time()
+        totals = {key: sum(metrics[key] for metrics in outstations) for key in (
+            "connections", "points", "offered_changes_per_second", "changes", "spontaneous_asdus", "periodic_asdus",
+            "interrogations", "interrogation_asdus", "truncated_interrogations", "overflows")}
+        asdus = totals["spontaneous_asdus"] + totals["periodic_asdus"] + totals["interrogation_asdus"]
+        with self._lock:
+            lag, self._lag = self._lag, 0.0
+            generator_cpu = self._generator_cpu
+            previous = self._snapshot or (now, cpu, 0, 0)
+            self._snapshot = (now, cpu, asdus, totals["changes"])
+        elapsed = now - previous[0]
+        metrics = {
+            "outstations": len(outstations),
+            "elapsed": (self._stopped or now) - self._started if self._started is not None else 0.0,
+            "asdus": asdus,
+            "asdus_per_second": (asdus - previous[2]) / elapsed if elapsed > 0 else 0.0,
+            "changes_per_second": (totals["changes"] - previous[3]) / elapsed if elapsed > 0 else 0.0,
+            "lag": lag,
+            "cpu_seconds": cpu,
+            "cpu_percent": 100.0 * (cpu - previous[1]) / elapsed if elapsed > 0 else 0.0,
+            "generator_cpu_seconds": generator_cpu,
+            "per_outstation": outstations,
+        }
+        metrics.update(totals)
+        return metrics
+
+
+class _Probe():
+    """
+    Reference master for main(): one T104Connection per outstation counting the received ASDUs by COT
+    """
+    def __init__(self, address, ports, ca):
+        from lib60870.T104Connection import T104Connection
+
+        self.received = collections.Counter()
+        self._stack = contextlib.ExitStack()
+        self.connections = []
+        for port in ports:
+            connection = T104Connection(address, port)
+            connection.set_asdu_received_handler(self._count)
+            self._stack.enter_context(connection.connect())
+            connection.send_start_dt()
+            self.connections.append(connection)
+        self.ca = ca
+
+    def _count(self, asdu):
+        self.received[asdu.get_cot().value] += 1
+        return True
+
+    def interrogate(self, timeout=30.0):
+        return [connection.interrogate(self.ca, timeout=timeout) for connection in self.connections]
+
+    def close(self):
+        self._stack.close()
+
+
+def _parse_type_ids(spec):
+    type_ids = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition(":")
+        try:
+            type_ids[TypeID[name.strip()]] = float(weight) if weight else 1.0
+        except (KeyError, ValueError):
+            raise argparse.ArgumentTypeError("invalid TypeID weight ({})".format(item))
+    return type_ids
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Synthetic IEC 60870-5-104 outstations for capacity tests")
+    parser.add_argument("--outstations", type=int, default=10, help="number of outstations")
+    parser.add_argument("--points", type=int, default=1000, help="points per outstation")
+    parser.add_argument("--type-ids", type=_parse_type_ids, default="M_ME_NC_1:3,M_SP_TB_1:1,M_DP_TB_1:1",
+                        help="TypeIDs of the points with their weights, TYPE:WEIGHT,...")
+    parser.add_argument("--rates", default="exponential:0.1",
+                        help="distribution of the changes per second of a point, see rate_distribution()")
+    parser.add_argument("--period", type=float, help="seconds between periodic cycles, none by default")
+    parser.add_argument("--periodic-fraction", type=float, default=1.0,
+                        help="share of the measured values without time tag sent periodically")
+    parser.add_argument("--address", default="127.0.0.1", help="local address of the outstations")
+    parser.add_argument("--port", type=int, default=lib60870.IEC_60870_5_104_DEFAULT_PORT,
+                        help="port of the first outstation, the others follow")
+    parser.add_argument("--ca", type=int, default=1, help="common address of the outstations")
+    parser.add_argument("--queue-size", type=int, default=1000, help="event queue size of an outstation")
+    parser.add_argument("--max-delay", type=float, default=0.1, help="seconds a change waits for a full ASDU")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to run")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between reports")
+    parser.add_argument("--seed", type=int, help="random seed for a reproducible load")
+    parser.add_argument("--probe", action="store_true",
+                        help="connect a counting master to every outstation and report the ASDUs it lost")
+    args = parser.parse_args(arguments)
+
+    generator = LoadGenerator(args.outstations, args.points, args.type_ids, args.rates, args.period,
+                              args.periodic_fraction, args.port, args.address, args.ca, args.queue_size,
+                              args.max_delay, seed=args.seed)
+    metrics = generator.get_metrics()
+    print("{} outstations on ports {}-{}, {} points, {:.0f} changes/s offered".format(
+        len(generator), args.port, args.port + len(generator) - 1, metrics["points"],
+        metrics["offered_changes_per_second"]))
+    generator.start()
+    probe = None
+    try:
+        if args.probe:
+            probe = _Probe(args.address, generator.get_ports(), args.ca)
+            time.sleep(0.1)
+            results = probe.interrogate()
+            print("interrogated {} points in {:.3f} s".format(sum(len(result) for result in results),
+                                                             max(result.duration for result in results)))
+        generator.get_metrics()
+        deadline = time.monotonic() + args.duration
+        while time.monotonic() < deadline:
+            time.sleep(max(0.0, min(args.interval, deadline - time.monotonic())))
+            metrics = generator.get_metrics()
+            print("{:8.1f} s {:4d} connected {:10.0f} ASDU/s {:10.0f} changes/s {:8d} overflows {:6.1f} % CPU "
+                  "lag {:.3f} s".format(metrics["elapsed"], metrics["connections"], metrics["asdus_per_second"],
+                                        metrics["changes_per_second"], metrics["overflows"],
+                                        metrics["cpu_percent"], metrics["lag"]))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        generator.stop(drain=1.0 if probe is not None else 0.0)
+        if probe is not None:
+            probe.close()
+    metrics = generator.get_metrics()
+    elapsed = metrics["elapsed"] or 1.0
+    print("{} ASDUs in {:.1f} s, {:.0f} ASDU/s, {} changes, {} interrogations, {} overflows, {} truncated "
+          "interrogations, {:.1f} s CPU ({:.1f} s generator)".format(
+              metrics["asdus"], elapsed, metrics["asdus"] / elapsed, metrics["changes"], metrics["interrogations"],
+              metrics["overflows"], metrics["truncated_interrogations"], metrics["cpu_seconds"],
+              metrics["generator_cpu_seconds"]))
+    if probe is not None:
+        received = (probe.received[CauseOfTransmission.SPONTANEOUS.value] +
+                    probe.received[CauseOfTransmission.PERIODIC.value])
+        sent = metrics["spontaneous_asdus"] + metrics["periodic_asdus"]
+        print("probe received {} of {} spontaneous and periodic ASDUs, {} lost".format(received, sent,
+                                                                                      sent - received))
+
+
+if __name__ == "__main__":
+    main()
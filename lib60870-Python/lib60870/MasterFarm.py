@@ -0,0 +1,351 @@
+import logging
+import collections
+import ctypes
+import multiprocessing
+import os
+import queue
+import struct
+import threading
+import time
+
+from lib60870 import lib60870
+from lib60870.asdu import _as_float
+
+logger = logging.getLogger(__name__)
+
+# ring header: write and read position in points, then the worker metrics
+_header = struct.Struct("<QQQQQQQd")
+_WRITE, _READ, _ASDUS, _POINTS, _DROPPED, _ERRORS, _LINKS, _HEARTBEAT = range(8)
+
+# one decoded point: link number, CA, TypeID, COT, quality, IOA, value, timestamp in ms (-1 without time tag)
+_point = struct.Struct("<IHBBB3xIdq")
+
+# numpy layout of the points returned by MasterFarm.read_numpy()
+FARM_POINT_FIELDS = {
+    "names": ["link", "ca", "type_id", "cot", "quality", "ioa", "value", "timestamp_ms"],
+    "formats": ["<u4", "<u2", "u1", "u1", "u1", "<u4", "<f8", "<i8"],
+    "offsets": [0, 4, 6, 7, 8, 12, 16, 24],
+    "itemsize": _point.size,
+}
+
+FarmPoint = collections.namedtuple("FarmPoint", ["link_id", "ca", "type_id", "cot", "quality", "ioa", "value",
+                                                 "timestamp_ms"])
+
+
+class _PointRing():
+    """
+    Single producer, single consumer ring of points in shared memory
+
+    The worker writes the points and then advances the write position, the
+    parent reads up to the write position and then advances the read
+    position. Each side only writes its own position.
+    """
+    def __init__(self, buffer, capacity):
+        self.buffer = memoryview(buffer).cast("B")
+        self.capacity = capacity
+
+    @classmethod
+    def size(cls, capacity):
+        return _header.size + capacity * _point.size
+
+    def get(self, field):
+        return struct.unpack_from("<Q" if field != _HEARTBEAT else "<d", self.buffer, field * 8)[0]
+
+    def set(self, field, value):
+        struct.pack_into("<Q" if field != _HEARTBEAT else "<d", self.buffer, field * 8, value)
+
+    def add(self, field, value):
+        self.set(field, self.get(field) + value)
+
+    def write(self, points):
+        write = self.get(_WRITE)
+        free = self.capacity - (write - self.get(_READ))
+        if len(points) > free:
+            self.add(_DROPPED, len(points) - free)
+            points = points[:free]
+        for point in points:
+            _point.pack_into(self.buffer, _header.size + (write % self.capacity) * _point.size, *point)
+            write += 1
+        self.set(_WRITE, write)
+        self.add(_POINTS, len(points))
+
+    def chunks(self, max_points=None):
+        """
+        Offsets and lengths of the unread points, up to two because of the wrap around
+        """
+        read = self.get(_READ)
+        count = self.get(_WRITE) - read
+        if max_points is not None:
+            count = min(count, max_points)
+        result = []
+        while count:
+            start = read % self.capacity
+            length = min(count, self.capacity - start)
+            result.append((_header.size + start * _point.size, length))
+            read += length
+            count -= length
+        return result, read
+
+    def read(self, max_points=None):
+        chunks, read = self.chunks(max_points)
+        points = []
+        for offset, length in chunks:
+            points.extend(_point.iter_unpack(self.buffer[offset:offset + length * _point.size]))
+        self.set(_READ, read)
+        return points
+
+
+def _worker_main(index, buffer, capacity, commands, options):
+    """
+    Worker process: runs a MasterPool and writes the decoded points to the ring
+    """
+    from lib60870.MasterPool import MasterPool, LinkState
+
+    ring = _PointRing(buffer, capacity)
+    pool = MasterPool(**options)
+
+    def handler(link, asdu):
+        try:
+            decoded = asdu.decode()
+        except ValueError:
+            ring.add(_ERRORS, 1)
+            return
+        type_id = decoded.type_id.value
+        cot = decoded.cot if isinstance(decoded.cot, int) else decoded.cot.value
+        ring.write([(link, decoded.ca, type_id, cot, element.quality or 0, element.ioa, _as_float(element.value),
+                     -1 if element.timestamp is None else element.timestamp) for element in decoded.elements])
+        ring.add(_ASDUS, 1)
+
+    pool.set_asdu_handler(handler)
+    pool.start()
+    try:
+        while True:
+            ring.set(_HEARTBEAT, time.time())
+            ring.set(_LINKS, pool.get_states()[LinkState.ACTIVE])
+            try:
+                command = commands.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if command[0] == "add":
+                pool.add_link(*command[1:])
+            elif command[0] == "remove":
+                if command[1] in pool:
+                    pool.remove_link(command[1])
+            elif command[0] == "stop":
+                return
+    finally:
+        pool.stop()
+
+
+class _Worker():
+    def __init__(self, context, index, capacity, options):
+        self.index = index
+        self.buffer = context.RawArray(ctypes.c_uint8, _PointRing.size(capacity))
+        self.ring = _PointRing(self.buffer, capacity)
+        self.commands = context.Queue()
+        self.links = set()
+        self.rate_time = time.monotonic()
+        self.rate_asdus = 0
+        self.rate_points = 0
+        self.asdus_per_second = 0.0
+        self.points_per_second = 0.0
+        self.process = context.Process(target=_worker_main, name="MasterFarmWorker-{}".format(index),
+                                       args=(index, self.buffer, capacity, self.commands, options), daemon=True)
+
+    @property
+    def alive(self):
+        return self.process.is_alive()
+
+
+class MasterFarm():
+    """
+    Spreads the connections to many RTUs over worker processes
+
+    Every worker process runs a MasterPool for its share of the endpoints and
+    decodes the received ASDUs itself, so decoding scales with the number of
+    processes instead of being bound by one GIL. The decoded points are
+    written to a ring in shared memory per worker, which read() or
+    read_numpy() take without pickling. When a ring is full the newest
+    points are dropped and counted.
+
+    A supervisor thread watches the workers. The endpoints of a worker that
+    died are assigned to the workers that are still alive, with the least
+    links first. get_metrics() reports links, ASDUs, points, drops and
+    throughput per worker.
+
+    endpoints are (link_id, ip, port) tuples; the link IDs are returned with
+    the points. Other keyword arguments are passed to MasterPool.
+    """
+    def __init__(self, endpoints, workers=None, ring_size=65536, check_interval=0.5, start_method="spawn",
+                 **options):
+        self.workers = workers or os.cpu_count() or 1
+        self.ring_size = ring_size
+        self.check_interval = check_interval
+        self.options = options
+        self.link_ids = []
+        self.endpoints = []
+        self.rebalanced = 0
+        self._numbers = {}
+        self._context = multiprocessing.get_context(start_method)
+        self._workers = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._supervisor = None
+        self._stopped = threading.Event()
+        for endpoint in endpoints:
+            self._add_endpoint(*endpoint)
+
+    def __len__(self):
+        return len(self.link_ids)
+
+    def _add_endpoint(self, link_id, ip, port=lib60870.IEC_60870_5_104_DEFAULT_PORT):
+        if link_id in self._numbers:
+            raise ValueError("Link {!r} exists".format(link_id))
+        self._numbers[link_id] = len(self.link_ids)
+        self.link_ids.append(link_id)
+        self.endpoints.append((ip, port))
+        return self._numbers[link_id]
+
+    def _assign(self, number, worker):
+        worker.links.add(number)
+        ip, port = self.endpoints[number]
+        worker.commands.put(("add", number, ip, port))
+
+    def _least_loaded(self):
+        alive = [worker for worker in self._workers if worker.alive]
+        if not alive:
+            raise RuntimeError("No worker alive")
+        return min(alive, key=lambda worker: len(worker.links))
+
+    def add_endpoint(self, link_id, ip, port=lib60870.IEC_60870_5_104_DEFAULT_PORT):
+        """
+        Add an RTU, it is assigned to the worker with the least links when the farm is running
+        """
+        with self._lock:
+            number = self._add_endpoint(link_id, ip, port)
+            if self._running:
+                self._assign(number, self._least_loaded())
+
+    def get_assignment(self):
+        """
+        Link ID to worker index
+        """
+        with self._lock:
+            return {self.link_ids[number]: worker.index for worker in self._workers for number in worker.links}
+
+    def start(self):
+        """
+        Start the worker processes, the endpoints are dealt round robin
+        """
+        with self._lock:
+            self._workers = [_Worker(self._context, index, self.ring_size, self.options)
+                             for index in range(self.workers)]
+            for worker in self._workers:
+                worker.process.start()
+            for number in range(len(self.link_ids)):
+                self._assign(number, self._workers[number % self.workers])
+            self._running = True
+        self._stopped.clear()
+        self._supervisor = threading.Thread(target=self._supervise, name="MasterFarmSupervisor", daemon=True)
+        self._supervisor.start()
+
+    def stop(self, timeout=5.0):
+        """
+        Stop the workers, points that were not read are lost
+        """
+        with self._lock:
+            self._running = False
+        self._stopped.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+            self._supervisor = None
+        for worker in self._workers:
+            if worker.alive:
+                worker.commands.put(("stop",))
+        for worker in self._workers:
+            worker.process.join(timeout)
+            if worker.alive:
+                worker.process.kill()
+                worker.process.join()
+
+    def _supervise(self):
+        while not self._stopped.wait(self.check_interval):
+            with self._lock:
+                for worker in self._workers:
+                    if worker.links and not worker.alive:
+                        self._rebalance(worker)
+
+    def _rebalance(self, worker):
+        logger.warning("worker {} exited with {}, reassigning {} links".format(
+            worker.index, worker.process.exitcode, len(worker.links)))
+        links, worker.links = sorted(worker.links), set()
+        for number in links:
+            self._assign(number, self._least_loaded())
+        self.rebalanced += len(links)
+
+    def _rings(self):
+        return [worker.ring for worker in self._workers]
+
+    def read(self, max_points=None):
+        """
+        The decoded points of all workers since the last read, as FarmPoints
+        """
+        points = []
+        for ring in self._rings():
+            for point in ring.read(None if max_points is None else max_points - len(points)):
+                points.append(FarmPoint(self.link_ids[point[0]], *point[1:]))
+        return points
+
+    def read_numpy(self, max_points=None):
+        """
+        The decoded points of all workers since the last read, as numpy structured array of FARM_POINT_FIELDS
+
+        The link field is the position of the link ID in `link_ids`.
+        """
+        import numpy
+
+        dtype = numpy.dtype(FARM_POINT_FIELDS)
+        arrays = []
+        remaining = max_points
+        for ring in self._rings():
+            chunks, read = ring.chunks(remaining)
+            for offset, length in chunks:
+                arrays.append(numpy.frombuffer(ring.buffer, dtype, length, offset).copy())
+                if remaining is not None:
+                    remaining -= length
+            ring.set(_READ, read)
+        if not arrays:
+            return numpy.empty(0, dtype=dtype)
+        return numpy.concatenate(arrays)
+
+    def get_metrics(self):
+        """
+        Per worker: process, links, ASDUs, points, dropped points, decode errors and throughput
+        """
+        metrics = []
+        now = time.monotonic()
+        with self._lock:
+            for worker in self._workers:
+                ring = worker.ring
+                asdus, points = ring.get(_ASDUS), ring.get(_POINTS)
+                elapsed = now - worker.rate_time
+                if elapsed > 0:
+                    worker.asdus_per_second = (asdus - worker.rate_asdus) / elapsed
+                    worker.points_per_second = (points - worker.rate_points) / elapsed
+                    worker.rate_time, worker.rate_asdus, worker.rate_points = now, asdus, points
+                metrics.append({
+                    "worker": worker.index,
+                    "pid": worker.process.pid,
+                    "alive": worker.alive,
+                    "links": len(worker.links),
+                    "active_links": ring.get(_LINKS),
+                    "asdus": asdus,
+                    "points": points,
+                    "dropped": ring.get(_DROPPED),
+                    "errors": ring.get(_ERRORS),
+                    "pending": ring.get(_WRITE) - ring.get(_READ),
+                    "heartbeat": ring.get(_HEARTBEAT),
+                    "asdus_per_second": worker.asdus_per_second,
+                    "points_per_second": worker.points_per_second,
+                })
+        return metrics
@@ -0,0 +1,312 @@
+import logging
+import math
+import collections
+import enum
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from lib60870.T104Connection import T104Connection
+from lib60870 import lib60870
+from lib60870.lib60870 import IEC60870ConnectionEvent
+
+logger = logging.getLogger(__name__)
+
+
+class LinkState(enum.Enum):
+    # not connected and no connection attempt scheduled
+    DISCONNECTED = 0
+    # waiting for the TCP connection
+    CONNECTING = 1
+    # connected, STARTDT act sent
+    OPEN = 2
+    # STARTDT con received, data transfer started
+    ACTIVE = 3
+    # connection failed or lost, the next attempt is scheduled
+    BACKOFF = 4
+
+
+class PoolLink():
+    """
+    One RTU of a MasterPool, with its T104Connection and link state
+    """
+    def __init__(self, link_id, ip, port):
+        self.link_id = link_id
+        self.ip = ip
+        self.port = port
+        self.connection = T104Connection(ip, port)
+        self.state = LinkState.DISCONNECTED
+        self.failures = 0
+        self.connects = 0
+        self.received = 0
+        self.next_attempt = None
+        # incremented on every connection attempt, outdated timers are ignored
+        self.attempt = 0
+
+    def __repr__(self):
+        return "PoolLink({!r}, {}:{}, {})".format(self.link_id, self.ip, self.port, self.state.name)
+
+
+class MasterPool():
+    """
+    Supervises the connections to many RTUs from two threads
+
+    The library still runs one connection thread per link, which does the
+    socket I/O and the APCI timers. Those threads only copy received ASDUs
+    and connection events into queues, all Python work happens on two pool
+    threads whatever the number of links: the supervisor connects, sends
+    STARTDT and reconnects lost links after an exponential backoff with
+    jitter, and the dispatcher hands the received ASDUs, tagged with the ID
+    of their link, to the ASDU handler. Without a handler they are read with
+    receive() or `for link_id, asdu in pool`.
+
+    The library does not report failed connection attempts, a link that is
+    not connected after connect_timeout seconds counts as failed. The
+    timeout is applied as t0 of the connections, rounded up to whole seconds.
+    """
+    def __init__(self, backoff=1.0, max_backoff=60.0, connect_timeout=10.0, max_queue_size=65536,
+                 parameters=None):
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.connect_timeout = connect_timeout
+        self.max_queue_size = max_queue_size
+        self.parameters = parameters
+        self.received = 0
+        self.delivered = 0
+        self._links = collections.OrderedDict()
+        self._asdus = collections.deque(maxlen=max_queue_size)
+        self._asdus_ready = threading.Condition()
+        self._events = collections.deque()
+        self._timers = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._asdu_handler = None
+        self._state_handler = None
+        self._running = False
+        self._supervisor = None
+        self._dispatcher = None
+
+    def __len__(self):
+        return len(self._links)
+
+    def __contains__(self, link_id):
+        return link_id in self._links
+
+    def __iter__(self):
+        while True:
+            item = self.receive()
+            if item is None:
+                return
+            yield item
+
+    @property
+    def dropped(self):
+        return self.received - self.delivered - len(self._asdus)
+
+    def get_link(self, link_id):
+        return self._links[link_id]
+
+    def get_links(self):
+        return list(self._links.values())
+
+    def get_state(self, link_id):
+        return self._links[link_id].state
+
+    def get_states(self):
+        """
+        Number of links per LinkState
+        """
+        return collections.Counter(link.state for link in list(self._links.values()))
+
+    def set_asdu_handler(self, callback):
+        """
+        callback(link_id, asdu) is called on the dispatcher thread for every received ASDU
+        """
+        self._asdu_handler = callback
+
+    def set_state_handler(self, callback):
+        """
+        callback(link_id, state) is called on the supervisor thread when a link changes its state
+        """
+        self._state_handler = callback
+
+    def add_link(self, link_id, ip, port=lib60870.IEC_60870_5_104_DEFAULT_PORT):
+        """
+        Add an RTU, it is connected right away when the pool is running
+        """
+        if link_id in self._links:
+            raise ValueError("Link {!r} exists".format(link_id))
+        link = PoolLink(link_id, ip, port)
+        if self.parameters is not None:
+            link.connection.set_connection_parameters(self.parameters)
+        # t0, the library resets the connect timeout to it on every connect
+        link.connection.set_apci_parameters(t0=max(1, int(math.ceil(self.connect_timeout))))
+        link.connection.set_connection_handler(lambda parameter, event: self._post(link, event))
+        link.connection.set_asdu_received_handler(lambda asdu: self._receive(link, asdu))
+        self._links[link_id] = link
+        if self._running:
+            self._post(link, "connect")
+        return link
+
+    def remove_link(self, link_id):
+        """
+        Close the connection of an RTU and forget it
+        """
+        link = self._links.pop(link_id)
+        self._post(link, "remove")
+        if not self._running:
+            self._close(link)
+
+    def start(self):
+        """
+        Start the pool threads and connect all links
+        """
+        self._running = True
+        self._supervisor = threading.Thread(target=self._supervise, name="MasterPoolSupervisor", daemon=True)
+        self._dispatcher = threading.Thread(target=self._dispatch, name="MasterPoolDispatcher", daemon=True)
+        self._supervisor.start()
+        self._dispatcher.start()
+        for link in self.get_links():
+            self._post(link, "connect")
+
+    def stop(self):
+        """
+        Close all connections and stop the pool threads
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        with self._asdus_ready:
+            self._asdus_ready.notify_all()
+        for thread in (self._supervisor, self._dispatcher):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join()
+        self._timers = []
+        self._events.clear()
+        for link in self.get_links():
+            link.attempt += 1
+            self._close(link)
+            self._set_state(link, LinkState.DISCONNECTED)
+
+    # called on the library connection threads
+    def _post(self, link, event):
+        with self._condition:
+            self._events.append((link, event))
+            self._condition.notify()
+
+    def _receive(self, link, asdu):
+        asdu = asdu.copy()
+        with self._asdus_ready:
+            link.received += 1
+            self.received += 1
+            self._asdus.append((link.link_id, asdu))
+            self._asdus_ready.notify()
+        return True
+
+    def receive(self, timeout=None):
+        """
+        Next received (link_id, asdu), None on timeout or when the pool is stopped
+        """
+        with self._asdus_ready:
+            if not self._asdus_ready.wait_for(lambda: self._asdus or not self._running, timeout):
+                return None
+            if not self._asdus:
+                return None
+            self.delivered += 1
+            return self._asdus.popleft()
+
+    def _dispatch(self):
+        while self._running:
+            with self._asdus_ready:
+                self._asdus_ready.wait_for(lambda: (self._asdus and self._asdu_handler) or not self._running, 0.1)
+            handler = self._asdu_handler
+            if handler is None:
+                continue
+            while True:
+                item = self.receive(0)
+                if item is None:
+                    break
+                try:
+                    handler(*item)
+                except Exception:
+                    logger.exception("asdu handler failed")
+
+    # called on the supervisor thread
+    def _supervise(self):
+        while True:
+            with self._condition:
+                timeout = max(self._timers[0][0] - time.monotonic(), 0) if self._timers else None
+                self._condition.wait_for(lambda: self._events or not self._running, timeout)
+                if not self._running:
+                    return
+                events = list(self._events)
+                self._events.clear()
+            for link, event in events:
+                self._handle(link, event)
+            now = time.monotonic()
+            while self._timers and self._timers[0][0] <= now:
+                deadline, sequence, link, attempt, action = heapq.heappop(self._timers)
+                if link.attempt == attempt and link.link_id in self._links:
+                    action(link)
+
+    def _schedule(self, link, delay, action):
+        heapq.heappush(self._timers, (time.monotonic() + delay, next(self._sequence), link, link.attempt, action))
+
+    def _set_state(self, link, state):
+        if link.state == state:
+            return
+        logger.debug("link {!r}: {} -> {}".format(link.link_id, link.state.name, state.name))
+        link.state = state
+        if self._state_handler is not None:
+            try:
+                self._state_handler(link.link_id, state)
+            except Exception:
+                logger.exception("state handler failed")
+
+    def _handle(self, link, event):
+        if event == "remove":
+            link.attempt += 1
+            self._close(link)
+            self._set_state(link, LinkState.DISCONNECTED)
+        elif link.link_id not in self._links:
+            return
+        elif event == "connect":
+            self._connect(link)
+        elif event == IEC60870ConnectionEvent.IEC60870_CONNECTION_OPENED:
+            link.connects += 1
+            self._set_state(link, LinkState.OPEN)
+            link.connection.send_start_dt()
+        elif event == IEC60870ConnectionEvent.IEC60870_CONNECTION_STARTDT_CON_RECEIVED:
+            link.failures = 0
+            self._set_state(link, LinkState.ACTIVE)
+        elif event == IEC60870ConnectionEvent.IEC60870_CONNECTION_CLOSED:
+            if link.state in (LinkState.OPEN, LinkState.ACTIVE):
+                self._fail(link)
+
+    def _connect(self, link):
+        link.attempt += 1
+        link.next_attempt = None
+        self._set_state(link, LinkState.CONNECTING)
+        link.connection.connect_async()
+        # after t0, so the connection thread gave up connecting and close() does not wait for it
+        t0 = link.connection.get_connection_parameters().t0
+        self._schedule(link, max(self.connect_timeout, t0) + 0.5, self._connect_timeout)
+
+    def _connect_timeout(self, link):
+        if link.state == LinkState.CONNECTING:
+            self._fail(link)
+
+    def _fail(self, link):
+        link.attempt += 1
+        link.failures += 1
+        # the connection thread has ended or ends within its poll interval
+        self._close(link)
+        delay = min(self.backoff * 2 ** (link.failures - 1), self.max_backoff) * random.uniform(0.8, 1.2)
+        link.next_attempt = time.time() + delay
+        self._set_state(link, LinkState.BACKOFF)
+        self._schedule(link, delay, self._connect)
+
+    def _close(self, link):
+        link.connection.close()
@@ -0,0 +1,306 @@
+import logging
+import array
+import collections
+import threading
+
+from lib60870.asdu import InformationValue, get_builder
+from lib60870.lib60870 import CauseOfTransmission, QualifierOfInterrogation, TypeID
+
+logger = logging.getLogger(__name__)
+
+# array typecode of the values per TypeID, as taken by ASDUBuilder
+_value_typecodes = {
+    1: "q", 2: "q", 30: "q", 3: "q", 4: "q", 31: "q", 5: "q", 6: "q", 32: "q", 7: "q", 8: "q", 33: "q",
+    9: "d", 10: "d", 34: "d", 21: "d", 11: "q", 12: "q", 35: "q", 13: "d", 14: "d", 36: "d",
+    15: "q", 16: "q", 37: "q", 20: "q",
+}
+
+# step positions: the position is kept in the values, the transient flag beside them
+_step_types = (5, 6, 32)
+
+# interrogation responses carry no time tag, time tagged points are sent as their plain TypeID
+_interrogation_types = {
+    2: 1, 30: 1, 4: 3, 31: 3, 6: 5, 32: 5, 8: 7, 33: 7, 10: 9, 34: 9, 12: 11, 35: 11, 14: 13, 36: 13,
+}
+
+# integrated totals are answered by counter interrogation, not by general interrogation
+_counter_types = (15, 16, 37)
+
+STATION = 0
+
+
+def _split_step_position(value):
+    """
+    (position, transient) of a step position given as tuple, like ASDUDecoder returns it, or as position
+    """
+    if isinstance(value, tuple):
+        return value[0], 1 if value[1] else 0
+    return value, 0
+
+
+class _PointTable():
+    """
+    Points of one TypeID and CA in IOA order, with the cached interrogation
+    response per group as blocks of block_size points
+    """
+    def __init__(self, type_id, block_size):
+        self.type_id = type_id
+        self.block_size = block_size
+        self.ioas = array.array("L")
+        self.values = array.array(_value_typecodes[type_id.value])
+        self.transients = array.array("B") if type_id.value in _step_types else None
+        self.qualities = array.array("B")
+        self.timestamps = array.array("q")
+        self.groups = array.array("B")
+        self.index = {}
+        self.invalidate()
+
+    def __len__(self):
+        return len(self.ioas)
+
+    def invalidate(self):
+        self.selections = {}
+        self.blocks = {}
+
+    def get_value(self, position):
+        if self.transients is None:
+            return self.values[position]
+        return self.values[position], self.transients[position] == 1
+
+    def add(self, ioas, values, qualities, timestamps, groups):
+        points = {}
+        for position, ioa in enumerate(self.ioas):
+            points[ioa] = (self.get_value(position), self.qualities[position], self.timestamps[position],
+                           self.groups[position])
+        points.update(zip(ioas, zip(values, qualities, timestamps, groups)))
+        ordered = sorted(points.items())
+        self.ioas = array.array("L", [ioa for ioa, point in ordered])
+        if self.transients is None:
+            self.values = array.array(self.values.typecode, [point[0] for ioa, point in ordered])
+        else:
+            steps = [_split_step_position(point[0]) for ioa, point in ordered]
+            self.values = array.array(self.values.typecode, [step[0] for step in steps])
+            self.transients = array.array("B", [step[1] for step in steps])
+        self.qualities = array.array("B", [point[1] for ioa, point in ordered])
+        self.timestamps = array.array("q", [point[2] for ioa, point in ordered])
+        self.groups = array.array("B", [point[3] for ioa, point in ordered])
+        self.index = {ioa: position for position, ioa in enumerate(self.ioas)}
+        # rank of each point within its group, to find its cached block
+        self.ranks = array.array("L", [0] * len(self.ioas))
+        counts = collections.Counter()
+        for position, group in enumerate(self.groups):
+            self.ranks[position] = counts[group]
+            counts[group] += 1
+        self.invalidate()
+
+    def update(self, position, value, quality, timestamp):
+        if self.transients is None:
+            self.values[position] = value
+        else:
+            self.values[position], self.transients[position] = _split_step_position(value)
+        if quality is not None:
+            self.qualities[position] = quality
+        if timestamp is not None:
+            self.timestamps[position] = timestamp
+        blocks = self.blocks.get(STATION)
+        if blocks is not None:
+            blocks[position // self.block_size] = None
+        group = self.groups[position]
+        blocks = self.blocks.get(group)
+        if group != STATION and blocks is not None:
+            blocks[self.ranks[position] // self.block_size] = None
+
+    def select(self, group):
+        positions = self.selections.get(group)
+        if positions is None:
+            if group == STATION:
+                positions = range(len(self.ioas))
+            else:
+                positions = [position for position, point_group in enumerate(self.groups) if point_group == group]
+            self.selections[group] = positions
+        return positions
+
+    def build(self, builder, response_type, group, cot, ca, statistics):
+        positions = self.select(group)
+        blocks = self.blocks.get(group)
+        if blocks is None:
+            blocks = self.blocks[group] = [None] * ((len(positions) + self.block_size - 1) // self.block_size)
+        asdus = []
+        for block, start in enumerate(range(0, len(positions), self.block_size)):
+            if blocks[block] is None:
+                selected = positions[start:start + self.block_size]
+                blocks[block] = builder.build(response_type,
+                                              [self.ioas[position] for position in selected],
+                                              [self.get_value(position) for position in selected],
+                                              [self.qualities[position] for position in selected],
+                                              [self.timestamps[position] for position in selected],
+                                              cot, ca)
+                statistics["misses"] += 1
+            else:
+                statistics["hits"] += 1
+            asdus.extend(blocks[block])
+        return asdus
+
+
+class PointDatabase():
+    """
+    Process image of an outstation that answers general interrogation
+
+    Points are kept per CA and TypeID in arrays ordered by IOA. Each point
+    belongs to the station and optionally to one of the interrogation groups
+    1 to 16. Attach the database with T104Slave.set_point_database() and a
+    C_IC_NA_1 is answered with ACT_CON, the points of the station or the
+    requested group packed by ASDUBuilder, and ACT_TERM.
+
+    The response ASDUs are cached per CA, group and TypeID in blocks of
+    block_size points. An update only invalidates the blocks holding the
+    point, the next interrogation re-encodes those and sends the other
+    blocks as they are. Reused blocks and re-encoded blocks are counted in
+    `cache_hits` and `cache_misses`.
+
+    All response ASDUs are handed to the library at once, so the high
+    priority queue of the T104Slave (max_high_prio_queue_size) must hold the
+    largest response.
+
+    Values are given and returned like the InformationValue records of
+    ASDUDecoder, step positions also as plain position.
+    """
+    def __init__(self, block_size=240):
+        self.block_size = block_size
+        self._tables = {}
+        self._points = {}
+        self._lock = threading.Lock()
+        self._builder = None
+        self._statistics = collections.Counter()
+
+    @property
+    def cache_hits(self):
+        return self._statistics["hits"]
+
+    @property
+    def cache_misses(self):
+        return self._statistics["misses"]
+
+    def invalidate(self):
+        """
+        Drop the cached interrogation responses
+        """
+        with self._lock:
+            for table in self._tables.values():
+                table.invalidate()
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, address):
+        return address in self._points
+
+    def get_common_addresses(self):
+        with self._lock:
+            return sorted(set(ca for ca, type_id in self._tables))
+
+    def add_points(self, ca, type_id, ioas, values=None, qualities=None, timestamps=None, group=STATION):
+        """
+        Add points, or replace them when they exist
+
+        group is a single group (1 to 16, or STATION for none) or one group per point
+        """
+        if type_id.value not in _value_typecodes:
+            raise ValueError("Unsupported TypeID ({})".format(type_id))
+        ioas = list(ioas)
+        count = len(ioas)
+        values = [0] * count if values is None else list(values)
+        qualities = [0] * count if qualities is None else list(qualities)
+        timestamps = [0] * count if timestamps is None else list(timestamps)
+        groups = [group] * count if isinstance(group, int) else list(group)
+        if not len(values) == len(qualities) == len(timestamps) == len(groups) == count:
+            raise ValueError("ioas, values, qualities, timestamps and groups differ in length")
+        if any(not STATION <= group <= 16 for group in groups):
+            raise ValueError("Interrogation group out of range")
+        with self._lock:
+            for ioa in ioas:
+                table = self._points.get((ca, ioa))
+                if table is not None and table.type_id != type_id:
+                    raise ValueError("IOA {} of CA {} exists as {}".format(ioa, ca, table.type_id))
+            table = self._tables.get((ca, type_id))
+            if table is None:
+                table = self._tables[(ca, type_id)] = _PointTable(type_id, self.block_size)
+            table.add(ioas, values, qualities, timestamps, groups)
+            for ioa in ioas:
+                self._points[(ca, ioa)] = table
+
+    def update(self, ca, ioa, value, quality=None, timestamp=None):
+        """
+        Update one point, quality and timestamp are kept unless given
+        """
+        table = self._points[(ca, ioa)]
+        with self._lock:
+            table.update(table.index[ioa], value, quality, timestamp)
+
+    def update_many(self, ca, ioas, values, qualities=None, timestamps=None):
+        """
+        Update points from arrays
+        """
+        with self._lock:
+            for offset, ioa in enumerate(ioas):
+                table = self._points[(ca, ioa)]
+                table.update(table.index[ioa], values[offset],
+                             None if qualities is None else qualities[offset],
+                             None if timestamps is None else timestamps[offset])
+
+    def get(self, ca, ioa):
+        """
+        The point as InformationValue
+        """
+        table = self._points[(ca, ioa)]
+        position = table.index[ioa]
+        return InformationValue(ioa, table.get_value(position), table.qualities[position], table.timestamps[position])
+
+    def get_type_id(self, ca, ioa):
+        return self._points[(ca, ioa)].type_id
+
+    def build_interrogation_response(self, ca, qoi, parameters=None):
+        """
+        The ASDUs answering an interrogation of the station (QOI 20) or a group (QOI 21 to 36)
+        """
+        group = int(getattr(qoi, "value", qoi)) - QualifierOfInterrogation.IEC60870_QOI_STATION.value
+        if not STATION <= group <= 16:
+            raise ValueError("Invalid qualifier of interrogation ({})".format(qoi))
+        cot = CauseOfTransmission(CauseOfTransmission.INTERROGATED_BY_STATION.value + group)
+        builder = get_builder(parameters)
+        asdus = []
+        with self._lock:
+            if builder is not self._builder:
+                # cached ASDUs are encoded for other ConnectionParameters
+                for table in self._tables.values():
+                    table.invalidate()
+                self._builder = builder
+            for (table_ca, type_id), table in sorted(self._tables.items(), key=lambda item: item[0][1].value):
+                if table_ca != ca or type_id.value in _counter_types:
+                    continue
+                response_type = TypeID(_interrogation_types.get(type_id.value, type_id.value))
+                asdus.extend(table.build(builder, response_type, group, cot, ca, self._statistics))
+        return asdus
+
+    def interrogation_handler(self, parameter, connection, asdu, qoi):
+        """
+        Interrogation handler for T104Slave.set_interrogation_handler()
+        """
+        ca = asdu.get_ca()
+        if ca not in self.get_common_addresses():
+            asdu.set_cot(CauseOfTransmission.UNKNOWN_COMMON_ADDRESS_OF_ASDU)
+            asdu.set_negative(True)
+            connection.send_asdu(asdu)
+            return True
+        try:
+            responses = self.build_interrogation_response(ca, qoi, asdu.parameters.contents)
+        except ValueError:
+            connection.send_act_con(asdu, True)
+            return True
+        connection.send_act_con(asdu)
+        for sent, response in enumerate(responses):
+            if not connection.send_asdu(response):
+                logger.warning("interrogation response truncated after {} of {} ASDUs".format(sent, len(responses)))
+                break
+        connection.send_act_term(asdu)
+        return True
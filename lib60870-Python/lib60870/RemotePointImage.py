@@ -0,0 +1,201 @@
+import logging
+import array
+import collections
+import threading
+
+from lib60870.asdu import _as_float, get_decoder
+
+logger = logging.getLogger(__name__)
+
+# monitoring direction TypeIDs are 1 to 44, the others are commands and system information
+_MAX_MONITORING_TYPE = 44
+
+RemotePoint = collections.namedtuple("RemotePoint", ["ca", "ioa", "type_id", "value", "quality", "timestamp",
+                                                     "sequence"])
+
+# numpy layout of RemotePointImage.to_numpy()
+REMOTE_POINT_FIELDS = [
+    ("ca", "<u2"),
+    ("ioa", "<u4"),
+    ("type_id", "u1"),
+    ("value", "<f8"),
+    ("quality", "u1"),
+    ("timestamp_ms", "<i8"),
+    ("sequence", "<u8"),
+]
+
+
+class RemotePointImage():
+    """
+    Last known value, quality and timestamp of every point a master received
+
+    Points are kept per (CA, IOA) in typed arrays, found by a dict in O(1).
+    Values are stored as float: booleans as 0 and 1, step positions and
+    protection events as their first part. The timestamp is -1 for points
+    without time tag.
+
+    Every update increments `sequence` and stamps the point with it, so a
+    consumer that remembers the sequence of its last poll gets only the
+    points changed since with changes_since(). The positions of the changes
+    are kept in a log of at most max_log entries; a consumer that fell
+    further behind than that gets all points changed since by a scan.
+
+    Attach it with attach(), or feed it from any other source with
+    update_asdu(), update_buffers() or update(). Commands and system
+    information are skipped by their TypeID, monitoring direction ASDUs that
+    cannot be decoded are counted in `undecoded`.
+    """
+    def __init__(self, max_log=1 << 20):
+        self.max_log = max_log
+        self.sequence = 0
+        self.undecoded = 0
+        self.cas = array.array("H")
+        self.ioas = array.array("L")
+        self.type_ids = array.array("B")
+        self.values = array.array("d")
+        self.qualities = array.array("B")
+        self.timestamps = array.array("q")
+        self.sequences = array.array("Q")
+        self._index = {}
+        self._log = array.array("L")
+        self._log_start = 1
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ioas)
+
+    def __contains__(self, address):
+        return address in self._index
+
+    def attach(self, connection):
+        """
+        Update the image with the ASDUs received by a T104Connection, replaces its ASDU received handler
+        """
+        connection.set_asdu_received_handler(self.asdu_received_handler)
+
+    def asdu_received_handler(self, asdu):
+        self.update_asdu(asdu)
+        return True
+
+    def update_asdu(self, asdu):
+        """
+        Update the points of a received ASDU
+        """
+        if asdu.asdu[0] <= _MAX_MONITORING_TYPE:
+            self._update_encoded(get_decoder(asdu.parameters.contents), asdu.get_buffer())
+
+    def update_buffers(self, parameters, buffers):
+        """
+        Update the points of encoded ASDUs, usable as T104Connection.set_asdu_batch_handler()
+        """
+        decoder = get_decoder(parameters)
+        for buffer in buffers:
+            if buffer[0] <= _MAX_MONITORING_TYPE:
+                self._update_encoded(decoder, buffer)
+
+    def _update_encoded(self, decoder, buffer):
+        try:
+            decoded = decoder.decode(buffer)
+        except ValueError:
+            self.undecoded += 1
+            return
+        type_id = decoded.type_id.value
+        ca = decoded.ca
+        with self._lock:
+            for element in decoded.elements:
+                self._update(ca, element.ioa, type_id, element.value, element.quality, element.timestamp)
+
+    def update(self, ca, ioa, type_id, value, quality=0, timestamp=None):
+        """
+        Update one point, adding it when it is new
+        """
+        with self._lock:
+            self._update(ca, ioa, int(getattr(type_id, "value", type_id)), value, quality, timestamp)
+
+    def _update(self, ca, ioa, type_id, value, quality, timestamp):
+        self.sequence += 1
+        position = self._index.get((ca, ioa))
+        if position is None:
+            position = self._index[(ca, ioa)] = len(self.ioas)
+            self.cas.append(ca)
+            self.ioas.append(ioa)
+            self.type_ids.append(type_id)
+            self.values.append(_as_float(value))
+            self.qualities.append(quality or 0)
+            self.timestamps.append(-1 if timestamp is None else timestamp)
+            self.sequences.append(self.sequence)
+        else:
+            self.type_ids[position] = type_id
+            self.values[position] = _as_float(value)
+            self.qualities[position] = quality or 0
+            self.timestamps[position] = -1 if timestamp is None else timestamp
+            self.sequences[position] = self.sequence
+        self._log.append(position)
+        if len(self._log) > self.max_log:
+            dropped = len(self._log) - self.max_log // 2
+            del self._log[:dropped]
+            self._log_start += dropped
+
+    def _point(self, position):
+        return RemotePoint(self.cas[position], self.ioas[position], self.type_ids[position], self.values[position],
+                           self.qualities[position], self.timestamps[position], self.sequences[position])
+
+    def get(self, ca, ioa):
+        """
+        The point as RemotePoint, KeyError when it was never received
+        """
+        with self._lock:
+            return self._point(self._index[(ca, ioa)])
+
+    def get_value(self, ca, ioa):
+        return self.values[self._index[(ca, ioa)]]
+
+    def _changed_positions(self, sequence):
+        if sequence >= self.sequence:
+            return []
+        if sequence + 1 >= self._log_start:
+            # each point once, in the order of its first change since sequence
+            return list(dict.fromkeys(self._log[sequence + 1 - self._log_start:]))
+        sequences = self.sequences
+        return [position for position in range(len(sequences)) if sequences[position] > sequence]
+
+    def changes_since(self, sequence):
+        """
+        The current sequence and the RemotePoints changed after sequence
+
+        Pass the returned sequence to the next call; 0 returns all points.
+        """
+        with self._lock:
+            return self.sequence, [self._point(position) for position in self._changed_positions(sequence)]
+
+    def to_numpy(self, since=None):
+        """
+        The points as numpy structured array of REMOTE_POINT_FIELDS, all or those changed after since
+        """
+        import numpy
+
+        with self._lock:
+            if since is None:
+                positions = slice(None)
+                count = len(self.ioas)
+            else:
+                positions = numpy.array(self._changed_positions(since), dtype=numpy.intp)
+                count = len(positions)
+            result = numpy.empty(count, dtype=REMOTE_POINT_FIELDS)
+            for field, column in (("ca", self.cas), ("ioa", self.ioas), ("type_id", self.type_ids),
+                                  ("value", self.values), ("quality", self.qualities),
+                                  ("timestamp_ms", self.timestamps), ("sequence", self.sequences)):
+                result[field] = numpy.frombuffer(column, dtype=column.typecode)[positions] if len(column) else []
+        return result
+
+    def clear(self):
+        """
+        Forget all points, the sequence keeps counting
+        """
+        with self._lock:
+            self._index.clear()
+            for column in (self.cas, self.ioas, self.type_ids, self.values, self.qualities, self.timestamps,
+                           self.sequences):
+                del column[:]
+            del self._log[:]
+            self._log_start = self.sequence + 1
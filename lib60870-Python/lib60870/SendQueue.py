@@ -0,0 +1,175 @@
+import logging
+import asyncio
+import collections
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SendQueue():
+    """
+    Bounded send queue in front of a T104Connection
+
+    The library refuses an ASDU while k I frames are unconfirmed. The queue
+    keeps the ASDUs and commands in order and a sender thread hands them to
+    the library as soon as the window opens again, retrying after
+    poll_interval seconds while the window is full. The library does not
+    report received S frames, so the window is polled, but from one thread
+    with a short interval instead of from every caller.
+
+    Adding to a full queue blocks, raises queue.Full after timeout or
+    without blocking, or is awaited with the *_async variants. While the
+    connection is down the ASDUs stay queued and are retried every
+    retry_interval seconds. An ASDU whose send raises is logged, counted in
+    `errors` and dropped.
+    """
+    def __init__(self, connection, max_size=1024, poll_interval=0.0005, retry_interval=0.1):
+        self.connection = connection
+        self.max_size = max_size
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.sent = 0
+        self.window_full = 0
+        self.errors = 0
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SendQueue", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def qsize(self):
+        """
+        Number of ASDUs and commands waiting to be sent
+        """
+        return len(self._queue)
+
+    def full(self):
+        return len(self._queue) >= self.max_size
+
+    def send_asdu(self, asdu, block=True, timeout=None):
+        """
+        Queue an ASDU, it is sent as it is when the window opens
+        """
+        self._put(lambda: self.connection.send_asdu(asdu), block, timeout)
+
+    def send_control_command(self, cot, ca, command, block=True, timeout=None):
+        """
+        Queue a control command, see T104Connection.send_control_command()
+        """
+        self._put(lambda: self.connection.send_control_command(cot, ca, command), block, timeout)
+
+    async def send_asdu_async(self, asdu, timeout=None):
+        await self._put_async(lambda: self.connection.send_asdu(asdu), timeout)
+
+    async def send_control_command_async(self, cot, ca, command, timeout=None):
+        await self._put_async(lambda: self.connection.send_control_command(cot, ca, command), timeout)
+
+    def _put(self, send, block, timeout):
+        with self._condition:
+            if not block:
+                timeout = 0
+            if not self._condition.wait_for(lambda: not self.full(), timeout):
+                raise queue.Full
+            self._queue.append(send)
+            self._condition.notify_all()
+
+    async def _put_async(self, send, timeout):
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._condition:
+                if not self.full():
+                    self._queue.append(send)
+                    self._condition.notify_all()
+                    return
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            try:
+                await asyncio.wait_for(future, None if deadline is None else max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                raise queue.Full
+
+    def join(self, timeout=None):
+        """
+        Wait until the library took all queued ASDUs, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue, timeout)
+
+    async def join_async(self, timeout=None):
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._condition:
+                if not self._queue:
+                    return True
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            try:
+                await asyncio.wait_for(future, None if deadline is None else max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                return False
+
+    def clear(self):
+        """
+        Drop the queued ASDUs
+        """
+        with self._condition:
+            self._queue.clear()
+            self._notify()
+
+    def stop(self):
+        """
+        Stop the sender thread, queued ASDUs are not sent
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    # called with the condition held
+    def _notify(self):
+        self._condition.notify_all()
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(lambda future=future: future.done() or future.set_result(None))
+            except RuntimeError:
+                pass
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or not self._running)
+                if not self._running:
+                    return
+                send = self._queue[0]
+            try:
+                result = send()
+            except Exception:
+                logger.exception("send failed, dropped")
+                with self._condition:
+                    if self._queue and self._queue[0] is send:
+                        self._queue.popleft()
+                    self.errors += 1
+                    self._notify()
+                continue
+            if result:
+                with self._condition:
+                    if self._queue and self._queue[0] is send:
+                        self._queue.popleft()
+                    self.sent += 1
+                    self._notify()
+            elif self.connection.is_transmit_buffer_full():
+                self.window_full += 1
+                time.sleep(self.poll_interval)
+            else:
+                # not connected
+                time.sleep(self.retry_interval)
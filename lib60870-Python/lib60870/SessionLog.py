@@ -0,0 +1,267 @@
+import logging
+import array
+import collections
+import os
+import struct
+import threading
+import time
+
+from lib60870.asdu import ASDU
+from lib60870.CaptureReader import Direction
+from lib60870.common import ConnectionParameters, default_connection_parameters
+
+logger = logging.getLogger(__name__)
+
+# file header: magic and format version
+_FILE_HEADER = b"IEC104LOG\x01"
+
+# record header: microseconds since the previous record, kind and payload length
+_record = struct.Struct("<IBB")
+
+# record kinds besides Direction: start of a recording session with its wall clock time and the
+# ConnectionParameters of its ASDUs, and time passed that does not fit the record header
+_SESSION = 0xff
+_DELAY = 0xfe
+_session = struct.Struct("<d")
+_session_parameters = struct.Struct("<6B")
+_delay = struct.Struct("<Q")
+
+SessionRecord = collections.namedtuple("SessionRecord",
+                                       ["session", "started", "time", "direction", "asdu", "parameters"])
+
+
+class SessionRecorder():
+    """
+    Appends the ASDUs of T104Connection and T104Slave sessions to a binary log
+
+    Attach it with T104Connection.set_recorder() or T104Slave.set_recorder().
+    Every ASDU is written with the microseconds since the previous record
+    on the monotonic clock, its direction (CONTROL for master to
+    outstation, MONITOR for outstation to master) and its length: 6 bytes
+    plus the encoded ASDU. The APCI is not recorded, the library generates
+    S and U frames and sequence numbers itself when the session is replayed.
+
+    Every recorder starts a new session in the file, stamped with the wall
+    clock time and the ConnectionParameters the ASDUs are encoded with,
+    which set_recorder() takes from the connection or slave. Writes are
+    buffered and flushed every flush_interval seconds and by flush() and
+    close(); a record torn by a crash is ignored by read_session_log().
+    """
+    def __init__(self, path, flush_interval=1.0, parameters=None):
+        self.path = os.fspath(path)
+        self.flush_interval = flush_interval
+        self.parameters = ConnectionParameters.from_buffer_copy(parameters or default_connection_parameters)
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_FILE_HEADER)
+        else:
+            with open(self.path, "rb") as existing:
+                if existing.read(len(_FILE_HEADER)) != _FILE_HEADER:
+                    self._file.close()
+                    raise ValueError("{} is no session log".format(self.path))
+        self._last = time.monotonic_ns() // 1000
+        self._flushed = time.monotonic()
+        # the session record is written with the first ASDU, when the parameters are known
+        self._started = time.time()
+        self._session_written = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def set_parameters(self, parameters):
+        """
+        Set the ConnectionParameters of the recorded ASDUs, ValueError when ASDUs of another layout were recorded
+        """
+        parameters = ConnectionParameters.from_buffer_copy(parameters)
+        with self._lock:
+            if self._session_written and bytes(parameters) != bytes(self.parameters):
+                raise ValueError("session recorded with {}".format(self.parameters))
+            self.parameters = parameters
+
+    def record_control(self, buffer):
+        self.record(Direction.CONTROL, buffer)
+
+    def record_monitor(self, buffer):
+        self.record(Direction.MONITOR, buffer)
+
+    def record(self, direction, buffer):
+        """
+        Append an encoded ASDU sent in direction
+        """
+        now = time.monotonic_ns() // 1000
+        with self._lock:
+            if self._file.closed:
+                return
+            if not self._session_written:
+                parameters = self.parameters
+                self._write(_SESSION, _session.pack(self._started) + _session_parameters.pack(
+                    parameters.sizeOfTypeId, parameters.sizeOfVSQ, parameters.sizeOfCOT,
+                    parameters.originatorAddress, parameters.sizeOfCA, parameters.sizeOfIOA), 0)
+                self._session_written = True
+            elapsed = now - self._last
+            self._last = now
+            if elapsed > 0xffffffff:
+                self._write(_DELAY, _delay.pack(elapsed), 0)
+                elapsed = 0
+            self._write(direction, buffer, elapsed)
+            self.records += 1
+            if time.monotonic() - self._flushed >= self.flush_interval:
+                self._file.flush()
+                self._flushed = time.monotonic()
+
+    def _write(self, kind, payload, elapsed):
+        self._file.write(_record.pack(elapsed, kind, len(payload)))
+        self._file.write(payload)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def read_session_log(path):
+    """
+    Iterate the SessionRecords of a session log
+
+    session is the number of the recording session in the file, started
+    its wall clock start time, time the seconds since the start and
+    parameters the ConnectionParameters of the session.
+    """
+    with open(path, "rb") as stream:
+        if stream.read(len(_FILE_HEADER)) != _FILE_HEADER:
+            raise ValueError("{} is no session log".format(path))
+        session = -1
+        started = None
+        parameters = None
+        offset = 0
+        while True:
+            header = stream.read(_record.size)
+            if len(header) < _record.size:
+                return
+            elapsed, kind, length = _record.unpack(header)
+            payload = stream.read(length)
+            if len(payload) < length:
+                return
+            offset += elapsed
+            if kind == _SESSION:
+                session += 1
+                started = _session.unpack_from(payload)[0]
+                parameters = ConnectionParameters(*_session_parameters.unpack_from(payload, _session.size))
+                offset = 0
+            elif kind == _DELAY:
+                offset += _delay.unpack(payload)[0]
+            else:
+                yield SessionRecord(session, started, offset / 1e6, Direction(kind), payload, parameters)
+
+
+class ReplayReport():
+    """
+    Timing of a replay: `lag` holds how far each ASDU was sent behind its recorded time, scaled by speed, in seconds
+
+    `retries` counts the attempts to send an ASDU while the k window of the
+    connection was full.
+    """
+    def __init__(self, speed, recorded_duration, duration, lags, retries):
+        self.speed = speed
+        self.records = len(lags)
+        self.recorded_duration = recorded_duration
+        self.duration = duration
+        self.retries = retries
+        self.rate = self.records / duration if duration > 0 else None
+        ordered = sorted(lags)
+        if ordered:
+            self.lag = {
+                "mean": sum(ordered) / len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "p99": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)],
+                "max": ordered[-1],
+                "final": lags[-1],
+            }
+        else:
+            self.lag = {"mean": None, "p50": None, "p99": None, "max": None, "final": None}
+
+    def __repr__(self):
+        return "ReplayReport(speed={}, records={}, duration={:.3f}, recorded_duration={:.3f}, rate={}, lag={})".format(
+            self.speed, self.records, self.duration, self.recorded_duration, self.rate, self.lag)
+
+
+class SessionReplayer():
+    """
+    Sends the ASDUs of a recorded session again, at speed times the recorded pace
+
+    Replays the records of one direction of one session: MONITOR through a
+    T104Slave or a MasterConnection to the connected masters, CONTROL
+    through a T104Connection to an outstation. speed None sends as fast as
+    the target accepts. Targets with send_asdu() are retried while their k
+    window is full, a T104Slave gets the ASDUs with enqueue_asdu(), whose
+    queue drops the oldest ASDU when it is full.
+
+    The ASDUs are decoded with the ConnectionParameters recorded with the
+    session unless parameters are given.
+
+    The ReplayReport shows how far the replay falls behind the recorded
+    timing; replaying at increasing speed finds the rate where it starts to
+    lag.
+    """
+    def __init__(self, path, direction=Direction.MONITOR, speed=1.0, session=0, parameters=None,
+                 poll_interval=0.0005):
+        self.direction = Direction(direction)
+        self.speed = speed
+        self.parameters = parameters
+        self.poll_interval = poll_interval
+        self.records = [(record.time, record.asdu, parameters or record.parameters)
+                        for record in read_session_log(path)
+                        if record.session == session and record.direction == self.direction]
+
+    def __len__(self):
+        return len(self.records)
+
+    def replay(self, target, stop=None):
+        """
+        Send the records to target, returns a ReplayReport
+
+        stop is an optional threading.Event that ends the replay early.
+        """
+        if hasattr(target, "send_asdu"):
+            send = target.send_asdu
+        else:
+            enqueue = target.enqueue_asdu
+
+            def send(asdu):
+                enqueue(asdu)
+                return True
+
+        lags = array.array("d")
+        retries = 0
+        first = self.records[0][0] if self.records else 0.0
+        start = time.monotonic()
+        for recorded, buffer, parameters in self.records:
+            if stop is not None and stop.is_set():
+                break
+            asdu = ASDU.from_bytes(buffer, parameters)
+            if self.speed:
+                due = start + (recorded - first) / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                due = time.monotonic()
+            while not send(asdu):
+                if stop is not None and stop.is_set():
+                    break
+                retries += 1
+                time.sleep(self.poll_interval)
+            lags.append(time.monotonic() - due)
+        duration = time.monotonic() - start
+        recorded_duration = self.records[-1][0] - first if self.records else 0.0
+        report = ReplayReport(self.speed, recorded_duration, duration, lags, retries)
+        logger.info(repr(report))
+        return report
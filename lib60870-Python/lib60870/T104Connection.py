@@ -1,12 +1,17 @@
 import logging
 import ctypes
+import math
 import time
+import threading
+import collections
 from ctypes import *
 
 from lib60870.common import *
 from lib60870.CP56Time2a import CP56Time2a
 from lib60870.asdu import ASDU, pASDU
-from lib60870.information_object import pInformationObject
+from lib60870.information_object import pInformationObject, InterrogationCommand, CounterInterrogationCommand, \
+    ReadCommand, ClockSynchronizationCommand
+from lib60870.Interrogation import Interrogation
 from lib60870 import lib60870
 from contextlib import contextmanager
 
@@ -17,18 +22,136 @@ lib = lib60870.get_library()
 pT104Connection = ctypes.c_void_p
 c_enum = c_int
 
+class _ASDUView(ctypes.Structure):
+    # struct sASDU with plain pointers, read by the batch receiver without building ctypes pointer objects
+    _fields_ = [
+        ("stackCreated", c_bool),
+        ("parameters", c_void_p),
+        ("asdu", c_void_p),
+        ("asduHeaderLength", c_int),
+        ("payload", c_void_p),
+        ("payloadSize", c_int),
+        ]
+
+
+class ASDUBatchReceiver():
+    """
+    Receive ASDUs in batches instead of one Python callback per ASDU
+
+    The library still calls back once per received ASDU, but the capture
+    callback only copies the encoded ASDU into a bounded queue: no pointer
+    objects, no logging, no ASDU wrapper and no locking. A drain thread
+    hands the encoded ASDUs to the batch handler as a list of bytes, as soon
+    as max_batch_size ASDUs are waiting or at the latest max_latency seconds
+    after the first one arrived. When the queue is full the oldest ASDU is
+    dropped and counted in `dropped`.
+    """
+    def __init__(self, callback, max_batch_size=256, max_latency=0.005, capacity=4096):
+        assert max_batch_size <= capacity
+        self.callback = callback
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.parameters = None
+        self.received = 0
+        self.delivered = 0
+        self.batches = 0
+        self._queue = collections.deque(maxlen=capacity)
+        self._delivery_lock = threading.Lock()
+        self._waiting = threading.Event()
+        self._ready = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._drain, name="ASDUBatchReceiver", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self._queue)
+
+    @property
+    def dropped(self):
+        return self.received - self.delivered - len(self._queue)
+
+    # called on the library connection thread
+    def capture(self, parameter, asdu):
+        view = _ASDUView.from_address(asdu)
+        if self.parameters is None:
+            self.parameters = ConnectionParameters.from_buffer_copy(ConnectionParameters.from_address(view.parameters))
+        queue = self._queue
+        queue.append(ctypes.string_at(view.asdu, view.asduHeaderLength + view.payloadSize))
+        self.received += 1
+        if len(queue) == 1:
+            self._waiting.set()
+        elif len(queue) == self.max_batch_size:
+            self._ready.set()
+        return True
+
+    def _take(self):
+        # clear the events before taking, so an ASDU captured meanwhile sets them again
+        self._waiting.clear()
+        self._ready.clear()
+        queue = self._queue
+        result = [queue.popleft() for _ in range(min(len(queue), self.max_batch_size))]
+        if queue:
+            self._waiting.set()
+            if len(queue) >= self.max_batch_size:
+                self._ready.set()
+        return result
+
+    def _deliver(self):
+        # batches are delivered in order, from the drain thread or flush()
+        with self._delivery_lock:
+            buffers = self._take()
+            if not buffers:
+                return
+            self.delivered += len(buffers)
+            self.batches += 1
+            try:
+                self.callback(self.parameters, buffers)
+            except Exception:
+                logger.exception("batch handler failed")
+
+    def _drain(self):
+        while True:
+            self._waiting.wait()
+            self._ready.wait(self.max_latency)
+            if not self._running:
+                return
+            self._deliver()
+
+    def flush(self):
+        """
+        Deliver the waiting ASDUs from the calling thread
+        """
+        while self._queue:
+            self._deliver()
+
+    def stop(self):
+        """
+        Stop the drain thread, waiting ASDUs are not delivered
+        """
+        self._running = False
+        self._waiting.set()
+        self._ready.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+
 class T104Connection():
     def __init__(self, ip, port=lib60870.IEC_60870_5_104_DEFAULT_PORT):
         logger.debug("calling T104Connection()")
-        lib.T104Connection_create.restype = pT104Connection
         if not isinstance(ip, bytes):
             ip = ip.encode('ascii')
-        self.con = pT104Connection(lib.T104Connection_create(c_char_p(ip), c_uint16(port)))
+        self.con = pT104Connection(lib.T104Connection_create(ip, port))
+        self._batch_receiver = None
+        self._asdu_received_callback = None
+        self._interrogations = {}
+        self._recorders = []
 
     def __del__(self):
         # clear callbacks. If a final callback is required, call disconnect before the connection is deleted
         lib.T104Connection_setConnectionHandler(self.con, None, None)
         lib.T104Connection_setASDUReceivedHandler(self.con, None, None)
+        if self._batch_receiver:
+            self._batch_receiver.stop()
         self.destroy()
 
     def destroy(self):
@@ -38,19 +161,56 @@ class T104Connection():
     def connect(self):
         try:
             logger.debug("calling T104Connection_connect()")
-            lib.T104Connection_connect.restype = c_bool
             if lib.T104Connection_connect(self.con):
                 yield self.con
             #RuntimeError("Connection failed")
         finally:
             self.close()
 
+    def get_connection_parameters(self):
+        """
+        The T104ConnectionParameters of this connection, changes apply to the next connect
+        """
+        logger.debug("calling T104Connection_getConnectionParameters()")
+        return lib.T104Connection_getConnectionParameters(self.con).contents
+
+    def set_connection_parameters(self, parameters):
+        """
+        Set T104ConnectionParameters before connecting, this sets the connect timeout to t0
+        """
+        if not isinstance(parameters, T104ConnectionParameters):
+            parameters = T104ConnectionParameters.from_connection_parameters(parameters)
+        logger.debug("calling T104Connection_setConnectionParameters()")
+        lib.T104Connection_setConnectionParameters(self.con, parameters.pointer)
+
+    def set_apci_parameters(self, **apci):
+        """
+        Set some of the APCI parameters k, w, t0, t1, t2 and t3 before connecting
+        """
+        self.set_connection_parameters(
+            T104ConnectionParameters.from_connection_parameters(self.get_connection_parameters(), **apci))
+
+    def set_connect_timeout(self, milliseconds):
+        """
+        Set t0, the effective connect timeout, rounded up to whole seconds
+
+        The library resets the connect timeout to t0 on every connect, so
+        T104Connection_setConnectTimeout() alone has no effect.
+        """
+        self.set_apci_parameters(t0=max(1, int(math.ceil(milliseconds / 1000.0))))
+
+    def connect_async(self):
+        logger.debug("calling T104Connection_connectAsync()")
+        lib.T104Connection_connectAsync(self.con)
+
     def disconnect(self):
         self.close()
 
     def close(self):
         logger.debug("calling T104Connection_close()")
         lib.T104Connection_close(self.con)
+        if self._batch_receiver:
+            self._batch_receiver.flush()
 
     def send_start_dt(self):
         logger.debug("calling T104Connection_sendStartDT()")
@@ -62,61 +222,134 @@ class T104Connection():
 
     def is_transmit_buffer_full(self):
         logger.debug("calling T104Connection_isTransmitBufferFull()")
-        lib.T104Connection_isTransmitBufferFull.restype = c_bool
         return lib.T104Connection_isTransmitBufferFull(self.con)
 
+    def set_recorder(self, recorder):
+        """
+        Record the sent and received ASDUs with a SessionRecorder, None stops recording
+
+        Test commands are not recorded. Needs the ASDU received handler, not a batch handler, and the
+        connection parameters set before.
+        """
+        if recorder is not None and self._batch_receiver:
+            raise RuntimeError("recording needs the ASDU received handler, not a batch handler")
+        if recorder is not None:
+            recorder.set_parameters(self.get_connection_parameters())
+        if self._asdu_received_callback is None:
+            self.set_asdu_received_handler(None)
+        self._recorders[:] = [] if recorder is None else [recorder]
+
+    def _record_sent(self, type_id, cot, ca, io):
+        if self._recorders:
+            # encoded like the library encodes the command, with the layout and originator address of the connection
+            parameters = ConnectionParameters.from_buffer_copy(self.get_connection_parameters())
+            asdu = ASDU(parameters, type_id=type_id, cot=cot, oa=parameters.originatorAddress, ca=ca)
+            asdu.add_information_object(io)
+            self._recorders[0].record_control(asdu.get_buffer())
+
     def send_interrogation_command(self,
                                    cot=lib60870.CauseOfTransmission.ACTIVATION,
                                    ca=1,
                                    qoi=lib60870.QualifierOfInterrogation.IEC60870_QOI_STATION):
         logger.debug("calling T104Connection_sendInterrogationCommand()")
-        lib.T104Connection_sendInterrogationCommand.restype = c_bool
-        return lib.T104Connection_sendInterrogationCommand(
+        result = lib.T104Connection_sendInterrogationCommand(
             self.con,
             cot.c_value,
-            c_int(ca),
-            qoi.c_value)
+            ca,
+            qoi.value)
+        if result:
+            self._record_sent(lib60870.TypeID.C_IC_NA_1, cot, ca, InterrogationCommand(0, qoi.value))
+        return result
+
+    def interrogate(self, ca=1, qoi=lib60870.QualifierOfInterrogation.IEC60870_QOI_STATION, timeout=30.0):
+        """
+        Interrogate a CA and wait for ACT_TERM, returns an InterrogationResult
+
+        Raises InterrogationError on a negative confirmation, TimeoutError
+        after timeout seconds. The ASDU received handler, if any, still gets
+        all ASDUs; CAs can be interrogated concurrently from several threads.
+        """
+        interrogation = Interrogation(ca, qoi)
+        return self._interrogate(interrogation, timeout, lambda: self.send_interrogation_command(
+            lib60870.CauseOfTransmission.ACTIVATION, ca, lib60870.QualifierOfInterrogation(interrogation.qoi)))
+
+    def counter_interrogate(self, ca=1, qcc=5, timeout=30.0):
+        """
+        Counter interrogate a CA and wait for ACT_TERM, see interrogate()
+        """
+        return self._interrogate(Interrogation(ca, qcc, lib60870.TypeID.C_CI_NA_1), timeout,
+                                 lambda: self.send_counter_interrogation_command(
+                                     lib60870.CauseOfTransmission.ACTIVATION, ca, qcc))
+
+    def _interrogate(self, interrogation, timeout, send):
+        if self._batch_receiver:
+            raise RuntimeError("interrogate() needs the ASDU received handler, not a batch handler")
+        if self._asdu_received_callback is None:
+            self.set_asdu_received_handler(None)
+        key = (interrogation.type_id, interrogation.ca)
+        if key in self._interrogations:
+            raise RuntimeError("{} of CA {} pending".format(interrogation.type_id.name, interrogation.ca))
+        self._interrogations[key] = interrogation
+        try:
+            if not send():
+                raise ConnectionError("failed to send {}".format(interrogation.type_id.name))
+            if not interrogation.done.wait(timeout):
+                raise TimeoutError("{} of CA {} timed out".format(interrogation.type_id.name, interrogation.ca))
+            return interrogation.get_result()
+        finally:
+            del self._interrogations[key]
 
     def send_counter_interrogation_command(self, cot, ca, qcc):
         logger.debug("calling T104Connection_sendCounterInterrogationCommand()")
-        lib.T104Connection_sendCounterInterrogationCommand.restype = c_bool
-        return lib.T104Connection_sendCounterInterrogationCommand(
+        result = lib.T104Connection_sendCounterInterrogationCommand(
             self.con,
             cot.c_value,
-            c_int(ca),
-            c_int(qcc))
+            ca,
+            qcc)
+        if result:
+            self._record_sent(lib60870.TypeID.C_CI_NA_1, cot, ca, CounterInterrogationCommand(0, qcc))
+        return result
 
     def send_read_command(self, ca, ioa):
         logger.debug("calling T104Connection_sendReadCommand()")
-        lib.T104Connection_sendReadCommand.restype = c_bool
-        return lib.T104Connection_sendReadCommand(self.con, c_int(ca), c_int(ioa))
+        result = lib.T104Connection_sendReadCommand(self.con, ca, ioa)
+        if result:
+            self._record_sent(lib60870.TypeID.C_RD_NA_1, lib60870.CauseOfTransmission.REQUEST, ca, ReadCommand(ioa))
+        return result
 
     def send_clock_sync_command(self, ca=1, cp56time2a=None):
         if not cp56time2a:
             cp56time2a = CP56Time2a(int(time.time()*1000))
         logger.debug("calling T104Connection_sendClockSyncCommand()")
-        lib.T104Connection_sendClockSyncCommand(
+        result = lib.T104Connection_sendClockSyncCommand(
             self.con,
-            c_int(ca),
+            ca,
             cp56time2a.pointer)
+        if result:
+            self._record_sent(lib60870.TypeID.C_CS_NA_1, lib60870.CauseOfTransmission.ACTIVATION, ca,
+                              ClockSynchronizationCommand(0, cp56time2a))
+        return result
 
     def send_test_command(self, ca=1):
-        lib.T104Connection_sendTestCommand.restype = c_bool
-        return lib.T104Connection_sendTestCommand(self.con, c_int(ca))
+        return lib.T104Connection_sendTestCommand(self.con, ca)
 
     def send_control_command(self, cot, ca, command):
-        lib.T104Connection_sendControlCommand.restype = c_bool
         type_id = command.type
-        return lib.T104Connection_sendControlCommand(
+        result = lib.T104Connection_sendControlCommand(
             self.con,
             type_id,
             cot.c_value,
-            c_int(ca),
+            ca,
             pInformationObject(command))
+        if result:
+            self._record_sent(command.get_type_id(), cot, ca, command)
+        return result
 
     def send_asdu(self, asdu):
-        lib.T104Connection_sendASDU.restype = c_bool
-        return lib.T104Connection_sendASDU(self.con, asdu.pointer)
+        result = lib.T104Connection_sendASDU(self.con, asdu.pointer)
+        if result and self._recorders:
+            self._recorders[0].record_control(asdu.get_buffer())
+        return result
 
     def set_connection_handler(self, callback, parameter=None):
         logger.debug("setting connection callback")
@@ -148,8 +381,42 @@ class T104Connection():
             :param asdu: ASDU
             :returns: bool
             """
-            logger.debug("asdu received : {}".format(asdu.contents))
-            return c_bool(callback(asdu.contents))
+            asdu = asdu.contents
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("asdu received : {}".format(asdu))
+            if recorders:
+                recorders[0].record_monitor(asdu.get_buffer())
+            if interrogations:
+                for interrogation in list(interrogations.values()):
+                    interrogation.feed(asdu)
+            if callback is None:
+                return True
+            return c_bool(callback(asdu))
+
+        # interrogate() sees the ASDUs before the handler, the wrapper must not reference self
+        interrogations = self._interrogations
+        recorders = self._recorders
+        self._set_asdu_received_callback(T104Connection_ASDUReceivedHandler(wrapper), parameter)
+
+    def set_asdu_batch_handler(self, callback, max_batch_size=256, max_latency=0.005, capacity=4096):
+        """
+        Receive ASDUs in batches, see ASDUBatchReceiver
+
+        callback(parameters, buffers) is called on the drain thread with the
+        ConnectionParameters and a list of encoded ASDUs, e.g. for
+        decode_asdu() or ASDUDecoder.to_numpy_many(). Replaces the ASDU
+        received handler.
+        """
+        logger.debug("setting asdu batch callback")
+        T104Connection_ASDUReceivedHandler = ctypes.CFUNCTYPE(c_bool, c_void_p, c_void_p)
+        receiver = ASDUBatchReceiver(callback, max_batch_size, max_latency, capacity)
+        self._set_asdu_received_callback(T104Connection_ASDUReceivedHandler(receiver.capture), None)
+        self._batch_receiver = receiver
+        return receiver
 
-        self._asdu_received_callback = T104Connection_ASDUReceivedHandler(wrapper)
-        lib.T104Connection_setASDUReceivedHandler(self.con, self._asdu_received_callback, parameter)
+    def _set_asdu_received_callback(self, handler, parameter):
+        self._asdu_received_callback = handler
+        lib.T104Connection_setASDUReceivedHandler(self.con, handler, parameter)
+        if self._batch_receiver:
+            self._batch_receiver.stop()
+            self._batch_receiver = None
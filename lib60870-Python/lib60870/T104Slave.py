@@ -29,20 +29,24 @@ class ServerMode(enum.Enum):
 
 
 class MasterConnection():
-    def __init__(self, pointer):
+    def __init__(self, pointer, recorders=()):
         self._pointer = pointer
+        self._recorders = recorders
+
+    def _record(self, asdu, sent):
+        # the library sets the COT of ACT_CON and ACT_TERM in the ASDU it sends
+        if sent and self._recorders:
+            self._recorders[0].record_monitor(asdu.get_buffer())
+        return sent
 
     def send_asdu(self, asdu):
-        lib.MasterConnection_sendASDU.restype = c_bool
-        return lib.MasterConnection_sendASDU(self.pointer, asdu.pointer)
+        return self._record(asdu, lib.MasterConnection_sendASDU(self.pointer, asdu.pointer))
 
     def send_act_con(self, asdu, negative=False):
-        lib.MasterConnection_sendACT_CON.restype = c_bool
-        return lib.MasterConnection_sendACT_CON(self.pointer, asdu.pointer, c_bool(negative))
+        return self._record(asdu, lib.MasterConnection_sendACT_CON(self.pointer, asdu.pointer, negative))
 
     def send_act_term(self, asdu):
-        lib.MasterConnection_sendACT_TERM.restype = c_bool
-        return lib.MasterConnection_sendACT_TERM(self.pointer, asdu.pointer)
+        return self._record(asdu, lib.MasterConnection_sendACT_TERM(self.pointer, asdu.pointer))
 
     def close(self):
         lib.MasterConnection_close(self.pointer)
@@ -57,44 +61,57 @@ class MasterConnection():
 
 class T104Slave():
     def __init__(self, parameters=None, max_low_prio_queue_size=128, max_high_prio_queue_size=128):
+        # the library copies T104ConnectionParameters, complete plain ConnectionParameters with the defaults
+        if parameters is not None and not isinstance(parameters, T104ConnectionParameters):
+            parameters = T104ConnectionParameters.from_connection_parameters(parameters)
         logger.debug("calling T104Slave_create()")
-        lib.T104Slave_create.restype = pT104Slave
         self.con = pT104Slave(
             lib.T104Slave_create(
                 parameters,
-                c_int(max_low_prio_queue_size),
-                c_int(max_high_prio_queue_size)
+                max_low_prio_queue_size,
+                max_high_prio_queue_size
             )
         )
+        self._recorders = []
 
     def __del__(self):
         self.destroy()
 
     def set_local_address(self, ip):
         logger.debug("calling T104Slave_setLocalAddress()")
-        lib.T104Slave_setLocalAddress(self.con, c_char_p(ip))
+        lib.T104Slave_setLocalAddress(self.con, ip)
 
     def set_local_port(self, port):
         logger.debug("calling T104Slave_setLocalPort()")
-        lib.T104Slave_setLocalPort(self.con, c_int(port))
+        lib.T104Slave_setLocalPort(self.con, port)
 
     def get_connection_parameters(self):
+        """
+        The T104ConnectionParameters of this slave, changes apply to new connections
+        """
         logger.debug("calling Slave_getConnectionParameters()")
-        lib.Slave_getConnectionParameters.restype = pConnectionParameters
-        return lib.Slave_getConnectionParameters(self.con).contents
+        parameters = lib.Slave_getConnectionParameters(self.con)
+        return T104ConnectionParameters.from_address(ctypes.addressof(parameters.contents))
+
+    def set_apci_parameters(self, **apci):
+        """
+        Set some of the APCI parameters k, w, t0, t1, t2 and t3 for new connections
+        """
+        parameters = self.get_connection_parameters()
+        updated = T104ConnectionParameters.from_connection_parameters(parameters, **apci)
+        ctypes.memmove(ctypes.addressof(parameters), ctypes.addressof(updated), ctypes.sizeof(updated))
 
     def get_open_connections(self):
         logger.debug("calling T104Slave_getOpenConnections()")
-        lib.T104Slave_getOpenConnections.restype = c_int
         return lib.T104Slave_getOpenConnections(self.con)
 
     def set_max_open_connections(self, num_connections):
         logger.debug("calling T104Slave_setMaxOpenConnections()")
-        lib.T104Slave_setMaxOpenConnections(self.con, c_int(num_connections))
+        lib.T104Slave_setMaxOpenConnections(self.con, num_connections)
 
     def set_server_mode(self, mode):
         logger.debug("calling T104Slave_setServerMode()")
-        lib.T104Slave_setServerMode(self.con, mode.c_value)
+        lib.T104Slave_setServerMode(self.con, mode.value)
 
     def start(self):
         logger.debug("calling Slave_start()")
@@ -107,12 +124,25 @@ class T104Slave():
 
     def is_running(self):
         logger.debug("calling Slave_isRunning()")
-        lib.Slave_isRunning.restype = c_bool
         return lib.Slave_isRunning(self.con)
 
     def enqueue_asdu(self, asdu):
         logger.debug("calling Slave_enqueueASDU()")
         lib.Slave_enqueueASDU(self.con, asdu.pointer)
+        if self._recorders:
+            self._recorders[0].record_monitor(asdu.get_buffer())
+
+    def set_recorder(self, recorder):
+        """
+        Record the ASDUs received by the handlers and sent with MasterConnection and enqueue_asdu() with a
+        SessionRecorder, None stops recording
+
+        ASDUs the library answers itself, without a handler, are not recorded. Set the connection parameters
+        before.
+        """
+        if recorder is not None:
+            recorder.set_parameters(self.get_connection_parameters())
+        self._recorders[:] = [] if recorder is None else [recorder]
 
     def destroy(self):
         lib.Slave_destroy(self.con)
@@ -134,21 +164,34 @@ class T104Slave():
 
         def wrapper(parameter, connection, asdu, qoi):
             logger.debug("interrogation event: {} {} {} {}".format(parameter, connection, asdu, qoi))
-            connection = MasterConnection(connection)
+            connection = MasterConnection(connection, recorders)
+            if recorders:
+                recorders[0].record_control(asdu.contents.get_buffer())
             return callback(parameter, connection, asdu.contents, qoi)
 
+        recorders = self._recorders
         self._interrogation_handler = InterrogationHandler(wrapper)
         lib.Slave_setInterrogationHandler(self.con, self._interrogation_handler, parameter)
 
+    def set_point_database(self, database):
+        """
+        Answer general interrogation from a PointDatabase
+        """
+        self.point_database = database
+        self.set_interrogation_handler(database.interrogation_handler)
+
     def set_counter_interrogation_handler(self, callback, parameter=None):
         logger.debug("setting counter interrogation callback")
         CounterInterrogationHandler = ctypes.CFUNCTYPE(c_bool, c_void_p, pMasterConnection, pASDU, c_uint8)
 
         def wrapper(parameter, connection, asdu, qcc):
             logger.debug("counter interrogation event: {} {} {} {}".format(parameter, connection, asdu, qcc))
-            connection = MasterConnection(connection)
+            connection = MasterConnection(connection, recorders)
+            if recorders:
+                recorders[0].record_control(asdu.contents.get_buffer())
             return callback(parameter, connection, asdu.contents, qcc)
 
+        recorders = self._recorders
         self._counter_interrogation_handler = CounterInterrogationHandler(wrapper)
         lib.Slave_setCounterInterrogationHandler(self.con, self._counter_interrogation_handler, parameter)
 
@@ -157,13 +200,16 @@ class T104Slave():
         Set Handler for read command (C_RD_NA_1 - 102)
         """
         logger.debug("setting read callback")
-        ReadHandler = ctypes.CFUNCTYPE(c_bool, c_void_p, pMasterConnection, pASDU, c_uint8)
+        ReadHandler = ctypes.CFUNCTYPE(c_bool, c_void_p, pMasterConnection, pASDU, c_int)
 
         def wrapper(parameter, connection, asdu, ioa):
             logger.debug("read event: {} {} {} {}".format(parameter, connection, asdu, ioa))
-            connection = MasterConnection(connection)
-            return callback(parameter, connection.contents, asdu.contents, ioa)
+            connection = MasterConnection(connection, recorders)
+            if recorders:
+                recorders[0].record_control(asdu.contents.get_buffer())
+            return callback(parameter, connection, asdu.contents, ioa)
 
+        recorders = self._recorders
         self._read_handler = ReadHandler(wrapper)
         lib.Slave_setReadHandler(self.con, self._read_handler, parameter)
 
@@ -176,9 +222,12 @@ class T104Slave():
 
         def wrapper(parameter, connection, asdu, newtime):
             logger.debug("clock sync event: {} {} {} {}".format(parameter, connection, asdu, newtime))
-            connection = MasterConnection(connection)
+            connection = MasterConnection(connection, recorders)
+            if recorders:
+                recorders[0].record_control(asdu.contents.get_buffer())
             return callback(parameter, connection, asdu.contents, newtime.contents)
 
+        recorders = self._recorders
         self._clock_sync_handler = ClockSynchronizationHandler(wrapper)
         lib.Slave_setClockSyncHandler(self.con, self._clock_sync_handler, parameter)
 
@@ -191,8 +240,11 @@ class T104Slave():
 
         def wrapper(parameter, connection, asdu):
             logger.debug("asdu event: {} {} {}".format(parameter, connection, asdu))
-            connection = MasterConnection(connection)
+            connection = MasterConnection(connection, recorders)
+            if recorders:
+                recorders[0].record_control(asdu.contents.get_buffer())
             return callback(parameter, connection, asdu.contents)
 
+        recorders = self._recorders
         self._asdu_handler = ASDUHandler(wrapper)
         lib.Slave_setASDUHandler(self.con, self._asdu_handler, parameter)
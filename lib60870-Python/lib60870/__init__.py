@@ -1,11 +1,27 @@
 import lib60870.lib60870 as lib60870
 import lib60870.T104Connection as T104Connection
 import lib60870.T104Slave as T104Slave
+import lib60870.AsyncT104Connection as AsyncT104Connection
+import lib60870.AsyncT104Slave as AsyncT104Slave
+import lib60870.PointDatabase as PointDatabase
+import lib60870.ChangeCollector as ChangeCollector
+import lib60870.DeadbandFilter as DeadbandFilter
+import lib60870.SendQueue as SendQueue
+import lib60870.MasterPool as MasterPool
+import lib60870.MasterFarm as MasterFarm
+import lib60870.RemotePointImage as RemotePointImage
+import lib60870.Interrogation as Interrogation
+import lib60870.InterrogationScheduler as InterrogationScheduler
+import lib60870.CommandTracker as CommandTracker
+import lib60870.CaptureReader as CaptureReader
+import lib60870.SessionLog as SessionLog
+import lib60870.LoadGenerator as LoadGenerator
 import lib60870.common as common
 import lib60870.information_object as information_object
 import lib60870.asdu as asdu
 import lib60870.CP16Time2a as CP16Time2a
 import lib60870.CP24Time2a as CP24Time2a
 import lib60870.CP56Time2a as CP56Time2a
+import lib60870.prototypes as prototypes
 
 __version__ = '0.9.dev1'
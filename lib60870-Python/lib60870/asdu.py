@@ -1,5 +1,10 @@
 import logging
 import ctypes
+import math
+import time
+import struct
+import collections
+import itertools
 from ctypes import c_int, c_uint64, c_void_p, c_bool, c_uint8, c_char
 
 from lib60870 import lib60870
@@ -10,6 +15,23 @@ from lib60870.lib60870 import CauseOfTransmission, TypeID, QualityDescriptor
 lib = lib60870.get_library()
 logger = logging.getLogger(__name__)
 
+MAX_ASDU_LENGTH = 249
+MAX_NUMBER_OF_ELEMENTS = 127
+
+# Element size without IOA per TypeID and whether <Type>_getFromBuffer() takes
+# isSequence, as in ASDU_getElement(). Types with a single element at offset 0
+# are absent.
+_element_sizes = {
+    1: (1, True), 2: (4, True), 3: (1, True), 4: (4, True), 5: (2, True), 6: (5, True), 7: (5, True), 8: (8, True),
+    9: (3, True), 10: (6, True), 11: (3, True), 12: (6, True), 13: (5, True), 14: (8, True), 15: (5, True),
+    16: (8, True), 17: (6, True), 18: (7, True), 19: (7, True), 20: (5, True), 21: (2, True), 30: (8, True),
+    31: (8, True), 32: (9, True), 33: (12, True), 34: (10, True), 35: (10, True), 36: (12, True), 37: (12, True),
+    38: (10, True), 39: (11, True), 40: (11, True), 45: (1, False), 46: (1, False), 47: (1, False), 48: (3, False),
+    49: (3, False), 50: (5, False), 51: (4, False), 58: (8, False), 59: (8, False), 60: (8, False), 61: (10, False),
+    62: (10, False), 63: (12, False), 64: (11, False), 110: (3, False), 111: (3, False), 112: (5, False),
+    113: (1, False), 126: (13, True),
+}
+
 
 class ASDU(ctypes.Structure):
     _fields_ = [
@@ -75,25 +97,21 @@ class ASDU(ctypes.Structure):
         return output + ")"
 
     def is_test(self):
-        lib.ASDU_isTest.restype = c_bool
         return lib.ASDU_isTest(self.pointer)
 
     def set_test(self, value):
-        lib.ASDU_setTest(self.pointer, c_bool(value))
+        lib.ASDU_setTest(self.pointer, value)
 
     def is_negative(self):
-        lib.ASDU_isNegative.restype = c_bool
         return lib.ASDU_isNegative(self.pointer)
 
     def set_negative(self, value):
-        lib.ASDU_setNegative(self.pointer, c_bool(value))
+        lib.ASDU_setNegative(self.pointer, value)
 
     def get_oa(self):
-        lib.ASDU_getOA.restype = c_int
         return lib.ASDU_getOA(self.pointer)
 
     def get_cot(self):
-        lib.ASDU_getCOT.restype = c_int
         value = lib.ASDU_getCOT(self.pointer)
         return lib60870.CauseOfTransmission(value)
 
@@ -101,40 +119,77 @@ class ASDU(ctypes.Structure):
         lib.ASDU_setCOT(self.pointer, cot.c_value)
 
     def get_ca(self):
-        lib.ASDU_getCA.restype = c_int
         return lib.ASDU_getCA(self.pointer)
 
     def set_ca(self, value):
-        lib.ASDU_setCA(self.pointer, c_int(value))
+        lib.ASDU_setCA(self.pointer, value)
 
     def get_type_id(self):
-        lib.ASDU_getTypeID.restype = c_int
         value = lib.ASDU_getTypeID(self.pointer)
         return lib60870.TypeID(value)
 
     def is_sequence(self):
-        lib.ASDU_isSequence.restype = c_bool
         return lib.ASDU_isSequence(self.pointer)
 
     def get_number_of_elements(self):
-        lib.ASDU_getNumberOfElements.restype = c_int
         return lib.ASDU_getNumberOfElements(self.pointer)
 
     def get_element(self, index, io_type=None):
         io_type = io_type or information_object.get_io_type_from_type_id(self.get_type_id())
-        lib.ASDU_getElement.restype = ctypes.POINTER(io_type)
-        io_p = lib.ASDU_getElement(self.pointer, c_int(index))
-        if io_p:
-            result = io_p.contents.clone()
-            io_p.contents.destroy()
+        address = lib.ASDU_getElement(self.pointer, index)
+        if address:
+            io = io_type.from_address(address)
+            result = io.clone()
+            io.destroy()
             return result
 
+    def iter_elements(self, reuse=True):
+        """
+        Iterate over the elements of this ASDU
+
+        With reuse, every element is decoded into the same instance, which is
+        yielded again for the next element. Use its copy() to keep an element.
+        """
+        count = self.get_number_of_elements()
+        if not reuse or count == 0:
+            for index in range(0, count):
+                yield self.get_element(index)
+            return
+
+        io = self.get_element(0)
+        if io is None:
+            return
+        yield io
+        if self.get_type_id().value not in _element_sizes:
+            return
+
+        element_size, takes_sequence = _element_sizes[self.get_type_id().value]
+        get_from_buffer = getattr(lib, type(io).__name__ + "_getFromBuffer")
+        address = ctypes.addressof(io)
+        parameters = self.parameters
+        size_of_ioa = parameters.contents.sizeOfIOA
+        payload = self.payload
+        payload_size = self.payloadSize
+        if takes_sequence and self.is_sequence():
+            start = io.objectAddress
+            for index in range(1, count):
+                get_from_buffer(address, parameters, payload, payload_size, size_of_ioa + index * element_size, True)
+                io.objectAddress = start + index
+                yield io
+        elif takes_sequence:
+            for index in range(1, count):
+                get_from_buffer(address, parameters, payload, payload_size, index * (size_of_ioa + element_size), False)
+                yield io
+        else:
+            for index in range(1, count):
+                get_from_buffer(address, parameters, payload, payload_size, index * (size_of_ioa + element_size))
+                yield io
+
     def add_information_object(self, io):
         if self.get_type_id() != io.get_type_id():
             raise ValueError("Cannot add InformationObject of type ({}) to ASDU of type({})"
                              "".format(io.get_type_id(), self.get_type_id()))
         io_type = information_object.get_io_type_from_type_id(io.get_type_id())
-        lib.ASDU_addInformationObject.restype = c_bool
         return lib.ASDU_addInformationObject(self.pointer, ctypes.POINTER(io_type)(io))
 
     def get_elements(self):
@@ -144,6 +199,52 @@ class ASDU(ctypes.Structure):
         size = self.asduHeaderLength + self.payloadSize
         return ctypes.string_at(self.asdu, size=size)
 
+    def decode(self):
+        """
+        Decode this ASDU in Python, see ASDUDecoder
+        """
+        return get_decoder(self.parameters.contents).decode(self.get_buffer())
+
+    def to_numpy(self):
+        """
+        Decode this measured value ASDU into a numpy array, see ASDUDecoder.to_numpy()
+        """
+        return get_decoder(self.parameters.contents).to_numpy(self.get_buffer_view())
+
+    def copy(self):
+        """
+        Copy of this ASDU that owns its encoded data and ConnectionParameters,
+        e.g. to keep an ASDU received in a callback
+        """
+        parameters = ConnectionParameters.from_buffer_copy(self.parameters.contents)
+        result = ASDU(parameters)
+        buffer = self.get_buffer()
+        ctypes.memmove(result.encodedData, buffer, len(buffer))
+        result.asduHeaderLength = self.asduHeaderLength
+        result.payload = ctypes.cast(ctypes.byref(result.encodedData, self.asduHeaderLength), ctypes.POINTER(c_uint8))
+        result.payloadSize = self.payloadSize
+        return result
+
+    @classmethod
+    def from_bytes(cls, buffer, parameters=None):
+        """
+        ASDU holding a copy of an encoded ASDU, like one returned by get_buffer()
+        """
+        if len(buffer) > MAX_ASDU_LENGTH:
+            raise ValueError("ASDU too long ({} > {} bytes)".format(len(buffer), MAX_ASDU_LENGTH))
+        parameters = ConnectionParameters.from_buffer_copy(parameters or default_connection_parameters)
+        result = cls(parameters)
+        ctypes.memmove(result.encodedData, bytes(buffer), len(buffer))
+        result.payloadSize = len(buffer) - result.asduHeaderLength
+        return result
+
+    def get_buffer_view(self):
+        """
+        The encoded ASDU like get_buffer(), as a ctypes array sharing the memory of this ASDU
+        """
+        size = self.asduHeaderLength + self.payloadSize
+        return (c_uint8 * size).from_address(ctypes.addressof(self.asdu.contents))
+
     @property
     def elements(self):
         return self.get_elements()
@@ -157,9 +258,682 @@ pASDU = ctypes.POINTER(ASDU)
 
 def ASDU_create_from_buffer(parameters, msg, msgLength):
     assert isinstance(parameters, ConnectionParameters)
-    lib.ASDU_createFromBuffer.restype = pASDU
     p_asdu = lib.ASDU_createFromBuffer(
         parameters.pointer,
         ctypes.cast(msg, ctypes.POINTER(c_uint8)),
-        c_int(msgLength))
+        msgLength)
     return p_asdu.contents
+
+
+DecodedASDU = collections.namedtuple(
+    "DecodedASDU", ["type_id", "is_sequence", "cot", "is_test", "is_negative", "oa", "ca", "elements"])
+
+InformationValue = collections.namedtuple("InformationValue", ["ioa", "value", "quality", "timestamp"])
+
+
+def _as_float(value):
+    """
+    Value of an InformationValue as float: booleans as 0 and 1, the first part of tuples, NaN for None
+    """
+    if value is None:
+        return math.nan
+    if isinstance(value, tuple):
+        value = value[0]
+    return float(value)
+
+
+def _cause_of_transmission(value):
+    """
+    CauseOfTransmission of a COT value, the value itself when the enum does not list it
+    """
+    try:
+        return CauseOfTransmission(value)
+    except ValueError:
+        return value
+
+
+def _cp24_to_ms(milliseconds, minute):
+    """
+    CP24Time2a as milliseconds past the hour
+    """
+    return milliseconds + (minute & 0x3f) * 60000
+
+
+def _cp56_to_ms(milliseconds, minute, hour, day, month, year):
+    """
+    CP56Time2a as milliseconds since epoch, computed like CP56Time2a_toMsTimestamp()
+    """
+    y = (year & 0x7f) + 100
+    m = (month & 0x0f) - 1
+    if m < 2:
+        m += 12
+        y -= 1
+    days = (y - 69) * 365 + y // 4 - y // 100 * 3 // 4 + (m + 2) * 153 // 5 - 446 + (day & 0x1f)
+    seconds = ((days * 24 + (hour & 0x1f)) * 60 + (minute & 0x3f)) * 60
+    return seconds * 1000 + milliseconds
+
+
+def _step_position(vti):
+    """
+    VTI as (position, transient)
+    """
+    position = vti & 0x7f
+    if position > 63:
+        position -= 128
+    return position, vti & 0x80 == 0x80
+
+
+def _normalized(raw):
+    return raw / 32767.0
+
+
+def _normalized_without_quality(raw):
+    return (raw + 0.5) / 32767.5
+
+
+# Per TypeID: struct format of an element after the IOA and a function that maps
+# the unpacked fields to (value, quality, timestamp). Quality is the quality
+# descriptor or qualifier octet, None when the type has neither.
+_NO_TIME = ""
+_CP16 = "H"
+_CP24 = "HB"
+_CP56 = "HBBBBB"
+
+_element_layouts = {
+    # single point: SIQ
+    1: ("B", lambda f: (f[0] & 0x01 == 0x01, f[0] & 0xf0, None)),
+    2: ("B" + _CP24, lambda f: (f[0] & 0x01 == 0x01, f[0] & 0xf0, _cp24_to_ms(*f[1:]))),
+    30: ("B" + _CP56, lambda f: (f[0] & 0x01 == 0x01, f[0] & 0xf0, _cp56_to_ms(*f[1:]))),
+    # double point: DIQ
+    3: ("B", lambda f: (f[0] & 0x03, f[0] & 0xf0, None)),
+    4: ("B" + _CP24, lambda f: (f[0] & 0x03, f[0] & 0xf0, _cp24_to_ms(*f[1:]))),
+    31: ("B" + _CP56, lambda f: (f[0] & 0x03, f[0] & 0xf0, _cp56_to_ms(*f[1:]))),
+    # step position: VTI + QDS, value is (position, transient)
+    5: ("BB", lambda f: (_step_position(f[0]), f[1], None)),
+    6: ("BB" + _CP24, lambda f: (_step_position(f[0]), f[1], _cp24_to_ms(*f[2:]))),
+    32: ("BB" + _CP56, lambda f: (_step_position(f[0]), f[1], _cp56_to_ms(*f[2:]))),
+    # bitstring: BSI + QDS
+    7: ("IB", lambda f: (f[0], f[1], None)),
+    8: ("IB" + _CP24, lambda f: (f[0], f[1], _cp24_to_ms(*f[2:]))),
+    33: ("IB" + _CP56, lambda f: (f[0], f[1], _cp56_to_ms(*f[2:]))),
+    # normalized value: NVA + QDS
+    9: ("hB", lambda f: (_normalized(f[0]), f[1], None)),
+    10: ("hB" + _CP24, lambda f: (_normalized(f[0]), f[1], _cp24_to_ms(*f[2:]))),
+    34: ("hB" + _CP56, lambda f: (_normalized(f[0]), f[1], _cp56_to_ms(*f[2:]))),
+    21: ("h", lambda f: (_normalized_without_quality(f[0]), None, None)),
+    # scaled value: SVA + QDS
+    11: ("hB", lambda f: (f[0], f[1], None)),
+    12: ("hB" + _CP24, lambda f: (f[0], f[1], _cp24_to_ms(*f[2:]))),
+    35: ("hB" + _CP56, lambda f: (f[0], f[1], _cp56_to_ms(*f[2:]))),
+    # short floating point: IEEE STD 754 + QDS
+    13: ("fB", lambda f: (f[0], f[1], None)),
+    14: ("fB" + _CP24, lambda f: (f[0], f[1], _cp24_to_ms(*f[2:]))),
+    36: ("fB" + _CP56, lambda f: (f[0], f[1], _cp56_to_ms(*f[2:]))),
+    # integrated totals: BCR, quality is the sequence octet (SQ, CY, CA, IV)
+    15: ("iB", lambda f: (f[0], f[1], None)),
+    16: ("iB" + _CP24, lambda f: (f[0], f[1], _cp24_to_ms(*f[2:]))),
+    37: ("iB" + _CP56, lambda f: (f[0], f[1], _cp56_to_ms(*f[2:]))),
+    # event of protection equipment: SEP + CP16, value is (event state, elapsed ms)
+    17: ("B" + _CP16 + _CP24, lambda f: ((f[0] & 0x03, f[1]), f[0] & 0xfc, _cp24_to_ms(*f[2:]))),
+    38: ("B" + _CP16 + _CP56, lambda f: ((f[0] & 0x03, f[1]), f[0] & 0xfc, _cp56_to_ms(*f[2:]))),
+    # packed start events / output circuit info: SPE or OCI + QDP + CP16, value is (events, elapsed ms)
+    18: ("BB" + _CP16 + _CP24, lambda f: ((f[0], f[2]), f[1], _cp24_to_ms(*f[3:]))),
+    39: ("BB" + _CP16 + _CP56, lambda f: ((f[0], f[2]), f[1], _cp56_to_ms(*f[3:]))),
+    19: ("BB" + _CP16 + _CP24, lambda f: ((f[0], f[2]), f[1], _cp24_to_ms(*f[3:]))),
+    40: ("BB" + _CP16 + _CP56, lambda f: ((f[0], f[2]), f[1], _cp56_to_ms(*f[3:]))),
+    # packed single point with status change detection: SCD + QDS
+    20: ("IB", lambda f: (f[0], f[1], None)),
+    # single command: SCO, quality is the qualifier part (S/E, QU)
+    45: ("B", lambda f: (f[0] & 0x01 == 0x01, f[0] & 0xfc, None)),
+    58: ("B" + _CP56, lambda f: (f[0] & 0x01 == 0x01, f[0] & 0xfc, _cp56_to_ms(*f[1:]))),
+    # double and regulating step command: DCO / RCO
+    46: ("B", lambda f: (f[0] & 0x03, f[0] & 0xfc, None)),
+    59: ("B" + _CP56, lambda f: (f[0] & 0x03, f[0] & 0xfc, _cp56_to_ms(*f[1:]))),
+    47: ("B", lambda f: (f[0] & 0x03, f[0] & 0xfc, None)),
+    60: ("B" + _CP56, lambda f: (f[0] & 0x03, f[0] & 0xfc, _cp56_to_ms(*f[1:]))),
+    # set-point commands: value + QOS
+    48: ("hB", lambda f: (_normalized_without_quality(f[0]), f[1], None)),
+    61: ("hB" + _CP56, lambda f: (_normalized_without_quality(f[0]), f[1], _cp56_to_ms(*f[2:]))),
+    49: ("hB", lambda f: (f[0], f[1], None)),
+    62: ("hB" + _CP56, lambda f: (f[0], f[1], _cp56_to_ms(*f[2:]))),
+    50: ("fB", lambda f: (f[0], f[1], None)),
+    63: ("fB" + _CP56, lambda f: (f[0], f[1], _cp56_to_ms(*f[2:]))),
+    # bitstring command: BSI
+    51: ("I", lambda f: (f[0], None, None)),
+    64: ("I" + _CP56, lambda f: (f[0], None, _cp56_to_ms(*f[1:]))),
+    # end of initialization: COI
+    70: ("B", lambda f: (f[0], None, None)),
+    # interrogation, counter interrogation and reset process: QOI / QCC / QRP
+    100: ("B", lambda f: (f[0], None, None)),
+    101: ("B", lambda f: (f[0], None, None)),
+    105: ("B", lambda f: (f[0], None, None)),
+    # read command
+    102: (_NO_TIME, lambda f: (None, None, None)),
+    # clock synchronization
+    103: (_CP56, lambda f: (None, None, _cp56_to_ms(*f))),
+    # test command: fixed test bit pattern
+    104: ("H", lambda f: (f[0], None, None)),
+    # delay acquisition: CP16 as value
+    106: (_CP16, lambda f: (f[0], None, None)),
+    # test command with time tag: TSC as value
+    107: ("H" + _CP56, lambda f: (f[0], None, _cp56_to_ms(*f[1:]))),
+    # parameters: value + QPM, parameter activation: QPA
+    110: ("hB", lambda f: (_normalized(f[0]), f[1], None)),
+    111: ("hB", lambda f: (f[0], f[1], None)),
+    112: ("fB", lambda f: (f[0], f[1], None)),
+    113: ("B", lambda f: (f[0], None, None)),
+}
+
+_ioa_formats = {1: ("B", 1), 2: ("H", 1), 3: ("HB", 2)}
+
+# Record layout returned by ASDUDecoder.to_numpy() and decode_many()
+MEASURED_VALUE_FIELDS = [
+    ("ca", "<u2"),
+    ("ioa", "<u4"),
+    ("value", "<f8"),
+    ("quality", "u1"),
+    ("timestamp_ms", "<i8"),
+]
+
+# Per measured value TypeID: numpy value format, has quality, time tag and value scaling
+_numpy_layouts = {
+    9: ("<i2", True, None, _normalized),
+    10: ("<i2", True, "CP24", _normalized),
+    34: ("<i2", True, "CP56", _normalized),
+    11: ("<i2", True, None, None),
+    12: ("<i2", True, "CP24", None),
+    35: ("<i2", True, "CP56", None),
+    13: ("<f4", True, None, None),
+    14: ("<f4", True, "CP24", None),
+    36: ("<f4", True, "CP56", None),
+    21: ("<i2", False, None, _normalized_without_quality),
+}
+
+_numpy_ioa_fields = {
+    1: [("ioa", "u1")],
+    2: [("ioa", "<u2")],
+    3: [("ioa", "<u2"), ("ioa_high", "u1")],
+}
+
+_numpy_time_fields = {
+    None: [],
+    "CP24": [("milliseconds", "<u2"), ("minute", "u1")],
+    "CP56": [("milliseconds", "<u2"), ("minute", "u1"), ("hour", "u1"), ("day", "u1"), ("month", "u1"),
+             ("year", "u1")],
+}
+
+
+def _numpy_cp56_to_ms(numpy, fields):
+    """
+    Vectorized _cp56_to_ms()
+    """
+    y = (fields["year"] & 0x7f).astype(numpy.int64) + 100
+    m = (fields["month"] & 0x0f).astype(numpy.int64) - 1
+    wrap = m < 2
+    m = numpy.where(wrap, m + 12, m)
+    y = numpy.where(wrap, y - 1, y)
+    days = (y - 69) * 365 + y // 4 - y // 100 * 3 // 4 + (m + 2) * 153 // 5 - 446 + (fields["day"] & 0x1f)
+    seconds = ((days * 24 + (fields["hour"] & 0x1f)) * 60 + (fields["minute"] & 0x3f)) * 60
+    return seconds * 1000 + fields["milliseconds"]
+
+
+class ASDUDecoder(object):
+    """
+    Pure Python ASDU decoder
+
+    Parses the encoded ASDU (see ASDU.get_buffer()) with precompiled struct
+    layouts instead of calling into the library for every element and field.
+    Elements are returned as InformationValue records holding plain Python
+    values: CP24Time2a timestamps are milliseconds past the hour, CP56Time2a
+    timestamps milliseconds since epoch. COT values that CauseOfTransmission
+    does not list are returned as int.
+    """
+    def __init__(self, parameters=None):
+        parameters = parameters or default_connection_parameters
+        assert isinstance(parameters, ConnectionParameters)
+        if parameters.sizeOfIOA not in _ioa_formats:
+            raise ValueError("Unsupported size of IOA ({})".format(parameters.sizeOfIOA))
+        self.size_of_cot = parameters.sizeOfCOT
+        self.size_of_ca = parameters.sizeOfCA
+        self.size_of_ioa = parameters.sizeOfIOA
+        self.header_length = 2 + self.size_of_cot + self.size_of_ca
+
+        header_format = "<BBB" + ("B" if self.size_of_cot > 1 else "") + ("H" if self.size_of_ca > 1 else "B")
+        self._header = struct.Struct(header_format)
+        ioa_format, ioa_fields = _ioa_formats[self.size_of_ioa]
+        self._ioa = struct.Struct("<" + ioa_format)
+        self._layouts = {}
+        for type_id, (element_format, convert) in _element_layouts.items():
+            self._layouts[type_id] = (
+                struct.Struct("<" + ioa_format + element_format),
+                struct.Struct("<" + element_format),
+                ioa_fields,
+                convert)
+
+        self._numpy_dtypes = {}
+
+    def supports(self, type_id):
+        return getattr(type_id, "value", type_id) in self._layouts
+
+    def decode(self, buffer):
+        """
+        Decode an encoded ASDU into a DecodedASDU
+        """
+        header = self._header.unpack_from(buffer)
+        type_id, vsq, cot = header[0], header[1], header[2]
+        oa = header[3] if self.size_of_cot > 1 else 0
+        ca = header[-1]
+        try:
+            element, body, ioa_fields, convert = self._layouts[type_id]
+        except KeyError:
+            raise ValueError("Cannot decode ASDU of type ({})".format(type_id))
+
+        is_sequence = vsq & 0x80 == 0x80
+        count = vsq & 0x7f
+        offset = self.header_length
+        if is_sequence:
+            needed = offset + self.size_of_ioa + count * body.size
+        else:
+            needed = offset + count * element.size
+        if len(buffer) < needed:
+            raise ValueError("ASDU too short ({} < {} bytes)".format(len(buffer), needed))
+
+        elements = []
+        if is_sequence:
+            ioa = self._ioa.unpack_from(buffer, offset)
+            ioa = ioa[0] | ioa[1] << 16 if ioa_fields == 2 else ioa[0]
+            offset += self.size_of_ioa
+            values = body.iter_unpack(buffer[offset:needed]) if body.size else [()] * count
+            for fields in values:
+                elements.append(InformationValue(ioa, *convert(fields)))
+                ioa += 1
+        elif ioa_fields == 2:
+            for fields in element.iter_unpack(buffer[offset:needed]):
+                elements.append(InformationValue(fields[0] | fields[1] << 16, *convert(fields[2:])))
+        else:
+            for fields in element.iter_unpack(buffer[offset:needed]):
+                elements.append(InformationValue(fields[0], *convert(fields[1:])))
+
+        return DecodedASDU(
+            TypeID(type_id), is_sequence, _cause_of_transmission(cot & 0x3f), cot & 0x80 == 0x80, cot & 0x40 == 0x40,
+            oa, ca, elements)
+
+    def _numpy_dtype(self, numpy, type_id, is_sequence):
+        key = (type_id, is_sequence)
+        dtype = self._numpy_dtypes.get(key)
+        if dtype is None:
+            value_format, has_quality, time_tag, scale = _numpy_layouts[type_id]
+            fields = [] if is_sequence else list(_numpy_ioa_fields[self.size_of_ioa])
+            fields.append(("value", value_format))
+            if has_quality:
+                fields.append(("quality", "u1"))
+            fields.extend(_numpy_time_fields[time_tag])
+            dtype = self._numpy_dtypes[key] = numpy.dtype(fields)
+        return dtype
+
+    def _numpy_fields(self, numpy, buffer):
+        """
+        Read the elements of a measured value ASDU as a view on the buffer
+        """
+        header = self._header.unpack_from(buffer)
+        type_id, vsq, ca = header[0], header[1], header[-1]
+        if type_id not in _numpy_layouts:
+            raise ValueError("Cannot decode ASDU of type ({}) to numpy".format(type_id))
+
+        is_sequence = vsq & 0x80 == 0x80
+        count = vsq & 0x7f
+        offset = self.header_length
+        start = 0
+        dtype = self._numpy_dtype(numpy, type_id, is_sequence)
+        if is_sequence:
+            ioa = self._ioa.unpack_from(buffer, offset)
+            start = ioa[0] | ioa[1] << 16 if len(ioa) == 2 else ioa[0]
+            offset += self.size_of_ioa
+        needed = offset + count * dtype.itemsize
+        if len(buffer) < needed:
+            raise ValueError("ASDU too short ({} < {} bytes)".format(len(buffer), needed))
+        return (type_id, is_sequence), ca, start, numpy.frombuffer(buffer, dtype, count, offset)
+
+    def _numpy_records(self, numpy, key, blocks):
+        """
+        Convert the element views of ASDUs with the same layout into one array of MEASURED_VALUE_FIELDS
+        """
+        type_id, is_sequence = key
+        value_format, has_quality, time_tag, scale = _numpy_layouts[type_id]
+        if len(blocks) == 1:
+            fields = blocks[0][2]
+        else:
+            fields = numpy.concatenate([block[2] for block in blocks])
+        counts = [len(block[2]) for block in blocks]
+
+        result = numpy.empty(len(fields), dtype=MEASURED_VALUE_FIELDS)
+        result["ca"] = numpy.repeat([block[0] for block in blocks], counts)
+        if is_sequence:
+            starts = numpy.repeat([block[1] for block in blocks], counts)
+            first = numpy.repeat(numpy.cumsum(counts) - counts, counts)
+            result["ioa"] = starts + (numpy.arange(len(fields)) - first)
+        elif self.size_of_ioa == 3:
+            result["ioa"] = fields["ioa"] | fields["ioa_high"].astype(numpy.uint32) << 16
+        else:
+            result["ioa"] = fields["ioa"]
+        result["value"] = scale(fields["value"]) if scale else fields["value"]
+        result["quality"] = fields["quality"] if has_quality else 0
+        if time_tag == "CP56":
+            result["timestamp_ms"] = _numpy_cp56_to_ms(numpy, fields)
+        elif time_tag == "CP24":
+            result["timestamp_ms"] = fields["milliseconds"] + (fields["minute"] & 0x3f).astype(numpy.int64) * 60000
+        else:
+            result["timestamp_ms"] = -1
+        return result
+
+    def to_numpy(self, buffer):
+        """
+        Decode a measured value ASDU (M_ME_NA/NB/NC/ND and their time tagged
+        variants) into a numpy structured array of MEASURED_VALUE_FIELDS
+
+        The elements are read with numpy.frombuffer(), without copying the
+        payload. Quality is 0 for M_ME_ND_1, timestamp_ms is -1 without time
+        tag and milliseconds past the hour for CP24Time2a.
+        """
+        import numpy
+
+        key, ca, start, fields = self._numpy_fields(numpy, buffer)
+        return self._numpy_records(numpy, key, [(ca, start, fields)])
+
+    def to_numpy_many(self, buffers):
+        """
+        Decode measured value ASDUs into one array, see to_numpy()
+
+        Consecutive ASDUs with the same layout, like an interrogation response,
+        are converted together.
+        """
+        import numpy
+
+        arrays = []
+        run_key = None
+        run = []
+        for buffer in buffers:
+            key, ca, start, fields = self._numpy_fields(numpy, buffer)
+            if key != run_key and run:
+                arrays.append(self._numpy_records(numpy, run_key, run))
+                run = []
+            run_key = key
+            run.append((ca, start, fields))
+        if run:
+            arrays.append(self._numpy_records(numpy, run_key, run))
+
+        if not arrays:
+            return numpy.empty(0, dtype=MEASURED_VALUE_FIELDS)
+        if len(arrays) == 1:
+            return arrays[0]
+        return numpy.concatenate(arrays)
+
+
+_decoders = {}
+
+
+def get_decoder(parameters=None):
+    """
+    Shared ASDUDecoder for the given ConnectionParameters
+    """
+    parameters = parameters or default_connection_parameters
+    key = (parameters.sizeOfCOT, parameters.sizeOfCA, parameters.sizeOfIOA)
+    decoder = _decoders.get(key)
+    if decoder is None:
+        decoder = _decoders[key] = ASDUDecoder(parameters)
+    return decoder
+
+
+def decode_asdu(buffer, parameters=None):
+    """
+    Decode an encoded ASDU with the shared decoder for the given ConnectionParameters
+    """
+    return get_decoder(parameters).decode(buffer)
+
+
+def _buffer_of(asdu):
+    return asdu.get_buffer_view() if isinstance(asdu, ASDU) else asdu
+
+
+def _decoder_of(asdu):
+    return get_decoder(asdu.parameters.contents if isinstance(asdu, ASDU) else None)
+
+
+def decode_many(asdus, parameters=None):
+    """
+    Decode measured value ASDUs (ASDU instances or encoded buffers) into one
+    numpy structured array of MEASURED_VALUE_FIELDS
+
+    Without parameters, ASDU instances are decoded with their own
+    ConnectionParameters and encoded buffers with the default ones.
+    """
+    if parameters is not None:
+        return get_decoder(parameters).to_numpy_many(_buffer_of(asdu) for asdu in asdus)
+
+    arrays = [decoder.to_numpy_many(_buffer_of(asdu) for asdu in run)
+              for decoder, run in itertools.groupby(asdus, _decoder_of)]
+    if len(arrays) == 1:
+        return arrays[0]
+    if not arrays:
+        return get_decoder().to_numpy_many([])
+    import numpy
+
+    return numpy.concatenate(arrays)
+
+
+def _cp24_from_ms(timestamp):
+    """
+    CP24Time2a fields (milliseconds, minute) of a timestamp in ms
+    """
+    timestamp %= 3600000
+    return timestamp % 60000, timestamp // 60000
+
+
+def _cp56_from_ms(timestamp):
+    """
+    CP56Time2a fields of a timestamp in ms since epoch, like CP56Time2a_setFromMsTimestamp()
+    """
+    utc = time.gmtime(timestamp // 1000)
+    return utc.tm_sec * 1000 + timestamp % 1000, utc.tm_min, utc.tm_hour, utc.tm_mday, utc.tm_mon, utc.tm_year % 100
+
+
+def _vti(value):
+    """
+    VTI of a step position given as (position, transient) or as position, the inverse of _step_position()
+    """
+    if isinstance(value, tuple):
+        position, transient = value
+        return position & 0x7f | (0x80 if transient else 0)
+    return value & 0x7f
+
+
+# Per TypeID: struct format of an element after the IOA and a function that maps
+# (value, quality, timestamp) to its fields, the inverse of _element_layouts.
+_element_encoders = {
+    # single point: SIQ
+    1: ("B", lambda v, q, t: ((1 if v else 0) | q & 0xf0,)),
+    2: ("B" + _CP24, lambda v, q, t: ((1 if v else 0) | q & 0xf0,) + _cp24_from_ms(t)),
+    30: ("B" + _CP56, lambda v, q, t: ((1 if v else 0) | q & 0xf0,) + _cp56_from_ms(t)),
+    # double point: DIQ
+    3: ("B", lambda v, q, t: (v & 0x03 | q & 0xf0,)),
+    4: ("B" + _CP24, lambda v, q, t: (v & 0x03 | q & 0xf0,) + _cp24_from_ms(t)),
+    31: ("B" + _CP56, lambda v, q, t: (v & 0x03 | q & 0xf0,) + _cp56_from_ms(t)),
+    # step position: VTI + QDS
+    5: ("BB", lambda v, q, t: (_vti(v), q)),
+    6: ("BB" + _CP24, lambda v, q, t: (_vti(v), q) + _cp24_from_ms(t)),
+    32: ("BB" + _CP56, lambda v, q, t: (_vti(v), q) + _cp56_from_ms(t)),
+    # bitstring: BSI + QDS
+    7: ("IB", lambda v, q, t: (v & 0xffffffff, q)),
+    8: ("IB" + _CP24, lambda v, q, t: (v & 0xffffffff, q) + _cp24_from_ms(t)),
+    33: ("IB" + _CP56, lambda v, q, t: (v & 0xffffffff, q) + _cp56_from_ms(t)),
+    # normalized value: NVA + QDS
+    9: ("HB", lambda v, q, t: (int(v * 32767) & 0xffff, q)),
+    10: ("HB" + _CP24, lambda v, q, t: (int(v * 32767) & 0xffff, q) + _cp24_from_ms(t)),
+    34: ("HB" + _CP56, lambda v, q, t: (int(v * 32767) & 0xffff, q) + _cp56_from_ms(t)),
+    21: ("H", lambda v, q, t: (int(v * 32767.5 - 0.5) & 0xffff,)),
+    # scaled value: SVA + QDS
+    11: ("HB", lambda v, q, t: (int(v) & 0xffff, q)),
+    12: ("HB" + _CP24, lambda v, q, t: (int(v) & 0xffff, q) + _cp24_from_ms(t)),
+    35: ("HB" + _CP56, lambda v, q, t: (int(v) & 0xffff, q) + _cp56_from_ms(t)),
+    # short floating point: IEEE STD 754 + QDS
+    13: ("fB", lambda v, q, t: (v, q)),
+    14: ("fB" + _CP24, lambda v, q, t: (v, q) + _cp24_from_ms(t)),
+    36: ("fB" + _CP56, lambda v, q, t: (v, q) + _cp56_from_ms(t)),
+    # integrated totals: BCR, quality is the sequence octet
+    15: ("IB", lambda v, q, t: (v & 0xffffffff, q)),
+    16: ("IB" + _CP24, lambda v, q, t: (v & 0xffffffff, q) + _cp24_from_ms(t)),
+    37: ("IB" + _CP56, lambda v, q, t: (v & 0xffffffff, q) + _cp56_from_ms(t)),
+    # packed single point with status change detection: SCD + QDS
+    20: ("IB", lambda v, q, t: (v & 0xffffffff, q)),
+}
+
+
+def _as_list(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class ASDUBuilder(object):
+    """
+    Builds monitor direction ASDUs from arrays of points
+
+    The elements are encoded with precompiled struct layouts straight into
+    ASDU.encodedData, and split over as many ASDUs as the ASDU length and
+    element count limits require. Runs of at least min_sequence_length
+    contiguous IOAs are sent as SQ=1 sequences, ahead of the remaining points.
+    Values, qualities and timestamps are given like the InformationValue
+    records of ASDUDecoder, step positions also as plain position without
+    the transient flag.
+    """
+    def __init__(self, parameters=None, min_sequence_length=8):
+        parameters = parameters or default_connection_parameters
+        assert isinstance(parameters, ConnectionParameters)
+        if parameters.sizeOfIOA not in _ioa_formats:
+            raise ValueError("Unsupported size of IOA ({})".format(parameters.sizeOfIOA))
+        self.parameters = parameters
+        self.min_sequence_length = min_sequence_length
+        self.size_of_ioa = parameters.sizeOfIOA
+        self.header_length = 2 + parameters.sizeOfCOT + parameters.sizeOfCA
+
+        ioa_format, self._ioa_fields = _ioa_formats[self.size_of_ioa]
+        self._ioa = struct.Struct("<" + ioa_format)
+        self._layouts = {}
+        for type_id, (element_format, encode) in _element_encoders.items():
+            self._layouts[type_id] = (
+                struct.Struct("<" + ioa_format + element_format),
+                struct.Struct("<" + element_format),
+                encode)
+
+    @classmethod
+    def from_arrays(cls, type_id, ioas, values, qualities=None, timestamps=None,
+                    cot=CauseOfTransmission.SPONTANEOUS, ca=1, oa=0, parameters=None):
+        """
+        Build ASDUs with the shared ASDUBuilder for the given ConnectionParameters
+        """
+        return get_builder(parameters).build(type_id, ioas, values, qualities, timestamps, cot, ca, oa)
+
+    def supports(self, type_id):
+        return getattr(type_id, "value", type_id) in self._layouts
+
+    def get_capacity(self, type_id):
+        """
+        Number of elements with their own IOA that fit in one ASDU
+        """
+        element, body, encode = self._layouts[type_id.value]
+        return min(MAX_NUMBER_OF_ELEMENTS, (MAX_ASDU_LENGTH - self.header_length) // element.size)
+
+    def build(self, type_id, ioas, values, qualities=None, timestamps=None,
+              cot=CauseOfTransmission.SPONTANEOUS, ca=1, oa=0):
+        """
+        Build the ASDUs for the given points, timestamps default to now
+        """
+        if type_id.value not in self._layouts:
+            raise ValueError("Cannot build ASDU of type ({})".format(type_id))
+        ioas = _as_list(ioas)
+        values = _as_list(values)
+        count = len(ioas)
+        qualities = [0] * count if qualities is None else _as_list(qualities)
+        if timestamps is None:
+            timestamps = [int(time.time() * 1000)] * count
+        else:
+            timestamps = _as_list(timestamps)
+        if not len(values) == len(qualities) == len(timestamps) == count:
+            raise ValueError("ioas, values, qualities and timestamps differ in length")
+
+        asdus = []
+        singles = []
+        start = 0
+        while start < count:
+            end = start + 1
+            while end < count and ioas[end] == ioas[end - 1] + 1:
+                end += 1
+            if end - start >= self.min_sequence_length:
+                asdus.extend(self._build_sequences(type_id, ioas, values, qualities, timestamps, start, end,
+                                                   cot, ca, oa))
+            else:
+                singles.extend(range(start, end))
+            start = end
+        asdus.extend(self._build_singles(type_id, ioas, values, qualities, timestamps, singles, cot, ca, oa))
+        return asdus
+
+    def _new_asdu(self, type_id, is_sequence, cot, ca, oa, count, payload_size):
+        asdu = ASDU(self.parameters, type_id, is_sequence, cot, oa, ca)
+        asdu.encodedData[1] = (0x80 if is_sequence else 0) | count
+        asdu.payloadSize = payload_size
+        return asdu
+
+    def _build_sequences(self, type_id, ioas, values, qualities, timestamps, start, end, cot, ca, oa):
+        element, body, encode = self._layouts[type_id.value]
+        capacity = min(MAX_NUMBER_OF_ELEMENTS, (MAX_ASDU_LENGTH - self.header_length - self.size_of_ioa) // body.size)
+        asdus = []
+        for first in range(start, end, capacity):
+            last = min(first + capacity, end)
+            payload_size = self.size_of_ioa + (last - first) * body.size
+            asdu = self._new_asdu(type_id, True, cot, ca, oa, last - first, payload_size)
+            buffer = asdu.encodedData
+            ioa = ioas[first]
+            if self._ioa_fields == 2:
+                self._ioa.pack_into(buffer, self.header_length, ioa & 0xffff, ioa >> 16)
+            else:
+                self._ioa.pack_into(buffer, self.header_length, ioa)
+            offset = self.header_length + self.size_of_ioa
+            for index in range(first, last):
+                body.pack_into(buffer, offset, *encode(values[index], qualities[index], timestamps[index]))
+                offset += body.size
+            asdus.append(asdu)
+        return asdus
+
+    def _build_singles(self, type_id, ioas, values, qualities, timestamps, indices, cot, ca, oa):
+        element, body, encode = self._layouts[type_id.value]
+        capacity = self.get_capacity(type_id)
+        asdus = []
+        for first in range(0, len(indices), capacity):
+            chunk = indices[first:first + capacity]
+            asdu = self._new_asdu(type_id, False, cot, ca, oa, len(chunk), len(chunk) * element.size)
+            buffer = asdu.encodedData
+            offset = self.header_length
+            for index in chunk:
+                ioa = ioas[index]
+                fields = encode(values[index], qualities[index], timestamps[index])
+                if self._ioa_fields == 2:
+                    element.pack_into(buffer, offset, ioa & 0xffff, ioa >> 16, *fields)
+                else:
+                    element.pack_into(buffer, offset, ioa, *fields)
+                offset += element.size
+            asdus.append(asdu)
+        return asdus
+
+
+_builders = {}
+
+
+def get_builder(parameters=None):
+    """
+    Shared ASDUBuilder for the given ConnectionParameters
+    """
+    parameters = parameters or default_connection_parameters
+    key = (parameters.sizeOfCOT, parameters.sizeOfCA, parameters.sizeOfIOA)
+    builder = _builders.get(key)
+    if builder is None:
+        # the ASDUs keep a pointer to the parameters, which may be owned by a slave or connection
+        builder = _builders[key] = ASDUBuilder(ConnectionParameters.from_buffer_copy(parameters))
+    return builder
@@ -42,3 +42,63 @@ default_connection_parameters = ConnectionParameters(
     originatorAddress=0,
     sizeOfCA=2,
     sizeOfIOA=3)
+
+
+class T104ConnectionParameters(ConnectionParameters):
+    """
+    ConnectionParameters with the APCI parameters of IEC 60870-5-104
+
+    k: maximum number of unconfirmed I frames sent
+    w: I frames received before they are confirmed
+    t0: connect timeout, t1: send or test APDU timeout, t2: acknowledge
+    timeout, t3: idle test frame timeout, all in seconds
+    """
+    _fields_ = [
+        ("k", c_int),
+        ("w", c_int),
+        ("t0", c_int),
+        ("t1", c_int),
+        ("t2", c_int),
+        ("t3", c_int)
+        ]
+
+    def __repr__(self):
+        fields = ConnectionParameters._fields_ + self._fields_
+        output = "{}(".format(type(self).__name__)
+        output += ", ".join(["{}={}".format(field[0],  getattr(self, field[0])) for field in fields])
+        return output + ")"
+
+    @classmethod
+    def from_connection_parameters(cls, parameters, **apci):
+        """
+        Copy of parameters as T104ConnectionParameters, with the default APCI
+        parameters for plain ConnectionParameters, changed by keyword
+        """
+        result = cls.from_buffer_copy(default_t104_connection_parameters)
+        ctypes.memmove(ctypes.addressof(result), ctypes.addressof(parameters), ctypes.sizeof(parameters))
+        for name, value in apci.items():
+            if name not in ("k", "w", "t0", "t1", "t2", "t3"):
+                raise TypeError("Unknown APCI parameter ({})".format(name))
+            setattr(result, name, value)
+        return result
+
+    @property
+    def pointer(self):
+        return pT104ConnectionParameters(self)
+
+pT104ConnectionParameters = ctypes.POINTER(T104ConnectionParameters)
+
+
+default_t104_connection_parameters = T104ConnectionParameters(
+    sizeOfTypeId=1,
+    sizeOfVSQ=1,
+    sizeOfCOT=2,
+    originatorAddress=0,
+    sizeOfCA=2,
+    sizeOfIOA=3,
+    k=12,
+    w=8,
+    t0=10,
+    t1=15,
+    t2=10,
+    t3=20)
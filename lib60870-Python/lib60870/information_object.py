@@ -87,6 +87,9 @@ class IOBase():
             setattr(c, field[0], value)
         return c
 
+    def copy(self):
+        return self.clone()
+
     @property
     def pointer(self):
         return self.get_pointer_type()(self)
@@ -105,29 +108,25 @@ class StatusAndStatusChangeDetection(ctypes.Structure):
         ]
 
     def get_stn(self):
-        lib.StatusAndStatusChangeDetection_getSTn.restype = c_uint16
         return lib.StatusAndStatusChangeDetection_getSTn(pStatusAndStatusChangeDetection(self))
 
     def get_cdn(self):
-        lib.StatusAndStatusChangeDetection_getCDn.restype = c_uint16
         return lib.StatusAndStatusChangeDetection_getCDn(pStatusAndStatusChangeDetection(self))
 
     def set_stn(self, value):
         lib.StatusAndStatusChangeDetection_setSTn(
             pStatusAndStatusChangeDetection(self),
-            c_uint16(value))
+            value)
 
     def get_st(self, index):
-        lib.StatusAndStatusChangeDetection_getST.restype = c_bool
         return lib.StatusAndStatusChangeDetection_getST(
             pStatusAndStatusChangeDetection(self),
-            c_int(index))
+            index)
 
     def get_cd(self, index):
-        lib.StatusAndStatusChangeDetection_getCD.restype = c_bool
         return lib.StatusAndStatusChangeDetection_getCD(
             pStatusAndStatusChangeDetection(self),
-            c_int(index))
+            index)
 
 pStatusAndStatusChangeDetection = ctypes.POINTER(StatusAndStatusChangeDetection)
 
@@ -136,19 +135,17 @@ class SingleEvent(ctypes.c_uint8):
     def set_event_state(self, eventState):
         lib.SingleEvent_setEventState(
             pSingleEvent(self),
-            pEventState(eventState))
+            eventState)
 
     def get_event_state(self):
-        lib.SingleEvent_getEventState.restype = pEventState
         return lib.SingleEvent_getEventState(pSingleEvent(self))
 
     def set_qdp(self, qdp):
         lib.SingleEvent_setQDP(
             pSingleEvent(self),
-            c_int(qdp))
+            qdp)
 
     def get_qdp(self):
-        lib.SingleEvent_getQDP.restype = c_uint8
         value = lib.SingleEvent_getQDP(pSingleEvent(self))
         return QualityDescriptor(value)
 
@@ -168,27 +165,25 @@ class InformationObject(ctypes.Structure, IOBase):
         self.type = lib60870.TypeID.INVALID.c_value
 
     def get_object_address(self):
-        lib.InformationObject_getObjectAddress.restype = c_int
         return lib.InformationObject_getObjectAddress(pInformationObject(self))
 
     def set_object_address(self, ioa):
         lib.InformationObject_setObjectAddress(
             pInformationObject(self),
-            c_int(ioa))
+            ioa)
 
     def encode_base(self, frame, parameters, isSequence):
         lib.InformationObject_encodeBase(
             pInformationObject(self),
             pFrame(frame),
             parameters.pointer,
-            c_bool(isSequence))
+            isSequence)
 
     def parse_object_address(parameters, msg, startIndex):
-        lib.InformationObject_ParseObjectAddress.restype = c_int
         return lib.InformationObject_ParseObjectAddress(
             parameters.pointer,
             ctypes.POINTER(c_uint8)(msg),
-            c_int(startIndex))
+            startIndex)
 
 
 pInformationObject = ctypes.POINTER(InformationObject)
@@ -210,19 +205,16 @@ class SinglePointInformation(ctypes.Structure, IOBase):
         self.create(ioa, value, quality)
 
     def create(self, ioa, value, quality):
-        lib.SinglePointInformation_create.restype = pSinglePointInformation
         return lib.SinglePointInformation_create(
             pSinglePointInformation(self),
-            c_int(ioa),
-            c_bool(value),
-            c_int(quality))
+            ioa,
+            value,
+            quality)
 
     def get_value(self):
-        lib.SinglePointInformation_getValue.restype = c_bool
         return lib.SinglePointInformation_getValue(pSinglePointInformation(self))
 
     def get_quality(self):
-        lib.SinglePointInformation_getQuality.restype = c_uint8
         value = lib.SinglePointInformation_getQuality(pSinglePointInformation(self))
         return QualityDescriptor(value)
 
@@ -247,24 +239,20 @@ class SinglePointWithCP24Time2a(ctypes.Structure, IOBase):
 
     def create(self, ioa, value, quality, timestamp):
         timestamp = timestamp or CP24Time2a()
-        lib.SinglePointWithCP24Time2a_create.restype = pSinglePointWithCP24Time2a
         return lib.SinglePointWithCP24Time2a_create(
             pSinglePointWithCP24Time2a(self),
-            c_int(ioa),
-            c_bool(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.SinglePointWithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.SinglePointWithCP24Time2a_getTimestamp(pSinglePointWithCP24Time2a(self)).contents
 
     def get_value(self):
-        lib.SinglePointInformation_getValue.restype = c_bool
         return lib.SinglePointInformation_getValue(pSinglePointInformation(self))
 
     def get_quality(self):
-        lib.SinglePointInformation_getQuality.restype = c_uint8
         value = lib.SinglePointInformation_getQuality(pSinglePointInformation(self))
         return QualityDescriptor(value)
 
@@ -286,19 +274,16 @@ class DoublePointInformation(ctypes.Structure, IOBase):
         self.create(ioa, value, quality)
 
     def create(self, ioa, value, quality):
-        lib.DoublePointInformation_create.restype = pDoublePointInformation
         return lib.DoublePointInformation_create(
             pDoublePointInformation(self),
-            c_int(ioa),
-            DoublePointValue(value),
-            c_int(quality)).contents
+            ioa,
+            value,
+            quality).contents
 
     def get_value(self):
-        lib.DoublePointInformation_getValue.restype = DoublePointValue
         return lib.DoublePointInformation_getValue(pDoublePointInformation(self))
 
     def get_quality(self):
-        lib.DoublePointInformation_getQuality.restype = c_uint8
         value = lib.DoublePointInformation_getQuality(pDoublePointInformation(self))
         return QualityDescriptor(value)
 
@@ -322,24 +307,20 @@ class DoublePointWithCP24Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.DoublePointWithCP24Time2a_create.restype = pDoublePointWithCP24Time2a
         return lib.DoublePointWithCP24Time2a_create(
             pDoublePointWithCP24Time2a(self),
-            c_int(ioa),
-            DoublePointValue(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.DoublePointWithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.DoublePointWithCP24Time2a_getTimestamp(pDoublePointWithCP24Time2a(self)).contents
 
     def get_value(self):
-        lib.DoublePointInformation_getValue.restype = DoublePointValue
         return lib.DoublePointInformation_getValue(pDoublePointInformation(self))
 
     def get_quality(self):
-        lib.DoublePointInformation_getQuality.restype = c_uint8
         value = lib.DoublePointInformation_getQuality(pDoublePointInformation(self))
         return QualityDescriptor(value)
 
@@ -361,28 +342,23 @@ class StepPositionInformation(ctypes.Structure, IOBase):
         self.create(ioa, value, isTransient, quality)
 
     def create(self, ioa, value, isTransient, quality):
-        lib.StepPositionInformation_create.restype = pStepPositionInformation
         return lib.StepPositionInformation_create(
             pStepPositionInformation(self),
-            c_int(ioa),
-            c_int(value),
-            c_bool(isTransient),
-            c_int(quality)).contents
+            ioa,
+            value,
+            isTransient,
+            quality).contents
 
     def get_object_address(self):
-        lib.StepPositionInformation_getObjectAddress.restype = c_int
         return lib.StepPositionInformation_getObjectAddress(pStepPositionInformation(self))
 
     def get_value(self):
-        lib.StepPositionInformation_getValue.restype = c_int
         return lib.StepPositionInformation_getValue(pStepPositionInformation(self))
 
     def is_transient(self):
-        lib.StepPositionInformation_isTransient.restype = c_bool
         return lib.StepPositionInformation_isTransient(pStepPositionInformation(self))
 
     def get_quality(self):
-        lib.StepPositionInformation_getQuality.restype = c_uint8
         value = lib.StepPositionInformation_getQuality(pStepPositionInformation(self))
         return QualityDescriptor(value)
 
@@ -406,33 +382,27 @@ class StepPositionWithCP24Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, isTransient, quality, timestamp)
 
     def create(self, ioa, value, isTransient, quality, timestamp):
-        lib.StepPositionWithCP24Time2a_create.restype = pStepPositionWithCP24Time2a
         return lib.StepPositionWithCP24Time2a_create(
             pStepPositionWithCP24Time2a(self),
-            c_int(ioa),
-            c_int(value),
-            c_bool(isTransient),
-            c_int(quality),
+            ioa,
+            value,
+            isTransient,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.StepPositionWithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.StepPositionWithCP24Time2a_getTimestamp(pStepPositionWithCP24Time2a(self)).contents
 
     def get_object_address(self):
-        lib.StepPositionInformation_getObjectAddress.restype = c_int
         return lib.StepPositionInformation_getObjectAddress(pStepPositionInformation(self))
 
     def get_value(self):
-        lib.StepPositionInformation_getValue.restype = c_int
         return lib.StepPositionInformation_getValue(pStepPositionInformation(self))
 
     def is_transient(self):
-        lib.StepPositionInformation_isTransient.restype = c_bool
         return lib.StepPositionInformation_isTransient(pStepPositionInformation(self))
 
     def get_quality(self):
-        lib.StepPositionInformation_getQuality.restype = c_uint8
         value = lib.StepPositionInformation_getQuality(pStepPositionInformation(self))
         return QualityDescriptor(value)
 
@@ -454,18 +424,15 @@ class BitString32(ctypes.Structure, IOBase):
         self.create(ioa, value)
 
     def create(self, ioa, value):
-        lib.BitString32_create.restype = pBitString32
         return lib.BitString32_create(
             pBitString32(self),
-            c_int(ioa),
-            c_uint32(value)).contents
+            ioa,
+            value).contents
 
     def get_value(self):
-        lib.BitString32_getValue.restype = c_uint32
         return lib.BitString32_getValue(pBitString32(self))
 
     def get_quality(self):
-        lib.BitString32_getQuality.restype = c_uint8
         value = lib.BitString32_getQuality(pBitString32(self))
         return QualityDescriptor(value)
 
@@ -489,24 +456,20 @@ class Bitstring32WithCP24Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, timestamp)
 
     def create(self, ioa, value, timestamp):
-        lib.Bitstring32WithCP24Time2a_create.restype = pBitstring32WithCP24Time2a
         return lib.Bitstring32WithCP24Time2a_create(
             pBitstring32WithCP24Time2a(self),
-            c_int(ioa),
-            c_uint32(value),
+            ioa,
+            value,
             timestamp.pointer).contents
 
     def get_value(self):
-        lib.BitString32_getValue.restype = c_uint32
         return lib.BitString32_getValue(pBitString32(self))
 
     def get_quality(self):
-        lib.BitString32_getQuality.restype = c_uint8
         value = lib.BitString32_getQuality(pBitString32(self))
         return QualityDescriptor(value)
 
     def get_timestamp(self):
-        lib.Bitstring32WithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.Bitstring32WithCP24Time2a_getTimestamp(pBitstring32WithCP24Time2a(self)).contents
 
 pBitstring32WithCP24Time2a = ctypes.POINTER(Bitstring32WithCP24Time2a)
@@ -527,33 +490,29 @@ class MeasuredValueNormalized(ctypes.Structure, IOBase):
         self.create(ioa, value, quality)
 
     def create(self, ioa, value, quality):
-        lib.MeasuredValueNormalized_create.restype = pMeasuredValueNormalized
         return lib.MeasuredValueNormalized_create(
             pMeasuredValueNormalized(self),
-            c_int(ioa),
-            c_float(value),
-            c_int(quality)).contents
+            ioa,
+            value,
+            quality).contents
 
     def get_value(self, as_scaled=False):
         if not as_scaled:
-            lib.MeasuredValueNormalized_getValue.restype = c_float
             return lib.MeasuredValueNormalized_getValue(pMeasuredValueNormalized(self))
         else:
-            lib.MeasuredValueNormalized_getValue.restype = c_int
             return lib.MeasuredValueNormalized_getScaledValue(pMeasuredValueNormalized(self))
 
     def set_value(self, value, as_scaled=False):
         if not as_scaled:
             lib.MeasuredValueNormalized_setValue(
                 pMeasuredValueNormalized(self),
-                c_float(value))
+                value)
         else:
             lib.MeasuredValueNormalized_setScaledValue(
                 pMeasuredValueNormalized(self),
-                c_int(value))
+                value)
 
     def get_quality(self):
-        lib.MeasuredValueNormalized_getQuality.restype = c_uint8
         value = lib.MeasuredValueNormalized_getQuality(pMeasuredValueNormalized(self))
         return QualityDescriptor(value)
 
@@ -577,16 +536,14 @@ class MeasuredValueNormalizedWithCP24Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.MeasuredValueNormalizedWithCP24Time2a_create.restype = pMeasuredValueNormalizedWithCP24Time2a
         return lib.MeasuredValueNormalizedWithCP24Time2a_create(
             pMeasuredValueNormalizedWithCP24Time2a(self),
-            c_int(ioa),
-            c_float(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.MeasuredValueNormalizedWithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.MeasuredValueNormalizedWithCP24Time2a_getTimestamp(pMeasuredValueNormalizedWithCP24Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -596,24 +553,21 @@ class MeasuredValueNormalizedWithCP24Time2a(ctypes.Structure, IOBase):
 
     def get_value(self, as_scaled=False):
         if not as_scaled:
-            lib.MeasuredValueNormalized_getValue.restype = c_float
             return lib.MeasuredValueNormalized_getValue(pMeasuredValueNormalized(self))
         else:
-            lib.MeasuredValueNormalized_getValue.restype = c_int
             return lib.MeasuredValueNormalized_getScaledValue(pMeasuredValueNormalized(self))
 
     def set_value(self, value, as_scaled=False):
         if not as_scaled:
             lib.MeasuredValueNormalized_setValue(
                 pMeasuredValueNormalized(self),
-                c_float(value))
+                value)
         else:
             lib.MeasuredValueNormalized_setScaledValue(
                 pMeasuredValueNormalized(self),
-                c_int(value))
+                value)
 
     def get_quality(self):
-        lib.MeasuredValueNormalized_getQuality.restype = c_uint8
         value = lib.MeasuredValueNormalized_getQuality(pMeasuredValueNormalized(self))
         return QualityDescriptor(value)
 
@@ -635,31 +589,28 @@ class MeasuredValueScaled(ctypes.Structure, IOBase):
         self.create(ioa, value, quality)
 
     def create(self, ioa, value, quality):
-        lib.MeasuredValueScaled_create.restype = pMeasuredValueScaled
         return lib.MeasuredValueScaled_create(
             pMeasuredValueScaled(self),
-            c_int(ioa),
-            c_int(value),
-            c_int(quality)).contents
+            ioa,
+            value,
+            quality).contents
 
     def get_value(self):
-        lib.MeasuredValueScaled_getValue.restype = c_int
         return lib.MeasuredValueScaled_getValue(pMeasuredValueScaled(self))
 
     def set_value(self, value):
         lib.MeasuredValueScaled_setValue(
             pMeasuredValueScaled(self),
-            c_int(value))
+            value)
 
     def get_quality(self):
-        lib.MeasuredValueScaled_getQuality.restype = c_uint8
         value = lib.MeasuredValueScaled_getQuality(pMeasuredValueScaled(self))
         return QualityDescriptor(value)
 
     def set_quality(self, quality):
         lib.MeasuredValueScaled_setQuality(
             pMeasuredValueScaled(self),
-            c_int(quality))
+            quality)
 
 pMeasuredValueScaled = ctypes.POINTER(MeasuredValueScaled)
 
@@ -681,16 +632,14 @@ class MeasuredValueScaledWithCP24Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.MeasuredValueScaledWithCP24Time2a_create.restype = pMeasuredValueScaledWithCP24Time2a
         return lib.MeasuredValueScaledWithCP24Time2a_create(
             pMeasuredValueScaledWithCP24Time2a(self),
-            c_int(ioa),
-            c_int(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.MeasuredValueScaledWithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.MeasuredValueScaledWithCP24Time2a_getTimestamp(pMeasuredValueScaledWithCP24Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -699,23 +648,21 @@ class MeasuredValueScaledWithCP24Time2a(ctypes.Structure, IOBase):
             pCP24Time2a(value))
 
     def get_value(self):
-        lib.MeasuredValueScaled_getValue.restype = c_int
         return lib.MeasuredValueScaled_getValue(pMeasuredValueScaled(self))
 
     def set_value(self, value):
         lib.MeasuredValueScaled_setValue(
             pMeasuredValueScaled(self),
-            c_int(value))
+            value)
 
     def get_quality(self):
-        lib.MeasuredValueScaled_getQuality.restype = c_uint8
         value = lib.MeasuredValueScaled_getQuality(pMeasuredValueScaled(self))
         return QualityDescriptor(value)
 
     def set_quality(self, quality):
         lib.MeasuredValueScaled_setQuality(
             pMeasuredValueScaled(self),
-            c_int(quality))
+            quality)
 
 pMeasuredValueScaledWithCP24Time2a = ctypes.POINTER(MeasuredValueScaledWithCP24Time2a)
 
@@ -735,24 +682,21 @@ class MeasuredValueShort(ctypes.Structure, IOBase):
         self.create(ioa, value, quality)
 
     def create(self, ioa, value, quality):
-        lib.MeasuredValueShort_create.restype = pMeasuredValueShort
         return lib.MeasuredValueShort_create(
             pMeasuredValueShort(self),
-            c_int(ioa),
-            c_float(value),
-            c_int(quality)).contents
+            ioa,
+            value,
+            quality).contents
 
     def get_value(self):
-        lib.MeasuredValueShort_getValue.restype = c_float
         return lib.MeasuredValueShort_getValue(pMeasuredValueShort(self))
 
     def set_value(self, value):
         lib.MeasuredValueShort_setValue(
             pMeasuredValueShort(self),
-            c_float(value))
+            value)
 
     def get_quality(self):
-        lib.MeasuredValueShort_getQuality.restype = c_uint8
         value = lib.MeasuredValueShort_getQuality(pMeasuredValueShort(self))
         return QualityDescriptor(value)
 
@@ -776,16 +720,14 @@ class MeasuredValueShortWithCP24Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.MeasuredValueShortWithCP24Time2a_create.restype = pMeasuredValueShortWithCP24Time2a
         return lib.MeasuredValueShortWithCP24Time2a_create(
             pMeasuredValueShortWithCP24Time2a(self),
-            c_int(ioa),
-            c_float(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.MeasuredValueShortWithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.MeasuredValueShortWithCP24Time2a_getTimestamp(pMeasuredValueShortWithCP24Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -794,16 +736,14 @@ class MeasuredValueShortWithCP24Time2a(ctypes.Structure, IOBase):
             pCP24Time2a(value))
 
     def get_value(self):
-        lib.MeasuredValueShort_getValue.restype = c_float
         return lib.MeasuredValueShort_getValue(pMeasuredValueShort(self))
 
     def set_value(self, value):
         lib.MeasuredValueShort_setValue(
             pMeasuredValueShort(self),
-            c_float(value))
+            value)
 
     def get_quality(self):
-        lib.MeasuredValueShort_getQuality.restype = c_uint8
         value = lib.MeasuredValueShort_getQuality(pMeasuredValueShort(self))
         return QualityDescriptor(value)
 
@@ -824,14 +764,12 @@ class IntegratedTotals(ctypes.Structure, IOBase):
         self.create(ioa, value)
 
     def create(self, ioa, value):
-        lib.IntegratedTotals_create.restype = pIntegratedTotals
         return lib.IntegratedTotals_create(
             pIntegratedTotals(self),
-            c_int(ioa),
+            ioa,
             pBinaryCounterReading(value)).contents
 
     def get_bcr(self):
-        lib.IntegratedTotals_getBCR.restype = pBinaryCounterReading
         return lib.IntegratedTotals_getBCR(pIntegratedTotals(self)).contents
 
     def set_bcr(self, value):
@@ -858,15 +796,13 @@ class IntegratedTotalsWithCP24Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, timestamp)
 
     def create(self, ioa, value, timestamp):
-        lib.IntegratedTotalsWithCP24Time2a_create.restype = pIntegratedTotalsWithCP24Time2a
         return lib.IntegratedTotalsWithCP24Time2a_create(
             pIntegratedTotalsWithCP24Time2a(self),
-            c_int(ioa),
+            ioa,
             pBinaryCounterReading(value),
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.IntegratedTotalsWithCP24Time2a_getTimestamp.restype = pCP24Time2a
         return lib.IntegratedTotalsWithCP24Time2a_getTimestamp(pIntegratedTotalsWithCP24Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -875,7 +811,6 @@ class IntegratedTotalsWithCP24Time2a(ctypes.Structure, IOBase):
             pCP24Time2a(value))
 
     def get_bcr(self):
-        lib.IntegratedTotals_getBCR.restype = pBinaryCounterReading
         return lib.IntegratedTotals_getBCR(pIntegratedTotals(self)).contents
 
     def set_bcr(self, value):
@@ -902,24 +837,20 @@ class EventOfProtectionEquipment(ctypes.Structure, IOBase):
         self.create(ioa, event, elapsedTime, timestamp)
 
     def create(self, ioa, event, elapsedTime, timestamp):
-        lib.EventOfProtectionEquipment_create.restype = pEventOfProtectionEquipment
         return lib.EventOfProtectionEquipment_create(
             pEventOfProtectionEquipment(self),
-            c_int(ioa),
+            ioa,
             pSingleEvent(event),
             pCP16Time2a(elapsedTime),
             timestamp.pointer).contents
 
     def get_event(self):
-        lib.EventOfProtectionEquipment_getEvent.restype = pSingleEvent
         return lib.EventOfProtectionEquipment_getEvent(pEventOfProtectionEquipment(self)).contents
 
     def get_elapsed_time(self):
-        lib.EventOfProtectionEquipment_getElapsedTime.restype = pCP16Time2a
         return lib.EventOfProtectionEquipment_getElapsedTime(pEventOfProtectionEquipment(self)).contents
 
     def get_timestamp(self):
-        lib.EventOfProtectionEquipment_getTimestamp.restype = pCP24Time2a
         return lib.EventOfProtectionEquipment_getTimestamp(pEventOfProtectionEquipment(self)).contents
 
 pEventOfProtectionEquipment = ctypes.POINTER(EventOfProtectionEquipment)
@@ -942,30 +873,25 @@ class PackedStartEventsOfProtectionEquipment(ctypes.Structure, IOBase):
         self.create(ioa, event, qdp, elapsedTime, timestamp)
 
     def create(self, ioa, event, qdp, elapsedTime, timestamp):
-        lib.PackedStartEventsOfProtectionEquipment_create.restype = pPackedStartEventsOfProtectionEquipment
         return lib.PackedStartEventsOfProtectionEquipment_create(
             pPackedStartEventsOfProtectionEquipment(self),
-            c_int(ioa),
-            StartEvent(event),
-            c_int(qdp),
+            ioa,
+            event,
+            qdp,
             pCP16Time2a(elapsedTime),
             timestamp.pointer).contents
 
     def get_event(self):
-        lib.PackedStartEventsOfProtectionEquipment_getEvent.restype = StartEvent
         return lib.PackedStartEventsOfProtectionEquipment_getEvent(pPackedStartEventsOfProtectionEquipment(self))
 
     def get_quality(self):
-        lib.PackedStartEventsOfProtectionEquipment_getQuality.restype = c_uint8
         value = lib.PackedStartEventsOfProtectionEquipment_getQuality(pPackedStartEventsOfProtectionEquipment(self))
         return QualityDescriptor(value)
 
     def get_elapsed_time(self):
-        lib.PackedStartEventsOfProtectionEquipment_getElapsedTime.restype = pCP16Time2a
         return lib.PackedStartEventsOfProtectionEquipment_getElapsedTime(pPackedStartEventsOfProtectionEquipment(self)).contents
 
     def get_timestamp(self):
-        lib.PackedStartEventsOfProtectionEquipment_getTimestamp.restype = pCP24Time2a
         return lib.PackedStartEventsOfProtectionEquipment_getTimestamp(pPackedStartEventsOfProtectionEquipment(self)).contents
 
 pPackedStartEventsOfProtectionEquipment = ctypes.POINTER(PackedStartEventsOfProtectionEquipment)
@@ -988,30 +914,25 @@ class PackedOutputCircuitInfo(ctypes.Structure, IOBase):
         self.create(ioa, oci, qdp, operatingTime, timestamp)
 
     def create(self, ioa, oci, qdp, operatingTime, timestamp):
-        lib.PackedOutputCircuitInfo_create.restype = pPackedOutputCircuitInfo
         return lib.PackedOutputCircuitInfo_create(
             pPackedOutputCircuitInfo(self),
-            c_int(ioa),
-            OutputCircuitInfo(oci),
-            c_int(qdp),
+            ioa,
+            oci,
+            qdp,
             pCP16Time2a(operatingTime),
             timestamp.pointer).contents
 
     def get_oci(self):
-        lib.PackedOutputCircuitInfo_getOCI.restype = OutputCircuitInfo
         return lib.PackedOutputCircuitInfo_getOCI(pPackedOutputCircuitInfo(self))
 
     def get_quality(self):
-        lib.PackedOutputCircuitInfo_getQuality.restype = c_uint8
         value = lib.PackedOutputCircuitInfo_getQuality(pPackedOutputCircuitInfo(self))
         return QualityDescriptor(value)
 
     def get_operating_time(self):
-        lib.PackedOutputCircuitInfo_getOperatingTime.restype = pCP16Time2a
         return lib.PackedOutputCircuitInfo_getOperatingTime(pPackedOutputCircuitInfo(self)).contents
 
     def get_timestamp(self):
-        lib.PackedOutputCircuitInfo_getTimestamp.restype = pCP24Time2a
         return lib.PackedOutputCircuitInfo_getTimestamp(pPackedOutputCircuitInfo(self)).contents
 
 pPackedOutputCircuitInfo = ctypes.POINTER(PackedOutputCircuitInfo)
@@ -1032,20 +953,17 @@ class PackedSinglePointWithSCD(ctypes.Structure, IOBase):
         self.create(ioa, scd, qds)
 
     def create(self, ioa, scd, qds):
-        lib.PackedSinglePointWithSCD_create.restype = pPackedSinglePointWithSCD
         return lib.PackedSinglePointWithSCD_create(
             pPackedSinglePointWithSCD(self),
-            c_int(ioa),
+            ioa,
             pStatusAndStatusChangeDetection(scd),
-            QualityDescriptor(qds)).contents
+            qds).contents
 
     def get_quality(self):
-        lib.PackedSinglePointWithSCD_getQuality.restype = c_uint8
         value = lib.PackedSinglePointWithSCD_getQuality(pPackedSinglePointWithSCD(self))
         return QualityDescriptor(value)
 
     def get_scd(self):
-        lib.PackedSinglePointWithSCD_getSCD.restype = pStatusAndStatusChangeDetection
         return lib.PackedSinglePointWithSCD_getSCD(pPackedSinglePointWithSCD(self)).contents
 
 pPackedSinglePointWithSCD = ctypes.POINTER(PackedSinglePointWithSCD)
@@ -1065,20 +983,18 @@ class MeasuredValueNormalizedWithoutQuality(ctypes.Structure, IOBase):
         self.create(ioa, value)
 
     def create(self, ioa, value):
-        lib.MeasuredValueNormalizedWithoutQuality_create.restype = pMeasuredValueNormalizedWithoutQuality
         return lib.MeasuredValueNormalizedWithoutQuality_create(
             pMeasuredValueNormalizedWithoutQuality(self),
-            c_int(ioa),
-            c_float(value)).contents
+            ioa,
+            value).contents
 
     def get_value(self):
-        lib.MeasuredValueNormalizedWithoutQuality_getValue.restype = c_float
         return lib.MeasuredValueNormalizedWithoutQuality_getValue(pMeasuredValueNormalizedWithoutQuality(self))
 
     def set_value(self, value):
         lib.MeasuredValueNormalizedWithoutQuality_setValue(
             pMeasuredValueNormalizedWithoutQuality(self),
-            c_float(value))
+            value)
 
 pMeasuredValueNormalizedWithoutQuality = ctypes.POINTER(MeasuredValueNormalizedWithoutQuality)
 
@@ -1100,24 +1016,20 @@ class SinglePointWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.SinglePointWithCP56Time2a_create.restype = pSinglePointWithCP56Time2a
         return lib.SinglePointWithCP56Time2a_create(
             pSinglePointWithCP56Time2a(self),
-            c_int(ioa),
-            c_bool(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.SinglePointWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.SinglePointWithCP56Time2a_getTimestamp(pSinglePointWithCP56Time2a(self)).contents
 
     def get_value(self):
-        lib.SinglePointInformation_getValue.restype = c_bool
         return lib.SinglePointInformation_getValue(pSinglePointInformation(self))
 
     def get_quality(self):
-        lib.SinglePointInformation_getQuality.restype = c_uint8
         value = lib.SinglePointInformation_getQuality(pSinglePointInformation(self))
         return QualityDescriptor(value)
 
@@ -1141,24 +1053,20 @@ class DoublePointWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.DoublePointWithCP56Time2a_create.restype = pDoublePointWithCP56Time2a
         return lib.DoublePointWithCP56Time2a_create(
             pDoublePointWithCP56Time2a(self),
-            c_int(ioa),
-            DoublePointValue(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.DoublePointWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.DoublePointWithCP56Time2a_getTimestamp(pDoublePointWithCP56Time2a(self)).contents
 
     def get_value(self):
-        lib.DoublePointInformation_getValue.restype = DoublePointValue
         return lib.DoublePointInformation_getValue(pDoublePointInformation(self))
 
     def get_quality(self):
-        lib.DoublePointInformation_getQuality.restype = c_uint8
         value = lib.DoublePointInformation_getQuality(pDoublePointInformation(self))
         return QualityDescriptor(value)
 
@@ -1182,33 +1090,27 @@ class StepPositionWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, isTransient, quality, timestamp)
 
     def create(self, ioa, value, isTransient, quality, timestamp):
-        lib.StepPositionWithCP56Time2a_create.restype = pStepPositionWithCP56Time2a
         return lib.StepPositionWithCP56Time2a_create(
             pStepPositionWithCP56Time2a(self),
-            c_int(ioa),
-            c_int(value),
-            c_bool(isTransient),
-            c_int(quality),
+            ioa,
+            value,
+            isTransient,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.StepPositionWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.StepPositionWithCP56Time2a_getTimestamp(pStepPositionWithCP56Time2a(self)).contents
 
     def get_object_address(self):
-        lib.StepPositionInformation_getObjectAddress.restype = c_int
         return lib.StepPositionInformation_getObjectAddress(pStepPositionInformation(self))
 
     def get_value(self):
-        lib.StepPositionInformation_getValue.restype = c_int
         return lib.StepPositionInformation_getValue(pStepPositionInformation(self))
 
     def is_transient(self):
-        lib.StepPositionInformation_isTransient.restype = c_bool
         return lib.StepPositionInformation_isTransient(pStepPositionInformation(self))
 
     def get_quality(self):
-        lib.StepPositionInformation_getQuality.restype = c_uint8
         value = lib.StepPositionInformation_getQuality(pStepPositionInformation(self))
         return QualityDescriptor(value)
 
@@ -1232,15 +1134,13 @@ class Bitstring32WithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, timestamp)
 
     def create(self, ioa, value, timestamp):
-        lib.Bitstring32WithCP56Time2a_create.restype = pBitstring32WithCP56Time2a
         return lib.Bitstring32WithCP56Time2a_create(
             pBitstring32WithCP56Time2a(self),
-            c_int(ioa),
-            c_uint32(value),
+            ioa,
+            value,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.Bitstring32WithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.Bitstring32WithCP56Time2a_getTimestamp(pBitstring32WithCP56Time2a(self)).contents
 
 pBitstring32WithCP56Time2a = ctypes.POINTER(Bitstring32WithCP56Time2a)
@@ -1263,16 +1163,14 @@ class MeasuredValueNormalizedWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.MeasuredValueNormalizedWithCP56Time2a_create.restype = pMeasuredValueNormalizedWithCP56Time2a
         return lib.MeasuredValueNormalizedWithCP56Time2a_create(
             pMeasuredValueNormalizedWithCP56Time2a(self),
-            c_int(ioa),
-            c_float(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.MeasuredValueNormalizedWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.MeasuredValueNormalizedWithCP56Time2a_getTimestamp(pMeasuredValueNormalizedWithCP56Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -1282,24 +1180,21 @@ class MeasuredValueNormalizedWithCP56Time2a(ctypes.Structure, IOBase):
 
     def get_value(self, as_scaled=False):
         if not as_scaled:
-            lib.MeasuredValueNormalized_getValue.restype = c_float
             return lib.MeasuredValueNormalized_getValue(pMeasuredValueNormalized(self))
         else:
-            lib.MeasuredValueNormalized_getValue.restype = c_int
             return lib.MeasuredValueNormalized_getScaledValue(pMeasuredValueNormalized(self))
 
     def set_value(self, value, as_scaled=False):
         if not as_scaled:
             lib.MeasuredValueNormalized_setValue(
                 pMeasuredValueNormalized(self),
-                c_float(value))
+                value)
         else:
             lib.MeasuredValueNormalized_setScaledValue(
                 pMeasuredValueNormalized(self),
-                c_int(value))
+                value)
 
     def get_quality(self):
-        lib.MeasuredValueNormalized_getQuality.restype = c_uint8
         value = lib.MeasuredValueNormalized_getQuality(pMeasuredValueNormalized(self))
         return QualityDescriptor(value)
 
@@ -1323,16 +1218,14 @@ class MeasuredValueScaledWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.MeasuredValueScaledWithCP56Time2a_create.restype = pMeasuredValueScaledWithCP56Time2a
         return lib.MeasuredValueScaledWithCP56Time2a_create(
             pMeasuredValueScaledWithCP56Time2a(self),
-            c_int(ioa),
-            c_int(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.MeasuredValueScaledWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.MeasuredValueScaledWithCP56Time2a_getTimestamp(pMeasuredValueScaledWithCP56Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -1341,23 +1234,21 @@ class MeasuredValueScaledWithCP56Time2a(ctypes.Structure, IOBase):
             pCP56Time2a(value))
 
     def get_value(self):
-        lib.MeasuredValueScaled_getValue.restype = c_int
         return lib.MeasuredValueScaled_getValue(pMeasuredValueScaled(self))
 
     def set_value(self, value):
         lib.MeasuredValueScaled_setValue(
             pMeasuredValueScaled(self),
-            c_int(value))
+            value)
 
     def get_quality(self):
-        lib.MeasuredValueScaled_getQuality.restype = c_uint8
         value = lib.MeasuredValueScaled_getQuality(pMeasuredValueScaled(self))
         return QualityDescriptor(value)
 
     def set_quality(self, quality):
         lib.MeasuredValueScaled_setQuality(
             pMeasuredValueScaled(self),
-            c_int(quality))
+            quality)
 
 pMeasuredValueScaledWithCP56Time2a = ctypes.POINTER(MeasuredValueScaledWithCP56Time2a)
 
@@ -1379,16 +1270,14 @@ class MeasuredValueShortWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, quality, timestamp)
 
     def create(self, ioa, value, quality, timestamp):
-        lib.MeasuredValueShortWithCP56Time2a_create.restype = pMeasuredValueShortWithCP56Time2a
         return lib.MeasuredValueShortWithCP56Time2a_create(
             pMeasuredValueShortWithCP56Time2a(self),
-            c_int(ioa),
-            c_float(value),
-            c_int(quality),
+            ioa,
+            value,
+            quality,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.MeasuredValueShortWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.MeasuredValueShortWithCP56Time2a_getTimestamp(pMeasuredValueShortWithCP56Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -1397,16 +1286,14 @@ class MeasuredValueShortWithCP56Time2a(ctypes.Structure, IOBase):
             pCP56Time2a(value))
 
     def get_value(self):
-        lib.MeasuredValueShort_getValue.restype = c_float
         return lib.MeasuredValueShort_getValue(pMeasuredValueShort(self))
 
     def set_value(self, value):
         lib.MeasuredValueShort_setValue(
             pMeasuredValueShort(self),
-            c_float(value))
+            value)
 
     def get_quality(self):
-        lib.MeasuredValueShort_getQuality.restype = c_uint8
         value = lib.MeasuredValueShort_getQuality(pMeasuredValueShort(self))
         return QualityDescriptor(value)
 
@@ -1429,15 +1316,13 @@ class IntegratedTotalsWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, timestamp)
 
     def create(self, ioa, value, timestamp):
-        lib.IntegratedTotalsWithCP56Time2a_create.restype = pIntegratedTotalsWithCP56Time2a
         return lib.IntegratedTotalsWithCP56Time2a_create(
             pIntegratedTotalsWithCP56Time2a(self),
-            c_int(ioa),
+            ioa,
             pBinaryCounterReading(value),
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.IntegratedTotalsWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.IntegratedTotalsWithCP56Time2a_getTimestamp(pIntegratedTotalsWithCP56Time2a(self)).contents
 
     def set_timestamp(self, value):
@@ -1446,7 +1331,6 @@ class IntegratedTotalsWithCP56Time2a(ctypes.Structure, IOBase):
             pCP56Time2a(value))
 
     def get_bcr(self):
-        lib.IntegratedTotals_getBCR.restype = pBinaryCounterReading
         return lib.IntegratedTotals_getBCR(pIntegratedTotals(self)).contents
 
     def set_bcr(self, value):
@@ -1474,24 +1358,20 @@ class EventOfProtectionEquipmentWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, event, elapsedTime, timestamp)
 
     def create(self, ioa, event, elapsedTime, timestamp):
-        lib.EventOfProtectionEquipmentWithCP56Time2a_create.restype = pEventOfProtectionEquipmentWithCP56Time2a
         return lib.EventOfProtectionEquipmentWithCP56Time2a_create(
             pEventOfProtectionEquipmentWithCP56Time2a(self),
-            c_int(ioa),
+            ioa,
             pSingleEvent(event),
             pCP16Time2a(elapsedTime),
             timestamp.pointer).contents
 
     def get_event(self):
-        lib.EventOfProtectionEquipmentWithCP56Time2a_getEvent.restype = pSingleEvent
         return lib.EventOfProtectionEquipmentWithCP56Time2a_getEvent(pEventOfProtectionEquipmentWithCP56Time2a(self)).contents
 
     def get_elapsed_time(self):
-        lib.EventOfProtectionEquipmentWithCP56Time2a_getElapsedTime.restype = pCP16Time2a
         return lib.EventOfProtectionEquipmentWithCP56Time2a_getElapsedTime(pEventOfProtectionEquipmentWithCP56Time2a(self)).contents
 
     def get_timestamp(self):
-        lib.EventOfProtectionEquipmentWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.EventOfProtectionEquipmentWithCP56Time2a_getTimestamp(pEventOfProtectionEquipmentWithCP56Time2a(self)).contents
 
 pEventOfProtectionEquipmentWithCP56Time2a = ctypes.POINTER(EventOfProtectionEquipmentWithCP56Time2a)
@@ -1515,30 +1395,25 @@ class PackedStartEventsOfProtectionEquipmentWithCP56Time2a(ctypes.Structure, IOB
         self.create(ioa, event, qdp, elapsedTime, timestamp)
 
     def create(self, ioa, event, qdp, elapsedTime, timestamp):
-        lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_create.restype = pPackedStartEventsOfProtectionEquipmentWithCP56Time2a
         return lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_create(
             pPackedStartEventsOfProtectionEquipmentWithCP56Time2a(self),
-            c_int(ioa),
-            StartEvent(event),
-            c_int(qdp),
+            ioa,
+            event,
+            qdp,
             pCP16Time2a(elapsedTime),
             timestamp.pointer).contents
 
     def get_event(self):
-        lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getEvent.restype = StartEvent
         return lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getEvent(pPackedStartEventsOfProtectionEquipmentWithCP56Time2a(self))
 
     def get_quality(self):
-        lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getQuality.restype = c_uint8
         value = lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getQuality(pPackedStartEventsOfProtectionEquipmentWithCP56Time2a(self))
         return QualityDescriptor(value)
 
     def get_elapsed_time(self):
-        lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getElapsedTime.restype = pCP16Time2a
         return lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getElapsedTime(pPackedStartEventsOfProtectionEquipmentWithCP56Time2a(self)).contents
 
     def get_timestamp(self):
-        lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getTimestamp(pPackedStartEventsOfProtectionEquipmentWithCP56Time2a(self)).contents
 
 pPackedStartEventsOfProtectionEquipmentWithCP56Time2a = ctypes.POINTER(PackedStartEventsOfProtectionEquipmentWithCP56Time2a)
@@ -1562,30 +1437,25 @@ class PackedOutputCircuitInfoWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, oci, qdp, operatingTime, timestamp)
 
     def create(self, ioa, oci, qdp, operatingTime, timestamp):
-        lib.PackedOutputCircuitInfoWithCP56Time2a_create.restype = pPackedOutputCircuitInfoWithCP56Time2a
         return lib.PackedOutputCircuitInfoWithCP56Time2a_create(
             pPackedOutputCircuitInfoWithCP56Time2a(self),
-            c_int(ioa),
-            OutputCircuitInfo(oci),
-            c_int(qdp),
+            ioa,
+            oci,
+            qdp,
             pCP16Time2a(operatingTime),
             timestamp.pointer).contents
 
     def get_oci(self):
-        lib.PackedOutputCircuitInfoWithCP56Time2a_getOCI.restype = OutputCircuitInfo
         return lib.PackedOutputCircuitInfoWithCP56Time2a_getOCI(pPackedOutputCircuitInfoWithCP56Time2a(self))
 
     def get_quality(self):
-        lib.PackedOutputCircuitInfoWithCP56Time2a_getQuality.restype = c_uint8
         value = lib.PackedOutputCircuitInfoWithCP56Time2a_getQuality(pPackedOutputCircuitInfoWithCP56Time2a(self))
         return QualityDescriptor(value)
 
     def get_operating_time(self):
-        lib.PackedOutputCircuitInfoWithCP56Time2a_getOperatingTime.restype = pCP16Time2a
         return lib.PackedOutputCircuitInfoWithCP56Time2a_getOperatingTime(pPackedOutputCircuitInfoWithCP56Time2a(self)).contents
 
     def get_timestamp(self):
-        lib.PackedOutputCircuitInfoWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.PackedOutputCircuitInfoWithCP56Time2a_getTimestamp(pPackedOutputCircuitInfoWithCP56Time2a(self)).contents
 
 pPackedOutputCircuitInfoWithCP56Time2a = ctypes.POINTER(PackedOutputCircuitInfoWithCP56Time2a)
@@ -1605,27 +1475,23 @@ class SingleCommand(ctypes.Structure, IOBase):
         self.create(ioa, command, selectCommand, qu)
 
     def create(self, ioa, command, selectCommand, qu):
-        lib.SingleCommand_create.restype = pSingleCommand
         return lib.SingleCommand_create(
             pSingleCommand(self),
-            c_int(ioa),
-            c_bool(command),
-            c_bool(selectCommand),
-            c_int(qu)).contents
+            ioa,
+            command,
+            selectCommand,
+            qu).contents
 
     def get_qu(self):
-        lib.SingleCommand_getQU.restype = c_int
         return lib.SingleCommand_getQU(pSingleCommand(self))
 
     def get_value(self):
         return self.get_state()
 
     def get_state(self):
-        lib.SingleCommand_getState.restype = c_bool
         return lib.SingleCommand_getState(pSingleCommand(self))
 
     def is_select(self):
-        lib.SingleCommand_isSelect.restype = c_bool
         return lib.SingleCommand_isSelect(pSingleCommand(self))
 
 pSingleCommand = ctypes.POINTER(SingleCommand)
@@ -1645,27 +1511,23 @@ class DoubleCommand(ctypes.Structure, IOBase):
         self.create(ioa, command, selectCommand, qu)
 
     def create(self, ioa, command, selectCommand, qu):
-        lib.DoubleCommand_create.restype = pDoubleCommand
         return lib.DoubleCommand_create(
             pDoubleCommand(self),
-            c_int(ioa),
-            c_int(command),
-            c_bool(selectCommand),
-            c_int(qu)).contents
+            ioa,
+            command,
+            selectCommand,
+            qu).contents
 
     def get_qu(self):
-        lib.DoubleCommand_getQU.restype = c_int
         return lib.DoubleCommand_getQU(pDoubleCommand(self))
 
     def get_value(self):
         return self.get_state()
 
     def get_state(self):
-        lib.DoubleCommand_getState.restype = c_int
         return lib.DoubleCommand_getState(pDoubleCommand(self))
 
     def is_select(self):
-        lib.DoubleCommand_isSelect.restype = c_bool
         return lib.DoubleCommand_isSelect(pDoubleCommand(self))
 
 pDoubleCommand = ctypes.POINTER(DoubleCommand)
@@ -1685,27 +1547,23 @@ class StepCommand(ctypes.Structure, IOBase):
         self.create(ioa, command, selectCommand, qu)
 
     def create(self, ioa, command, selectCommand, qu):
-        lib.StepCommand_create.restype = pStepCommand
         return lib.StepCommand_create(
             pStepCommand(self),
-            c_int(ioa),
-            StepCommandValue(command),
-            c_bool(selectCommand),
-            c_int(qu)).contents
+            ioa,
+            command,
+            selectCommand,
+            qu).contents
 
     def get_qu(self):
-        lib.StepCommand_getQU.restype = c_int
         return lib.StepCommand_getQU(pStepCommand(self))
 
     def get_value(self):
         return self.get_state()
 
     def get_state(self):
-        lib.StepCommand_getState.restype = StepCommandValue
-        return lib.StepCommand_getState(pStepCommand(self)).contents
+        return lib.StepCommand_getState(pStepCommand(self))
 
     def is_select(self):
-        lib.StepCommand_isSelect.restype = c_bool
         return lib.StepCommand_isSelect(pStepCommand(self))
 
 pStepCommand = ctypes.POINTER(StepCommand)
@@ -1729,37 +1587,31 @@ class SetpointCommandNormalized(ctypes.Structure, IOBase):
             self.create_scaled(ioa, value, selectCommand, ql)
 
     def create(self, ioa, value, selectCommand, ql):
-        lib.SetpointCommandNormalized_create.restype = pSetpointCommandNormalized
         return lib.SetpointCommandNormalized_create(
             pSetpointCommandNormalized(self),
-            c_int(ioa),
-            c_float(value),
-            c_bool(selectCommand),
-            c_int(ql)).contents
+            ioa,
+            value,
+            selectCommand,
+            ql).contents
 
     def create_scaled(self, ioa, value, selectCommand, ql):
-        lib.SetpointCommandNormalized_create_scaled.restype = pSetpointCommandNormalized
         return lib.SetpointCommandNormalized_create_scaled(
             pSetpointCommandNormalized(self),
-            c_int(ioa),
-            c_int(value),
-            c_bool(selectCommand),
-            c_int(ql)).contents
+            ioa,
+            value,
+            selectCommand,
+            ql).contents
 
     def get_value(self, as_scaled=False):
         if not as_scaled:
-            lib.SetpointCommandNormalized_getValue.restype = c_float
             return lib.SetpointCommandNormalized_getValue(pSetpointCommandNormalized(self))
         else:
-            lib.SetpointCommandNormalized_getValue.restype = c_int
             return lib.SetpointCommandNormalized_getScaledValue(pSetpointCommandNormalized(self))
 
     def get_ql(self):
-        lib.SetpointCommandNormalized_getQL.restype = c_int
         return lib.SetpointCommandNormalized_getQL(pSetpointCommandNormalized(self))
 
     def is_select(self):
-        lib.SetpointCommandNormalized_isSelect.restype = c_bool
         return lib.SetpointCommandNormalized_isSelect(pSetpointCommandNormalized(self))
 
 pSetpointCommandNormalized = ctypes.POINTER(SetpointCommandNormalized)
@@ -1780,24 +1632,20 @@ class SetpointCommandScaled(ctypes.Structure, IOBase):
         self.create(ioa, value, selectCommand, ql)
 
     def create(self, ioa, value, selectCommand, ql):
-        lib.SetpointCommandScaled_create.restype = pSetpointCommandScaled
         return lib.SetpointCommandScaled_create(
             pSetpointCommandScaled(self),
-            c_int(ioa),
-            c_int(value),
-            c_bool(selectCommand),
-            c_int(ql)).contents
+            ioa,
+            value,
+            selectCommand,
+            ql).contents
 
     def get_value(self):
-        lib.SetpointCommandScaled_getValue.restype = c_int
         return lib.SetpointCommandScaled_getValue(pSetpointCommandScaled(self))
 
     def get_ql(self):
-        lib.SetpointCommandScaled_getQL.restype = c_int
         return lib.SetpointCommandScaled_getQL(pSetpointCommandScaled(self))
 
     def is_select(self):
-        lib.SetpointCommandScaled_isSelect.restype = c_bool
         return lib.SetpointCommandScaled_isSelect(pSetpointCommandScaled(self))
 
 pSetpointCommandScaled = ctypes.POINTER(SetpointCommandScaled)
@@ -1818,24 +1666,20 @@ class SetpointCommandShort(ctypes.Structure, IOBase):
         self.create(ioa, value, selectCommand, ql)
 
     def create(self, ioa, value, selectCommand, ql):
-        lib.SetpointCommandShort_create.restype = pSetpointCommandShort
         return lib.SetpointCommandShort_create(
             pSetpointCommandShort(self),
-            c_int(ioa),
-            c_float(value),
-            c_bool(selectCommand),
-            c_int(ql)).contents
+            ioa,
+            value,
+            selectCommand,
+            ql).contents
 
     def get_value(self):
-        lib.SetpointCommandShort_getValue.restype = c_float
         return lib.SetpointCommandShort_getValue(pSetpointCommandShort(self))
 
     def get_ql(self):
-        lib.SetpointCommandShort_getQL.restype = c_int
         return lib.SetpointCommandShort_getQL(pSetpointCommandShort(self))
 
     def is_select(self):
-        lib.SetpointCommandShort_isSelect.restype = c_bool
         return lib.SetpointCommandShort_isSelect(pSetpointCommandShort(self))
 
 pSetpointCommandShort = ctypes.POINTER(SetpointCommandShort)
@@ -1855,14 +1699,12 @@ class Bitstring32Command(ctypes.Structure, IOBase):
         self.create(ioa, value)
 
     def create(self, ioa, value):
-        lib.Bitstring32Command_create.restype = pBitstring32Command
         return lib.Bitstring32Command_create(
             pBitstring32Command(self),
-            c_int(ioa),
-            c_uint32(value)).contents
+            ioa,
+            value).contents
 
     def get_value(self):
-        lib.Bitstring32Command_getValue.restype = c_uint32
         return lib.Bitstring32Command_getValue(pBitstring32Command(self))
 
 pBitstring32Command = ctypes.POINTER(Bitstring32Command)
@@ -1884,32 +1726,27 @@ class SingleCommandWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, command, selectCommand, qu, timestamp)
 
     def create(self, ioa, command, selectCommand, qu, timestamp):
-        lib.SingleCommandWithCP56Time2a_create.restype = pSingleCommandWithCP56Time2a
         return lib.SingleCommandWithCP56Time2a_create(
             pSingleCommandWithCP56Time2a(self),
-            c_int(ioa),
-            c_bool(command),
-            c_bool(selectCommand),
-            c_int(qu),
+            ioa,
+            command,
+            selectCommand,
+            qu,
             timestamp.pointer).contents
 
     def get_timestamp(self):
-        lib.SingleCommandWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.SingleCommandWithCP56Time2a_getTimestamp(pSingleCommandWithCP56Time2a(self)).contents
 
     def get_qu(self):
-        lib.SingleCommand_getQU.restype = c_int
         return lib.SingleCommand_getQU(pSingleCommand(self))
 
     def get_value(self):
         return self.get_state()
 
     def get_state(self):
-        lib.SingleCommand_getState.restype = c_bool
         return lib.SingleCommand_getState(pSingleCommand(self))
 
     def is_select(self):
-        lib.SingleCommand_isSelect.restype = c_bool
         return lib.SingleCommand_isSelect(pSingleCommand(self))
 
 pSingleCommandWithCP56Time2a = ctypes.POINTER(SingleCommandWithCP56Time2a)
@@ -1931,28 +1768,24 @@ class DoubleCommandWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, command, selectCommand, qu, timestamp)
 
     def create(self, ioa, command, selectCommand, qu, timestamp):
-        lib.DoubleCommandWithCP56Time2a_create.restype = pDoubleCommandWithCP56Time2a
         return lib.DoubleCommandWithCP56Time2a_create(
             pDoubleCommandWithCP56Time2a(self),
-            c_int(ioa),
-            c_int(command),
-            c_bool(selectCommand),
-            c_int(qu),
+            ioa,
+            command,
+            selectCommand,
+            qu,
             timestamp.pointer).contents
 
     def get_qu(self):
-        lib.DoubleCommandWithCP56Time2a_getQU.restype = c_int
         return lib.DoubleCommandWithCP56Time2a_getQU(pDoubleCommandWithCP56Time2a(self))
 
     def get_value(self):
         return self.get_state()
 
     def get_state(self):
-        lib.DoubleCommandWithCP56Time2a_getState.restype = c_int
         return lib.DoubleCommandWithCP56Time2a_getState(pDoubleCommandWithCP56Time2a(self))
 
     def is_select(self):
-        lib.DoubleCommandWithCP56Time2a_isSelect.restype = c_bool
         return lib.DoubleCommandWithCP56Time2a_isSelect(pDoubleCommandWithCP56Time2a(self))
 
 pDoubleCommandWithCP56Time2a = ctypes.POINTER(DoubleCommandWithCP56Time2a)
@@ -1974,28 +1807,24 @@ class StepCommandWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, command, selectCommand, qu, timestamp)
 
     def create(self, ioa, command, selectCommand, qu, timestamp):
-        lib.StepCommandWithCP56Time2a_create.restype = pStepCommandWithCP56Time2a
         return lib.StepCommandWithCP56Time2a_create(
             pStepCommandWithCP56Time2a(self),
-            c_int(ioa),
-            StepCommandValue(command),
-            c_bool(selectCommand),
-            c_int(qu),
+            ioa,
+            command,
+            selectCommand,
+            qu,
             timestamp.pointer).contents
 
     def get_qu(self):
-        lib.StepCommandWithCP56Time2a_getQU.restype = c_int
         return lib.StepCommandWithCP56Time2a_getQU(pStepCommandWithCP56Time2a(self))
 
     def get_value(self):
         return self.get_state()
 
     def get_state(self):
-        lib.StepCommandWithCP56Time2a_getState.restype = StepCommandValue
-        return lib.StepCommandWithCP56Time2a_getState(pStepCommandWithCP56Time2a(self)).contents
+        return lib.StepCommandWithCP56Time2a_getState(pStepCommandWithCP56Time2a(self))
 
     def is_select(self):
-        lib.StepCommandWithCP56Time2a_isSelect.restype = c_bool
         return lib.StepCommandWithCP56Time2a_isSelect(pStepCommandWithCP56Time2a(self))
 
 pStepCommandWithCP56Time2a = ctypes.POINTER(StepCommandWithCP56Time2a)
@@ -2018,25 +1847,21 @@ class SetpointCommandNormalizedWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, selectCommand, ql, timestamp)
 
     def create(self, ioa, value, selectCommand, ql, timestamp):
-        lib.SetpointCommandNormalizedWithCP56Time2a_create.restype = pSetpointCommandNormalizedWithCP56Time2a
         return lib.SetpointCommandNormalizedWithCP56Time2a_create(
             pSetpointCommandNormalizedWithCP56Time2a(self),
-            c_int(ioa),
-            c_float(value),
-            c_bool(selectCommand),
-            c_int(ql),
+            ioa,
+            value,
+            selectCommand,
+            ql,
             timestamp.pointer).contents
 
     def get_value(self):
-        lib.SetpointCommandNormalizedWithCP56Time2a_getValue.restype = c_float
         return lib.SetpointCommandNormalizedWithCP56Time2a_getValue(pSetpointCommandNormalizedWithCP56Time2a(self))
 
     def get_ql(self):
-        lib.SetpointCommandNormalizedWithCP56Time2a_getQL.restype = c_int
         return lib.SetpointCommandNormalizedWithCP56Time2a_getQL(pSetpointCommandNormalizedWithCP56Time2a(self))
 
     def is_select(self):
-        lib.SetpointCommandNormalizedWithCP56Time2a_isSelect.restype = c_bool
         return lib.SetpointCommandNormalizedWithCP56Time2a_isSelect(pSetpointCommandNormalizedWithCP56Time2a(self))
 
 pSetpointCommandNormalizedWithCP56Time2a = ctypes.POINTER(SetpointCommandNormalizedWithCP56Time2a)
@@ -2059,25 +1884,21 @@ class SetpointCommandScaledWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, selectCommand, ql, timestamp)
 
     def create(self, ioa, value, selectCommand, ql, timestamp):
-        lib.SetpointCommandScaledWithCP56Time2a_create.restype = pSetpointCommandScaledWithCP56Time2a
         return lib.SetpointCommandScaledWithCP56Time2a_create(
             pSetpointCommandScaledWithCP56Time2a(self),
-            c_int(ioa),
-            c_int(value),
-            c_bool(selectCommand),
-            c_int(ql),
+            ioa,
+            value,
+            selectCommand,
+            ql,
             timestamp.pointer).contents
 
     def get_value(self):
-        lib.SetpointCommandScaledWithCP56Time2a_getValue.restype = c_int
         return lib.SetpointCommandScaledWithCP56Time2a_getValue(pSetpointCommandScaledWithCP56Time2a(self))
 
     def get_ql(self):
-        lib.SetpointCommandScaledWithCP56Time2a_getQL.restype = c_int
         return lib.SetpointCommandScaledWithCP56Time2a_getQL(pSetpointCommandScaledWithCP56Time2a(self))
 
     def is_select(self):
-        lib.SetpointCommandScaledWithCP56Time2a_isSelect.restype = c_bool
         return lib.SetpointCommandScaledWithCP56Time2a_isSelect(pSetpointCommandScaledWithCP56Time2a(self))
 
 pSetpointCommandScaledWithCP56Time2a = ctypes.POINTER(SetpointCommandScaledWithCP56Time2a)
@@ -2100,25 +1921,21 @@ class SetpointCommandShortWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, selectCommand, ql, timestamp)
 
     def create(self, ioa, value, selectCommand, ql, timestamp):
-        lib.SetpointCommandShortWithCP56Time2a_create.restype = pSetpointCommandShortWithCP56Time2a
         return lib.SetpointCommandShortWithCP56Time2a_create(
             pSetpointCommandShortWithCP56Time2a(self),
-            c_int(ioa),
-            c_float(value),
-            c_bool(selectCommand),
-            c_int(ql),
+            ioa,
+            value,
+            selectCommand,
+            ql,
             timestamp.pointer).contents
 
     def get_value(self):
-        lib.SetpointCommandShortWithCP56Time2a_getValue.restype = c_float
         return lib.SetpointCommandShortWithCP56Time2a_getValue(pSetpointCommandShortWithCP56Time2a(self))
 
     def get_ql(self):
-        lib.SetpointCommandShortWithCP56Time2a_getQL.restype = c_int
         return lib.SetpointCommandShortWithCP56Time2a_getQL(pSetpointCommandShortWithCP56Time2a(self))
 
     def is_select(self):
-        lib.SetpointCommandShortWithCP56Time2a_isSelect.restype = c_bool
         return lib.SetpointCommandShortWithCP56Time2a_isSelect(pSetpointCommandShortWithCP56Time2a(self))
 
 pSetpointCommandShortWithCP56Time2a = ctypes.POINTER(SetpointCommandShortWithCP56Time2a)
@@ -2140,19 +1957,16 @@ class Bitstring32CommandWithCP56Time2a(ctypes.Structure, IOBase):
         self.create(ioa, value, timestamp)
 
     def create(self, ioa, value, timestamp):
-        lib.Bitstring32CommandWithCP56Time2a_create.restype = pBitstring32CommandWithCP56Time2a
         return lib.Bitstring32CommandWithCP56Time2a_create(
             pBitstring32CommandWithCP56Time2a(self),
-            c_int(ioa),
-            c_uint32(value),
+            ioa,
+            value,
             timestamp.pointer).contents
 
     def get_value(self):
-        lib.Bitstring32CommandWithCP56Time2a_getValue.restype = c_uint32
         return lib.Bitstring32CommandWithCP56Time2a_getValue(pBitstring32CommandWithCP56Time2a(self))
 
     def get_timestamp(self):
-        lib.Bitstring32CommandWithCP56Time2a_getTimestamp.restype = pCP56Time2a
         return lib.Bitstring32CommandWithCP56Time2a_getTimestamp(pBitstring32CommandWithCP56Time2a(self)).contents
 
 pBitstring32CommandWithCP56Time2a = ctypes.POINTER(Bitstring32CommandWithCP56Time2a)
@@ -2172,13 +1986,11 @@ class EndOfInitialization(ctypes.Structure, IOBase):
         self.create(coi)
 
     def create(self, coi):
-        lib.EndOfInitialization_create.restype = pEndOfInitialization
         return lib.EndOfInitialization_create(
             pEndOfInitialization(self),
-            c_uint8(coi)).contents
+            coi).contents
 
     def get_coi(self):
-        lib.EndOfInitialization_getCOI.restype = c_uint8
         return lib.EndOfInitialization_getCOI(pEndOfInitialization(self))
 
 pEndOfInitialization = ctypes.POINTER(EndOfInitialization)
@@ -2198,14 +2010,12 @@ class InterrogationCommand(ctypes.Structure, IOBase):
         self.create(ioa, qoi)
 
     def create(self, ioa, qoi):
-        lib.InterrogationCommand_create.restype = pInterrogationCommand
         return lib.InterrogationCommand_create(
             pInterrogationCommand(self),
-            c_int(ioa),
-            c_uint8(qoi)).contents
+            ioa,
+            qoi).contents
 
     def get_qoi(self):
-        lib.InterrogationCommand_getQOI.restype = c_uint8
         return lib.InterrogationCommand_getQOI(pInterrogationCommand(self))
 
 pInterrogationCommand = ctypes.POINTER(InterrogationCommand)
@@ -2225,15 +2035,13 @@ class CounterInterrogationCommand(ctypes.Structure, IOBase):
         self.create(ioa, qcc)
 
     def create(self, ioa, qcc):
-        lib.CounterInterrogationCommand_create.restype = pCounterInterrogationCommand
         return lib.CounterInterrogationCommand_create(
             pCounterInterrogationCommand(self),
-            c_int(ioa),
-            pQualifierOfCIC(qcc)).contents
+            ioa,
+            qcc).contents
 
     def get_qcc(self):
-        lib.CounterInterrogationCommand_getQCC.restype = pQualifierOfCIC
-        return lib.CounterInterrogationCommand_getQCC(pCounterInterrogationCommand(self)).contents
+        return lib.CounterInterrogationCommand_getQCC(pCounterInterrogationCommand(self))
 
 pCounterInterrogationCommand = ctypes.POINTER(CounterInterrogationCommand)
 
@@ -2251,10 +2059,9 @@ class ReadCommand(ctypes.Structure, IOBase):
         self.create(ioa)
 
     def create(self, ioa):
-        lib.ReadCommand_create.restype = pReadCommand
         return lib.ReadCommand_create(
             pReadCommand(self),
-            c_int(ioa)).contents
+            ioa).contents
 
 pReadCommand = ctypes.POINTER(ReadCommand)
 
@@ -2273,14 +2080,12 @@ class ClockSynchronizationCommand(ctypes.Structure, IOBase):
         self.create(ioa, timestamp)
 
     def create(self, ioa, timestamp):
-        lib.ClockSynchronizationCommand_create.restype = pClockSynchronizationCommand
         return lib.ClockSynchronizationCommand_create(
             pClockSynchronizationCommand(self),
-            c_int(ioa),
+            ioa,
             timestamp.pointer).contents
 
     def get_time(self):
-        lib.ClockSynchronizationCommand_getTime.restype = pCP56Time2a
         return lib.ClockSynchronizationCommand_getTime(pClockSynchronizationCommand(self)).contents
 
 pClockSynchronizationCommand = ctypes.POINTER(ClockSynchronizationCommand)
@@ -2300,14 +2105,12 @@ class ResetProcessCommand(ctypes.Structure, IOBase):
         self.create(ioa, qrp)
 
     def create(self, ioa, qrp):
-        lib.ResetProcessCommand_create.restype = pResetProcessCommand
         return lib.ResetProcessCommand_create(
             pResetProcessCommand(self),
-            c_int(ioa),
-            QualifierOfRPC(qrp)).contents
+            ioa,
+            qrp).contents
 
     def get_qrp(self):
-        lib.ResetProcessCommand_getQRP.restype = QualifierOfRPC
         return lib.ResetProcessCommand_getQRP(pResetProcessCommand(self))
 
 pResetProcessCommand = ctypes.POINTER(ResetProcessCommand)
@@ -2327,14 +2130,12 @@ class DelayAcquisitionCommand(ctypes.Structure, IOBase):
         self.create(ioa, delay)
 
     def create(self, ioa, delay):
-        lib.DelayAcquisitionCommand_create.restype = pDelayAcquisitionCommand
         return lib.DelayAcquisitionCommand_create(
             pDelayAcquisitionCommand(self),
-            c_int(ioa),
+            ioa,
             pCP16Time2a(delay)).contents
 
     def get_delay(self):
-        lib.DelayAcquisitionCommand_getDelay.restype = pCP16Time2a
         return lib.DelayAcquisitionCommand_getDelay(pDelayAcquisitionCommand(self)).contents
 
 pDelayAcquisitionCommand = ctypes.POINTER(DelayAcquisitionCommand)
@@ -2347,25 +2148,22 @@ class ParameterNormalizedValue(MeasuredValueNormalized):
         self.create(ioa, value, qpm)
 
     def create(self, ioa, value, qpm):
-        lib.ParameterNormalizedValue_create.restype = pParameterNormalizedValue
         return lib.ParameterNormalizedValue_create(
             pParameterNormalizedValue(self),
-            c_int(ioa),
-            c_float(value),
-            pQualifierOfParameterMV(qpm)).contents
+            ioa,
+            value,
+            qpm).contents
 
     def get_value(self):
-        lib.ParameterNormalizedValue_getValue.restype = c_float
         return lib.ParameterNormalizedValue_getValue(pParameterNormalizedValue(self))
 
     def set_value(self, value):
         lib.ParameterNormalizedValue_setValue(
             pParameterNormalizedValue(self),
-            c_float(value))
+            value)
 
     def get_qpm(self):
-        lib.ParameterNormalizedValue_getQPM.restype = pQualifierOfParameterMV
-        return lib.ParameterNormalizedValue_getQPM(pParameterNormalizedValue(self)).contents
+        return lib.ParameterNormalizedValue_getQPM(pParameterNormalizedValue(self))
 
 pParameterNormalizedValue = ctypes.POINTER(ParameterNormalizedValue)
 
@@ -2377,25 +2175,22 @@ class ParameterScaledValue(MeasuredValueScaled):
         self.create(ioa, value, qpm)
 
     def create(self, ioa, value, qpm):
-        lib.ParameterScaledValue_create.restype = pParameterScaledValue
         return lib.ParameterScaledValue_create(
             pParameterScaledValue(self),
-            c_int(ioa),
-            c_int(value),
-            pQualifierOfParameterMV(qpm)).contents
+            ioa,
+            value,
+            qpm).contents
 
     def get_value(self):
-        lib.ParameterScaledValue_getValue.restype = c_int
         return lib.ParameterScaledValue_getValue(pParameterScaledValue(self))
 
     def set_value(self, value):
         lib.ParameterScaledValue_setValue(
             pParameterScaledValue(self),
-            c_int(value))
+            value)
 
     def get_qpm(self):
-        lib.ParameterScaledValue_getQPM.restype = pQualifierOfParameterMV
-        return lib.ParameterScaledValue_getQPM(pParameterScaledValue(self)).contents
+        return lib.ParameterScaledValue_getQPM(pParameterScaledValue(self))
 
 pParameterScaledValue = ctypes.POINTER(ParameterScaledValue)
 
@@ -2407,25 +2202,22 @@ class ParameterFloatValue(MeasuredValueShort):
         self.create(ioa, value, qpm)
 
     def create(self, ioa, value, qpm):
-        lib.ParameterFloatValue_create.restype = pParameterFloatValue
         return lib.ParameterFloatValue_create(
             pParameterFloatValue(self),
-            c_int(ioa),
-            c_float(value),
-            pQualifierOfParameterMV(qpm)).contents
+            ioa,
+            value,
+            qpm).contents
 
     def get_value(self):
-        lib.ParameterFloatValue_getValue.restype = c_float
         return lib.ParameterFloatValue_getValue(pParameterFloatValue(self))
 
     def set_value(self, value):
         lib.ParameterFloatValue_setValue(
             pParameterFloatValue(self),
-            c_float(value))
+            value)
 
     def get_qpm(self):
-        lib.ParameterFloatValue_getQPM.restype = pQualifierOfParameterMV
-        return lib.ParameterFloatValue_getQPM(pParameterFloatValue(self)).contents
+        return lib.ParameterFloatValue_getQPM(pParameterFloatValue(self))
 
 pParameterFloatValue = ctypes.POINTER(ParameterFloatValue)
 
@@ -2444,14 +2236,12 @@ class ParameterActivation(ctypes.Structure, IOBase):
         self.create(ioa, qpa)
 
     def create(self, ioa, qpa):
-        lib.ParameterActivation_create.restype = pParameterActivation
         return lib.ParameterActivation_create(
             pParameterActivation(self),
-            c_int(ioa),
-            QualifierOfParameterActivation(qpa)).contents
+            ioa,
+            qpa).contents
 
     def get_quality(self):
-        lib.ParameterActivation_getQuality.restype = QualifierOfParameterActivation
         value = lib.ParameterActivation_getQuality(pParameterActivation(self))
         return QualityDescriptor(value)
 
@@ -2474,33 +2264,28 @@ class FileReady(ctypes.Structure, IOBase):
         self.create(ioa, nof, lengthOfFile, positive)
 
     def create(self, ioa, nof, lengthOfFile, positive):
-        lib.FileReady_create.restype = pFileReady
         return lib.FileReady_create(
             pFileReady(self),
-            c_int(ioa),
-            c_uint16(nof),
-            c_uint32(lengthOfFile),
-            c_bool(positive)).contents
+            ioa,
+            nof,
+            lengthOfFile,
+            positive).contents
 
     def get_frq(self):
-        lib.FileReady_getFRQ.restype = c_uint8
         return lib.FileReady_getFRQ(pFileReady(self))
 
     def set_frq(self, frq):
         lib.FileReady_setFRQ(
             pFileReady(self),
-            c_uint8(frq))
+            frq)
 
     def is_positive(self):
-        lib.FileReady_isPositive.restype = c_bool
         return lib.FileReady_isPositive(pFileReady(self))
 
     def get_nof(self):
-        lib.FileReady_getNOF.restype = c_uint16
         return lib.FileReady_getNOF(pFileReady(self))
 
     def get_length_of_file(self):
-        lib.FileReady_getLengthOfFile.restype = c_uint32
         return lib.FileReady_getLengthOfFile(pFileReady(self))
 
 pFileReady = ctypes.POINTER(FileReady)
@@ -2523,38 +2308,32 @@ class SectionReady(ctypes.Structure, IOBase):
         self.create(ioa, nof, nos, lengthOfSection, notReady)
 
     def create(self, ioa, nof, nos, lengthOfSection, notReady):
-        lib.SectionReady_create.restype = pSectionReady
         return lib.SectionReady_create(
             pSectionReady(self),
-            c_int(ioa),
-            c_uint16(nof),
-            c_uint8(nos),
-            c_uint32(lengthOfSection),
-            c_bool(notReady)).contents
+            ioa,
+            nof,
+            nos,
+            lengthOfSection,
+            notReady).contents
 
     def is_not_ready(self):
-        lib.SectionReady_isNotReady.restype = c_bool
         return lib.SectionReady_isNotReady(pSectionReady(self))
 
     def get_srq(self):
-        lib.SectionReady_getSRQ.restype = c_uint8
         return lib.SectionReady_getSRQ(pSectionReady(self))
 
     def set_srq(self, srq):
         lib.SectionReady_setSRQ(
             pSectionReady(self),
-            c_uint8(srq))
+            srq)
 
     def get_nof(self):
-        lib.SectionReady_getNOF.restype = c_uint16
         return lib.SectionReady_getNOF(pSectionReady(self))
 
     def get_name_of_section(self):
-        lib.SectionReady_getNameOfSection.restype = c_uint8
         return lib.SectionReady_getNameOfSection(pSectionReady(self))
 
     def get_length_of_section(self):
-        lib.SectionReady_getLengthOfSection.restype = c_uint32
         return lib.SectionReady_getLengthOfSection(pSectionReady(self))
 
 pSectionReady = ctypes.POINTER(SectionReady)
@@ -2576,24 +2355,20 @@ class FileCallOrSelect(ctypes.Structure, IOBase):
         self.create(ioa, nof, nos, scq)
 
     def create(self, ioa, nof, nos, scq):
-        lib.FileCallOrSelect_create.restype = pFileCallOrSelect
         return lib.FileCallOrSelect_create(
             pFileCallOrSelect(self),
-            c_int(ioa),
-            c_uint16(nof),
-            c_uint8(nos),
-            c_uint8(scq)).contents
+            ioa,
+            nof,
+            nos,
+            scq).contents
 
     def get_nof(self):
-        lib.FileCallOrSelect_getNOF.restype = c_uint16
         return lib.FileCallOrSelect_getNOF(pFileCallOrSelect(self))
 
     def get_name_of_section(self):
-        lib.FileCallOrSelect_getNameOfSection.restype = c_uint8
         return lib.FileCallOrSelect_getNameOfSection(pFileCallOrSelect(self))
 
     def get_scq(self):
-        lib.FileCallOrSelect_getSCQ.restype = c_uint8
         return lib.FileCallOrSelect_getSCQ(pFileCallOrSelect(self))
 
 pFileCallOrSelect = ctypes.POINTER(FileCallOrSelect)
@@ -2616,29 +2391,24 @@ class FileLastSegmentOrSection(ctypes.Structure, IOBase):
         self.create(ioa, nof, nos, lsq, chs)
 
     def create(self, ioa, nof, nos, lsq, chs):
-        lib.FileLastSegmentOrSection_create.restype = pFileLastSegmentOrSection
         return lib.FileLastSegmentOrSection_create(
             pFileLastSegmentOrSection(self),
-            c_int(ioa),
-            c_uint16(nof),
-            c_uint8(nos),
-            c_uint8(lsq),
-            c_uint8(chs)).contents
+            ioa,
+            nof,
+            nos,
+            lsq,
+            chs).contents
 
     def get_nof(self):
-        lib.FileLastSegmentOrSection_getNOF.restype = c_uint16
         return lib.FileLastSegmentOrSection_getNOF(pFileLastSegmentOrSection(self))
 
     def get_name_of_section(self):
-        lib.FileLastSegmentOrSection_getNameOfSection.restype = c_uint8
         return lib.FileLastSegmentOrSection_getNameOfSection(pFileLastSegmentOrSection(self))
 
     def get_lsq(self):
-        lib.FileLastSegmentOrSection_getLSQ.restype = c_uint8
         return lib.FileLastSegmentOrSection_getLSQ(pFileLastSegmentOrSection(self))
 
     def get_chs(self):
-        lib.FileLastSegmentOrSection_getCHS.restype = c_uint8
         return lib.FileLastSegmentOrSection_getCHS(pFileLastSegmentOrSection(self))
 
 pFileLastSegmentOrSection = ctypes.POINTER(FileLastSegmentOrSection)
@@ -2660,24 +2430,20 @@ class FileACK(ctypes.Structure, IOBase):
         self.create(ioa, nof, nos, afq)
 
     def create(self, ioa, nof, nos, afq):
-        lib.FileACK_create.restype = pFileACK
         return lib.FileACK_create(
             pFileACK(self),
-            c_int(ioa),
-            c_uint16(nof),
-            c_uint8(nos),
-            c_uint8(afq)).contents
+            ioa,
+            nof,
+            nos,
+            afq).contents
 
     def get_nof(self):
-        lib.FileACK_getNOF.restype = c_uint16
         return lib.FileACK_getNOF(pFileACK(self))
 
     def get_name_of_section(self):
-        lib.FileACK_getNameOfSection.restype = c_uint8
         return lib.FileACK_getNameOfSection(pFileACK(self))
 
     def get_afq(self):
-        lib.FileACK_getAFQ.restype = c_uint8
         return lib.FileACK_getAFQ(pFileACK(self))
 
 pFileACK = ctypes.POINTER(FileACK)
@@ -2700,33 +2466,27 @@ class FileSegment(ctypes.Structure, IOBase):
         self.create(ioa, nof, nos, data, los)
 
     def create(self, ioa, nof, nos, data, los):
-        lib.FileSegment_create.restype = pFileSegment
         return lib.FileSegment_create(
             pFileSegment(self),
-            c_int(ioa),
-            c_uint16(nof),
-            c_uint8(nos),
+            ioa,
+            nof,
+            nos,
             ctypes.POINTER(c_uint8)(data),
-            c_uint8(los)).contents
+            los).contents
 
     def get_nof(self):
-        lib.FileSegment_getNOF.restype = c_uint16
         return lib.FileSegment_getNOF(pFileSegment(self))
 
     def get_name_of_section(self):
-        lib.FileSegment_getNameOfSection.restype = c_uint8
         return lib.FileSegment_getNameOfSection(pFileSegment(self))
 
     def get_length_of_segment(self):
-        lib.FileSegment_getLengthOfSegment.restype = c_uint8
         return lib.FileSegment_getLengthOfSegment(pFileSegment(self))
 
     def get_segment_data(self):
-        lib.FileSegment_getSegmentData.restype = ctypes.POINTER(c_uint8)
         return lib.FileSegment_getSegmentData(pFileSegment(self))
 
     def get_max_data_size(parameters):
-        lib.FileSegment_GetMaxDataSize.restype = c_int
         return lib.FileSegment_GetMaxDataSize(parameters.pointer)
 
 pFileSegment = ctypes.POINTER(FileSegment)
@@ -2749,45 +2509,36 @@ class FileDirectory(ctypes.Structure, IOBase):
         self.create(ioa, nof, lengthOfFile, sof, creationTime)
 
     def create(self, ioa, nof, lengthOfFile, sof, creationTime):
-        lib.FileDirectory_create.restype = pFileDirectory
         return lib.FileDirectory_create(
             pFileDirectory(self),
-            c_int(ioa),
-            c_uint16(nof),
-            c_int(lengthOfFile),
-            c_uint8(sof),
+            ioa,
+            nof,
+            lengthOfFile,
+            sof,
             pCP56Time2a(creationTime)).contents
 
     def get_nof(self):
-        lib.FileDirectory_getNOF.restype = c_uint16
         return lib.FileDirectory_getNOF(pFileDirectory(self))
 
     def get_sof(self):
-        lib.FileDirectory_getSOF.restype = c_uint8
         return lib.FileDirectory_getSOF(pFileDirectory(self))
 
     def get_status(self):
-        lib.FileDirectory_getSTATUS.restype = c_int
         return lib.FileDirectory_getSTATUS(pFileDirectory(self))
 
     def get_lfd(self):
-        lib.FileDirectory_getLFD.restype = c_bool
         return lib.FileDirectory_getLFD(pFileDirectory(self))
 
     def get_for(self):
-        lib.FileDirectory_getFOR.restype = c_bool
         return lib.FileDirectory_getFOR(pFileDirectory(self))
 
     def get_fa(self):
-        lib.FileDirectory_getFA.restype = c_bool
         return lib.FileDirectory_getFA(pFileDirectory(self))
 
     def get_length_of_file(self):
-        lib.FileDirectory_getLengthOfFile.restype = c_uint8
         return lib.FileDirectory_getLengthOfFile(pFileDirectory(self))
 
     def get_creation_time(self):
-        lib.FileDirectory_getCreationTime.restype = pCP56Time2a
         return lib.FileDirectory_getCreationTime(pFileDirectory(self)).contents
 
 pFileDirectory = ctypes.POINTER(FileDirectory)
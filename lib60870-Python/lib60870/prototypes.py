@@ -0,0 +1,450 @@
+"""
+ctypes prototypes for every library function used by the wrapper
+
+restype and argtypes are declared once, when the package is loaded, so the
+wrapper methods can call straight into the library without reconfiguring the
+function pointer on every call. Arguments of information object functions are
+declared as c_void_p, because the wrappers pass pointers to related types
+(e.g. SinglePointWithCP24Time2a to SinglePointInformation_getValue).
+"""
+import logging
+import ctypes
+from ctypes import c_int, c_uint8, c_uint16, c_uint32, c_uint64, c_void_p, c_bool, c_float, c_char_p
+
+from lib60870 import lib60870
+from lib60870.common import pConnectionParameters, pT104ConnectionParameters, pBinaryCounterReading
+from lib60870.CP16Time2a import pCP16Time2a
+from lib60870.CP24Time2a import pCP24Time2a
+from lib60870.CP56Time2a import pCP56Time2a
+from lib60870.asdu import pASDU
+from lib60870.information_object import *
+
+logger = logging.getLogger(__name__)
+
+# type aliases
+c_uint8_p = ctypes.POINTER(c_uint8)
+
+
+_prototypes = [
+    # (function name, restype, argtypes)
+    # ASDU
+    ("ASDU_addInformationObject", c_bool, [pASDU, c_void_p]),
+    ("ASDU_createFromBuffer", pASDU, [pConnectionParameters, c_uint8_p, c_int]),
+    ("ASDU_getCA", c_int, [pASDU]),
+    ("ASDU_getCOT", c_int, [pASDU]),
+    ("ASDU_getElement", c_void_p, [pASDU, c_int]),
+    ("ASDU_getNumberOfElements", c_int, [pASDU]),
+    ("ASDU_getOA", c_int, [pASDU]),
+    ("ASDU_getTypeID", c_int, [pASDU]),
+    ("ASDU_isNegative", c_bool, [pASDU]),
+    ("ASDU_isSequence", c_bool, [pASDU]),
+    ("ASDU_isTest", c_bool, [pASDU]),
+    ("ASDU_setCA", None, [pASDU, c_int]),
+    ("ASDU_setCOT", None, [pASDU, c_int]),
+    ("ASDU_setNegative", None, [pASDU, c_bool]),
+    ("ASDU_setTest", None, [pASDU, c_bool]),
+
+    # CP16Time2a, CP24Time2a, CP56Time2a
+    ("CP16Time2a_getEplapsedTimeInMs", c_int, [pCP16Time2a]),
+    ("CP16Time2a_setEplapsedTimeInMs", None, [pCP16Time2a, c_int]),
+    ("CP24Time2a_getMillisecond", c_int, [pCP24Time2a]),
+    ("CP24Time2a_getMinute", c_int, [pCP24Time2a]),
+    ("CP24Time2a_getSecond", c_int, [pCP24Time2a]),
+    ("CP24Time2a_isInvalid", c_bool, [pCP24Time2a]),
+    ("CP24Time2a_isSubstituted", c_bool, [pCP24Time2a]),
+    ("CP24Time2a_setInvalid", None, [pCP24Time2a, c_bool]),
+    ("CP24Time2a_setMillisecond", None, [pCP24Time2a, c_int]),
+    ("CP24Time2a_setMinute", None, [pCP24Time2a, c_int]),
+    ("CP24Time2a_setSecond", None, [pCP24Time2a, c_int]),
+    ("CP24Time2a_setSubstituted", None, [pCP24Time2a, c_bool]),
+    ("CP56Time2a_getDayOfMonth", c_int, [pCP56Time2a]),
+    ("CP56Time2a_getDayOfWeek", c_int, [pCP56Time2a]),
+    ("CP56Time2a_getHour", c_int, [pCP56Time2a]),
+    ("CP56Time2a_getMillisecond", c_int, [pCP56Time2a]),
+    ("CP56Time2a_getMinute", c_int, [pCP56Time2a]),
+    ("CP56Time2a_getMonth", c_int, [pCP56Time2a]),
+    ("CP56Time2a_getSecond", c_int, [pCP56Time2a]),
+    ("CP56Time2a_getYear", c_int, [pCP56Time2a]),
+    ("CP56Time2a_isInvalid", c_bool, [pCP56Time2a]),
+    ("CP56Time2a_isSubstituted", c_bool, [pCP56Time2a]),
+    ("CP56Time2a_isSummerTime", c_bool, [pCP56Time2a]),
+    ("CP56Time2a_setDayOfMonth", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_setDayOfWeek", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_setFromMsTimestamp", None, [pCP56Time2a, c_uint64]),
+    ("CP56Time2a_setHour", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_setInvalid", None, [pCP56Time2a, c_bool]),
+    ("CP56Time2a_setMillisecond", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_setMinute", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_setMonth", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_setSecond", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_setSubstituted", None, [pCP56Time2a, c_bool]),
+    ("CP56Time2a_setSummerTime", None, [pCP56Time2a, c_bool]),
+    ("CP56Time2a_setYear", None, [pCP56Time2a, c_int]),
+    ("CP56Time2a_toMsTimestamp", c_uint64, [pCP56Time2a]),
+
+    # Information objects
+    ("BitString32_create", pBitString32, [c_void_p, c_int, c_uint32]),
+    ("BitString32_getQuality", c_uint8, [c_void_p]),
+    ("BitString32_getValue", c_uint32, [c_void_p]),
+    ("Bitstring32CommandWithCP56Time2a_create", pBitstring32CommandWithCP56Time2a, [c_void_p, c_int, c_uint32, pCP56Time2a]),
+    ("Bitstring32CommandWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("Bitstring32CommandWithCP56Time2a_getValue", c_uint32, [c_void_p]),
+    ("Bitstring32Command_create", pBitstring32Command, [c_void_p, c_int, c_uint32]),
+    ("Bitstring32Command_getValue", c_uint32, [c_void_p]),
+    ("Bitstring32WithCP24Time2a_create", pBitstring32WithCP24Time2a, [c_void_p, c_int, c_uint32, pCP24Time2a]),
+    ("Bitstring32WithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("Bitstring32WithCP56Time2a_create", pBitstring32WithCP56Time2a, [c_void_p, c_int, c_uint32, pCP56Time2a]),
+    ("Bitstring32WithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("ClockSynchronizationCommand_create", pClockSynchronizationCommand, [c_void_p, c_int, pCP56Time2a]),
+    ("ClockSynchronizationCommand_getTime", pCP56Time2a, [c_void_p]),
+    ("CounterInterrogationCommand_create", pCounterInterrogationCommand, [c_void_p, c_int, c_uint8]),
+    ("CounterInterrogationCommand_getQCC", c_uint8, [c_void_p]),
+    ("DelayAcquisitionCommand_create", pDelayAcquisitionCommand, [c_void_p, c_int, pCP16Time2a]),
+    ("DelayAcquisitionCommand_getDelay", pCP16Time2a, [c_void_p]),
+    ("DoubleCommandWithCP56Time2a_create", pDoubleCommandWithCP56Time2a, [c_void_p, c_int, c_int, c_bool, c_int, pCP56Time2a]),
+    ("DoubleCommandWithCP56Time2a_getQU", c_int, [c_void_p]),
+    ("DoubleCommandWithCP56Time2a_getState", c_int, [c_void_p]),
+    ("DoubleCommandWithCP56Time2a_isSelect", c_bool, [c_void_p]),
+    ("DoubleCommand_create", pDoubleCommand, [c_void_p, c_int, c_int, c_bool, c_int]),
+    ("DoubleCommand_getQU", c_int, [c_void_p]),
+    ("DoubleCommand_getState", c_int, [c_void_p]),
+    ("DoubleCommand_isSelect", c_bool, [c_void_p]),
+    ("DoublePointInformation_create", pDoublePointInformation, [c_void_p, c_int, c_int, c_uint8]),
+    ("DoublePointInformation_getQuality", c_uint8, [c_void_p]),
+    ("DoublePointInformation_getValue", c_int, [c_void_p]),
+    ("DoublePointWithCP24Time2a_create", pDoublePointWithCP24Time2a, [c_void_p, c_int, c_int, c_uint8, pCP24Time2a]),
+    ("DoublePointWithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("DoublePointWithCP56Time2a_create", pDoublePointWithCP56Time2a, [c_void_p, c_int, c_int, c_uint8, pCP56Time2a]),
+    ("DoublePointWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("EndOfInitialization_create", pEndOfInitialization, [c_void_p, c_uint8]),
+    ("EndOfInitialization_getCOI", c_uint8, [c_void_p]),
+    ("EventOfProtectionEquipmentWithCP56Time2a_create", pEventOfProtectionEquipmentWithCP56Time2a, [c_void_p, c_int, c_void_p, pCP16Time2a, pCP56Time2a]),
+    ("EventOfProtectionEquipmentWithCP56Time2a_getElapsedTime", pCP16Time2a, [c_void_p]),
+    ("EventOfProtectionEquipmentWithCP56Time2a_getEvent", pSingleEvent, [c_void_p]),
+    ("EventOfProtectionEquipmentWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("EventOfProtectionEquipment_create", pEventOfProtectionEquipment, [c_void_p, c_int, c_void_p, pCP16Time2a, pCP24Time2a]),
+    ("EventOfProtectionEquipment_getElapsedTime", pCP16Time2a, [c_void_p]),
+    ("EventOfProtectionEquipment_getEvent", pSingleEvent, [c_void_p]),
+    ("EventOfProtectionEquipment_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("FileACK_create", pFileACK, [c_void_p, c_int, c_uint16, c_uint8, c_uint8]),
+    ("FileACK_getAFQ", c_uint8, [c_void_p]),
+    ("FileACK_getNOF", c_uint16, [c_void_p]),
+    ("FileACK_getNameOfSection", c_uint8, [c_void_p]),
+    ("FileCallOrSelect_create", pFileCallOrSelect, [c_void_p, c_int, c_uint16, c_uint8, c_uint8]),
+    ("FileCallOrSelect_getNOF", c_uint16, [c_void_p]),
+    ("FileCallOrSelect_getNameOfSection", c_uint8, [c_void_p]),
+    ("FileCallOrSelect_getSCQ", c_uint8, [c_void_p]),
+    ("FileDirectory_create", pFileDirectory, [c_void_p, c_int, c_uint16, c_int, c_uint8, pCP56Time2a]),
+    ("FileDirectory_getCreationTime", pCP56Time2a, [c_void_p]),
+    ("FileDirectory_getFA", c_bool, [c_void_p]),
+    ("FileDirectory_getFOR", c_bool, [c_void_p]),
+    ("FileDirectory_getLFD", c_bool, [c_void_p]),
+    ("FileDirectory_getLengthOfFile", c_uint8, [c_void_p]),
+    ("FileDirectory_getNOF", c_uint16, [c_void_p]),
+    ("FileDirectory_getSOF", c_uint8, [c_void_p]),
+    ("FileDirectory_getSTATUS", c_int, [c_void_p]),
+    ("FileLastSegmentOrSection_create", pFileLastSegmentOrSection, [c_void_p, c_int, c_uint16, c_uint8, c_uint8, c_uint8]),
+    ("FileLastSegmentOrSection_getCHS", c_uint8, [c_void_p]),
+    ("FileLastSegmentOrSection_getLSQ", c_uint8, [c_void_p]),
+    ("FileLastSegmentOrSection_getNOF", c_uint16, [c_void_p]),
+    ("FileLastSegmentOrSection_getNameOfSection", c_uint8, [c_void_p]),
+    ("FileReady_create", pFileReady, [c_void_p, c_int, c_uint16, c_uint32, c_bool]),
+    ("FileReady_getFRQ", c_uint8, [c_void_p]),
+    ("FileReady_getLengthOfFile", c_uint32, [c_void_p]),
+    ("FileReady_getNOF", c_uint16, [c_void_p]),
+    ("FileReady_isPositive", c_bool, [c_void_p]),
+    ("FileReady_setFRQ", None, [c_void_p, c_uint8]),
+    ("FileSegment_GetMaxDataSize", c_int, [pConnectionParameters]),
+    ("FileSegment_create", pFileSegment, [c_void_p, c_int, c_uint16, c_uint8, c_uint8_p, c_uint8]),
+    ("FileSegment_getLengthOfSegment", c_uint8, [c_void_p]),
+    ("FileSegment_getNOF", c_uint16, [c_void_p]),
+    ("FileSegment_getNameOfSection", c_uint8, [c_void_p]),
+    ("FileSegment_getSegmentData", c_uint8_p, [c_void_p]),
+    ("InformationObject_ParseObjectAddress", c_int, [pConnectionParameters, c_uint8_p, c_int]),
+    ("InformationObject_getObjectAddress", c_int, [c_void_p]),
+    ("InformationObject_setObjectAddress", None, [c_void_p, c_int]),
+    ("IntegratedTotalsWithCP24Time2a_create", pIntegratedTotalsWithCP24Time2a, [c_void_p, c_int, c_void_p, pCP24Time2a]),
+    ("IntegratedTotalsWithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("IntegratedTotalsWithCP24Time2a_setTimestamp", None, [c_void_p, pCP24Time2a]),
+    ("IntegratedTotalsWithCP56Time2a_create", pIntegratedTotalsWithCP56Time2a, [c_void_p, c_int, c_void_p, pCP56Time2a]),
+    ("IntegratedTotalsWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("IntegratedTotalsWithCP56Time2a_setTimestamp", None, [c_void_p, pCP56Time2a]),
+    ("IntegratedTotals_create", pIntegratedTotals, [c_void_p, c_int, c_void_p]),
+    ("IntegratedTotals_getBCR", pBinaryCounterReading, [c_void_p]),
+    ("IntegratedTotals_setBCR", None, [c_void_p, c_void_p]),
+    ("InterrogationCommand_create", pInterrogationCommand, [c_void_p, c_int, c_uint8]),
+    ("InterrogationCommand_getQOI", c_uint8, [c_void_p]),
+    ("MeasuredValueNormalizedWithCP24Time2a_create", pMeasuredValueNormalizedWithCP24Time2a, [c_void_p, c_int, c_float, c_uint8, pCP24Time2a]),
+    ("MeasuredValueNormalizedWithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("MeasuredValueNormalizedWithCP24Time2a_setTimestamp", None, [c_void_p, pCP24Time2a]),
+    ("MeasuredValueNormalizedWithCP56Time2a_create", pMeasuredValueNormalizedWithCP56Time2a, [c_void_p, c_int, c_float, c_uint8, pCP56Time2a]),
+    ("MeasuredValueNormalizedWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("MeasuredValueNormalizedWithCP56Time2a_setTimestamp", None, [c_void_p, pCP56Time2a]),
+    ("MeasuredValueNormalizedWithoutQuality_create", pMeasuredValueNormalizedWithoutQuality, [c_void_p, c_int, c_float]),
+    ("MeasuredValueNormalizedWithoutQuality_getValue", c_float, [c_void_p]),
+    ("MeasuredValueNormalizedWithoutQuality_setValue", None, [c_void_p, c_float]),
+    ("MeasuredValueNormalized_create", pMeasuredValueNormalized, [c_void_p, c_int, c_float, c_uint8]),
+    ("MeasuredValueNormalized_getQuality", c_uint8, [c_void_p]),
+    ("MeasuredValueNormalized_getScaledValue", c_int, [c_void_p]),
+    ("MeasuredValueNormalized_getValue", c_float, [c_void_p]),
+    ("MeasuredValueNormalized_setScaledValue", None, [c_void_p, c_int]),
+    ("MeasuredValueNormalized_setValue", None, [c_void_p, c_float]),
+    ("MeasuredValueScaledWithCP24Time2a_create", pMeasuredValueScaledWithCP24Time2a, [c_void_p, c_int, c_int, c_uint8, pCP24Time2a]),
+    ("MeasuredValueScaledWithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("MeasuredValueScaledWithCP24Time2a_setTimestamp", None, [c_void_p, pCP24Time2a]),
+    ("MeasuredValueScaledWithCP56Time2a_create", pMeasuredValueScaledWithCP56Time2a, [c_void_p, c_int, c_int, c_uint8, pCP56Time2a]),
+    ("MeasuredValueScaledWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("MeasuredValueScaledWithCP56Time2a_setTimestamp", None, [c_void_p, pCP56Time2a]),
+    ("MeasuredValueScaled_create", pMeasuredValueScaled, [c_void_p, c_int, c_int, c_uint8]),
+    ("MeasuredValueScaled_getQuality", c_uint8, [c_void_p]),
+    ("MeasuredValueScaled_getValue", c_int, [c_void_p]),
+    ("MeasuredValueScaled_setQuality", None, [c_void_p, c_uint8]),
+    ("MeasuredValueScaled_setValue", None, [c_void_p, c_int]),
+    ("MeasuredValueShortWithCP24Time2a_create", pMeasuredValueShortWithCP24Time2a, [c_void_p, c_int, c_float, c_uint8, pCP24Time2a]),
+    ("MeasuredValueShortWithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("MeasuredValueShortWithCP24Time2a_setTimestamp", None, [c_void_p, pCP24Time2a]),
+    ("MeasuredValueShortWithCP56Time2a_create", pMeasuredValueShortWithCP56Time2a, [c_void_p, c_int, c_float, c_uint8, pCP56Time2a]),
+    ("MeasuredValueShortWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("MeasuredValueShortWithCP56Time2a_setTimestamp", None, [c_void_p, pCP56Time2a]),
+    ("MeasuredValueShort_create", pMeasuredValueShort, [c_void_p, c_int, c_float, c_uint8]),
+    ("MeasuredValueShort_getQuality", c_uint8, [c_void_p]),
+    ("MeasuredValueShort_getValue", c_float, [c_void_p]),
+    ("MeasuredValueShort_setValue", None, [c_void_p, c_float]),
+    ("PackedOutputCircuitInfoWithCP56Time2a_create", pPackedOutputCircuitInfoWithCP56Time2a, [c_void_p, c_int, c_uint8, c_uint8, pCP16Time2a, pCP56Time2a]),
+    ("PackedOutputCircuitInfoWithCP56Time2a_getOCI", c_uint8, [c_void_p]),
+    ("PackedOutputCircuitInfoWithCP56Time2a_getOperatingTime", pCP16Time2a, [c_void_p]),
+    ("PackedOutputCircuitInfoWithCP56Time2a_getQuality", c_uint8, [c_void_p]),
+    ("PackedOutputCircuitInfoWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("PackedOutputCircuitInfo_create", pPackedOutputCircuitInfo, [c_void_p, c_int, c_uint8, c_uint8, pCP16Time2a, pCP24Time2a]),
+    ("PackedOutputCircuitInfo_getOCI", c_uint8, [c_void_p]),
+    ("PackedOutputCircuitInfo_getOperatingTime", pCP16Time2a, [c_void_p]),
+    ("PackedOutputCircuitInfo_getQuality", c_uint8, [c_void_p]),
+    ("PackedOutputCircuitInfo_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("PackedSinglePointWithSCD_create", pPackedSinglePointWithSCD, [c_void_p, c_int, c_void_p, c_uint8]),
+    ("PackedSinglePointWithSCD_getQuality", c_uint8, [c_void_p]),
+    ("PackedSinglePointWithSCD_getSCD", pStatusAndStatusChangeDetection, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipmentWithCP56Time2a_create", pPackedStartEventsOfProtectionEquipmentWithCP56Time2a, [c_void_p, c_int, c_uint8, c_uint8, pCP16Time2a, pCP56Time2a]),
+    ("PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getElapsedTime", pCP16Time2a, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getEvent", c_uint8, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getQuality", c_uint8, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipment_create", pPackedStartEventsOfProtectionEquipment, [c_void_p, c_int, c_uint8, c_uint8, pCP16Time2a, pCP24Time2a]),
+    ("PackedStartEventsOfProtectionEquipment_getElapsedTime", pCP16Time2a, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipment_getEvent", c_uint8, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipment_getQuality", c_uint8, [c_void_p]),
+    ("PackedStartEventsOfProtectionEquipment_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("ParameterActivation_create", pParameterActivation, [c_void_p, c_int, c_uint8]),
+    ("ParameterActivation_getQuality", c_uint8, [c_void_p]),
+    ("ParameterFloatValue_create", pParameterFloatValue, [c_void_p, c_int, c_float, c_uint8]),
+    ("ParameterFloatValue_getQPM", c_uint8, [c_void_p]),
+    ("ParameterFloatValue_getValue", c_float, [c_void_p]),
+    ("ParameterFloatValue_setValue", None, [c_void_p, c_float]),
+    ("ParameterNormalizedValue_create", pParameterNormalizedValue, [c_void_p, c_int, c_float, c_uint8]),
+    ("ParameterNormalizedValue_getQPM", c_uint8, [c_void_p]),
+    ("ParameterNormalizedValue_getValue", c_float, [c_void_p]),
+    ("ParameterNormalizedValue_setValue", None, [c_void_p, c_float]),
+    ("ParameterScaledValue_create", pParameterScaledValue, [c_void_p, c_int, c_int, c_uint8]),
+    ("ParameterScaledValue_getQPM", c_uint8, [c_void_p]),
+    ("ParameterScaledValue_getValue", c_int, [c_void_p]),
+    ("ParameterScaledValue_setValue", None, [c_void_p, c_int]),
+    ("ReadCommand_create", pReadCommand, [c_void_p, c_int]),
+    ("ResetProcessCommand_create", pResetProcessCommand, [c_void_p, c_int, c_uint8]),
+    ("ResetProcessCommand_getQRP", c_uint8, [c_void_p]),
+    ("SectionReady_create", pSectionReady, [c_void_p, c_int, c_uint16, c_uint8, c_uint32, c_bool]),
+    ("SectionReady_getLengthOfSection", c_uint32, [c_void_p]),
+    ("SectionReady_getNOF", c_uint16, [c_void_p]),
+    ("SectionReady_getNameOfSection", c_uint8, [c_void_p]),
+    ("SectionReady_getSRQ", c_uint8, [c_void_p]),
+    ("SectionReady_isNotReady", c_bool, [c_void_p]),
+    ("SectionReady_setSRQ", None, [c_void_p, c_uint8]),
+    ("SetpointCommandNormalizedWithCP56Time2a_create", pSetpointCommandNormalizedWithCP56Time2a, [c_void_p, c_int, c_float, c_bool, c_int, pCP56Time2a]),
+    ("SetpointCommandNormalizedWithCP56Time2a_getQL", c_int, [c_void_p]),
+    ("SetpointCommandNormalizedWithCP56Time2a_getValue", c_float, [c_void_p]),
+    ("SetpointCommandNormalizedWithCP56Time2a_isSelect", c_bool, [c_void_p]),
+    ("SetpointCommandNormalized_create", pSetpointCommandNormalized, [c_void_p, c_int, c_float, c_bool, c_int]),
+    ("SetpointCommandNormalized_create_scaled", pSetpointCommandNormalized, [c_void_p, c_int, c_int, c_bool, c_int]),
+    ("SetpointCommandNormalized_getQL", c_int, [c_void_p]),
+    ("SetpointCommandNormalized_getScaledValue", c_int, [c_void_p]),
+    ("SetpointCommandNormalized_getValue", c_float, [c_void_p]),
+    ("SetpointCommandNormalized_isSelect", c_bool, [c_void_p]),
+    ("SetpointCommandScaledWithCP56Time2a_create", pSetpointCommandScaledWithCP56Time2a, [c_void_p, c_int, c_int, c_bool, c_int, pCP56Time2a]),
+    ("SetpointCommandScaledWithCP56Time2a_getQL", c_int, [c_void_p]),
+    ("SetpointCommandScaledWithCP56Time2a_getValue", c_int, [c_void_p]),
+    ("SetpointCommandScaledWithCP56Time2a_isSelect", c_bool, [c_void_p]),
+    ("SetpointCommandScaled_create", pSetpointCommandScaled, [c_void_p, c_int, c_int, c_bool, c_int]),
+    ("SetpointCommandScaled_getQL", c_int, [c_void_p]),
+    ("SetpointCommandScaled_getValue", c_int, [c_void_p]),
+    ("SetpointCommandScaled_isSelect", c_bool, [c_void_p]),
+    ("SetpointCommandShortWithCP56Time2a_create", pSetpointCommandShortWithCP56Time2a, [c_void_p, c_int, c_float, c_bool, c_int, pCP56Time2a]),
+    ("SetpointCommandShortWithCP56Time2a_getQL", c_int, [c_void_p]),
+    ("SetpointCommandShortWithCP56Time2a_getValue", c_float, [c_void_p]),
+    ("SetpointCommandShortWithCP56Time2a_isSelect", c_bool, [c_void_p]),
+    ("SetpointCommandShort_create", pSetpointCommandShort, [c_void_p, c_int, c_float, c_bool, c_int]),
+    ("SetpointCommandShort_getQL", c_int, [c_void_p]),
+    ("SetpointCommandShort_getValue", c_float, [c_void_p]),
+    ("SetpointCommandShort_isSelect", c_bool, [c_void_p]),
+    ("SingleCommandWithCP56Time2a_create", pSingleCommandWithCP56Time2a, [c_void_p, c_int, c_bool, c_bool, c_int, pCP56Time2a]),
+    ("SingleCommandWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("SingleCommand_create", pSingleCommand, [c_void_p, c_int, c_bool, c_bool, c_int]),
+    ("SingleCommand_getQU", c_int, [c_void_p]),
+    ("SingleCommand_getState", c_bool, [c_void_p]),
+    ("SingleCommand_isSelect", c_bool, [c_void_p]),
+    ("SingleEvent_getEventState", c_int, [c_void_p]),
+    ("SingleEvent_getQDP", c_uint8, [c_void_p]),
+    ("SingleEvent_setEventState", None, [c_void_p, c_int]),
+    ("SingleEvent_setQDP", None, [c_void_p, c_uint8]),
+    ("SinglePointInformation_create", pSinglePointInformation, [c_void_p, c_int, c_bool, c_uint8]),
+    ("SinglePointInformation_getQuality", c_uint8, [c_void_p]),
+    ("SinglePointInformation_getValue", c_bool, [c_void_p]),
+    ("SinglePointWithCP24Time2a_create", pSinglePointWithCP24Time2a, [c_void_p, c_int, c_bool, c_uint8, pCP24Time2a]),
+    ("SinglePointWithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("SinglePointWithCP56Time2a_create", pSinglePointWithCP56Time2a, [c_void_p, c_int, c_bool, c_uint8, pCP56Time2a]),
+    ("SinglePointWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+    ("StatusAndStatusChangeDetection_getCD", c_bool, [c_void_p, c_int]),
+    ("StatusAndStatusChangeDetection_getCDn", c_uint16, [c_void_p]),
+    ("StatusAndStatusChangeDetection_getST", c_bool, [c_void_p, c_int]),
+    ("StatusAndStatusChangeDetection_getSTn", c_uint16, [c_void_p]),
+    ("StatusAndStatusChangeDetection_setSTn", None, [c_void_p, c_uint16]),
+    ("StepCommandWithCP56Time2a_create", pStepCommandWithCP56Time2a, [c_void_p, c_int, c_int, c_bool, c_int, pCP56Time2a]),
+    ("StepCommandWithCP56Time2a_getQU", c_int, [c_void_p]),
+    ("StepCommandWithCP56Time2a_getState", c_int, [c_void_p]),
+    ("StepCommandWithCP56Time2a_isSelect", c_bool, [c_void_p]),
+    ("StepCommand_create", pStepCommand, [c_void_p, c_int, c_int, c_bool, c_int]),
+    ("StepCommand_getQU", c_int, [c_void_p]),
+    ("StepCommand_getState", c_int, [c_void_p]),
+    ("StepCommand_isSelect", c_bool, [c_void_p]),
+    ("StepPositionInformation_create", pStepPositionInformation, [c_void_p, c_int, c_int, c_bool, c_uint8]),
+    ("StepPositionInformation_getObjectAddress", c_int, [c_void_p]),
+    ("StepPositionInformation_getQuality", c_uint8, [c_void_p]),
+    ("StepPositionInformation_getValue", c_int, [c_void_p]),
+    ("StepPositionInformation_isTransient", c_bool, [c_void_p]),
+    ("StepPositionWithCP24Time2a_create", pStepPositionWithCP24Time2a, [c_void_p, c_int, c_int, c_bool, c_uint8, pCP24Time2a]),
+    ("StepPositionWithCP24Time2a_getTimestamp", pCP24Time2a, [c_void_p]),
+    ("StepPositionWithCP56Time2a_create", pStepPositionWithCP56Time2a, [c_void_p, c_int, c_int, c_bool, c_uint8, pCP56Time2a]),
+    ("StepPositionWithCP56Time2a_getTimestamp", pCP56Time2a, [c_void_p]),
+
+    # Information object decoding, <Type>_getFromBuffer() as used by ASDU_getElement()
+    ("SinglePointInformation_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("SinglePointWithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("DoublePointInformation_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("DoublePointWithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("StepPositionInformation_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("StepPositionWithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("BitString32_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("Bitstring32WithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueNormalized_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueNormalizedWithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueScaled_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueScaledWithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueShort_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueShortWithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("IntegratedTotals_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("IntegratedTotalsWithCP24Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("EventOfProtectionEquipment_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("PackedStartEventsOfProtectionEquipment_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("PackedOutputCircuitInfo_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("PackedSinglePointWithSCD_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueNormalizedWithoutQuality_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("SinglePointWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("DoublePointWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("StepPositionWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("Bitstring32WithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueNormalizedWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueScaledWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("MeasuredValueShortWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("IntegratedTotalsWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("EventOfProtectionEquipmentWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("PackedStartEventsOfProtectionEquipmentWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("PackedOutputCircuitInfoWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    ("SingleCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("DoubleCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("StepCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SetpointCommandNormalized_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SetpointCommandScaled_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SetpointCommandShort_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("Bitstring32Command_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SingleCommandWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("DoubleCommandWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("StepCommandWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SetpointCommandNormalizedWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SetpointCommandScaledWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SetpointCommandShortWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("Bitstring32CommandWithCP56Time2a_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("EndOfInitialization_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("InterrogationCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("CounterInterrogationCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("ReadCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("ClockSynchronizationCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("ResetProcessCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("DelayAcquisitionCommand_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("ParameterNormalizedValue_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("ParameterScaledValue_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("ParameterFloatValue_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("ParameterActivation_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("FileReady_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("SectionReady_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("FileCallOrSelect_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("FileLastSegmentOrSection_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("FileACK_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("FileSegment_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int]),
+    ("FileDirectory_getFromBuffer", c_void_p, [c_void_p, pConnectionParameters, c_uint8_p, c_int, c_int, c_bool]),
+    # T104Connection
+    ("T104Connection_close", None, [c_void_p]),
+    ("T104Connection_connect", c_bool, [c_void_p]),
+    ("T104Connection_connectAsync", None, [c_void_p]),
+    ("T104Connection_create", c_void_p, [c_char_p, c_int]),
+    ("T104Connection_destroy", None, [c_void_p]),
+    ("T104Connection_getConnectionParameters", pT104ConnectionParameters, [c_void_p]),
+    ("T104Connection_isTransmitBufferFull", c_bool, [c_void_p]),
+    ("T104Connection_sendASDU", c_bool, [c_void_p, pASDU]),
+    ("T104Connection_sendClockSyncCommand", c_bool, [c_void_p, c_int, pCP56Time2a]),
+    ("T104Connection_sendControlCommand", c_bool, [c_void_p, c_int, c_int, c_int, c_void_p]),
+    ("T104Connection_sendCounterInterrogationCommand", c_bool, [c_void_p, c_int, c_int, c_uint8]),
+    ("T104Connection_sendInterrogationCommand", c_bool, [c_void_p, c_int, c_int, c_uint8]),
+    ("T104Connection_sendReadCommand", c_bool, [c_void_p, c_int, c_int]),
+    ("T104Connection_sendStartDT", None, [c_void_p]),
+    ("T104Connection_sendStopDT", None, [c_void_p]),
+    ("T104Connection_sendTestCommand", c_bool, [c_void_p, c_int]),
+    ("T104Connection_setASDUReceivedHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("T104Connection_setConnectTimeout", None, [c_void_p, c_int]),
+    ("T104Connection_setConnectionHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("T104Connection_setConnectionParameters", None, [c_void_p, pT104ConnectionParameters]),
+
+    # T104Slave / MasterConnection
+    ("MasterConnection_close", None, [c_void_p]),
+    ("MasterConnection_deactivate", None, [c_void_p]),
+    ("MasterConnection_sendACT_CON", c_bool, [c_void_p, pASDU, c_bool]),
+    ("MasterConnection_sendACT_TERM", c_bool, [c_void_p, pASDU]),
+    ("MasterConnection_sendASDU", c_bool, [c_void_p, pASDU]),
+    ("Slave_destroy", None, [c_void_p]),
+    ("Slave_enqueueASDU", None, [c_void_p, pASDU]),
+    ("Slave_getConnectionParameters", pConnectionParameters, [c_void_p]),
+    ("Slave_isRunning", c_bool, [c_void_p]),
+    ("Slave_setASDUHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("Slave_setClockSyncHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("Slave_setCounterInterrogationHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("Slave_setInterrogationHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("Slave_setReadHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("Slave_start", None, [c_void_p]),
+    ("Slave_stop", None, [c_void_p]),
+    ("T104Slave_create", c_void_p, [pConnectionParameters, c_int, c_int]),
+    ("T104Slave_getOpenConnections", c_int, [c_void_p]),
+    ("T104Slave_setConnectionRequestHandler", None, [c_void_p, c_void_p, c_void_p]),
+    ("T104Slave_setLocalAddress", None, [c_void_p, c_char_p]),
+    ("T104Slave_setLocalPort", None, [c_void_p, c_int]),
+    ("T104Slave_setMaxOpenConnections", None, [c_void_p, c_int]),
+    ("T104Slave_setServerMode", None, [c_void_p, c_int]),
+]
+
+
+def bind_prototypes(library, prototypes=_prototypes):
+    """
+    Declare restype and argtypes of the given library functions
+    """
+    for name, restype, argtypes in prototypes:
+        function = getattr(library, name)
+        function.restype = restype
+        function.argtypes = argtypes
+
+
+bind_prototypes(lib60870.get_library())
@@ -90,6 +90,7 @@ setup(
     extras_require={
         'dev': ['check-manifest'],
         'test': ['coverage'],
+        'numpy': ['numpy'],
     },
 
     # If there are data files included in your packages that need to be
@@ -113,5 +114,8 @@ setup(
             'lib60870-simple-client=simple_client:main',
             'lib60870-simple-server=simple_server:main',
         ],
+        'console_scripts': [
+            'lib60870-load-generator=lib60870.LoadGenerator:main',
+        ],
     },
 )
@@ -0,0 +1,123 @@
+import sys
+import os
+import unittest
+import logging
+import asyncio
+
+sys.path.insert(1, '../')
+from lib60870.AsyncT104Connection import AsyncT104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.Interrogation import InterrogationError
+from lib60870.asdu import ASDUBuilder
+from lib60870.information_object import SingleCommand
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24104
+
+
+def interrogation_handler(parameter, connection, asdu, qoi):
+    if asdu.get_ca() == 9:
+        connection.send_act_con(asdu, True)
+        return True
+    connection.send_act_con(asdu)
+    for response in ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, range(100, 110), [float(i) for i in range(10)],
+                                            cot=CauseOfTransmission.INTERROGATED_BY_STATION, ca=asdu.get_ca()):
+        connection.send_asdu(response)
+    connection.send_act_term(asdu)
+    return True
+
+
+def asdu_handler(parameter, connection, asdu):
+    if asdu.get_type_id() == TypeID.C_SC_NA_1:
+        asdu.set_cot(CauseOfTransmission.ACTIVATION_CON)
+        connection.send_asdu(asdu)
+        return True
+    return False
+
+
+class AsyncT104ConnectionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.slave = T104Slave()
+        cls.slave.set_local_address(b"127.0.0.1")
+        cls.slave.set_local_port(PORT)
+        cls.slave.set_interrogation_handler(interrogation_handler)
+        cls.slave.set_asdu_handler(asdu_handler)
+        cls.slave.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.slave.stop()
+
+    def run_connected(self, test):
+        async def run():
+            sut = AsyncT104Connection("127.0.0.1", PORT)
+            await sut.connect(timeout=5)
+            try:
+                await sut.start_dt()
+                return await test(sut)
+            finally:
+                await sut.close()
+        return asyncio.run(run())
+
+    def test_interrogation(self):
+        async def test(sut):
+            confirmation = await sut.send_interrogation_command(ca=1)
+            self.assertEqual(confirmation.get_cot(), CauseOfTransmission.ACTIVATION_CON)
+            received = []
+            async for asdu in sut:
+                received.append(asdu)
+                if asdu.get_cot() == CauseOfTransmission.ACTIVATION_TERMINATION:
+                    break
+            return received
+        received = self.run_connected(test)
+        self.assertEqual([asdu.get_type_id() for asdu in received],
+                         [TypeID.C_IC_NA_1, TypeID.M_ME_NC_1, TypeID.C_IC_NA_1])
+        self.assertEqual([element.ioa for element in received[1].decode().elements], list(range(100, 110)))
+
+    def test_interrogate(self):
+        async def test(sut):
+            return await asyncio.gather(sut.interrogate(1, timeout=5), sut.interrogate(2, timeout=5),
+                                        sut.interrogate(9, timeout=5), return_exceptions=True)
+        first, second, rejected = self.run_connected(test)
+        self.assertEqual(list(first.ioas), list(range(100, 110)))
+        self.assertEqual(list(second.values), [float(i) for i in range(10)])
+        self.assertEqual((first.ca, second.ca, first.asdus), (1, 2, 1))
+        self.assertIsNotNone(first.duration)
+        self.assertIsInstance(rejected, InterrogationError)
+        self.assertTrue(rejected.asdu.is_negative())
+
+    def test_control_command(self):
+        async def test(sut):
+            return await sut.send_control_command(CauseOfTransmission.ACTIVATION, 1, SingleCommand(5000, True, False, 0))
+        confirmation = self.run_connected(test)
+        self.assertEqual(confirmation.get_cot(), CauseOfTransmission.ACTIVATION_CON)
+        self.assertTrue(confirmation.get_element(0).get_state())
+
+    def test_stream_ends_on_close(self):
+        async def test(sut):
+            await sut.close()
+            return [asdu async for asdu in sut]
+        self.assertEqual(self.run_connected(test), [])
+
+    def test_queue_drops_oldest(self):
+        async def test(sut):
+            sut.max_queue_size = 1
+            await sut.send_interrogation_command(ca=1)
+            await asyncio.sleep(0.5)
+            return sut.dropped, await sut.receive()
+        dropped, asdu = self.run_connected(test)
+        self.assertEqual(dropped, 2)
+        self.assertEqual(asdu.get_cot(), CauseOfTransmission.ACTIVATION_TERMINATION)
+
+    def test_connect_failure(self):
+        async def test():
+            sut = AsyncT104Connection("127.0.0.1", PORT + 1)
+            await sut.connect(timeout=0.5)
+        with self.assertRaises(ConnectionError):
+            asyncio.run(test())
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,176 @@
+import sys
+import os
+import unittest
+import logging
+import asyncio
+
+sys.path.insert(1, '../')
+from lib60870.AsyncT104Connection import AsyncT104Connection
+from lib60870.AsyncT104Slave import AsyncT104Slave
+from lib60870.asdu import ASDUBuilder
+from lib60870.information_object import SingleCommand
+from lib60870.lib60870 import CauseOfTransmission, QualifierOfInterrogation, TypeID
+
+PORT = 24105
+
+
+async def interrogation_handler(connection, asdu, qoi):
+    if qoi != QualifierOfInterrogation.IEC60870_QOI_STATION.value:
+        return False
+    await asyncio.sleep(0.01)
+    return ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, range(100, 110), [float(i) for i in range(10)],
+                                   cot=CauseOfTransmission.INTERROGATED_BY_STATION)
+
+
+async def clock_synchronization_handler(connection, asdu, newtime):
+    return newtime.to_ms_timestamp() > 0
+
+
+async def asdu_handler(connection, asdu):
+    if asdu.get_type_id() != TypeID.C_SC_NA_1:
+        return False
+    asdu.set_cot(CauseOfTransmission.ACTIVATION_CON)
+    return asdu
+
+
+class AsyncT104SlaveTest(unittest.TestCase):
+    def run_connected(self, test):
+        async def run():
+            slave = AsyncT104Slave()
+            slave.set_local_address(b"127.0.0.1")
+            slave.set_local_port(PORT)
+            slave.set_interrogation_handler(interrogation_handler)
+            slave.set_clock_synchronization_handler(clock_synchronization_handler)
+            slave.set_asdu_handler(asdu_handler)
+            slave.start()
+            try:
+                sut = AsyncT104Connection("127.0.0.1", PORT)
+                await sut.connect(timeout=5)
+                try:
+                    await sut.start_dt()
+                    return await test(sut)
+                finally:
+                    await sut.close()
+                    await slave.join()
+            finally:
+                slave.stop()
+        return asyncio.run(run())
+
+    def test_interrogation(self):
+        async def test(sut):
+            await sut.send_interrogation_command(ca=1)
+            received = []
+            async for asdu in sut:
+                received.append(asdu)
+                if asdu.get_cot() == CauseOfTransmission.ACTIVATION_TERMINATION:
+                    break
+            return received
+        received = self.run_connected(test)
+        self.assertEqual([asdu.get_cot() for asdu in received],
+                         [CauseOfTransmission.ACTIVATION_CON, CauseOfTransmission.INTERROGATED_BY_STATION,
+                          CauseOfTransmission.ACTIVATION_TERMINATION])
+        self.assertEqual([element.value for element in received[1].decode().elements],
+                         [float(i) for i in range(10)])
+
+    def test_negative_interrogation(self):
+        async def test(sut):
+            return await sut.send_interrogation_command(ca=1, qoi=QualifierOfInterrogation.IEC60870_QOI_GROUP_1)
+        confirmation = self.run_connected(test)
+        self.assertEqual(confirmation.get_cot(), CauseOfTransmission.ACTIVATION_CON)
+        self.assertTrue(confirmation.is_negative())
+
+    def test_clock_synchronization(self):
+        async def test(sut):
+            return await sut.send_clock_sync_command(ca=1)
+        confirmation = self.run_connected(test)
+        self.assertFalse(confirmation.is_negative())
+
+    def test_asdu_handler(self):
+        async def test(sut):
+            return await sut.send_control_command(CauseOfTransmission.ACTIVATION, 1, SingleCommand(5000, True, False, 0))
+        confirmation = self.run_connected(test)
+        self.assertEqual(confirmation.get_cot(), CauseOfTransmission.ACTIVATION_CON)
+        self.assertTrue(confirmation.get_element(0).get_state())
+
+    def test_reconnect_while_handling(self):
+        async def run():
+            started = asyncio.Event()
+            release = asyncio.Event()
+
+            async def slow_interrogation_handler(connection, asdu, qoi):
+                started.set()
+                await release.wait()
+                return ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [100], [1.0],
+                                               cot=CauseOfTransmission.INTERROGATED_BY_STATION)
+
+            slave = AsyncT104Slave()
+            slave.set_local_address(b"127.0.0.1")
+            slave.set_local_port(PORT)
+            slave.set_interrogation_handler(slow_interrogation_handler)
+            slave.set_clock_synchronization_handler(clock_synchronization_handler)
+            slave.start()
+            try:
+                first = AsyncT104Connection("127.0.0.1", PORT)
+                await first.connect(timeout=5)
+                await first.start_dt()
+                request = asyncio.ensure_future(first.send_interrogation_command(ca=1))
+                await asyncio.wait_for(started.wait(), 5)
+                await first.close()
+                request.cancel()
+
+                second = AsyncT104Connection("127.0.0.1", PORT)
+                await second.connect(timeout=5)
+                try:
+                    await second.start_dt()
+                    release.set()
+                    await slave.join()
+                    confirmation = await second.send_clock_sync_command(ca=1)
+                    received = []
+                    try:
+                        while True:
+                            received.append(await asyncio.wait_for(second.receive(), 0.2))
+                    except asyncio.TimeoutError:
+                        pass
+                finally:
+                    await second.close()
+                    await slave.join()
+            finally:
+                slave.stop()
+            return confirmation, received
+
+        confirmation, received = asyncio.run(run())
+        self.assertEqual(confirmation.get_type_id(), TypeID.C_CS_NA_1)
+        self.assertFalse(confirmation.is_negative())
+        # the interrogation response of the closed connection is not sent to the new one
+        self.assertNotIn(TypeID.M_ME_NC_1, [asdu.get_type_id() for asdu in received])
+
+    def test_handler_timeout(self):
+        async def run():
+            async def hanging_interrogation_handler(connection, asdu, qoi):
+                await asyncio.sleep(10)
+
+            slave = AsyncT104Slave(timeout=0.2)
+            slave.set_local_address(b"127.0.0.1")
+            slave.set_local_port(PORT)
+            slave.set_interrogation_handler(hanging_interrogation_handler)
+            slave.start()
+            try:
+                sut = AsyncT104Connection("127.0.0.1", PORT)
+                await sut.connect(timeout=5)
+                try:
+                    await sut.start_dt()
+                    return await sut.send_interrogation_command(ca=1)
+                finally:
+                    await sut.close()
+                    await slave.join()
+            finally:
+                slave.stop()
+
+        confirmation = asyncio.run(run())
+        self.assertEqual(confirmation.get_cot(), CauseOfTransmission.ACTIVATION_CON)
+        self.assertTrue(confirmation.is_negative())
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
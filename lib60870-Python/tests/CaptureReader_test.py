@@ -0,0 +1,271 @@
+import sys
+import os
+import unittest
+import logging
+import io
+import struct
+import tempfile
+from unittest import mock
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+sys.path.insert(1, '../')
+from lib60870.CaptureReader import CaptureReader, ParallelCaptureReader, Direction, FrameFormat, UFunction, \
+    flow_id, read_packets
+from lib60870.asdu import ASDUBuilder
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+SERVER = bytes([10, 0, 0, 1])
+CLIENT = bytes([10, 0, 0, 2])
+
+
+def i_frame(asdu, send_seq=0, recv_seq=0):
+    return struct.pack("<BBHH", 0x68, 4 + len(asdu), send_seq << 1, recv_seq << 1) + asdu
+
+
+def s_frame(recv_seq):
+    return struct.pack("<BBHH", 0x68, 4, 1, recv_seq << 1)
+
+
+def u_frame(function):
+    return struct.pack("<BBBBBB", 0x68, 4, function, 0, 0, 0)
+
+
+def measurements(ioas, values, ca=1):
+    # one ASDU per point
+    return [ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [ioa], [value], cot=CauseOfTransmission.SPONTANEOUS,
+                                    ca=ca)[0].get_buffer() for ioa, value in zip(ioas, values)]
+
+
+def tcp_packet(source, source_port, destination, destination_port, seq, payload, flags=0x18, ipv6=False):
+    tcp = struct.pack(">HHIIBBHHH", source_port, destination_port, seq, 0, 5 << 4, flags, 65535, 0, 0) + payload
+    if ipv6:
+        ip = struct.pack(">IHBB", 6 << 28, len(tcp), 6, 64) + bytes(15) + source[-1:] + bytes(15) + \
+            destination[-1:]
+        ethertype = 0x86dd
+    else:
+        ip = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp), 0, 0x4000, 64, 6, 0, source, destination)
+        ethertype = 0x0800
+    return ip + tcp, ethertype
+
+
+def ethernet(packet, ethertype, vlan=False):
+    header = bytes(12)
+    if vlan:
+        header += struct.pack(">HH", 0x8100, 7)
+    return header + struct.pack(">H", ethertype) + packet
+
+
+class Connection():
+    """
+    Writes the segments of one TCP connection on port 2404
+    """
+    def __init__(self, client_port=40000, server=SERVER, client=CLIENT, ipv6=False):
+        self.client_port = client_port
+        self.server = server
+        self.client = client
+        self.ipv6 = ipv6
+        self.seq = {Direction.CONTROL: 1000, Direction.MONITOR: 5000}
+        self.packets = []
+        self.time = 1700000000.0
+
+    def handshake(self):
+        self.segment(Direction.CONTROL, b"", flags=0x02)
+        self.segment(Direction.MONITOR, b"", flags=0x12)
+        self.seq[Direction.CONTROL] += 1
+        self.seq[Direction.MONITOR] += 1
+        return self
+
+    def segment(self, direction, payload, flags=0x18, seq=None, advance=True):
+        if seq is None:
+            seq = self.seq[direction]
+        if direction == Direction.CONTROL:
+            packet = tcp_packet(self.client, self.client_port, self.server, 2404, seq, payload, flags, self.ipv6)
+        else:
+            packet = tcp_packet(self.server, 2404, self.client, self.client_port, seq, payload, flags, self.ipv6)
+        self.time += 0.001
+        self.packets.append((self.time, packet))
+        if advance:
+            self.seq[direction] = seq + len(payload)
+        return seq
+
+
+def pcap(packets, vlan=False):
+    output = struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)
+    for timestamp, (packet, ethertype) in packets:
+        frame = ethernet(packet, ethertype, vlan)
+        output += struct.pack("<IIII", int(timestamp), round(timestamp % 1 * 1e6), len(frame), len(frame)) + frame
+    return output
+
+
+def pcapng(packets):
+    def block(block_type, body):
+        body += bytes(-len(body) % 4)
+        return struct.pack("<II", block_type, len(body) + 12) + body + struct.pack("<I", len(body) + 12)
+
+    # Linux cooked capture with nanosecond timestamps (if_tsresol 9)
+    output = block(0x0a0d0d0a, struct.pack("<IHHq", 0x1a2b3c4d, 1, 0, -1))
+    output += block(1, struct.pack("<HHI", 113, 0, 65535) + struct.pack("<HHB3x", 9, 1, 9) + bytes(4))
+    output += block(5, bytes(8))
+    for timestamp, (packet, ethertype) in packets:
+        frame = bytes(14) + struct.pack(">H", ethertype) + packet
+        ticks = round(timestamp * 1e9)
+        output += block(6, struct.pack("<IIIII", 0, ticks >> 32, ticks & 0xffffffff, len(frame), len(frame)) + frame)
+    return output
+
+
+class CaptureReaderTest(unittest.TestCase):
+    def read(self, data, **options):
+        sut = CaptureReader(io.BytesIO(data), **options)
+        return sut, list(sut)
+
+    def session(self, connection, count=10):
+        connection.segment(Direction.CONTROL, u_frame(UFunction.STARTDT_ACT))
+        connection.segment(Direction.MONITOR, u_frame(UFunction.STARTDT_CON))
+        for index, asdu in enumerate(measurements(range(count), [float(value) for value in range(count)])):
+            connection.segment(Direction.MONITOR, i_frame(asdu, index))
+        connection.segment(Direction.CONTROL, s_frame(count))
+        return connection
+
+    def test_pcap(self):
+        connection = self.session(Connection().handshake())
+        sut, batches = self.read(pcap(connection.packets))
+        self.assertEqual(len(batches), 1)
+        batch = batches[0]
+        self.assertEqual(list(batch.formats), [FrameFormat.U, FrameFormat.U] + [FrameFormat.I] * 10 + [FrameFormat.S])
+        self.assertEqual(list(batch.directions[:2]), [Direction.CONTROL, Direction.MONITOR])
+        self.assertEqual(list(batch.u_functions[:2]), [UFunction.STARTDT_ACT, UFunction.STARTDT_CON])
+        self.assertEqual(list(batch.send_seqs[2:12]), list(range(10)))
+        self.assertEqual(batch.recv_seqs[-1], 10)
+        self.assertEqual(set(batch.type_ids[2:12]), {TypeID.M_ME_NC_1.value})
+        self.assertEqual(list(batch.point_ioas), list(range(10)))
+        self.assertEqual(list(batch.point_values), [float(value) for value in range(10)])
+        self.assertEqual(list(batch.point_frames), list(range(2, 12)))
+        self.assertAlmostEqual(batch.timestamps[0], 1700000000.003, places=5)
+        flow = flow_id(SERVER, 2404, CLIENT, 40000)
+        self.assertEqual(batch.flows, {flow: ("10.0.0.1", 2404, "10.0.0.2", 40000)})
+        self.assertEqual(set(batch.flow_ids), {flow})
+        self.assertEqual((sut.statistics["i_frames"], sut.statistics["s_frames"], sut.statistics["u_frames"]),
+                         (10, 1, 2))
+        self.assertEqual((sut.statistics["points"], sut.statistics["gaps"]), (10, 0))
+
+    def test_pcapng(self):
+        connection = self.session(Connection(ipv6=True).handshake())
+        sut, batches = self.read(pcapng(connection.packets))
+        self.assertEqual(sut.statistics["frames"], 13)
+        self.assertEqual(len(batches[0].point_ioas), 10)
+        self.assertAlmostEqual(batches[0].timestamps[0], 1700000000.003, places=5)
+        self.assertEqual(list(batches[0].flows.values())[0][0], "::1")
+
+    def test_segmentation(self):
+        connection = Connection().handshake()
+        frames = b"".join(i_frame(asdu, index) for index, asdu in
+                          enumerate(measurements(range(100), [1.5] * 100) + measurements([7], [2.5], ca=2)))
+        # APDUs split over and packed into segments of 37 bytes, with a vlan tag
+        for start in range(0, len(frames), 37):
+            connection.segment(Direction.MONITOR, frames[start:start + 37])
+        sut, batches = self.read(pcap(connection.packets, vlan=True))
+        self.assertEqual(len(batches[0].point_ioas), 101)
+        self.assertEqual(list(batches[0].cas), [1] * (len(batches[0]) - 1) + [2])
+        self.assertEqual(sut.statistics["skipped_bytes"], 0)
+
+    def test_reordering(self):
+        connection = Connection().handshake()
+        first, second, third = [i_frame(asdu, index) for index, asdu in
+                                enumerate(measurements(range(3), [1.0, 2.0, 3.0]))]
+        start = connection.seq[Direction.MONITOR]
+        connection.segment(Direction.MONITOR, first)
+        # the third segment arrives before the second, then the second is retransmitted
+        connection.segment(Direction.MONITOR, third, seq=start + len(first) + len(second), advance=False)
+        connection.segment(Direction.MONITOR, second)
+        connection.segment(Direction.MONITOR, second, seq=start + len(first))
+        sut, batches = self.read(pcap(connection.packets))
+        self.assertEqual(list(batches[0].point_values), [1.0, 2.0, 3.0])
+        self.assertEqual((sut.statistics["out_of_order"], sut.statistics["retransmitted"]), (1, 1))
+
+    def test_gap(self):
+        connection = Connection().handshake()
+        frames = [i_frame(asdu, index) for index, asdu in
+                  enumerate(measurements(range(4), [1.0, 2.0, 3.0, 4.0]))]
+        connection.segment(Direction.MONITOR, frames[0])
+        # the second APDU and half of the third were not captured
+        lost = frames[1] + frames[2][:5]
+        connection.seq[Direction.MONITOR] += len(lost)
+        connection.segment(Direction.MONITOR, frames[2][5:] + frames[3])
+        sut, batches = self.read(pcap(connection.packets), max_pending=8)
+        self.assertEqual(list(batches[0].point_values), [1.0, 4.0])
+        self.assertEqual(sut.statistics["gaps"], 1)
+        self.assertEqual(sut.statistics["skipped_bytes"], len(frames[2]) - 5)
+
+    def test_mid_stream(self):
+        # no handshake and the capture starts inside an APDU
+        connection = Connection()
+        frames = b"".join(i_frame(asdu, index) for index, asdu in
+                          enumerate(measurements(range(3), [1.0, 2.0, 3.0])))
+        connection.segment(Direction.MONITOR, frames[7:])
+        sut, batches = self.read(pcap(connection.packets))
+        self.assertEqual(list(batches[0].point_values), [2.0, 3.0])
+
+    def test_batches(self):
+        connections = [self.session(Connection(40000 + index).handshake(), 20) for index in range(3)]
+        packets = sorted(packet for connection in connections for packet in connection.packets)
+        sut, batches = self.read(pcap(packets), batch_size=16, decode=False, keep_asdus=True)
+        self.assertGreater(len(batches), 3)
+        self.assertEqual(sum(len(batch) for batch in batches), 3 * 23)
+        self.assertEqual(sum(len(batch.asdus) for batch in batches), 60)
+        self.assertEqual(sum(len(batch.point_ioas) for batch in batches), 0)
+        self.assertTrue(all(set(batch.flow_ids) <= set(batch.flows) for batch in batches))
+
+    def test_other_traffic(self):
+        packet = tcp_packet(CLIENT, 40000, SERVER, 80, 1, b"GET / HTTP/1.0\r\n\r\n")
+        sut, batches = self.read(pcap([(1.0, packet)]))
+        self.assertEqual(batches, [])
+        self.assertEqual(sut.statistics["ignored"], 1)
+        with self.assertRaises(ValueError):
+            read_packets(io.BytesIO(b"not a capture"))
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_to_numpy(self):
+        connection = self.session(Connection().handshake())
+        frames, points = CaptureReader(io.BytesIO(pcap(connection.packets)), batch_size=4).to_numpy()
+        self.assertEqual(len(frames), 13)
+        self.assertEqual(list(points["ioa"]), list(range(10)))
+        self.assertEqual(list(frames["send_seq"][points["frame"]]), list(range(10)))
+        self.assertEqual(list(frames["format"][:2]), [FrameFormat.U, FrameFormat.U])
+
+
+class ParallelCaptureReaderTest(unittest.TestCase):
+    def test_partitions(self):
+        connections = [CaptureReaderTest.session(None, Connection(40000 + index).handshake(), 20)
+                       for index in range(6)]
+        packets = sorted(packet for connection in connections for packet in connection.packets)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "capture.pcap")
+            with open(path, "wb") as output:
+                output.write(pcap(packets))
+            sut = ParallelCaptureReader(path, workers=2, batch_size=32)
+            batches = list(sut)
+        self.assertEqual(sum(len(batch) for batch in batches), 6 * 23)
+        self.assertEqual(sum(len(batch.point_ioas) for batch in batches), 120)
+        self.assertEqual(sut.statistics["frames"], 6 * 23)
+        self.assertEqual(sut.statistics["packets"], 2 * len(packets))
+
+    def test_worker_killed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "capture.pcap")
+            with open(path, "wb") as output:
+                output.write(pcap([]))
+            # the worker exits without posting its end
+            with mock.patch("lib60870.CaptureReader._partition_main", lambda *args: os._exit(1)):
+                sut = ParallelCaptureReader(path, workers=2, start_method="fork", poll_interval=0.1)
+                with self.assertRaises(RuntimeError) as context:
+                    list(sut)
+        self.assertIn("exited with 1", str(context.exception))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
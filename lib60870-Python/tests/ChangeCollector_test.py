@@ -0,0 +1,127 @@
+import sys
+import os
+import unittest
+import logging
+import threading
+import time
+from unittest import mock
+
+sys.path.insert(1, '../')
+from lib60870.ChangeCollector import ChangeCollector
+from lib60870.PointDatabase import PointDatabase
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.common import default_connection_parameters
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24108
+
+
+class ChangeCollectorTest(unittest.TestCase):
+    def setUp(self):
+        self.enqueued = []
+        self.slave = mock.Mock(spec=["enqueue_asdu", "get_connection_parameters"])
+        self.slave.get_connection_parameters.return_value = default_connection_parameters
+        self.slave.enqueue_asdu.side_effect = self.enqueued.append
+
+    def elements(self):
+        return [(asdu.get_type_id(), asdu.get_ca(), element.ioa, element.value)
+                for asdu in self.enqueued for element in asdu.decode().elements]
+
+    def test_full_asdu(self):
+        sut = ChangeCollector(self.slave, max_fill=10)
+        for ioa in range(25):
+            sut.update(ioa * 2, float(ioa), type_id=TypeID.M_ME_NC_1)
+        self.assertEqual(len(self.enqueued), 2)
+        self.assertEqual(len(sut), 5)
+        sut.flush()
+        self.assertEqual(len(self.enqueued), 3)
+        self.assertEqual([element[2] for element in self.elements()], list(range(0, 50, 2)))
+        self.assertEqual((sut.changes, sut.asdus), (25, 3))
+
+    def test_groups_by_ca_and_type(self):
+        sut = ChangeCollector(self.slave)
+        sut.update(1, 1.5, type_id=TypeID.M_ME_NC_1)
+        sut.update(2, True, type_id=TypeID.M_SP_NA_1)
+        sut.update(3, 2.5, ca=2, type_id=TypeID.M_ME_NC_1)
+        sut.flush()
+        self.assertEqual(self.elements(), [(TypeID.M_ME_NC_1, 1, 1, 1.5), (TypeID.M_SP_NA_1, 1, 2, True),
+                                           (TypeID.M_ME_NC_1, 2, 3, 2.5)])
+        self.assertEqual(self.enqueued[0].get_cot(), CauseOfTransmission.SPONTANEOUS)
+
+    def test_coalesce(self):
+        sut = ChangeCollector(self.slave)
+        sut.update(1, 1.5, type_id=TypeID.M_ME_NC_1)
+        sut.update(1, 2.5, type_id=TypeID.M_ME_NC_1)
+        sut.update(1, 1.5, timestamp=1000, type_id=TypeID.M_ME_TF_1)
+        sut.update(1, 2.5, timestamp=2000, type_id=TypeID.M_ME_TF_1)
+        sut.flush()
+        self.assertEqual([element[3] for element in self.elements()], [2.5, 1.5, 2.5])
+
+    def test_max_delay(self):
+        sut = ChangeCollector(self.slave, max_delay=0.05)
+        sut.update(1, 1.5, type_id=TypeID.M_ME_NC_1)
+        self.assertIsNotNone(sut.flush(max_age=10))
+        self.assertEqual(self.enqueued, [])
+        sut.start()
+        try:
+            deadline = time.monotonic() + 5
+            while not self.enqueued and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            sut.stop()
+        self.assertEqual(len(self.enqueued), 1)
+
+    def test_database(self):
+        database = PointDatabase()
+        database.add_points(1, TypeID.M_SP_NA_1, [10, 11])
+        sut = ChangeCollector(self.slave, database=database)
+        sut.update(11, True)
+        sut.flush()
+        self.assertEqual(self.elements(), [(TypeID.M_SP_NA_1, 1, 11, True)])
+        self.assertEqual(database.get(1, 11).value, 1)
+        with self.assertRaises(KeyError):
+            sut.update(12, True)
+
+    def test_type_id_required(self):
+        sut = ChangeCollector(self.slave)
+        with self.assertRaises(ValueError):
+            sut.update(1, 1.5)
+
+
+class ChangeCollectorSlaveTest(unittest.TestCase):
+    def test_spontaneous(self):
+        received = []
+        done = threading.Event()
+
+        def handler(asdu):
+            if asdu.get_cot() == CauseOfTransmission.SPONTANEOUS:
+                received.append(asdu.decode())
+                if sum(len(decoded.elements) for decoded in received) == 300:
+                    done.set()
+            return True
+
+        slave = T104Slave()
+        slave.set_local_address(b"127.0.0.1")
+        slave.set_local_port(PORT)
+        slave.start()
+        try:
+            sut = ChangeCollector(slave)
+            connection = T104Connection("127.0.0.1", PORT)
+            connection.set_asdu_received_handler(handler)
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                for ioa in range(300):
+                    sut.update(ioa * 3, float(ioa), type_id=TypeID.M_ME_NC_1)
+                sut.flush()
+                self.assertTrue(done.wait(5))
+        finally:
+            slave.stop()
+        self.assertEqual(len(received), sut.asdus)
+        self.assertLessEqual(sut.asdus, 11)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,159 @@
+import sys
+import os
+import unittest
+import logging
+import threading
+import time
+
+sys.path.insert(1, '../')
+from lib60870.CommandTracker import CommandTracker, CommandError, LatencyHistogram
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDU
+from lib60870.information_object import SingleCommand
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24116
+
+
+def response(cot, ca=1, ioa=100, negative=False, select=False):
+    asdu = ASDU(type_id=TypeID.C_SC_NA_1, cot=cot, ca=ca)
+    asdu.set_negative(negative)
+    asdu.add_information_object(SingleCommand(ioa, True, select, 0))
+    return asdu
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_percentiles(self):
+        sut = LatencyHistogram(bounds=[0.01, 0.02, 0.04])
+        self.assertIsNone(sut.percentile(50))
+        for latency in [0.005] * 50 + [0.015] * 49 + [0.1]:
+            sut.add(latency)
+        self.assertEqual(sut.counts, [50, 49, 0, 1])
+        self.assertAlmostEqual(sut.percentile(50), 0.01)
+        self.assertAlmostEqual(sut.percentile(99), 0.02)
+        self.assertEqual(sut.percentile(100), 0.1)
+        result = sut.get()
+        self.assertEqual((result["count"], result["max"]), (100, 0.1))
+        self.assertAlmostEqual(result["mean"], (0.25 + 0.735 + 0.1) / 100)
+
+
+class CommandTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.sut = CommandTracker(timeout=5.0)
+
+    def tearDown(self):
+        self.sut.stop()
+
+    def test_round_trip(self):
+        tracked = self.sut.track(1, 100, TypeID.C_SC_NA_1)
+        with self.assertRaises(RuntimeError):
+            self.sut.track(1, 100, TypeID.C_SC_NA_1)
+        # another IOA and a monitoring ASDU are no response
+        self.assertFalse(self.sut.feed(response(CauseOfTransmission.ACTIVATION_CON, ioa=101)))
+        self.assertTrue(self.sut.feed(response(CauseOfTransmission.ACTIVATION_CON)))
+        self.assertIsNotNone(tracked.confirmation_time)
+        self.assertFalse(tracked.done.is_set())
+        self.assertTrue(self.sut.feed(response(CauseOfTransmission.ACTIVATION_TERMINATION)))
+        self.assertIs(tracked.wait(0), tracked)
+        self.assertGreaterEqual(tracked.duration, tracked.confirmation_time)
+        self.assertFalse(self.sut.feed(response(CauseOfTransmission.ACTIVATION_TERMINATION)))
+        latency = self.sut.get_latency(1)
+        self.assertEqual((latency["sent"], latency["completed"]), (1, 1))
+        self.assertEqual((latency["confirmation"]["count"], latency["completion"]["count"]), (1, 1))
+
+    def test_select(self):
+        tracked = self.sut.track(1, 100, TypeID.C_SC_NA_1, outstation="sub", select=True)
+        self.assertFalse(self.sut.feed(response(CauseOfTransmission.ACTIVATION_CON)))
+        self.assertTrue(self.sut.feed(response(CauseOfTransmission.ACTIVATION_CON, select=True), "sub"))
+        tracked.wait(0)
+        self.assertEqual(tracked.duration, tracked.confirmation_time)
+        self.assertEqual(list(self.sut.get_metrics()), ["sub"])
+
+    def test_rejected(self):
+        tracked = self.sut.track(1, 100, TypeID.C_SC_NA_1)
+        self.sut.feed(response(CauseOfTransmission.ACTIVATION_CON, negative=True))
+        with self.assertRaises(CommandError) as context:
+            tracked.wait(0)
+        self.assertTrue(context.exception.asdu.is_negative())
+        tracked = self.sut.track(1, 100, TypeID.C_SC_NA_1)
+        self.sut.feed(response(CauseOfTransmission.UNKNOWN_INFORMATION_OBJECT_ADDRESS))
+        with self.assertRaises(CommandError):
+            tracked.wait(0)
+        latency = self.sut.get_latency(1)
+        self.assertEqual((latency["rejected"], latency["completed"]), (2, 0))
+
+    def test_timeout(self):
+        timed_out = []
+        self.sut.set_timeout_handler(timed_out.append)
+        tracked = self.sut.track(1, 100, TypeID.C_SC_NA_1, timeout=0.05)
+        self.sut.feed(response(CauseOfTransmission.ACTIVATION_CON))
+        with self.assertRaises(TimeoutError) as context:
+            tracked.wait(1)
+        self.assertIn("ACT_TERM", str(context.exception))
+        time.sleep(0.05)
+        self.assertEqual(timed_out, [tracked])
+        self.assertEqual(len(self.sut), 0)
+        self.assertEqual(self.sut.get_latency(1)["timed_out"], 1)
+
+    def test_timeout_handler_raises(self):
+        self.sut.set_timeout_handler(lambda tracked: 1 / 0)
+        first = self.sut.track(1, 100, TypeID.C_SC_NA_1, timeout=0.05)
+        self.assertTrue(first.done.wait(5))
+        time.sleep(0.05)
+        # the tracker thread survived the handler and still expires commands
+        second = self.sut.track(1, 101, TypeID.C_SC_NA_1, timeout=0.05)
+        self.assertTrue(second.done.wait(5))
+        self.assertIsInstance(second.error, TimeoutError)
+
+    def test_invalid_type(self):
+        with self.assertRaises(ValueError):
+            self.sut.track(1, 100, TypeID.C_IC_NA_1)
+
+
+class CommandTrackerConnectionTest(unittest.TestCase):
+    def test_send_control_command(self):
+        def handler(parameter, connection, asdu):
+            if asdu.get_type_id() != TypeID.C_SC_NA_1:
+                return False
+            if asdu.get_ca() == 2:
+                connection.send_act_con(asdu, True)
+                return True
+            connection.send_act_con(asdu)
+            connection.send_act_term(asdu)
+            return True
+
+        slave = T104Slave()
+        slave.set_local_address(b"127.0.0.1")
+        slave.set_local_port(PORT)
+        slave.set_asdu_handler(handler)
+        slave.start()
+        received = []
+        sut = CommandTracker(timeout=5.0)
+        try:
+            connection = T104Connection("127.0.0.1", PORT)
+            sut.attach(connection, "substation", lambda asdu: received.append(asdu.get_cot()) or True)
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                for ioa in range(10):
+                    tracked = sut.send_control_command(connection, CauseOfTransmission.ACTIVATION, 1,
+                                                       SingleCommand(ioa, True, False, 0))
+                    tracked.wait(5)
+                rejected = sut.send_control_command(connection, CauseOfTransmission.ACTIVATION, 2,
+                                                    SingleCommand(0, True, False, 0))
+                with self.assertRaises(CommandError):
+                    rejected.wait(5)
+        finally:
+            sut.stop()
+            slave.stop()
+        latency = sut.get_latency("substation")
+        self.assertEqual((latency["sent"], latency["completed"], latency["rejected"]), (11, 10, 1))
+        self.assertEqual(latency["completion"]["count"], 10)
+        self.assertLessEqual(latency["completion"]["p50"], latency["completion"]["p99"])
+        self.assertEqual(received.count(CauseOfTransmission.ACTIVATION_TERMINATION), 10)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
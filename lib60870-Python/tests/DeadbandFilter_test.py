@@ -0,0 +1,94 @@
+import sys
+import os
+import unittest
+import logging
+from unittest import mock
+
+sys.path.insert(1, '../')
+from lib60870.ChangeCollector import ChangeCollector
+from lib60870.DeadbandFilter import DeadbandFilter, DeadbandMode
+from lib60870.common import default_connection_parameters
+from lib60870.lib60870 import TypeID
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class DeadbandFilterTest(unittest.TestCase):
+    def test_absolute(self):
+        sut = DeadbandFilter([1, 2, 3], 0.5)
+        self.assertEqual(sut.filter([1, 2, 3], [1.0, 1.0, 1.0])[0].tolist(), [1, 2, 3])
+        ioas, values, qualities, timestamps = sut.filter([1, 2, 3], [1.4, 0.4, 1.6])
+        self.assertEqual(ioas.tolist(), [2, 3])
+        self.assertEqual(values.tolist(), [0.4, 1.6])
+        # the band is around the last sent value
+        self.assertEqual(sut.filter([1], [1.6])[0].tolist(), [1])
+        self.assertEqual(sut.point_suppressed.tolist(), [1, 0, 0])
+
+    def test_percent(self):
+        sut = DeadbandFilter([1, 2], [1.0, 10.0], DeadbandMode.PERCENT, ranges=[100.0, 100.0])
+        sut.filter([1, 2], [0.0, 0.0])
+        self.assertEqual(sut.filter([1, 2], [2.0, 2.0])[0].tolist(), [1])
+
+    def test_percent_needs_ranges(self):
+        with self.assertRaises(ValueError):
+            DeadbandFilter([1], 1.0, DeadbandMode.PERCENT)
+
+    def test_integrated(self):
+        sut = DeadbandFilter([1], 1.0, DeadbandMode.INTEGRATED)
+        sut.filter([1], [0.0], timestamps=[0])
+        # 0.4 for 1 s, then another 1 s: integral 0.4, then 0.8, then 1.2
+        self.assertEqual(len(sut.filter([1], [0.4], timestamps=[1000])[0]), 0)
+        self.assertEqual(len(sut.filter([1], [0.4], timestamps=[2000])[0]), 0)
+        self.assertEqual(sut.filter([1], [0.4], timestamps=[3000])[0].tolist(), [1])
+        self.assertEqual(sut.integrals.tolist(), [0.0])
+
+    def test_quality_change_passes(self):
+        sut = DeadbandFilter([1], 10.0)
+        sut.filter([1], [1.0])
+        self.assertEqual(sut.filter([1], [1.0], qualities=[0x80])[0].tolist(), [1])
+
+    def test_unknown_ioa_passes(self):
+        sut = DeadbandFilter([5, 1], [1.0, 1.0], [DeadbandMode.ABSOLUTE, DeadbandMode.ABSOLUTE])
+        sut.filter([1, 5], [0.0, 0.0])
+        self.assertEqual(sut.filter([9, 5, 1], [0.0, 0.5, 0.5])[0].tolist(), [9])
+
+    def test_statistics(self):
+        sut = DeadbandFilter(range(100), 1.0)
+        sut.filter(range(100), numpy.zeros(100))
+        sut.filter(range(100), numpy.linspace(0, 2, 100))
+        statistics = sut.get_statistics()
+        self.assertEqual(statistics["received"], 200)
+        self.assertEqual(statistics["passed"], 100 + 50)
+        self.assertEqual(statistics["suppressed"], 50)
+        sut.reset_statistics()
+        self.assertEqual(sut.get_statistics()["suppression_ratio"], 0.0)
+
+    def test_reset(self):
+        sut = DeadbandFilter([1, 2], 1.0)
+        sut.filter([1, 2], [0.0, 0.0])
+        sut.reset([2])
+        self.assertEqual(sut.filter([1, 2], [0.0, 0.0])[0].tolist(), [2])
+
+    def test_change_collector(self):
+        enqueued = []
+        slave = mock.Mock(spec=["enqueue_asdu", "get_connection_parameters"])
+        slave.get_connection_parameters.return_value = default_connection_parameters
+        slave.enqueue_asdu.side_effect = enqueued.append
+        collector = ChangeCollector(slave)
+        sut = DeadbandFilter(range(10), 0.5)
+        collector.update_many(range(10), [0.0] * 10, type_id=TypeID.M_ME_NC_1, deadband=sut)
+        collector.update_many(range(10), [0.1] * 5 + [1.0] * 5, type_id=TypeID.M_ME_NC_1, deadband=sut)
+        collector.flush()
+        self.assertEqual(collector.changes, 15)
+        # the changes of IOA 5 to 9 replace their pending values
+        self.assertEqual([(element.ioa, element.value) for asdu in enqueued for element in asdu.decode().elements],
+                         [(ioa, 0.0 if ioa < 5 else 1.0) for ioa in range(10)])
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
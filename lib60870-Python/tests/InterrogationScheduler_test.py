@@ -0,0 +1,155 @@
+import sys
+import os
+import unittest
+import logging
+import threading
+import time
+import concurrent.futures
+
+sys.path.insert(1, '../')
+from lib60870.InterrogationScheduler import InterrogationScheduler, InterrogationKind, Priority
+from lib60870.PointDatabase import PointDatabase
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.lib60870 import TypeID
+
+PORT = 24115
+
+
+class FakeConnection():
+    def __init__(self, name, log, duration=0.0, release=None):
+        self.name = name
+        self.log = log
+        self.duration = duration
+        self.release = release
+
+    def interrogate(self, ca, qoi, timeout):
+        self.log.append((time.monotonic(), self.name, "GI", ca, qoi))
+        if self.release is not None:
+            self.release.wait(5)
+        time.sleep(self.duration)
+        if ca == 99:
+            raise TimeoutError("interrogation of CA 99 timed out")
+        return (self.name, ca)
+
+    def counter_interrogate(self, ca, qcc, timeout):
+        self.log.append((time.monotonic(), self.name, "CI", ca, qcc))
+        return (self.name, ca, qcc)
+
+
+class InterrogationSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+
+    def tearDown(self):
+        self.sut.stop()
+
+    def test_rate_limit(self):
+        self.sut = InterrogationScheduler(rate=20.0, burst=2)
+        connections = [FakeConnection(index, self.log) for index in range(8)]
+        start = time.monotonic()
+        futures = [self.sut.request(connection) for connection in connections]
+        results = [future.result(5) for future in futures]
+        self.assertEqual(results, [(index, 1) for index in range(8)])
+        # 2 at once, then 6 at 20 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+        starts = [entry[0] - start for entry in self.log]
+        self.assertLess(starts[1], 0.05)
+        self.assertGreater(starts[2], 0.03)
+        metrics = self.sut.get_metrics()
+        self.assertEqual((metrics["started"], metrics["completed"], metrics["queued"]), (8, 8, 0))
+        self.assertEqual(metrics["completion_time"]["count"], 8)
+
+    def test_priority(self):
+        self.sut = InterrogationScheduler(rate=1000.0, burst=1, max_concurrent=1)
+        release = threading.Event()
+        blocker = FakeConnection("blocker", self.log, release=release)
+        first = self.sut.request(blocker)
+        time.sleep(0.05)
+        futures = [self.sut.request(FakeConnection("low", self.log), priority=Priority.LOW),
+                   self.sut.request(FakeConnection("normal", self.log)),
+                   self.sut.request(FakeConnection("high", self.log), priority=Priority.HIGH)]
+        self.assertEqual(self.sut.get_metrics()["queued_by_priority"], {"LOW": 1, "NORMAL": 1, "HIGH": 1})
+        release.set()
+        concurrent.futures.wait([first] + futures, 5)
+        self.assertEqual([entry[1] for entry in self.log], ["blocker", "high", "normal", "low"])
+
+    def test_coalesce(self):
+        self.sut = InterrogationScheduler(rate=1000.0, burst=1, max_concurrent=1)
+        release = threading.Event()
+        connection = FakeConnection("rtu", self.log, release=release)
+        running = self.sut.request(connection, ca=1)
+        time.sleep(0.05)
+        # the CA is busy, a second request is queued and the third joins it
+        queued = self.sut.request(connection, ca=1)
+        self.assertIs(self.sut.request(connection, ca=1, priority=Priority.HIGH), queued)
+        counter = self.sut.request_counter(connection, ca=1)
+        release.set()
+        self.assertEqual(queued.result(5), ("rtu", 1))
+        self.assertEqual(counter.result(5), ("rtu", 1, 5))
+        self.assertEqual(running.result(5), ("rtu", 1))
+        self.assertEqual([entry[2] for entry in self.log].count("GI"), 2)
+        self.assertEqual(self.sut.coalesced, 1)
+
+    def test_failure(self):
+        self.sut = InterrogationScheduler()
+        future = self.sut.request(FakeConnection("rtu", self.log), ca=99)
+        with self.assertRaises(TimeoutError):
+            future.result(5)
+        metrics = self.sut.get_metrics()
+        self.assertEqual((metrics["failed"], metrics["timed_out"]), (1, 1))
+
+    def test_cycles(self):
+        self.sut = InterrogationScheduler(rate=1000.0, burst=10)
+        connection = FakeConnection("rtu", self.log)
+        general = self.sut.add_cycle(connection, 0.1, ca=1, first=0)
+        counter = self.sut.add_cycle(connection, 0.1, InterrogationKind.COUNTER, ca=2)
+        self.assertLessEqual(counter.due - time.monotonic(), 0.1)
+        time.sleep(0.45)
+        self.sut.remove_cycle(general)
+        runs = general.runs
+        time.sleep(0.2)
+        self.assertGreaterEqual(runs, 4)
+        self.assertEqual(general.runs, runs)
+        self.assertGreaterEqual(counter.runs, 3)
+        self.assertIn(("rtu", "CI", 2, 5), [entry[1:] for entry in self.log])
+
+    def test_stop(self):
+        self.sut = InterrogationScheduler(rate=0.1, burst=1)
+        self.sut.request(FakeConnection("first", self.log)).result(5)
+        queued = self.sut.request(FakeConnection("second", self.log))
+        self.sut.stop()
+        self.assertTrue(queued.cancelled())
+        with self.assertRaises(RuntimeError):
+            self.sut.request(FakeConnection("third", self.log))
+
+
+class InterrogationSchedulerConnectionTest(unittest.TestCase):
+    def test_interrogate(self):
+        database = PointDatabase()
+        for ca in range(1, 6):
+            database.add_points(ca, TypeID.M_ME_NC_1, range(100), [float(ca)] * 100)
+        slave = T104Slave()
+        slave.set_local_address(b"127.0.0.1")
+        slave.set_local_port(PORT)
+        slave.set_point_database(database)
+        slave.start()
+        sut = InterrogationScheduler(rate=50.0, burst=2)
+        try:
+            connection = T104Connection("127.0.0.1", PORT)
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                futures = [sut.request(connection, ca) for ca in range(1, 6)]
+                results = [future.result(5) for future in futures]
+        finally:
+            sut.stop()
+            slave.stop()
+        self.assertEqual([result.values[0] for result in results], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertTrue(all(len(result) == 100 for result in results))
+        self.assertEqual(sut.get_metrics()["completed"], 5)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
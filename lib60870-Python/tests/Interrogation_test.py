@@ -0,0 +1,79 @@
+import sys
+import os
+import unittest
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+sys.path.insert(1, '../')
+from lib60870.Interrogation import Interrogation, InterrogationError
+from lib60870.asdu import ASDU, ASDUBuilder
+from lib60870.information_object import InterrogationCommand
+from lib60870.lib60870 import CauseOfTransmission, QualifierOfInterrogation, TypeID
+
+
+def command(cot, ca=1, negative=False):
+    asdu = ASDU(type_id=TypeID.C_IC_NA_1, cot=cot, ca=ca)
+    asdu.set_negative(negative)
+    asdu.add_information_object(InterrogationCommand(0, QualifierOfInterrogation.IEC60870_QOI_STATION.value))
+    return asdu
+
+
+class InterrogationTest(unittest.TestCase):
+    def test_collect(self):
+        sut = Interrogation(1, QualifierOfInterrogation.IEC60870_QOI_GROUP_2)
+        self.assertTrue(sut.feed(command(CauseOfTransmission.ACTIVATION_CON)))
+        group_2 = CauseOfTransmission.INTERROGATED_BY_GROUP_2
+        for asdu in (ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [10, 11], [1.5, 2.5], cot=group_2) +
+                     ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [12], [1.5], cot=CauseOfTransmission.SPONTANEOUS) +
+                     ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [13], [1.5], cot=group_2, ca=2)):
+            sut.feed(asdu)
+        self.assertFalse(sut.done.is_set())
+        self.assertTrue(sut.feed(command(CauseOfTransmission.ACTIVATION_TERMINATION)))
+        result = sut.get_result()
+        self.assertEqual(result.to_dict(), {10: 1.5, 11: 2.5})
+        self.assertEqual((result.asdus, result.qoi), (1, 22))
+        self.assertIsNotNone(result.confirmation_time)
+        self.assertFalse(sut.feed(command(CauseOfTransmission.ACTIVATION_TERMINATION)))
+
+    def test_negative(self):
+        sut = Interrogation(1)
+        sut.feed(command(CauseOfTransmission.ACTIVATION_CON, negative=True))
+        self.assertTrue(sut.done.is_set())
+        with self.assertRaises(InterrogationError):
+            sut.get_result()
+
+    def test_invalid_qoi(self):
+        with self.assertRaises(ValueError):
+            Interrogation(1, 40)
+        with self.assertRaises(ValueError):
+            Interrogation(1, 6, TypeID.C_CI_NA_1)
+
+    def test_counter(self):
+        sut = Interrogation(1, 1, TypeID.C_CI_NA_1)
+        self.assertEqual(sut.cot, CauseOfTransmission.REQUESTED_BY_GROUP_1_COUNTER)
+        # a general interrogation termination does not end a counter interrogation
+        self.assertFalse(sut.feed(command(CauseOfTransmission.ACTIVATION_TERMINATION)))
+        for asdu in ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [5], [42.0],
+                                            cot=CauseOfTransmission.REQUESTED_BY_GROUP_1_COUNTER):
+            self.assertTrue(sut.feed(asdu))
+        self.assertEqual(sut.result.to_dict(), {5: 42.0})
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_to_numpy(self):
+        sut = Interrogation(1)
+        for asdu in ASDUBuilder.from_arrays(TypeID.M_SP_NA_1, [1, 2], [True, False],
+                                            cot=CauseOfTransmission.INTERROGATED_BY_STATION):
+            sut.feed(asdu)
+        result = sut.result.to_numpy()
+        self.assertEqual(list(result["ioa"]), [1, 2])
+        self.assertEqual(list(result["value"]), [1.0, 0.0])
+        self.assertEqual(list(result["timestamp_ms"]), [-1, -1])
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,103 @@
+import sys
+import os
+import unittest
+import logging
+import random
+import time
+
+sys.path.insert(1, '../')
+from lib60870.LoadGenerator import LoadGenerator, rate_distribution
+from lib60870.T104Connection import T104Connection
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24118
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class RateDistributionTest(unittest.TestCase):
+    def test_distributions(self):
+        rng = random.Random(1)
+        self.assertEqual(rate_distribution("fixed:2.5")(rng), 2.5)
+        self.assertTrue(1.0 <= rate_distribution("uniform:1,2")(rng) <= 2.0)
+        rates = [rate_distribution("exponential:0.5")(rng) for _ in range(2000)]
+        self.assertAlmostEqual(sum(rates) / len(rates), 0.5, delta=0.05)
+        rates = sorted(rate_distribution("lognormal:0.1,1")(rng) for _ in range(2001))
+        self.assertAlmostEqual(rates[1000], 0.1, delta=0.02)
+        self.assertGreaterEqual(min(rate_distribution("pareto:0.01,1.5")(rng) for _ in range(100)), 0.01)
+
+    def test_invalid(self):
+        for spec in ("normal:1", "fixed", "fixed:1,2", "uniform:a,b", "exponential:-1"):
+            with self.assertRaises(ValueError):
+                rate_distribution(spec)
+
+
+class LoadGeneratorTest(unittest.TestCase):
+    def test_layout(self):
+        sut = LoadGenerator(outstations=2, points=101, type_ids={TypeID.M_ME_NC_1: 3, TypeID.M_SP_NA_1: 1},
+                            rates="fixed:0.5", port=PORT)
+        self.assertEqual(sut.layout, [(TypeID.M_ME_NC_1, 76), (TypeID.M_SP_NA_1, 25)])
+        self.assertEqual(sut.get_ports(), [PORT, PORT + 1])
+        database = sut.get_database(1)
+        self.assertEqual(len(database), 101)
+        self.assertEqual((database.get_type_id(1, 1), database.get_type_id(1, 101)),
+                         (TypeID.M_ME_NC_1, TypeID.M_SP_NA_1))
+        metrics = sut.get_metrics()
+        self.assertEqual((metrics["outstations"], metrics["points"]), (2, 202))
+        self.assertAlmostEqual(metrics["offered_changes_per_second"], 101.0)
+        with self.assertRaises(ValueError):
+            LoadGenerator(type_ids={TypeID.M_ME_NC_1: 0})
+
+    def test_overflows_without_master(self):
+        sut = LoadGenerator(points=100, rates="fixed:10", max_queue_size=10, max_delay=0.01, port=PORT)
+        sut.start()
+        try:
+            self.assertTrue(wait_until(lambda: sut.get_metrics()["spontaneous_asdus"] > 20))
+        finally:
+            sut.stop()
+        metrics = sut.get_metrics()
+        self.assertEqual(metrics["connections"], 0)
+        self.assertEqual(metrics["overflows"], metrics["spontaneous_asdus"] - 10)
+        self.assertGreater(metrics["cpu_seconds"], 0)
+
+    def test_master(self):
+        sut = LoadGenerator(outstations=2, points=200, type_ids=(TypeID.M_ME_NC_1, TypeID.M_SP_TB_1),
+                            rates="fixed:1", period=0.2, periodic_fraction=0.5, max_delay=0.02, port=PORT, seed=1)
+        received = []
+        connection = T104Connection("127.0.0.1", PORT)
+        connection.set_asdu_received_handler(lambda asdu: received.append(asdu.get_cot()) or True)
+        sut.start()
+        try:
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                result = connection.interrogate(1)
+                self.assertTrue(wait_until(lambda: CauseOfTransmission.PERIODIC in received and
+                                           CauseOfTransmission.SPONTANEOUS in received))
+                time.sleep(0.3)
+                metrics = sut.get_metrics()
+        finally:
+            sut.stop()
+        self.assertEqual(len(result), 200)
+        self.assertEqual(metrics["connections"], 1)
+        self.assertEqual((metrics["interrogations"], metrics["truncated_interrogations"]), (1, 0))
+        self.assertEqual(metrics["interrogation_asdus"], result.asdus)
+        self.assertEqual(metrics["overflows"], 0)
+        self.assertGreater(metrics["asdus_per_second"], 0)
+        self.assertGreater(metrics["changes"], 0)
+        # half the measured values are periodic, the other points change spontaneously
+        self.assertAlmostEqual(metrics["offered_changes_per_second"], 2 * 150.0)
+        self.assertEqual(metrics["per_outstation"][0]["connections"], 1)
+        self.assertEqual(metrics["per_outstation"][1]["interrogations"], 0)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
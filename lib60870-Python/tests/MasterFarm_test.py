@@ -0,0 +1,113 @@
+import sys
+import os
+import unittest
+import logging
+import threading
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+sys.path.insert(1, '../')
+from lib60870.MasterFarm import MasterFarm, _PointRing, _DROPPED
+from lib60870.T104Slave import T104Slave, ServerMode
+from lib60870.asdu import ASDUBuilder
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24113
+
+
+def wait_until(condition, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+class PointRingTest(unittest.TestCase):
+    def test_wrap_around(self):
+        sut = _PointRing(bytearray(_PointRing.size(4)), 4)
+        sut.write([(0, 1, 13, 3, 0, ioa, 1.5, -1) for ioa in range(3)])
+        self.assertEqual([point[5] for point in sut.read()], [0, 1, 2])
+        sut.write([(0, 1, 13, 3, 0, ioa, 1.5, -1) for ioa in range(3, 9)])
+        self.assertEqual(sut.get(_DROPPED), 2)
+        self.assertEqual([point[5] for point in sut.read()], [3, 4, 5, 6])
+        self.assertEqual(sut.read(), [])
+
+
+class MasterFarmTest(unittest.TestCase):
+    def setUp(self):
+        # every connection gets each spontaneous ASDU
+        self.slave = T104Slave()
+        self.slave.set_local_address(b"127.0.0.1")
+        self.slave.set_local_port(PORT)
+        self.slave.set_server_mode(ServerMode.CONNECTION_IS_REDUNDANCY_GROUP)
+        self.slave.start()
+        self.running = True
+        self.thread = threading.Thread(target=self.produce)
+        self.thread.start()
+
+    def tearDown(self):
+        self.running = False
+        self.thread.join()
+        self.slave.stop()
+
+    def produce(self):
+        asdus = ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [100, 101, 102], [1.5, 2.5, 3.5],
+                                        cot=CauseOfTransmission.SPONTANEOUS)
+        while self.running:
+            for asdu in asdus:
+                self.slave.enqueue_asdu(asdu)
+            time.sleep(0.05)
+
+    def read_links(self, sut):
+        points = sut.read()
+        for point in points:
+            self.assertEqual((point.ca, point.type_id, point.cot), (1, 13, 3))
+            self.assertIn(point.ioa, (100, 101, 102))
+        return set(point.link_id for point in points)
+
+    def test_farm(self):
+        sut = MasterFarm([("rtu{}".format(index), "127.0.0.1", PORT) for index in range(4)], workers=2,
+                         check_interval=0.1, connect_timeout=1.0, backoff=0.1)
+        sut.start()
+        try:
+            self.assertEqual(sorted(sut.get_assignment().values()), [0, 0, 1, 1])
+            links = set()
+            self.assertTrue(wait_until(lambda: links.update(self.read_links(sut)) or len(links) == 4))
+            metrics = sut.get_metrics()
+            self.assertEqual([worker["links"] for worker in metrics], [2, 2])
+            self.assertTrue(all(worker["points"] > 0 and worker["alive"] for worker in metrics))
+
+            sut._workers[0].process.kill()
+            self.assertTrue(wait_until(lambda: set(sut.get_assignment().values()) == {1}))
+            self.assertEqual(sut.rebalanced, 2)
+            sut.read()
+            links = set()
+            self.assertTrue(wait_until(lambda: links.update(self.read_links(sut)) or len(links) == 4))
+            self.assertEqual([worker["alive"] for worker in sut.get_metrics()], [False, True])
+        finally:
+            sut.stop()
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_read_numpy(self):
+        sut = MasterFarm([("rtu", "127.0.0.1", PORT)], workers=1, connect_timeout=1.0)
+        sut.start()
+        try:
+            self.assertTrue(wait_until(lambda: sut.get_metrics()[0]["pending"] >= 6))
+            points = sut.read_numpy()
+        finally:
+            sut.stop()
+        self.assertGreaterEqual(len(points), 6)
+        self.assertEqual(list(points["ioa"][:3]), [100, 101, 102])
+        self.assertEqual(list(points["value"][:3]), [1.5, 2.5, 3.5])
+        self.assertTrue((points["link"] == 0).all())
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
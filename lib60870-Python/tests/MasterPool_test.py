@@ -0,0 +1,153 @@
+import sys
+import os
+import unittest
+import logging
+import socket
+import threading
+import time
+
+sys.path.insert(1, '../')
+from lib60870.MasterPool import MasterPool, LinkState
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDUBuilder
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24112
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def create_slave(port):
+    def interrogation_handler(parameter, connection, asdu, qoi):
+        connection.send_act_con(asdu)
+        for response in ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [100, 101], [1.5, 2.5],
+                                                cot=CauseOfTransmission.INTERROGATED_BY_STATION):
+            connection.send_asdu(response)
+        connection.send_act_term(asdu)
+        return True
+
+    slave = T104Slave()
+    slave.set_local_address(b"127.0.0.1")
+    slave.set_local_port(port)
+    slave.set_interrogation_handler(interrogation_handler)
+    return slave
+
+
+class MasterPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.slave = create_slave(PORT)
+        self.slave.start()
+        self.sut = MasterPool(backoff=0.1, connect_timeout=0.5)
+
+    def tearDown(self):
+        self.sut.stop()
+        self.slave.stop()
+
+    def test_tagged_stream(self):
+        for link_id in ("rtu1", "rtu2", "rtu3"):
+            self.sut.add_link(link_id, "127.0.0.1", PORT)
+        self.sut.start()
+        self.assertTrue(wait_until(lambda: self.sut.get_states()[LinkState.ACTIVE] == 3))
+        for link in self.sut.get_links():
+            link.connection.send_interrogation_command(ca=1)
+        received = {}
+        for link_id, asdu in self.sut:
+            if asdu.get_cot() == CauseOfTransmission.INTERROGATED_BY_STATION:
+                received[link_id] = [element.ioa for element in asdu.decode().elements]
+            if len(received) == 3:
+                break
+        self.assertEqual(received, {"rtu1": [100, 101], "rtu2": [100, 101], "rtu3": [100, 101]})
+        self.assertEqual(self.sut.get_link("rtu1").connects, 1)
+
+    def test_asdu_handler(self):
+        received = []
+        done = threading.Event()
+
+        def handler(link_id, asdu):
+            received.append((link_id, asdu.get_cot()))
+            if asdu.get_cot() == CauseOfTransmission.ACTIVATION_TERMINATION:
+                done.set()
+
+        self.sut.set_asdu_handler(handler)
+        self.sut.add_link(7, "127.0.0.1", PORT)
+        self.sut.start()
+        self.assertTrue(wait_until(lambda: self.sut.get_state(7) == LinkState.ACTIVE))
+        self.sut.get_link(7).connection.send_interrogation_command(ca=1)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(received, [(7, CauseOfTransmission.ACTIVATION_CON),
+                                    (7, CauseOfTransmission.INTERROGATED_BY_STATION),
+                                    (7, CauseOfTransmission.ACTIVATION_TERMINATION)])
+
+    def test_reconnect(self):
+        states = []
+        self.sut.set_state_handler(lambda link_id, state: states.append(state))
+        self.sut.add_link("rtu", "127.0.0.1", PORT + 1)
+        self.sut.start()
+        self.assertTrue(wait_until(lambda: self.sut.get_link("rtu").failures >= 2))
+        self.assertEqual(states[:3], [LinkState.CONNECTING, LinkState.BACKOFF, LinkState.CONNECTING])
+        late_slave = create_slave(PORT + 1)
+        # the RTU drops the link on interrogation
+        late_slave.set_interrogation_handler(lambda parameter, connection, asdu, qoi: connection.close() or True)
+        late_slave.start()
+        try:
+            self.assertTrue(wait_until(lambda: self.sut.get_state("rtu") == LinkState.ACTIVE))
+            link = self.sut.get_link("rtu")
+            self.assertEqual((link.failures, link.connects), (0, 1))
+            link.connection.send_interrogation_command(ca=1)
+            self.assertTrue(wait_until(lambda: link.connects == 2 and link.state == LinkState.ACTIVE))
+            self.assertIn(LinkState.BACKOFF, states[states.index(LinkState.ACTIVE):])
+        finally:
+            late_slave.stop()
+
+    def test_remove_link(self):
+        self.sut.add_link("rtu", "127.0.0.1", PORT)
+        self.sut.start()
+        self.assertTrue(wait_until(lambda: self.sut.get_state("rtu") == LinkState.ACTIVE))
+        with self.assertRaises(ValueError):
+            self.sut.add_link("rtu", "127.0.0.1", PORT)
+        link = self.sut.get_link("rtu")
+        self.sut.remove_link("rtu")
+        self.assertNotIn("rtu", self.sut)
+        self.assertTrue(wait_until(lambda: link.state == LinkState.DISCONNECTED))
+
+    def test_unreachable_link(self):
+        # a listener whose backlog is full drops the SYN of further connects, which hang like an unreachable RTU
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", PORT + 2))
+        listener.listen(0)
+        backlog = []
+        sut = MasterPool(backoff=0.1, connect_timeout=1.0)
+        try:
+            for _ in range(3):
+                client = socket.socket()
+                client.setblocking(False)
+                client.connect_ex(("127.0.0.1", PORT + 2))
+                backlog.append(client)
+            sut.add_link("rtu", "127.0.0.1", PORT + 2)
+            self.assertEqual(sut.get_link("rtu").connection.get_connection_parameters().t0, 1)
+            sut.start()
+            self.assertTrue(wait_until(lambda: sut.get_state("rtu") == LinkState.CONNECTING))
+            self.assertTrue(wait_until(lambda: sut.get_state("rtu") == LinkState.BACKOFF, 3))
+            self.assertTrue(wait_until(lambda: sut.get_state("rtu") == LinkState.CONNECTING))
+            time.sleep(0.1)
+            start = time.monotonic()
+            sut.remove_link("rtu")
+            sut.stop()
+            self.assertLess(time.monotonic() - start, sut.connect_timeout)
+        finally:
+            sut.stop()
+            for client in backlog:
+                client.close()
+            listener.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
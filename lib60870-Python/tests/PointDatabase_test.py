@@ -0,0 +1,181 @@
+import sys
+import os
+import unittest
+import logging
+import threading
+
+sys.path.insert(1, '../')
+from lib60870.PointDatabase import PointDatabase
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import decode_asdu
+from lib60870.lib60870 import CauseOfTransmission, QualifierOfInterrogation, TypeID
+
+PORT = 24107
+
+
+def decode_all(asdus):
+    return [(asdu.get_type_id(), asdu.get_cot(), [element.ioa for element in asdu.decode().elements])
+            for asdu in asdus]
+
+
+class PointDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.sut = PointDatabase()
+        self.sut.add_points(1, TypeID.M_SP_NA_1, range(100, 110), [True] * 10, group=1)
+        self.sut.add_points(1, TypeID.M_ME_TF_1, range(200, 205), [1.5] * 5, timestamps=[1000] * 5, group=2)
+        self.sut.add_points(1, TypeID.M_IT_NA_1, [300], [42])
+        self.sut.add_points(2, TypeID.M_ME_NB_1, [100], [7])
+
+    def test_station(self):
+        response = decode_all(self.sut.build_interrogation_response(1, QualifierOfInterrogation.IEC60870_QOI_STATION))
+        self.assertEqual(response, [
+            (TypeID.M_SP_NA_1, CauseOfTransmission.INTERROGATED_BY_STATION, list(range(100, 110))),
+            (TypeID.M_ME_NC_1, CauseOfTransmission.INTERROGATED_BY_STATION, list(range(200, 205)))])
+
+    def test_group(self):
+        response = decode_all(self.sut.build_interrogation_response(1, 22))
+        self.assertEqual(response, [
+            (TypeID.M_ME_NC_1, CauseOfTransmission.INTERROGATED_BY_GROUP_2, list(range(200, 205)))])
+        self.assertEqual(self.sut.build_interrogation_response(1, 23), [])
+
+    def test_invalid_qoi(self):
+        with self.assertRaises(ValueError):
+            self.sut.build_interrogation_response(1, 37)
+
+    def test_update(self):
+        self.sut.update(1, 201, 2.5, timestamp=2000)
+        self.sut.update_many(1, [100, 101], [False, False], [0x80, 0x80])
+        self.assertEqual(self.sut.get(1, 201), (201, 2.5, 0, 2000))
+        self.assertEqual(self.sut.get(1, 101), (101, 0, 0x80, 0))
+        elements = self.sut.build_interrogation_response(1, 20)[0].decode().elements
+        self.assertEqual([element.value for element in elements[:3]], [False, False, True])
+
+    def test_step_positions(self):
+        for type_id in (TypeID.M_ST_NA_1, TypeID.M_ST_TA_1, TypeID.M_ST_TB_1):
+            sut = PointDatabase()
+            sut.add_points(1, type_id, [10, 11], [(-20, True), 5])
+            sut.update(1, 11, (63, True))
+            sut.update_many(1, [10], [(-64, False)])
+            self.assertEqual(sut.get(1, 11).value, (63, True))
+            elements = sut.build_interrogation_response(1, 20)[0].decode().elements
+            self.assertEqual([element.value for element in elements], [(-64, False), (63, True)])
+            sut.add_points(1, type_id, [12], [7])
+            self.assertEqual([sut.get(1, ioa).value for ioa in (10, 11, 12)], [(-64, False), (63, True), (7, False)])
+
+    def test_replace_points(self):
+        self.sut.add_points(1, TypeID.M_SP_NA_1, [105, 120], [False, False])
+        self.assertEqual(len(self.sut), 18)
+        self.assertEqual(self.sut.get(1, 105).value, 0)
+        self.assertEqual(self.sut.build_interrogation_response(1, 21)[0].decode().elements[-1].ioa, 109)
+
+    def test_type_conflict(self):
+        with self.assertRaises(ValueError):
+            self.sut.add_points(1, TypeID.M_DP_NA_1, [100])
+
+    def test_common_addresses(self):
+        self.assertEqual(self.sut.get_common_addresses(), [1, 2])
+        self.assertIn((2, 100), self.sut)
+        self.assertEqual(self.sut.get_type_id(2, 100), TypeID.M_ME_NB_1)
+
+
+class PointDatabaseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.sut = PointDatabase(block_size=100)
+        self.sut.add_points(1, TypeID.M_ME_NC_1, range(1000), [0.0] * 1000, group=[1 + i % 2 for i in range(1000)])
+
+    def test_hits(self):
+        first = self.sut.build_interrogation_response(1, 20)
+        second = self.sut.build_interrogation_response(1, 20)
+        self.assertEqual((self.sut.cache_misses, self.sut.cache_hits), (10, 10))
+        self.assertEqual(len(first), len(second))
+        for cached, asdu in zip(first, second):
+            self.assertIs(cached, asdu)
+
+    def test_update_invalidates_block(self):
+        first = self.sut.build_interrogation_response(1, 20)
+        self.sut.build_interrogation_response(1, 21)
+        self.sut.update(1, 250, 1.0)
+        second = self.sut.build_interrogation_response(1, 20)
+        self.assertEqual(self.sut.cache_misses, 10 + 5 + 1)
+        changed = [index for index, (cached, asdu) in enumerate(zip(first, second)) if cached is not asdu]
+        self.assertTrue(changed)
+        values = [element.value for asdu in second for element in asdu.decode().elements]
+        self.assertEqual(values, [1.0 if ioa == 250 else 0.0 for ioa in range(1000)])
+        # IOA 250 is in group 1, the group 2 response is still cached
+        self.sut.build_interrogation_response(1, 22)
+        self.assertEqual(self.sut.cache_misses, 10 + 5 + 1 + 5)
+        self.sut.build_interrogation_response(1, 21)
+        self.assertEqual(self.sut.cache_misses, 10 + 5 + 1 + 5 + 1)
+
+    def test_add_points_invalidates(self):
+        self.sut.build_interrogation_response(1, 20)
+        self.sut.add_points(1, TypeID.M_ME_NC_1, [5000], [2.0])
+        response = self.sut.build_interrogation_response(1, 20)
+        self.assertEqual(self.sut.cache_misses, 10 + 11)
+        self.assertEqual(response[-1].decode().elements[-1].ioa, 5000)
+
+    def test_invalidate(self):
+        self.sut.build_interrogation_response(1, 20)
+        self.sut.invalidate()
+        self.sut.build_interrogation_response(1, 20)
+        self.assertEqual(self.sut.cache_misses, 20)
+
+
+class PointDatabaseSlaveTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.database = PointDatabase()
+        cls.database.add_points(1, TypeID.M_ME_NC_1, range(1000, 6000), [float(i) for i in range(5000)],
+                                group=[1 + i % 2 for i in range(5000)])
+        cls.slave = T104Slave(max_high_prio_queue_size=1024)
+        cls.slave.set_local_address(b"127.0.0.1")
+        cls.slave.set_local_port(PORT)
+        cls.slave.set_point_database(cls.database)
+        cls.slave.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.slave.stop()
+
+    def interrogate(self, ca, qoi):
+        received = []
+        done = threading.Event()
+
+        def handler(asdu):
+            received.append(asdu.copy())
+            if asdu.get_cot() in (CauseOfTransmission.ACTIVATION_TERMINATION,
+                                  CauseOfTransmission.UNKNOWN_COMMON_ADDRESS_OF_ASDU) or asdu.is_negative():
+                done.set()
+            return True
+
+        connection = T104Connection("127.0.0.1", PORT)
+        connection.set_asdu_received_handler(handler)
+        with connection.connect():
+            connection.send_start_dt()
+            connection.send_interrogation_command(ca=ca, qoi=qoi)
+            self.assertTrue(done.wait(10))
+        return received
+
+    def test_station(self):
+        received = self.interrogate(1, QualifierOfInterrogation.IEC60870_QOI_STATION)
+        self.assertEqual(received[0].get_cot(), CauseOfTransmission.ACTIVATION_CON)
+        self.assertEqual(received[-1].get_cot(), CauseOfTransmission.ACTIVATION_TERMINATION)
+        values = [element.value for asdu in received[1:-1] for element in asdu.decode().elements]
+        self.assertEqual(values, [float(i) for i in range(5000)])
+
+    def test_group(self):
+        received = self.interrogate(1, QualifierOfInterrogation.IEC60870_QOI_GROUP_2)
+        ioas = [element.ioa for asdu in received[1:-1] for element in asdu.decode().elements]
+        self.assertEqual(ioas, list(range(1001, 6000, 2)))
+        self.assertEqual(received[1].get_cot(), CauseOfTransmission.INTERROGATED_BY_GROUP_2)
+
+    def test_unknown_ca(self):
+        received = self.interrogate(5, QualifierOfInterrogation.IEC60870_QOI_STATION)
+        self.assertEqual(received[-1].get_cot(), CauseOfTransmission.UNKNOWN_COMMON_ADDRESS_OF_ASDU)
+        self.assertTrue(received[-1].is_negative())
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,138 @@
+import sys
+import os
+import unittest
+import logging
+import threading
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+sys.path.insert(1, '../')
+from lib60870.RemotePointImage import RemotePointImage
+from lib60870.PointDatabase import PointDatabase
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDU, ASDUBuilder
+from lib60870.information_object import SetpointCommandShort
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24114
+
+
+class RemotePointImageTest(unittest.TestCase):
+    def setUp(self):
+        self.sut = RemotePointImage()
+
+    def test_update_asdu(self):
+        for asdu in ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [10, 11], [1.5, 2.5], [0, 0x80], ca=3):
+            self.sut.update_asdu(asdu)
+        for asdu in ASDUBuilder.from_arrays(TypeID.M_SP_TB_1, [12], [True], timestamps=[1500000000000]):
+            self.sut.update_asdu(asdu)
+        self.assertEqual(len(self.sut), 3)
+        self.assertIn((3, 10), self.sut)
+        point = self.sut.get(3, 11)
+        self.assertEqual((point.type_id, point.value, point.quality, point.timestamp), (13, 2.5, 0x80, -1))
+        point = self.sut.get(1, 12)
+        self.assertEqual((point.type_id, point.value, point.timestamp), (30, 1.0, 1500000000000))
+        self.assertEqual(self.sut.get_value(3, 10), 1.5)
+        with self.assertRaises(KeyError):
+            self.sut.get(1, 10)
+
+    def test_commands_ignored(self):
+        asdu = ASDU(type_id=TypeID.C_SE_NC_1, cot=CauseOfTransmission.ACTIVATION_CON)
+        asdu.add_information_object(SetpointCommandShort(10, 1.5, False, 0))
+        self.sut.update_asdu(asdu)
+        self.assertEqual((len(self.sut), self.sut.sequence), (0, 0))
+
+    def test_undecodable_asdus_ignored(self):
+        test_command = b"\x68\x01\x07\x00\x01\x00\x00\x00\x00\xcc\x55"
+        file_ready = b"\x78\x01\x0d\x00\x01\x00\x00\x00\x00\x01\x00\x64\x00\x00\x00"
+        unlisted_cot = b"\x0d\x01\x13\x00\x01\x00\x0a\x00\x00\x00\x00\xc0\x3f\x00"
+        reserved_type = b"\x16\x01\x03\x00\x01\x00\x0a\x00\x00\x00"
+        for buffer in (test_command, file_ready, unlisted_cot, reserved_type):
+            self.assertTrue(self.sut.asdu_received_handler(ASDU.from_bytes(buffer)))
+        self.sut.update_buffers(None, [test_command, file_ready, unlisted_cot, reserved_type])
+        self.assertEqual(len(self.sut), 1)
+        self.assertEqual(self.sut.get_value(1, 10), 1.5)
+        self.assertEqual(self.sut.undecoded, 2)
+
+    def test_changes_since(self):
+        for ioa in range(5):
+            self.sut.update(1, ioa, TypeID.M_ME_NC_1, float(ioa))
+        sequence, points = self.sut.changes_since(0)
+        self.assertEqual((sequence, [point.ioa for point in points]), (5, [0, 1, 2, 3, 4]))
+        self.sut.update(1, 3, TypeID.M_ME_NC_1, 5.0)
+        self.sut.update(1, 1, TypeID.M_ME_NC_1, 6.0)
+        self.sut.update(1, 3, TypeID.M_ME_NC_1, 7.0)
+        sequence, points = self.sut.changes_since(sequence)
+        self.assertEqual(sequence, 8)
+        self.assertEqual([(point.ioa, point.value, point.sequence) for point in points], [(3, 7.0, 8), (1, 6.0, 7)])
+        self.assertEqual(self.sut.changes_since(sequence), (8, []))
+
+    def test_log_overflow(self):
+        self.sut = RemotePointImage(max_log=8)
+        for value in range(20):
+            self.sut.update(1, value % 4, TypeID.M_ME_NC_1, float(value))
+        self.assertLessEqual(len(self.sut._log), 8)
+        sequence, points = self.sut.changes_since(2)
+        self.assertEqual(sorted((point.ioa, point.value) for point in points),
+                         [(0, 16.0), (1, 17.0), (2, 18.0), (3, 19.0)])
+        sequence, points = self.sut.changes_since(18)
+        self.assertEqual([point.ioa for point in points], [2, 3])
+
+    def test_clear(self):
+        self.sut.update(1, 1, TypeID.M_ME_NC_1, 1.0)
+        self.sut.clear()
+        self.assertEqual(len(self.sut), 0)
+        self.assertEqual(self.sut.changes_since(0), (1, []))
+        self.sut.update(1, 2, TypeID.M_ME_NC_1, 1.0)
+        self.assertEqual([point.ioa for point in self.sut.changes_since(1)[1]], [2])
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_to_numpy(self):
+        for ioa in range(5):
+            self.sut.update(2, ioa + 100, TypeID.M_ME_NC_1, ioa * 0.5)
+        self.sut.update(2, 102, TypeID.M_ME_NC_1, 9.0)
+        snapshot = self.sut.to_numpy()
+        self.assertEqual(list(snapshot["ioa"]), [100, 101, 102, 103, 104])
+        self.assertEqual(list(snapshot["value"]), [0.0, 0.5, 9.0, 1.5, 2.0])
+        self.assertEqual(list(snapshot["sequence"]), [1, 2, 6, 4, 5])
+        changed = self.sut.to_numpy(since=5)
+        self.assertEqual(list(changed["ioa"]), [102])
+        self.assertEqual(len(RemotePointImage().to_numpy()), 0)
+
+
+class RemotePointImageConnectionTest(unittest.TestCase):
+    def test_interrogation(self):
+        database = PointDatabase()
+        database.add_points(1, TypeID.M_ME_NC_1, range(1000), [float(ioa) for ioa in range(1000)])
+        database.add_points(1, TypeID.M_SP_NA_1, range(2000, 2010), [1] * 10)
+        slave = T104Slave(max_high_prio_queue_size=64)
+        slave.set_local_address(b"127.0.0.1")
+        slave.set_local_port(PORT)
+        slave.set_point_database(database)
+        slave.start()
+        try:
+            sut = RemotePointImage()
+            connection = T104Connection("127.0.0.1", PORT)
+            sut.attach(connection)
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                connection.send_interrogation_command(ca=1)
+                deadline = time.monotonic() + 5
+                while len(sut) < 1010 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+        finally:
+            slave.stop()
+        self.assertEqual(len(sut), 1010)
+        self.assertEqual(sut.get_value(1, 999), 999.0)
+        self.assertEqual(sut.get(1, 2005).type_id, TypeID.M_SP_NA_1.value)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,119 @@
+import sys
+import os
+import unittest
+import logging
+import asyncio
+import queue
+import threading
+import time
+from unittest import mock
+
+sys.path.insert(1, '../')
+from lib60870.SendQueue import SendQueue
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.information_object import SetpointCommandShort
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24109
+
+
+class SendQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.window = threading.Event()
+        self.connection = mock.Mock(spec=["send_asdu", "send_control_command", "is_transmit_buffer_full"])
+        self.connection.send_asdu.side_effect = lambda asdu: self.window.is_set()
+        self.connection.is_transmit_buffer_full.return_value = True
+        self.sut = SendQueue(self.connection, max_size=2)
+
+    def tearDown(self):
+        self.sut.stop()
+
+    def test_backpressure(self):
+        self.sut.send_asdu("a")
+        self.sut.send_asdu("b")
+        self.assertEqual(self.sut.qsize(), 2)
+        with self.assertRaises(queue.Full):
+            self.sut.send_asdu("c", block=False)
+        with self.assertRaises(queue.Full):
+            self.sut.send_asdu("c", timeout=0.01)
+        self.assertFalse(self.sut.join(0.01))
+        self.window.set()
+        self.assertTrue(self.sut.join(5))
+        self.assertEqual(set(call.args[0] for call in self.connection.send_asdu.call_args_list), {"a", "b"})
+        self.assertEqual(self.sut.sent, 2)
+        self.assertGreater(self.sut.window_full, 0)
+        self.assertEqual(len(self.sut), 0)
+
+    def test_order(self):
+        self.window.set()
+        for name in "abcdef":
+            self.sut.send_asdu(name)
+        self.assertTrue(self.sut.join(5))
+        self.assertEqual([call.args[0] for call in self.connection.send_asdu.call_args_list], list("abcdef"))
+
+    def test_send_raises(self):
+        self.window.set()
+        self.connection.send_asdu.side_effect = lambda asdu: asdu != "b" or 1 / 0
+        for name in "abc":
+            self.sut.send_asdu(name)
+        self.assertTrue(self.sut.join(5))
+        self.assertEqual([call.args[0] for call in self.connection.send_asdu.call_args_list], list("abc"))
+        self.assertEqual((self.sut.sent, self.sut.errors), (2, 1))
+
+    def test_async(self):
+        async def send():
+            for name in "abcd":
+                await self.sut.send_asdu_async(name)
+            with self.assertRaises(queue.Full):
+                await self.sut.send_asdu_async("e", timeout=0.01)
+            self.assertFalse(await self.sut.join_async(0.01))
+            self.window.set()
+            self.assertTrue(await self.sut.join_async(5))
+
+        self.connection.send_asdu.side_effect = lambda asdu: self.window.is_set() or asdu in "ab"
+        asyncio.run(send())
+        self.assertEqual(self.sut.sent, 4)
+
+
+class SendQueueSlaveTest(unittest.TestCase):
+    def test_setpoints(self):
+        count = 2000
+        received = []
+        done = threading.Event()
+
+        def handler(parameter, connection, asdu):
+            if asdu.get_type_id() == TypeID.C_SE_NC_1:
+                received.append(asdu.decode().elements[0].ioa)
+                if len(received) == count:
+                    done.set()
+            return True
+
+        slave = T104Slave()
+        slave.set_local_address(b"127.0.0.1")
+        slave.set_local_port(PORT)
+        slave.set_asdu_handler(handler)
+        slave.start()
+        try:
+            connection = T104Connection("127.0.0.1", PORT)
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                sut = SendQueue(connection, max_size=64)
+                try:
+                    for ioa in range(count):
+                        sut.send_control_command(CauseOfTransmission.ACTIVATION, 1,
+                                                 SetpointCommandShort(ioa, 1.5, False, 0))
+                    self.assertTrue(sut.join(10))
+                    self.assertTrue(done.wait(10))
+                finally:
+                    sut.stop()
+        finally:
+            slave.stop()
+        self.assertEqual(received, list(range(count)))
+        self.assertEqual(sut.sent, count)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,223 @@
+import sys
+import os
+import unittest
+import logging
+import tempfile
+import time
+
+sys.path.insert(1, '../')
+from lib60870.SessionLog import SessionRecorder, SessionReplayer, read_session_log
+from lib60870.CaptureReader import Direction
+from lib60870.PointDatabase import PointDatabase
+from lib60870.T104Connection import T104Connection
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDU, ASDUBuilder, get_decoder
+from lib60870.common import ConnectionParameters
+from lib60870.information_object import SingleCommand
+from lib60870.lib60870 import CauseOfTransmission, TypeID
+
+PORT = 24117
+
+
+def measurements(count):
+    return [ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [ioa], [float(ioa)], cot=CauseOfTransmission.SPONTANEOUS)[0]
+            for ioa in range(count)]
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class SessionLogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record(self):
+        asdus = [asdu.get_buffer() for asdu in measurements(3)]
+        with SessionRecorder(self.path) as sut:
+            sut.record_monitor(asdus[0])
+            time.sleep(0.02)
+            sut.record_control(asdus[1])
+        with SessionRecorder(self.path) as sut:
+            sut.record_monitor(asdus[2])
+            # more than 71 minutes since the previous record
+            sut._last -= 1 << 33
+            sut.record_monitor(asdus[2])
+        self.assertEqual(sut.records, 2)
+        records = list(read_session_log(self.path))
+        self.assertEqual([(record.session, record.direction, record.asdu) for record in records],
+                         [(0, Direction.MONITOR, asdus[0]), (0, Direction.CONTROL, asdus[1]),
+                          (1, Direction.MONITOR, asdus[2]), (1, Direction.MONITOR, asdus[2])])
+        self.assertGreaterEqual(records[1].time - records[0].time, 0.02)
+        self.assertGreater(records[3].time, (1 << 33) / 1e6)
+        self.assertAlmostEqual(records[0].started, time.time(), delta=5)
+
+    def test_torn_record(self):
+        with SessionRecorder(self.path) as sut:
+            for asdu in measurements(2):
+                sut.record_monitor(asdu.get_buffer())
+        with open(self.path, "r+b") as log:
+            log.truncate(os.path.getsize(self.path) - 3)
+        self.assertEqual(len(list(read_session_log(self.path))), 1)
+        with open(self.path, "wb") as log:
+            log.write(b"something else")
+        with self.assertRaises(ValueError):
+            SessionRecorder(self.path)
+
+
+class SessionLogConnectionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.slave = T104Slave(max_low_prio_queue_size=1000)
+        self.slave.set_local_address(b"127.0.0.1")
+        self.slave.set_local_port(PORT)
+
+    def tearDown(self):
+        self.slave.stop()
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_tap(self):
+        database = PointDatabase()
+        database.add_points(1, TypeID.M_ME_NC_1, range(10), [1.0] * 10)
+        self.slave.set_point_database(database)
+        commands = []
+
+        def handler(parameter, connection, asdu):
+            commands.append(asdu.get_type_id())
+            connection.send_act_con(asdu)
+            return True
+
+        self.slave.set_asdu_handler(handler)
+        self.slave.start()
+        connection = T104Connection("127.0.0.1", PORT)
+        with SessionRecorder(self.path("master.log")) as master, SessionRecorder(self.path("slave.log")) as slave:
+            self.slave.set_recorder(slave)
+            connection.set_recorder(master)
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                connection.interrogate(1)
+                connection.send_control_command(CauseOfTransmission.ACTIVATION, 1, SingleCommand(5, True, False, 0))
+                self.assertTrue(wait_until(lambda: master.records == 6))
+        expected = [(Direction.CONTROL, TypeID.C_IC_NA_1, CauseOfTransmission.ACTIVATION),
+                    (Direction.MONITOR, TypeID.C_IC_NA_1, CauseOfTransmission.ACTIVATION_CON),
+                    (Direction.MONITOR, TypeID.M_ME_NC_1, CauseOfTransmission.INTERROGATED_BY_STATION),
+                    (Direction.MONITOR, TypeID.C_IC_NA_1, CauseOfTransmission.ACTIVATION_TERMINATION),
+                    (Direction.CONTROL, TypeID.C_SC_NA_1, CauseOfTransmission.ACTIVATION),
+                    (Direction.MONITOR, TypeID.C_SC_NA_1, CauseOfTransmission.ACTIVATION_CON)]
+        for name in ("master.log", "slave.log"):
+            records = list(read_session_log(self.path(name)))
+            decoded = [(record.direction, record.asdu[0], record.asdu[2] & 0x3f) for record in records]
+            self.assertEqual(decoded, [(direction, type_id.value, cot.value) for direction, type_id, cot in expected])
+        self.assertEqual(commands, [TypeID.C_SC_NA_1])
+
+    def test_failed_send_not_recorded(self):
+        self.slave.start()
+        connection = T104Connection("127.0.0.1", PORT)
+        with SessionRecorder(self.path("master.log")) as master:
+            connection.set_recorder(master)
+            with connection.connect():
+                pass
+            # closed, the library refuses the command
+            self.assertFalse(connection.send_clock_sync_command(1))
+            self.assertEqual(master.records, 0)
+
+    def test_tap_connection_parameters(self):
+        parameters = ConnectionParameters(
+            sizeOfTypeId=1, sizeOfVSQ=1, sizeOfCOT=2, originatorAddress=7, sizeOfCA=1, sizeOfIOA=3)
+        self.slave = T104Slave(parameters)
+        self.slave.set_local_address(b"127.0.0.1")
+        self.slave.set_local_port(PORT)
+        database = PointDatabase()
+        database.add_points(1, TypeID.M_ME_NC_1, range(1000, 1010), [1.5] * 10)
+        self.slave.set_point_database(database)
+        self.slave.start()
+        connection = T104Connection("127.0.0.1", PORT)
+        connection.set_connection_parameters(parameters)
+        with SessionRecorder(self.path("master.log")) as master:
+            connection.set_recorder(master)
+            with connection.connect():
+                connection.send_start_dt()
+                time.sleep(0.1)
+                connection.interrogate(1)
+                self.assertTrue(wait_until(lambda: master.records == 4))
+        records = list(read_session_log(self.path("master.log")))
+        self.assertEqual(bytes(records[0].parameters), bytes(parameters))
+        decoded = [get_decoder(record.parameters).decode(record.asdu) for record in records]
+        self.assertEqual([(asdu.type_id, asdu.oa, asdu.ca) for asdu in decoded],
+                         [(TypeID.C_IC_NA_1, 7, 1), (TypeID.C_IC_NA_1, 7, 1), (TypeID.M_ME_NC_1, 0, 1),
+                          (TypeID.C_IC_NA_1, 7, 1)])
+        self.assertEqual(decoded[0].elements[0].value, 20)
+        self.assertEqual([element.ioa for element in decoded[2].elements], list(range(1000, 1010)))
+        sut = SessionReplayer(self.path("master.log"), Direction.CONTROL)
+        self.assertEqual(sut.records[0][2].sizeOfCA, 1)
+
+    def test_replay(self):
+        path = self.path("session.log")
+        with SessionRecorder(path) as recorder:
+            for asdu in measurements(50):
+                recorder.record_monitor(asdu.get_buffer())
+                time.sleep(0.002)
+            recorder.record_control(measurements(1)[0].get_buffer())
+        received = []
+        self.slave.start()
+        connection = T104Connection("127.0.0.1", PORT)
+        connection.set_asdu_received_handler(lambda asdu: received.append(asdu.decode().elements[0].ioa) or True)
+        with connection.connect():
+            connection.send_start_dt()
+            time.sleep(0.1)
+            sut = SessionReplayer(path, speed=10.0)
+            self.assertEqual(len(sut), 50)
+            start = time.monotonic()
+            report = sut.replay(self.slave)
+            self.assertLess(time.monotonic() - start, report.recorded_duration)
+            self.assertTrue(wait_until(lambda: len(received) == 50))
+            fastest = SessionReplayer(path, speed=None).replay(self.slave)
+            self.assertTrue(wait_until(lambda: len(received) == 100))
+        self.assertEqual(received, list(range(50)) * 2)
+        self.assertEqual(report.records, 50)
+        self.assertGreaterEqual(report.recorded_duration, 0.098)
+        self.assertLess(report.lag["p50"], 0.05)
+        self.assertEqual(fastest.records, 50)
+        self.assertIsNotNone(fastest.rate)
+
+    def test_replay_control(self):
+        path = self.path("session.log")
+        with SessionRecorder(path) as recorder:
+            for ioa in range(20):
+                asdu = ASDU(type_id=TypeID.C_SC_NA_1, cot=CauseOfTransmission.ACTIVATION)
+                asdu.add_information_object(SingleCommand(ioa, True, False, 0))
+                recorder.record_control(asdu.get_buffer())
+        received = []
+
+        def handler(parameter, connection, asdu):
+            received.append(asdu.get_element(0).get_object_address())
+            return True
+
+        self.slave.set_asdu_handler(handler)
+        self.slave.start()
+        connection = T104Connection("127.0.0.1", PORT)
+        with connection.connect():
+            connection.send_start_dt()
+            time.sleep(0.1)
+            report = SessionReplayer(path, Direction.CONTROL, speed=None).replay(connection)
+            self.assertTrue(wait_until(lambda: len(received) == 20))
+        self.assertEqual(received, list(range(20)))
+        self.assertEqual(report.records, 20)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,183 @@
+import sys
+import os
+import unittest
+import logging
+import ctypes
+import threading
+import time
+
+sys.path.insert(1, '../')
+from lib60870.T104Connection import T104Connection, ASDUBatchReceiver
+from lib60870.T104Slave import T104Slave
+from lib60870.asdu import ASDU, ASDUBuilder, decode_asdu
+from lib60870.common import default_connection_parameters
+from lib60870.information_object import MeasuredValueShort
+from lib60870.Interrogation import InterrogationError
+from lib60870.PointDatabase import PointDatabase
+from lib60870.lib60870 import CauseOfTransmission, QualifierOfInterrogation, TypeID, QualityDescriptor
+
+PORT = 24106
+
+
+def build_asdu(ioa):
+    asdu = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.SPONTANEOUS)
+    asdu.add_information_object(MeasuredValueShort(ioa, 1.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+    return asdu
+
+
+class ASDUBatchReceiverTest(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.delivered = threading.Event()
+
+    def tearDown(self):
+        self.sut.stop()
+
+    def callback(self, parameters, buffers):
+        self.batches.append([decode_asdu(buffer, parameters).elements[0].ioa for buffer in buffers])
+        self.delivered.set()
+
+    def capture(self, ioas):
+        for ioa in ioas:
+            self.sut.capture(None, ctypes.addressof(build_asdu(ioa)))
+
+    def test_full_batch(self):
+        self.sut = ASDUBatchReceiver(self.callback, max_batch_size=4, max_latency=10)
+        self.capture(range(100, 104))
+        self.assertTrue(self.delivered.wait(5))
+        self.assertEqual(self.batches, [[100, 101, 102, 103]])
+        self.assertEqual(self.sut.batches, 1)
+
+    def test_max_latency(self):
+        self.sut = ASDUBatchReceiver(self.callback, max_batch_size=4, max_latency=0.01)
+        self.capture([100])
+        self.assertTrue(self.delivered.wait(5))
+        self.assertEqual(self.batches, [[100]])
+
+    def test_drop_oldest(self):
+        self.sut = ASDUBatchReceiver(self.callback, max_batch_size=2, max_latency=10, capacity=2)
+        self.sut.stop()
+        self.capture(range(100, 105))
+        self.assertEqual(self.sut.dropped, 3)
+        self.sut.flush()
+        self.assertEqual(self.batches, [[103, 104]])
+
+    def test_flush(self):
+        self.sut = ASDUBatchReceiver(self.callback, max_batch_size=2, max_latency=10)
+        self.capture(range(100, 105))
+        self.sut.flush()
+        self.assertEqual(sum(self.batches, []), list(range(100, 105)))
+        self.assertEqual(len(self.sut), 0)
+
+
+class T104ConnectionParametersTest(unittest.TestCase):
+    def test_apci_parameters(self):
+        sut = T104Connection("127.0.0.1", PORT)
+        self.assertEqual(sut.get_connection_parameters().k, 12)
+        sut.set_apci_parameters(k=64, w=32)
+        parameters = sut.get_connection_parameters()
+        self.assertEqual((parameters.k, parameters.w, parameters.t0), (64, 32, 10))
+
+    def test_connect_timeout(self):
+        sut = T104Connection("127.0.0.1", PORT)
+        sut.set_connect_timeout(2500)
+        self.assertEqual(sut.get_connection_parameters().t0, 3)
+        sut.set_connect_timeout(200)
+        self.assertEqual(sut.get_connection_parameters().t0, 1)
+
+    def test_slave_apci_parameters(self):
+        slave = T104Slave(default_connection_parameters)
+        slave.set_apci_parameters(k=64, t3=5)
+        parameters = slave.get_connection_parameters()
+        self.assertEqual((parameters.sizeOfIOA, parameters.k, parameters.w, parameters.t3), (3, 64, 8, 5))
+
+
+class T104ConnectionBatchTest(unittest.TestCase):
+    def test_batch_handler(self):
+        def interrogation_handler(parameter, connection, asdu, qoi):
+            connection.send_act_con(asdu)
+            for response in ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, range(100, 400), [1.0] * 300,
+                                                    cot=CauseOfTransmission.INTERROGATED_BY_STATION):
+                connection.send_asdu(response)
+            connection.send_act_term(asdu)
+            return True
+
+        received = []
+        done = threading.Event()
+
+        def batch_handler(parameters, buffers):
+            for buffer in buffers:
+                if buffer[0] == TypeID.M_ME_NC_1.value:
+                    received.append(decode_asdu(buffer, parameters))
+                elif buffer[2] == CauseOfTransmission.ACTIVATION_TERMINATION.value:
+                    done.set()
+
+        slave = T104Slave()
+        slave.set_local_address(b"127.0.0.1")
+        slave.set_local_port(PORT)
+        slave.set_interrogation_handler(interrogation_handler)
+        slave.start()
+        try:
+            sut = T104Connection("127.0.0.1", PORT)
+            receiver = sut.set_asdu_batch_handler(batch_handler, max_batch_size=4)
+            with sut.connect():
+                sut.send_start_dt()
+                sut.send_interrogation_command(ca=1)
+                self.assertTrue(done.wait(5))
+        finally:
+            slave.stop()
+        ioas = [element.ioa for asdu in received for element in asdu.elements]
+        self.assertEqual(ioas, list(range(100, 400)))
+        self.assertEqual(receiver.dropped, 0)
+
+
+class T104ConnectionInterrogateTest(unittest.TestCase):
+    def test_interrogate(self):
+        database = PointDatabase()
+        database.add_points(1, TypeID.M_ME_NC_1, range(500), [float(ioa) for ioa in range(500)])
+        database.add_points(1, TypeID.M_SP_NA_1, [1000, 1001], [True, False], group=1)
+        database.add_points(2, TypeID.M_ME_NC_1, [7], [7.5])
+        slave = T104Slave(max_high_prio_queue_size=32)
+        slave.set_local_address(b"127.0.0.1")
+        slave.set_local_port(PORT)
+        slave.set_point_database(database)
+        slave.start()
+        received = []
+        try:
+            sut = T104Connection("127.0.0.1", PORT)
+            sut.set_asdu_received_handler(lambda asdu: received.append(asdu.get_cot()) or True)
+            with sut.connect():
+                sut.send_start_dt()
+                time.sleep(0.1)
+                results = {}
+                threads = [threading.Thread(target=lambda ca=ca: results.update({ca: sut.interrogate(ca, timeout=5)}))
+                           for ca in (1, 2)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                group = sut.interrogate(1, QualifierOfInterrogation.IEC60870_QOI_GROUP_1, timeout=5)
+                with self.assertRaises(InterrogationError) as context:
+                    sut.interrogate(3, timeout=5)
+        finally:
+            slave.stop()
+        self.assertEqual(len(results[1]), 502)
+        self.assertEqual(sorted(results[1].ioas), list(range(500)) + [1000, 1001])
+        self.assertEqual(results[1].to_dict()[1000], 1.0)
+        self.assertGreater(results[1].duration, 0)
+        self.assertLessEqual(results[1].confirmation_time, results[1].duration)
+        self.assertEqual(results[2].to_dict(), {7: 7.5})
+        self.assertEqual((list(group.ioas), list(group.type_ids)), ([1000, 1001], [1, 1]))
+        self.assertEqual(context.exception.asdu.get_cot(), CauseOfTransmission.UNKNOWN_COMMON_ADDRESS_OF_ASDU)
+        self.assertIn(CauseOfTransmission.ACTIVATION_TERMINATION, received)
+
+    def test_interrogate_timeout(self):
+        sut = T104Connection("127.0.0.1", PORT)
+        with self.assertRaises(ConnectionError):
+            sut.interrogate(1, timeout=0.1)
+        self.assertEqual(sut._interrogations, {})
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()
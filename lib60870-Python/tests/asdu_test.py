@@ -6,11 +6,20 @@ from unittest import mock
 import datetime
 import time
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 sys.path.insert(1, '../')
-from lib60870.asdu import ASDU, ASDU_create_from_buffer
+from lib60870.asdu import ASDU, ASDU_create_from_buffer, ASDUDecoder, decode_asdu, decode_many
+from lib60870.asdu import ASDUBuilder, MAX_ASDU_LENGTH
 from lib60870.common import ConnectionParameters, default_connection_parameters
 from lib60870.lib60870 import CauseOfTransmission, TypeID, QualityDescriptor
-from lib60870.information_object import pMeasuredValueScaled, SinglePointInformation
+from lib60870.information_object import pMeasuredValueScaled, SinglePointInformation, MeasuredValueShort
+from lib60870.information_object import MeasuredValueNormalized, StepPositionInformation, SinglePointWithCP56Time2a
+from lib60870.information_object import MeasuredValueScaledWithCP56Time2a
+from lib60870.CP56Time2a import CP56Time2a
 
 parameters = default_connection_parameters
 class ASDUTest(unittest.TestCase):
@@ -81,6 +90,30 @@ class ASDUTest(unittest.TestCase):
             self.assertEqual(element.get_type_id(), TypeID.M_ME_NB_1)
             self.assertIs(element.get_pointer_type(), pMeasuredValueScaled)
 
+    def test_iter_elements_reuses_instance(self):
+        sut = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.SPONTANEOUS)
+        for ioa in range(100, 105):
+            sut.add_information_object(MeasuredValueShort(ioa, ioa * 1.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        elements = [(id(io), io.get_object_address(), io.get_value()) for io in sut.iter_elements()]
+        self.assertEqual(len(set(element[0] for element in elements)), 1)
+        self.assertEqual([element[1:] for element in elements], [(ioa, ioa * 1.5) for ioa in range(100, 105)])
+
+    def test_iter_elements_sequence(self):
+        data = b'\x0b\x83\x03\x00\x01\x00\x01\x00\x00\x00\x80\xf1\n\x00\xf1\xfb\xff\xf1'
+        sut = ASDU_create_from_buffer(parameters, data, len(data))
+        self.assertEqual([io.copy() for io in sut.iter_elements()], sut.get_elements())
+
+    def test_iter_elements_without_reuse(self):
+        sut = ASDU(type_id=TypeID.M_SP_NA_1, cot=CauseOfTransmission.SPONTANEOUS)
+        sut.add_information_object(SinglePointInformation(1, True, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        sut.add_information_object(SinglePointInformation(2, False, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        elements = list(sut.iter_elements(reuse=False))
+        self.assertIsNot(elements[0], elements[1])
+        self.assertEqual(elements, sut.get_elements())
+
+    def test_iter_elements_empty(self):
+        self.assertEqual(list(ASDU().iter_elements()), [])
+
     def test_add_information_object(self):
         io = SinglePointInformation(400, True, QualityDescriptor.IEC60870_QUALITY_GOOD)
         sut = ASDU(None, io.get_type_id(), False, CauseOfTransmission.PERIODIC, 0, 1, False, False)
@@ -88,6 +121,249 @@ class ASDUTest(unittest.TestCase):
         self.assertEqual(io, sut.elements[0])
 
 
+class ASDUDecoderTest(unittest.TestCase):
+    def test_decode_interrogation_command(self):
+        data = b"d\001\a\000\001\000\000\000\000\024"
+        sut = decode_asdu(data)
+        self.assertEqual(sut.type_id, TypeID.C_IC_NA_1)
+        self.assertEqual(sut.cot, CauseOfTransmission.ACTIVATION_CON)
+        self.assertEqual(sut.ca, 1)
+        self.assertEqual(len(sut.elements), 1)
+        self.assertEqual(sut.elements[0].ioa, 0)
+        self.assertEqual(sut.elements[0].value, 20)
+
+    def test_decode_sequence(self):
+        data = b'\x0b\x83\x03\x00\x01\x00\x01\x00\x00\x00\x80\xf1\n\x00\xf1\xfb\xff\xf1'
+        sut = decode_asdu(data)
+        self.assertTrue(sut.is_sequence)
+        self.assertEqual([element.ioa for element in sut.elements], [1, 2, 3])
+        expected = ASDU_create_from_buffer(parameters, data, len(data)).get_elements()
+        self.assertEqual([element.value for element in sut.elements], [io.get_value() for io in expected])
+        self.assertEqual([element.quality for element in sut.elements], [io.get_quality() for io in expected])
+
+    def test_decode_matches_get_elements(self):
+        sut = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.SPONTANEOUS, ca=300)
+        sut.add_information_object(MeasuredValueShort(100, 1.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        sut.add_information_object(MeasuredValueShort(70000, -2.25, QualityDescriptor.IEC60870_QUALITY_INVALID))
+        decoded = sut.decode()
+        self.assertEqual(decoded.ca, 300)
+        self.assertEqual(decoded.cot, CauseOfTransmission.SPONTANEOUS)
+        for element, io in zip(decoded.elements, sut.get_elements()):
+            self.assertEqual(element.ioa, io.get_object_address())
+            self.assertEqual(element.value, io.get_value())
+            self.assertEqual(element.quality, io.get_quality())
+
+    def test_decode_normalized_value(self):
+        sut = ASDU(type_id=TypeID.M_ME_NA_1, cot=CauseOfTransmission.PERIODIC)
+        sut.add_information_object(MeasuredValueNormalized(100, -0.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        self.assertAlmostEqual(sut.decode().elements[0].value, sut.get_element(0).get_value(), places=6)
+
+    def test_decode_step_position(self):
+        sut = ASDU(type_id=TypeID.M_ST_NA_1, cot=CauseOfTransmission.SPONTANEOUS)
+        sut.add_information_object(StepPositionInformation(100, -20, True, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        self.assertEqual(sut.decode().elements[0].value, (-20, True))
+
+    def test_decode_cp56_timestamp(self):
+        timestamp = CP56Time2a(1500000012345)
+        sut = ASDU(type_id=TypeID.M_SP_TB_1, cot=CauseOfTransmission.SPONTANEOUS)
+        sut.add_information_object(
+            SinglePointWithCP56Time2a(100, True, QualityDescriptor.IEC60870_QUALITY_GOOD, timestamp))
+        element = sut.decode().elements[0]
+        self.assertEqual(element.timestamp, timestamp.to_ms_timestamp())
+        self.assertEqual(element.timestamp, 1500000012345)
+
+    def test_decode_small_parameters(self):
+        small_parameters = ConnectionParameters(
+            sizeOfTypeId=1, sizeOfVSQ=1, sizeOfCOT=1, originatorAddress=0, sizeOfCA=1, sizeOfIOA=2)
+        data = b"\x0d\x01\x03\x07\x34\x12\x00\x00\xc0\x3f\x00"
+        sut = ASDUDecoder(small_parameters).decode(data)
+        self.assertEqual(sut.ca, 7)
+        self.assertEqual(sut.oa, 0)
+        self.assertEqual(sut.elements[0].ioa, 0x1234)
+        self.assertEqual(sut.elements[0].value, 1.5)
+
+    def test_decode_unlisted_cot(self):
+        data = b"\x0d\x01\x13\x00\x01\x00\x01\x00\x00\x00\x00\xc0\x3f\x00"
+        sut = decode_asdu(data)
+        self.assertEqual(sut.cot, 19)
+        self.assertEqual(sut.elements[0].value, 1.5)
+
+    def test_decode_test_command(self):
+        data = b"\x68\x01\x07\x00\x01\x00\x00\x00\x00\xcc\x55"
+        sut = decode_asdu(data)
+        self.assertEqual(sut.type_id, TypeID.C_TS_NA_1)
+        self.assertEqual(sut.cot, CauseOfTransmission.ACTIVATION_CON)
+        self.assertEqual(sut.elements[0].value, 0x55cc)
+
+    def test_decode_test_command_cp56_timestamp(self):
+        timestamp = CP56Time2a(1500000012345)
+        data = b"\x6b\x01\x06\x00\x01\x00\x00\x00\x00\x34\x12" + bytes(timestamp.encodedValue)
+        sut = decode_asdu(data)
+        self.assertEqual(sut.type_id, TypeID.C_TS_TA_1)
+        self.assertEqual(sut.elements[0].value, 0x1234)
+        self.assertEqual(sut.elements[0].timestamp, 1500000012345)
+
+    def test_supports(self):
+        sut = ASDUDecoder()
+        self.assertTrue(sut.supports(TypeID.M_ME_NC_1))
+        self.assertTrue(sut.supports(13))
+        self.assertFalse(sut.supports(TypeID.F_FR_NA_1))
+
+    def test_decode_unsupported_type(self):
+        data = b"\x78\x01\x03\x00\x01\x00\x00\x00\x00"
+        with self.assertRaises(ValueError):
+            decode_asdu(data)
+
+    def test_decode_too_short(self):
+        data = b"\x0d\x01\x03\x00\x01\x00\x01\x00\x00"
+        with self.assertRaises(ValueError):
+            decode_asdu(data)
+
+
+class ASDUBuilderTest(unittest.TestCase):
+    def test_from_arrays(self):
+        sut = ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [100, 200, 300], [1.5, -2.25, 3.0],
+                                      [0, QualityDescriptor.IEC60870_QUALITY_INVALID, 0],
+                                      cot=CauseOfTransmission.INTERROGATED_BY_STATION, ca=5)
+        self.assertEqual(len(sut), 1)
+        asdu = sut[0]
+        self.assertEqual(asdu.get_type_id(), TypeID.M_ME_NC_1)
+        self.assertEqual(asdu.get_cot(), CauseOfTransmission.INTERROGATED_BY_STATION)
+        self.assertEqual(asdu.get_ca(), 5)
+        self.assertFalse(asdu.is_sequence())
+        self.assertEqual(asdu.get_elements(), [
+            MeasuredValueShort(100, 1.5, QualityDescriptor.IEC60870_QUALITY_GOOD),
+            MeasuredValueShort(200, -2.25, QualityDescriptor.IEC60870_QUALITY_INVALID),
+            MeasuredValueShort(300, 3.0, QualityDescriptor.IEC60870_QUALITY_GOOD)])
+
+    def test_from_arrays_sequence(self):
+        ioas = list(range(1000, 1010)) + [2000]
+        sut = ASDUBuilder.from_arrays(TypeID.M_SP_NA_1, ioas, [ioa % 2 == 0 for ioa in ioas])
+        self.assertEqual([asdu.is_sequence() for asdu in sut], [True, False])
+        elements = [io for asdu in sut for io in asdu.get_elements()]
+        self.assertEqual([io.get_object_address() for io in elements], ioas)
+        self.assertEqual([io.get_value() for io in elements], [ioa % 2 == 0 for ioa in ioas])
+
+    def test_from_arrays_splits(self):
+        ioas = list(range(0, 2000, 2))
+        sut = ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, ioas, [float(ioa) for ioa in ioas])
+        self.assertTrue(all(len(asdu.get_buffer()) <= MAX_ASDU_LENGTH for asdu in sut))
+        elements = [element for asdu in sut for element in asdu.decode().elements]
+        self.assertEqual([element.ioa for element in elements], ioas)
+        self.assertEqual([element.value for element in elements], [float(ioa) for ioa in ioas])
+
+    def test_from_arrays_splits_sequence(self):
+        sut = ASDUBuilder.from_arrays(TypeID.M_SP_NA_1, range(300), [True] * 300)
+        self.assertEqual([asdu.get_number_of_elements() for asdu in sut], [127, 127, 46])
+        self.assertEqual(sut[1].get_element(0).get_object_address(), 127)
+
+    def test_from_arrays_cp56_timestamp(self):
+        sut = ASDUBuilder.from_arrays(TypeID.M_SP_TB_1, [100], [True], timestamps=[1500000012345])
+        self.assertEqual(sut[0].get_element(0).get_timestamp().to_ms_timestamp(), 1500000012345)
+
+    def test_from_arrays_step_position_round_trip(self):
+        values = [(-20, True), (63, False), (-64, True), 5]
+        timestamps = [1500000012345] * len(values)
+        for type_id in (TypeID.M_ST_NA_1, TypeID.M_ST_TA_1, TypeID.M_ST_TB_1):
+            sut = ASDUBuilder.from_arrays(type_id, [10, 20, 30, 40], values, timestamps=timestamps)
+            elements = sut[0].decode().elements
+            self.assertEqual([element.value for element in elements],
+                             [(-20, True), (63, False), (-64, True), (5, False)])
+            decoded = [element.value for element in elements]
+            again = ASDUBuilder.from_arrays(type_id, [10, 20, 30, 40], decoded, timestamps=timestamps)
+            self.assertEqual(again[0].get_buffer(), sut[0].get_buffer())
+        io = sut[0].get_element(0)
+        self.assertEqual((io.get_value(), io.is_transient()), (-20, True))
+
+    def test_from_arrays_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            ASDUBuilder.from_arrays(TypeID.M_ME_NC_1, [1, 2], [1.0])
+
+    def test_supports(self):
+        sut = ASDUBuilder()
+        self.assertTrue(sut.supports(TypeID.M_ST_TB_1))
+        self.assertTrue(sut.supports(32))
+        self.assertFalse(sut.supports(TypeID.C_SC_NA_1))
+
+    def test_from_arrays_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            ASDUBuilder.from_arrays(TypeID.C_SC_NA_1, [1], [True])
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class ASDUNumpyTest(unittest.TestCase):
+    def test_to_numpy(self):
+        sut = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.SPONTANEOUS, ca=300)
+        sut.add_information_object(MeasuredValueShort(100, 1.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        sut.add_information_object(MeasuredValueShort(70000, -2.25, QualityDescriptor.IEC60870_QUALITY_INVALID))
+        result = sut.to_numpy()
+        self.assertEqual(list(result["ca"]), [300, 300])
+        self.assertEqual(list(result["ioa"]), [100, 70000])
+        self.assertEqual(list(result["value"]), [1.5, -2.25])
+        self.assertEqual(list(result["quality"]), [0, QualityDescriptor.IEC60870_QUALITY_INVALID])
+        self.assertEqual(list(result["timestamp_ms"]), [-1, -1])
+
+    def test_to_numpy_sequence(self):
+        data = b'\x0b\x83\x03\x00\x01\x00\x01\x00\x00\x00\x80\xf1\n\x00\xf1\xfb\xff\xf1'
+        result = decode_many([data])
+        self.assertEqual(list(result["ioa"]), [1, 2, 3])
+        self.assertEqual(list(result["value"]), [element.value for element in decode_asdu(data).elements])
+
+    def test_to_numpy_cp56_timestamp(self):
+        timestamp = CP56Time2a(1500000012345)
+        sut = ASDU(type_id=TypeID.M_ME_TE_1, cot=CauseOfTransmission.SPONTANEOUS)
+        sut.add_information_object(
+            MeasuredValueScaledWithCP56Time2a(100, -1234, QualityDescriptor.IEC60870_QUALITY_GOOD, timestamp))
+        result = sut.to_numpy()
+        self.assertEqual(result["value"][0], -1234)
+        self.assertEqual(result["timestamp_ms"][0], 1500000012345)
+
+    def test_to_numpy_normalized_matches_decode(self):
+        sut = ASDU(type_id=TypeID.M_ME_NA_1, cot=CauseOfTransmission.PERIODIC)
+        sut.add_information_object(MeasuredValueNormalized(100, -0.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        self.assertEqual(sut.to_numpy()["value"][0], sut.decode().elements[0].value)
+
+    def test_decode_many(self):
+        asdus = []
+        for ca in (1, 2):
+            asdu = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.SPONTANEOUS, ca=ca)
+            asdu.add_information_object(MeasuredValueShort(100, ca, QualityDescriptor.IEC60870_QUALITY_GOOD))
+            asdus.append(asdu)
+        result = decode_many(asdus)
+        self.assertEqual(list(result["ca"]), [1, 2])
+        self.assertEqual(list(result["value"]), [1.0, 2.0])
+
+    def test_decode_many_mixed_types(self):
+        normalized = ASDU(type_id=TypeID.M_ME_NA_1, cot=CauseOfTransmission.PERIODIC, is_sequence=True)
+        normalized.add_information_object(MeasuredValueNormalized(10, 0.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        normalized.add_information_object(MeasuredValueNormalized(11, 0.25, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        short = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.PERIODIC)
+        short.add_information_object(MeasuredValueShort(20, 3.5, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        result = decode_many([normalized, normalized, short])
+        self.assertEqual(list(result["ioa"]), [10, 11, 10, 11, 20])
+        self.assertEqual(result["value"][4], 3.5)
+
+    def test_decode_many_connection_parameters(self):
+        small_parameters = ConnectionParameters(
+            sizeOfTypeId=1, sizeOfVSQ=1, sizeOfCOT=1, originatorAddress=0, sizeOfCA=1, sizeOfIOA=2)
+        small = ASDU.from_bytes(b"\x0d\x01\x03\x07\x34\x12\x00\x00\xc0\x3f\x00", small_parameters)
+        default = ASDU(type_id=TypeID.M_ME_NC_1, cot=CauseOfTransmission.SPONTANEOUS, ca=300)
+        default.add_information_object(MeasuredValueShort(70000, -2.25, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        result = decode_many([small, default, small])
+        self.assertEqual(list(result["ca"]), [7, 300, 7])
+        self.assertEqual(list(result["ioa"]), [0x1234, 70000, 0x1234])
+        self.assertEqual(list(result["value"]), [1.5, -2.25, 1.5])
+
+    def test_decode_many_empty(self):
+        self.assertEqual(len(decode_many([])), 0)
+
+    def test_to_numpy_unsupported_type(self):
+        sut = ASDU(type_id=TypeID.M_SP_NA_1, cot=CauseOfTransmission.SPONTANEOUS)
+        sut.add_information_object(SinglePointInformation(100, True, QualityDescriptor.IEC60870_QUALITY_GOOD))
+        with self.assertRaises(ValueError):
+            sut.to_numpy()
+
+
 if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
     unittest.main()
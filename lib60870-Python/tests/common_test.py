@@ -10,6 +10,7 @@ sys.path.insert(1, '../')
 from lib60870.CP56Time2a import CP56Time2a
 from lib60870.CP24Time2a import CP24Time2a
 from lib60870.CP16Time2a import CP16Time2a
+from lib60870.common import ConnectionParameters, T104ConnectionParameters, default_connection_parameters
 
 
 class CP56Time2aTest(unittest.TestCase):
@@ -130,6 +131,26 @@ class CPxxTime2aCompare(unittest.TestCase):
         self.assertFalse(a == b)
 
 
+class T104ConnectionParametersTest(unittest.TestCase):
+    def test_from_connection_parameters(self):
+        sut = T104ConnectionParameters.from_connection_parameters(default_connection_parameters, k=100, t1=30)
+        self.assertIsInstance(sut, ConnectionParameters)
+        self.assertEqual((sut.sizeOfCOT, sut.sizeOfCA, sut.sizeOfIOA), (2, 2, 3))
+        self.assertEqual((sut.k, sut.w, sut.t0, sut.t1, sut.t2, sut.t3), (100, 8, 10, 30, 10, 20))
+
+    def test_keeps_apci_parameters(self):
+        parameters = T104ConnectionParameters.from_connection_parameters(default_connection_parameters, k=100)
+        sut = T104ConnectionParameters.from_connection_parameters(parameters, w=50)
+        self.assertEqual((sut.k, sut.w), (100, 50))
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(TypeError):
+            T104ConnectionParameters.from_connection_parameters(default_connection_parameters, x=1)
+
+    def test_repr(self):
+        self.assertIn("sizeOfIOA=3, k=12", repr(T104ConnectionParameters.from_connection_parameters(
+            default_connection_parameters)))
+
 if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
     unittest.main()
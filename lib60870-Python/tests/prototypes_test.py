@@ -0,0 +1,46 @@
+import sys
+import os
+import unittest
+import logging
+import ctypes
+from unittest import mock
+
+sys.path.insert(1, '../')
+from lib60870.prototypes import _prototypes, bind_prototypes
+from lib60870.lib60870 import get_library
+from lib60870.information_object import MeasuredValueNormalized, CounterInterrogationCommand
+from lib60870.lib60870 import QualityDescriptor
+
+
+class PrototypesTest(unittest.TestCase):
+    def test_all_prototypes_bound(self):
+        lib = get_library()
+        for name, restype, argtypes in _prototypes:
+            function = getattr(lib, name)
+            self.assertIs(function.restype, restype, name)
+            self.assertEqual(function.argtypes, argtypes, name)
+
+    def test_names_unique(self):
+        names = [prototype[0] for prototype in _prototypes]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_bind_custom_library(self):
+        function = mock.Mock()
+        library = mock.Mock(Test_function=function)
+        bind_prototypes(library, [("Test_function", ctypes.c_bool, [ctypes.c_int])])
+        self.assertIs(function.restype, ctypes.c_bool)
+        self.assertEqual(function.argtypes, [ctypes.c_int])
+
+    def test_scaled_value_does_not_change_float_restype(self):
+        sut = MeasuredValueNormalized(100, 0.5, QualityDescriptor.IEC60870_QUALITY_GOOD)
+        sut.get_value(as_scaled=True)
+        self.assertAlmostEqual(sut.get_value(), 0.5, places=3)
+
+    def test_uint8_argument(self):
+        sut = CounterInterrogationCommand(0, 5)
+        self.assertEqual(sut.get_qcc(), 5)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s %(name)s:%(levelname)s:%(message)s', level=logging.DEBUG)
+    unittest.main()